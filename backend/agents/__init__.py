@@ -7,6 +7,9 @@ Phase 2: Simple Agent Foundation ✅
 Phase 3: Multi-Agent Supervisor Architecture ✅
 - supervisor_agent.py: Supervisor agent with routing logic
 - workers/: Specialized worker agents (Technical, Billing, Policy)
+
+Phase 6: Streaming ✅
+- streaming.py: Token-level streaming from supervisor and worker agents
 """
 
 # Phase 2: Simple Agent (for reference/fallback)
@@ -15,10 +18,21 @@ from .simple_agent import (
     get_agent,
 )
 
+# Phase 6: Token streaming
+from .streaming import (
+    SUPERVISOR_AGENT_NAME,
+    TokenChunk,
+    stream_agent_tokens,
+)
+
 # Phase 3: Supervisor Agent (primary for multi-agent routing)
 from .supervisor_agent import (
     create_supervisor_agent,
     get_supervisor,
+    record_turn,
+    routed_domain,
+    session_count,
+    session_has_history,
 )
 
 __all__ = [
@@ -28,4 +42,12 @@ __all__ = [
     # Phase 3 exports
     "create_supervisor_agent",
     "get_supervisor",
+    "record_turn",
+    "routed_domain",
+    "session_count",
+    "session_has_history",
+    # Phase 6 exports
+    "SUPERVISOR_AGENT_NAME",
+    "TokenChunk",
+    "stream_agent_tokens",
 ]
@@ -0,0 +1,268 @@
+"""
+Embedding-Centroid Router for Fast-Path Routing.
+
+Routes a message to the domain whose knowledge base it is closest to in
+embedding space. Each domain is represented by the normalized mean of its
+chunk embeddings (centroid) plus a sample of the chunks themselves
+(exemplars); a domain's score is the average of the message's cosine
+similarity to its centroid and to its nearest exemplar. Messages whose two
+best domains are within ``min_margin`` go to the supervisor LLM.
+
+The per-domain vectors are precomputed by scripts/build_domain_centroids.py
+(from the Chroma collections of technical, billing and general, and the
+compliance documents) and loaded at startup. At query time the message is
+embedded once through data.vectorstore.embed_query, which remembers the
+vector; the routed worker's first knowledge base search reuses it instead
+of embedding its own query (see data.vectorstore.set_routed_query).
+
+Last Updated: October 17, 2026
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import numpy as np
+
+from .routing import RouteDecision
+
+logger = logging.getLogger(__name__)
+
+# Default artifact location (scripts/build_domain_centroids.py writes it here)
+DEFAULT_CENTROIDS_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "domain_centroids.npz"
+)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows (or a single vector) to unit length."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingRouter:
+    """
+    Nearest-domain router over knowledge base embeddings.
+
+    Example:
+        >>> router = EmbeddingRouter.load("domain_centroids.npz", embed=embed_query)
+        >>> router.route("Why was my card charged twice?")
+        RouteDecision(domain='billing', confidence=0.081, router='embedding')
+    """
+
+    name = "embedding"
+
+    def __init__(
+        self,
+        domains: list[str],
+        centroids: np.ndarray,
+        exemplars: np.ndarray,
+        exemplar_domains: np.ndarray,
+        embed: Callable[[str], list[float]],
+        aembed: Callable[[str], Awaitable[list[float]]] | None = None,
+        min_similarity: float = 0.25,
+        min_margin: float = 0.04,
+    ):
+        """
+        Args:
+            domains: Domain names, in row order of ``centroids``
+            centroids: One vector per domain, shape (domains, dimensions)
+            exemplars: Sample chunk vectors, shape (exemplars, dimensions)
+            exemplar_domains: Index into ``domains`` per exemplar
+            embed: Embeds a message (sync runs)
+            aembed: Embeds a message (async runs); defaults to ``embed``
+            min_similarity: Lowest score of the best domain used for routing
+            min_margin: Lowest lead of the best domain over the runner-up
+        """
+        self.domains = list(domains)
+        self.centroids = _normalize(np.asarray(centroids, dtype=np.float32))
+        self.exemplars = _normalize(np.asarray(exemplars, dtype=np.float32))
+        self.exemplar_domains = np.asarray(exemplar_domains, dtype=np.intp)
+        self.embed = embed
+        self.aembed = aembed
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+
+    def scores(self, vector: list[float] | np.ndarray) -> dict[str, float]:
+        """
+        Score each domain for a message embedding.
+
+        Args:
+            vector: Message embedding
+
+        Returns:
+            dict: Domain -> mean of the cosine similarity to its centroid
+            and to its nearest exemplar
+        """
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        centroid_similarity = self.centroids @ query
+        nearest = np.full(len(self.domains), -1.0, dtype=np.float32)
+        np.maximum.at(nearest, self.exemplar_domains, self.exemplars @ query)
+        # Domains without exemplars are scored on their centroid alone
+        nearest = np.where(nearest > -1.0, nearest, centroid_similarity)
+        return dict(zip(self.domains, ((centroid_similarity + nearest) / 2).tolist()))
+
+    def decide(self, vector: list[float] | np.ndarray) -> RouteDecision | None:
+        """
+        Route a message embedding if one domain clearly wins.
+
+        Returns:
+            RouteDecision | None: Nearest domain with its lead over the
+            runner-up as confidence, or None below ``min_similarity`` or
+            ``min_margin``
+        """
+        ranked = sorted(
+            self.scores(vector).items(), key=lambda item: item[1], reverse=True
+        )
+        (domain, top), (_, second) = ranked[0], ranked[1]
+        if top < self.min_similarity or top - second < self.min_margin:
+            return None
+        return RouteDecision(domain, round(top - second, 3), self.name)
+
+    def route(self, message: str) -> RouteDecision | None:
+        """Embed ``message`` and route it (None if embedding fails)."""
+        try:
+            vector = self.embed(message)
+        except Exception as e:  # noqa: BLE001 - any failure falls back to the LLM
+            logger.warning(
+                f"Embedding router: could not embed message, leaving it to the LLM: {e}"
+            )
+            return None
+        return self.decide(vector)
+
+    async def aroute(self, message: str) -> RouteDecision | None:
+        """Async ``route``: embeds without blocking the event loop."""
+        if self.aembed is None:
+            return self.route(message)
+        try:
+            vector = await self.aembed(message)
+        except Exception as e:  # noqa: BLE001 - any failure falls back to the LLM
+            logger.warning(
+                f"Embedding router: could not embed message, leaving it to the LLM: {e}"
+            )
+            return None
+        return self.decide(vector)
+
+    @staticmethod
+    def build_vectors(
+        corpora: dict[str, np.ndarray], max_exemplars: int = 64
+    ) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute centroids and exemplars from per-domain chunk embeddings.
+
+        Args:
+            corpora: Domain -> chunk embeddings, shape (chunks, dimensions)
+            max_exemplars: Chunks kept per domain (evenly spaced sample)
+
+        Returns:
+            tuple: (domains, centroids, exemplars, exemplar_domains)
+
+        Raises:
+            ValueError: If fewer than two domains have embeddings
+        """
+        domains = [domain for domain, vectors in corpora.items() if len(vectors)]
+        if len(domains) < 2:
+            raise ValueError("Need chunk embeddings for at least two domains")
+        centroids, exemplars, exemplar_domains = [], [], []
+        for index, domain in enumerate(domains):
+            vectors = _normalize(np.asarray(corpora[domain], dtype=np.float32))
+            centroids.append(_normalize(vectors.mean(axis=0)))
+            picks = (
+                np.linspace(0, len(vectors) - 1, min(len(vectors), max_exemplars))
+                .round()
+                .astype(int)
+            )
+            exemplars.append(vectors[np.unique(picks)])
+            exemplar_domains += [index] * len(np.unique(picks))
+        return (
+            domains,
+            np.stack(centroids),
+            np.concatenate(exemplars),
+            np.array(exemplar_domains),
+        )
+
+    @staticmethod
+    def save_vectors(
+        path: str | Path,
+        domains: list[str],
+        centroids: np.ndarray,
+        exemplars: np.ndarray,
+        exemplar_domains: np.ndarray,
+        embedding_model: str,
+        knowledge_base_version: str,
+    ) -> None:
+        """
+        Write domain vectors as a compressed ``.npz`` artifact.
+
+        Args:
+            path: Output file
+            domains, centroids, exemplars, exemplar_domains: From build_vectors()
+            embedding_model: Model the vectors were embedded with
+            knowledge_base_version: Version of data/docs they were built from
+        """
+        np.savez_compressed(
+            path,
+            domains=np.array(domains),
+            centroids=centroids.astype(np.float32),
+            exemplars=exemplars.astype(np.float16),
+            exemplar_domains=exemplar_domains.astype(np.int16),
+            embedding_model=np.array(embedding_model),
+            knowledge_base_version=np.array(knowledge_base_version),
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        embed: Callable[[str], list[float]],
+        aembed: Callable[[str], Awaitable[list[float]]] | None = None,
+        embedding_model: str | None = None,
+        knowledge_base_version: str | None = None,
+        min_similarity: float = 0.25,
+        min_margin: float = 0.04,
+    ) -> "EmbeddingRouter":
+        """
+        Load a router from an artifact written by save_vectors().
+
+        Args:
+            path: Artifact file
+            embed, aembed: Message embedding functions
+            embedding_model: Model ``embed`` uses; must match the artifact's
+            knowledge_base_version: Current data/docs version; a mismatch
+                (stale centroids) is logged
+            min_similarity, min_margin: Routing thresholds
+
+        Returns:
+            EmbeddingRouter: Loaded router
+
+        Raises:
+            FileNotFoundError: If the artifact does not exist
+            ValueError: If the artifact was built with another embedding model
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            built_with = str(artifact["embedding_model"])
+            built_from = str(artifact["knowledge_base_version"])
+            if embedding_model is not None and built_with != embedding_model:
+                raise ValueError(
+                    f"Domain centroids in {path} were built with {built_with}, not {embedding_model}"
+                )
+            router = cls(
+                artifact["domains"].tolist(),
+                artifact["centroids"],
+                artifact["exemplars"],
+                artifact["exemplar_domains"],
+                embed,
+                aembed,
+                min_similarity,
+                min_margin,
+            )
+        if knowledge_base_version is not None and built_from != knowledge_base_version:
+            logger.warning(
+                f"Domain centroids in {path} were built from knowledge base {built_from}, "
+                f"now {knowledge_base_version}; rebuild with scripts/build_domain_centroids.py"
+            )
+        logger.info(
+            f"Loaded domain centroids from {path} "
+            f"({len(router.exemplars)} exemplars, domains: {', '.join(router.domains)})"
+        )
+        return router
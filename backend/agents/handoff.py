@@ -0,0 +1,135 @@
+"""
+Worker Handoff for the Supervisor Agent.
+
+The supervisor prompt says to pass specialist responses directly to the
+user, but once a worker tool has returned, the agent loop still makes a
+second supervisor LLM call, which re-generates the worker's answer token by
+token. That doubles the output tokens of a routed turn and adds a full
+generation to its latency.
+
+``WorkerHandoffMiddleware`` runs on the supervisor's model calls: when the
+call would follow a single, successful worker tool call, it is replaced by
+an AIMessage carrying the worker's answer verbatim. The message has no tool
+calls, so the turn ends there; it is streamed (stream_mode="messages") and
+written to the session checkpoint like any supervisor reply. Turns in which
+the supervisor called several workers, or a worker failed, still get the
+LLM call to combine or explain the results.
+
+LangChain Version: v1.0+
+Documentation Reference: https://docs.langchain.com/oss/python/langchain/middleware
+Last Updated: October 17, 2026
+"""
+
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.messages import AIMessage, ToolMessage
+
+from .streaming import SUPERVISOR_AGENT_NAME, message_text
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerHandoffMiddleware(AgentMiddleware):
+    """
+    Supervisor middleware that ends a turn with the worker's answer.
+
+    Example:
+        >>> handoff = WorkerHandoffMiddleware({"billing_support_tool", "technical_support_tool"})
+        >>> supervisor = create_agent(model, tools, middleware=[handoff], ...)
+    """
+
+    def __init__(self, worker_tools: set[str], enabled: bool = True):
+        """
+        Args:
+            worker_tools: Names of the worker tools whose results are handed
+                off (other tools' results still go back to the LLM)
+            enabled: False to always make the LLM call (WORKER_HANDOFF_ENABLED)
+        """
+        super().__init__()
+        self.worker_tools = set(worker_tools)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._handoffs: dict[str, int] = {}
+        self._fallbacks = 0
+        self._characters = 0
+
+    def worker_result(self, messages: list) -> ToolMessage | None:
+        """
+        The worker answer a model call could hand off.
+
+        Args:
+            messages: Conversation the model call would see
+
+        Returns:
+            ToolMessage | None: The result of the only tool call made since
+            the supervisor's last message, if it came from a worker tool
+            and succeeded; None otherwise (including the first model call
+            of a turn)
+        """
+        results = []
+        for message in reversed(messages):
+            if not isinstance(message, ToolMessage):
+                break
+            results.append(message)
+        if not results:
+            return None
+        if (
+            len(results) > 1
+            or results[0].name not in self.worker_tools
+            or results[0].status == "error"
+        ):
+            with self._lock:
+                self._fallbacks += 1
+            return None
+        return results[0]
+
+    def _handoff(self, request: ModelRequest) -> AIMessage | None:
+        """The supervisor's final message, or None if the LLM should answer."""
+        if not self.enabled:
+            return None
+        result = self.worker_result(request.messages)
+        if result is None:
+            return None
+        answer = message_text(result)
+        with self._lock:
+            self._handoffs[result.name] = self._handoffs.get(result.name, 0) + 1
+            self._characters += len(answer)
+        logger.info(
+            f"🤝 HANDOFF: Returning {result.name} answer directly ({len(answer)} chars), "
+            "skipping the supervisor LLM call"
+        )
+        return AIMessage(content=answer, name=SUPERVISOR_AGENT_NAME)
+
+    def wrap_model_call(
+        self, request: ModelRequest, handler: Callable[[ModelRequest], ModelResponse]
+    ) -> ModelResponse | AIMessage:
+        message = self._handoff(request)
+        return message if message is not None else handler(request)
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse | AIMessage:
+        message = self._handoff(request)
+        return message if message is not None else await handler(request)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Handoff counters for health and metrics endpoints.
+
+        Returns:
+            dict: Turns handed off per worker tool, turns whose tool results
+            went back to the LLM ("fallback": several tools or an error),
+            and the answer characters the LLM did not have to re-generate
+        """
+        with self._lock:
+            return {
+                "handoffs": dict(self._handoffs),
+                "fallback": self._fallbacks,
+                "characters_saved": self._characters,
+            }
@@ -0,0 +1,311 @@
+"""
+Trainable Intent Classifier for Fast-Path Routing.
+
+The rule router (see agents.routing) only knows the keywords of the
+supervisor prompt's matrix. ``IntentClassifier`` learns routing from
+labelled queries instead: TF-IDF features (word unigrams and bigrams plus
+character n-grams, which cover inflections like "crashing"/"crashes") and
+a multinomial logistic regression over technical, billing, compliance,
+general and "direct" (answered by the supervisor itself).
+
+Training runs offline (scripts/train_router.py) and writes a compact
+``.npz`` artifact (vocabulary, IDF weights, coefficients) that is loaded at
+startup. Prediction is a sparse dot product, well under a millisecond, and
+only predictions with a probability of at least ``min_confidence`` are
+used; everything else goes to the supervisor LLM. The default threshold is
+chosen by scripts/train_router.py on data/routing/validation_queries.jsonl
+(the lowest one at which 98% of routed validation queries are correct) and
+reported on data/routing/heldout_queries.jsonl; both are written apart from
+the training queries and the prompt's routing matrix.
+
+Last Updated: October 17, 2026
+"""
+
+import json
+import logging
+import math
+import re
+from collections import Counter
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+
+from .routing import RouteDecision
+
+logger = logging.getLogger(__name__)
+
+# Default artifact location (scripts/train_router.py writes it here)
+DEFAULT_MODEL_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "intent_classifier.npz"
+)
+
+# Lowest class probability routed without the LLM (ROUTER_MIN_CONFIDENCE)
+DEFAULT_MIN_CONFIDENCE = 0.62
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def extract_features(text: str, char_ngrams: tuple[int, int] = (3, 5)) -> Counter:
+    """
+    Count the features of a query.
+
+    Features are lowercase words ("w:error"), adjacent word pairs
+    ("b:error 500") and character n-grams of each word padded with spaces
+    ("c: cra").
+
+    Args:
+        text: Query text
+        char_ngrams: Smallest and largest character n-gram length
+
+    Returns:
+        Counter: Feature -> occurrences
+    """
+    words = _WORD_RE.findall(text.lower())
+    features = Counter(f"w:{word}" for word in words)
+    features.update(f"b:{a} {b}" for a, b in pairwise(words))
+    low, high = char_ngrams
+    for word in words:
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            features.update(
+                f"c:{padded[i : i + n]}" for i in range(len(padded) - n + 1)
+            )
+    return features
+
+
+class IntentClassifier:
+    """
+    TF-IDF + softmax regression router (a ``Router`` for FastPathMiddleware).
+
+    Example:
+        >>> classifier = IntentClassifier.train(queries, labels)
+        >>> classifier.save("intent_classifier.npz")
+        >>> router = IntentClassifier.load("intent_classifier.npz", min_confidence=0.75)
+        >>> router.route("The app keeps crashing")
+        RouteDecision(domain='technical', confidence=0.91, router='classifier')
+    """
+
+    name = "classifier"
+
+    def __init__(
+        self,
+        vocabulary: list[str],
+        idf: np.ndarray,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        classes: list[str],
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    ):
+        """
+        Args:
+            vocabulary: Feature names, in column order
+            idf: IDF weight per feature
+            weights: Coefficients, shape (classes, features)
+            bias: Intercept per class
+            classes: Class labels, in row order
+            min_confidence: Lowest class probability used for routing
+        """
+        self.vocabulary = {feature: i for i, feature in enumerate(vocabulary)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.classes = list(classes)
+        self.min_confidence = min_confidence
+
+    def _vectorize(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """Sparse TF-IDF vector of ``text`` as (column indices, L2-normalized values)."""
+        counts = [
+            (self.vocabulary[feature], count)
+            for feature, count in extract_features(text).items()
+            if feature in self.vocabulary
+        ]
+        if not counts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+        columns = np.fromiter(
+            (column for column, _ in counts), dtype=np.intp, count=len(counts)
+        )
+        # Sublinear term frequency, like TfidfVectorizer(sublinear_tf=True)
+        values = (1.0 + np.log([count for _, count in counts])).astype(
+            np.float32
+        ) * self.idf[columns]
+        return columns, values / np.linalg.norm(values)
+
+    def predict_proba(self, text: str) -> dict[str, float]:
+        """
+        Class probabilities for a query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            dict: Class label -> probability (sums to 1)
+        """
+        columns, values = self._vectorize(text)
+        logits = self.weights[:, columns] @ values + self.bias
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+        return dict(zip(self.classes, probabilities.tolist()))
+
+    def route(self, message: str) -> RouteDecision | None:
+        """
+        Route a message if the most likely class is likely enough.
+
+        Returns:
+            RouteDecision | None: Predicted domain (or "direct") with its
+            probability as confidence, or None below ``min_confidence``
+        """
+        probabilities = self.predict_proba(message)
+        label = max(probabilities, key=probabilities.get)
+        if probabilities[label] < self.min_confidence:
+            return None
+        return RouteDecision(label, round(probabilities[label], 3), self.name)
+
+    @classmethod
+    def train(
+        cls,
+        queries: list[str],
+        labels: list[str],
+        l2: float = 1e-3,
+        epochs: int = 500,
+        learning_rate: float = 2.0,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    ) -> "IntentClassifier":
+        """
+        Fit the classifier on labelled queries.
+
+        Full-batch gradient descent on the L2-regularized cross-entropy; the
+        feature matrix of a few thousand queries fits in memory easily.
+
+        Args:
+            queries: Training queries
+            labels: Class label per query
+            l2: L2 regularization strength
+            epochs: Gradient descent steps
+            learning_rate: Step size
+            min_confidence: Stored on the returned classifier
+
+        Returns:
+            IntentClassifier: Trained classifier
+
+        Raises:
+            ValueError: If there are no queries, lengths differ or only one
+                class is present
+        """
+        if not queries or len(queries) != len(labels):
+            raise ValueError("Need the same, non-zero number of queries and labels")
+        classes = sorted(set(labels))
+        if len(classes) < 2:
+            raise ValueError("Need at least two classes to train a classifier")
+
+        features = [extract_features(query) for query in queries]
+        document_frequency = Counter(
+            feature for counts in features for feature in counts
+        )
+        vocabulary = sorted(document_frequency)
+        # Smoothed IDF, like TfidfVectorizer(smooth_idf=True)
+        idf = np.array(
+            [
+                math.log((1 + len(queries)) / (1 + document_frequency[f])) + 1
+                for f in vocabulary
+            ],
+            dtype=np.float32,
+        )
+        classifier = cls(
+            vocabulary,
+            idf,
+            np.zeros((len(classes), len(vocabulary)), dtype=np.float32),
+            np.zeros(len(classes), dtype=np.float32),
+            classes,
+            min_confidence,
+        )
+
+        x = np.zeros((len(queries), len(vocabulary)), dtype=np.float32)
+        for row, query in enumerate(queries):
+            columns, values = classifier._vectorize(query)
+            x[row, columns] = values
+        y = np.zeros((len(queries), len(classes)), dtype=np.float32)
+        y[np.arange(len(queries)), [classes.index(label) for label in labels]] = 1.0
+
+        weights = np.zeros((len(vocabulary), len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        for _ in range(epochs):
+            logits = x @ weights + bias
+            probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            error = (probabilities - y) / len(queries)
+            weights -= learning_rate * (x.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+
+        classifier.weights = weights.T.copy()
+        classifier.bias = bias
+        return classifier
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the classifier as a compressed ``.npz`` artifact.
+
+        Args:
+            path: Output file
+        """
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        np.savez_compressed(
+            path,
+            vocabulary=np.array(vocabulary),
+            idf=self.idf.astype(np.float16),
+            weights=self.weights.astype(np.float16),
+            bias=self.bias,
+            classes=np.array(self.classes),
+        )
+
+    @classmethod
+    def load(
+        cls, path: str | Path, min_confidence: float = DEFAULT_MIN_CONFIDENCE
+    ) -> "IntentClassifier":
+        """
+        Load a classifier saved with ``save``.
+
+        Args:
+            path: Artifact file
+            min_confidence: Lowest class probability used for routing
+
+        Returns:
+            IntentClassifier: Loaded classifier
+
+        Raises:
+            FileNotFoundError: If the artifact does not exist
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            classifier = cls(
+                artifact["vocabulary"].tolist(),
+                artifact["idf"],
+                artifact["weights"],
+                artifact["bias"],
+                artifact["classes"].tolist(),
+                min_confidence,
+            )
+        logger.info(
+            f"Loaded intent classifier from {path} "
+            f"({len(classifier.vocabulary)} features, classes: {', '.join(classifier.classes)})"
+        )
+        return classifier
+
+
+def load_examples(path: str | Path) -> tuple[list[str], list[str]]:
+    """
+    Read labelled queries from JSONL ({"query": ..., "domain": ...} per line).
+
+    Args:
+        path: JSONL file
+
+    Returns:
+        tuple: (queries, labels)
+    """
+    queries, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                example = json.loads(line)
+                queries.append(example["query"])
+                labels.append(example["domain"])
+    return queries, labels
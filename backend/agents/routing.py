@@ -0,0 +1,391 @@
+"""
+Fast-Path Routing for the Supervisor Agent.
+
+The supervisor's first LLM call of a turn mostly just picks a worker, and
+for clear-cut queries its system prompt already spells out the answer (the
+"Routing Decision Matrix": error codes and crashes → technical, refunds
+and invoices → billing, GDPR and cookies → compliance, ...). That decision
+costs a full Bedrock/OpenAI round-trip and the prompt's input tokens.
+
+``RuleRouter`` encodes the matrix as weighted, precompiled regular
+expressions per domain and scores a message in microseconds. The
+``FastPathMiddleware`` runs on the supervisor's model calls: when a router
+is confident about the user message of a conversation's first turn, the
+model call is replaced by a call to that domain's worker tool (with the
+message as query); otherwise the LLM supervisor decides as before.
+Follow-up turns always go to the LLM, which can turn "It still does not
+work" into a self-contained query for the worker. Because the decision is
+an ordinary tool-call message inside the agent graph, the worker run,
+streaming, checkpointing and metrics work unchanged.
+
+Routers are tried in order; each one returns a ``RouteDecision`` or None.
+A router may also decide ``DIRECT_DOMAIN`` (small talk the supervisor
+answers itself): no worker call is forced, and the LLM call runs as usual,
+with the worker tools, so a wrong "direct" can still be routed.
+
+LangChain Version: v1.0+
+Documentation Reference: https://docs.langchain.com/oss/python/langchain/middleware
+Last Updated: October 17, 2026
+"""
+
+import logging
+import re
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple, Protocol
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.messages import AIMessage, HumanMessage
+
+from .streaming import message_text
+
+logger = logging.getLogger(__name__)
+
+# Domain of turns the supervisor answers without calling a worker
+DIRECT_DOMAIN = "direct"
+
+
+class RouteDecision(NamedTuple):
+    """A router's choice of worker domain for a message."""
+
+    domain: str
+    # How clear the decision is (rules: lead over the runner-up as a share
+    # of the top score; classifier: class probability; embedding: lead in
+    # cosine similarity)
+    confidence: float
+    # Name of the router that decided
+    router: str
+
+
+class Router(Protocol):
+    """Anything that can route a message (see RuleRouter)."""
+
+    name: str
+
+    def route(self, message: str) -> RouteDecision | None:
+        """Confident decision for ``message``, or None to leave it to the LLM."""
+        ...
+
+    # Routers doing I/O may also define ``async def aroute(message)``, which
+    # async agent runs await instead of calling ``route``
+
+
+# Routing Decision Matrix of the supervisor prompt as (pattern, weight)
+# pairs. One strong keyword (weight >= 2) is enough to route; the
+# tie-breaking rules of the prompt are encoded as heavier phrase patterns:
+# "refund policy" → compliance, "payment failed error" → technical,
+# "cancel subscription" → billing
+ROUTING_RULES: dict[str, list[tuple[str, float]]] = {
+    "technical": [
+        (r"\berror(s)?\b", 2),
+        (r"\b(error|status) code\b|\b(code|error) [45]\d\d\b|\b[45]\d\d error\b", 2),
+        (r"\bcrash(es|ed|ing)?\b", 2),
+        (r"\bbug(s|gy)?\b", 2),
+        (
+            r"\bnot working\b|\b(doesn'?t|does not|won'?t|isn'?t|stopped) (work|working|load|loading|open|start)\b",
+            2,
+        ),
+        (r"\bbroken\b|\bfreez(e|es|ing)\b|\bhangs?\b", 2),
+        (r"\binstall(s|ed|ing|ation)?\b|\bset ?up\b", 2),
+        (r"\bconfigur(e|ed|ing|ation)\b", 2),
+        (r"\b(slow|slowness|lag(gy|ging)?|performance|time ?outs?|timed out)\b", 2),
+        (r"\btroubleshoot(ing)?\b|\bdiagnos(e|tic|tics)\b", 2),
+        (r"\b(load|loading)\b.{0,20}\b(forever|slowly|issues?|problems?)\b", 2),
+        (r"\bfail(s|ed|ing|ure)?\b", 1),
+    ],
+    "billing": [
+        (r"\bpayments?\b|\bpaid\b|\bpay\b", 2),
+        (r"\binvoices?\b|\breceipts?\b", 2),
+        (r"\b(charge|charged|charges|overcharged?)\b", 2),
+        (r"\brefund(s|ed)?\b", 2),
+        (r"\bsubscriptions?\b|\bbilling\b|\bbilled\b", 2),
+        (r"\bbilling cycle\b|\bdue date\b|\b(account )?balance\b", 2),
+        (r"\b(credit|debit) card\b|\bpayment method\b", 2),
+        (r"\b(price|prices|pricing|cost|costs)\b", 1),
+        (r"\b(upgrade|downgrade)\b", 1.5),
+        (r"\b(upgrade|downgrade)\b.{0,30}\b(plan|tier|subscription|account)\b", 1),
+        (r"\bcancel(l?ing)?\b.{0,20}\b(plan|subscription|membership)\b", 3),
+    ],
+    "compliance": [
+        (r"\bterms of (service|use)\b|\bterms and conditions\b|\btos\b", 3),
+        (r"\bprivacy\b", 2),
+        (r"\blegal(ly)?\b|\blaw(s)?\b", 1.5),
+        (r"\bgdpr\b|\bccpa\b", 3),
+        (r"\bdata protection\b|\bpersonal data\b", 2.5),
+        (
+            r"\b(delete|deletion|erase|remove)\b.{0,20}\b(my )?(data|information|account)\b",
+            2.5,
+        ),
+        (r"\b(export|download|access)\b.{0,15}\bmy (data|information)\b", 2.5),
+        (r"\bcookies?\b|\bconsent\b", 2.5),
+        (r"\b(user|my) rights\b", 2),
+        (r"\bpolic(y|ies)\b|\bregulations?\b|\bcompliance\b|\bcompliant\b", 1.5),
+        (r"\b(refund|cancellation|retention) polic(y|ies)\b", 3),
+    ],
+    "general": [
+        (r"^\s*what('s| is| are)\b", 1),
+        (r"\btell me about\b", 1.5),
+        (r"\bhow does\b.{0,40}\bwork\b", 2),
+        (r"\b(your )?company\b|\bwho are you\b|\bmission\b", 1.5),
+        (
+            r"\bfeatures?\b|\bofferings?\b|\bservices (do|does|can)\b|\bwhat services\b",
+            2,
+        ),
+        (r"\bget(ting)? started\b|\bonboarding\b", 2),
+        (
+            r"\bcompare\b.{0,20}\bplans?\b|\bplan comparison\b|\bdifference between\b.{0,30}\bplans?\b",
+            2,
+        ),
+        (r"\bnavigat(e|ion)\b|\bwhere (can|do) i find\b", 2),
+        (r"\bbest practices?\b|\btips\b", 2),
+    ],
+}
+
+
+class RuleRouter:
+    """
+    Scores a message against weighted per-domain patterns.
+
+    A message is routed when its best domain scores at least ``min_score``
+    and beats the runner-up by at least ``min_margin``.
+
+    Example:
+        >>> router = RuleRouter()
+        >>> router.route("I keep getting error 500 when I log in")
+        RouteDecision(domain='technical', confidence=1.0, router='rules')
+        >>> router.route("Hello!") is None
+        True
+    """
+
+    name = "rules"
+
+    def __init__(
+        self,
+        rules: dict[str, list[tuple[str, float]]] = ROUTING_RULES,
+        min_score: float = 2.0,
+        min_margin: float = 1.0,
+    ):
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self._rules = {
+            domain: [
+                (re.compile(pattern, re.IGNORECASE), weight)
+                for pattern, weight in patterns
+            ]
+            for domain, patterns in rules.items()
+        }
+
+    def scores(self, message: str) -> dict[str, float]:
+        """Sum of the weights of matching patterns, per domain."""
+        return {
+            domain: sum(
+                weight for pattern, weight in patterns if pattern.search(message)
+            )
+            for domain, patterns in self._rules.items()
+        }
+
+    def route(self, message: str) -> RouteDecision | None:
+        """
+        Route a message if one domain clearly wins.
+
+        Returns:
+            RouteDecision | None: The winning domain, or None if no domain
+            scores ``min_score`` or the top two are within ``min_margin``
+        """
+        ranked = sorted(
+            self.scores(message).items(), key=lambda item: item[1], reverse=True
+        )
+        (domain, top), (_, second) = ranked[0], ranked[1]
+        if top < self.min_score or top - second < self.min_margin:
+            return None
+        return RouteDecision(domain, round((top - second) / top, 3), self.name)
+
+
+class FastPathMiddleware(AgentMiddleware):
+    """
+    Supervisor middleware that skips the routing LLM call for clear-cut messages.
+
+    Only the first model call of a conversation's first turn (the user's
+    message is the only one) is considered; follow-up turns and the call
+    after the worker's answer always go to the LLM.
+
+    Example:
+        >>> fast_path = FastPathMiddleware([RuleRouter()], {"technical": "technical_support_tool"})
+        >>> supervisor = create_agent(model, tools, middleware=[fast_path], ...)
+    """
+
+    def __init__(
+        self,
+        routers: list[Router],
+        domain_tools: dict[str, str],
+        on_route: Callable[[str, str], None] | None = None,
+    ):
+        """
+        Args:
+            routers: Routers to ask, in order (first confident one wins)
+            domain_tools: Worker domain -> worker tool name
+            on_route: Called with (domain, message) when a message is sent
+                to a worker, e.g. data.vectorstore.set_routed_query so the
+                worker's search reuses the message's embedding
+        """
+        super().__init__()
+        self.routers = routers
+        self.domain_tools = domain_tools
+        self.on_route = on_route
+        self._lock = threading.Lock()
+        self._routed: dict[str, dict[str, int]] = {}
+        self._fallbacks = 0
+        self._route_seconds = 0.0
+        self._decisions = 0
+
+    def decide(self, messages: list) -> RouteDecision | None:
+        """
+        Ask the routers about the latest message of a turn.
+
+        Args:
+            messages: Conversation the model call would see
+
+        Returns:
+            RouteDecision | None: Confident decision for a worker domain or
+            DIRECT_DOMAIN, or None if the LLM should decide (also mid-turn
+            and on follow-up turns)
+        """
+        if not self._first_turn(messages):
+            return None
+        text = message_text(messages[-1])
+        started = time.perf_counter()
+        decision = None
+        for router in self.routers:
+            decision = self._usable(router.route(text))
+            if decision is not None:
+                break
+        return self._record(decision, time.perf_counter() - started)
+
+    async def adecide(self, messages: list) -> RouteDecision | None:
+        """
+        Async ``decide``.
+
+        Routers with an ``aroute`` method (e.g. ones calling an embedding
+        API) are awaited instead of blocking the event loop.
+        """
+        if not self._first_turn(messages):
+            return None
+        started = time.perf_counter()
+        decision = await self.aroute(message_text(messages[-1]))
+        return self._record(decision, time.perf_counter() - started)
+
+    async def aroute(self, text: str) -> RouteDecision | None:
+        """
+        Ask the routers about a message outside of a model call.
+
+        Not counted in ``stats()``; used to scope the semantic cache lookup
+        to the domain the turn will most likely be routed to.
+
+        Args:
+            text: The user's message
+
+        Returns:
+            RouteDecision | None: The first usable decision, or None
+        """
+        for router in self.routers:
+            if hasattr(router, "aroute"):
+                decision = self._usable(await router.aroute(text))
+            else:
+                decision = self._usable(router.route(text))
+            if decision is not None:
+                return decision
+        return None
+
+    @staticmethod
+    def _first_turn(messages: list) -> bool:
+        """True for the first model call of a conversation (only the user's message)."""
+        return len(messages) == 1 and isinstance(messages[0], HumanMessage)
+
+    def _usable(self, decision: RouteDecision | None) -> RouteDecision | None:
+        """The decision if this supervisor can act on it (known worker or direct)."""
+        if decision is not None and (
+            decision.domain in self.domain_tools or decision.domain == DIRECT_DOMAIN
+        ):
+            return decision
+        return None
+
+    def _record(
+        self, decision: RouteDecision | None, elapsed: float
+    ) -> RouteDecision | None:
+        with self._lock:
+            self._decisions += 1
+            self._route_seconds += elapsed
+            if decision is None:
+                self._fallbacks += 1
+            else:
+                by_domain = self._routed.setdefault(decision.router, {})
+                by_domain[decision.domain] = by_domain.get(decision.domain, 0) + 1
+        return decision
+
+    def _apply(
+        self, request: ModelRequest, decision: RouteDecision | None
+    ) -> tuple[ModelRequest, AIMessage | None]:
+        """The request for the LLM, or a worker tool call replacing it."""
+        if decision is None:
+            return request, None
+        if decision.domain == DIRECT_DOMAIN:
+            # The tools stay bound: the LLM may still route the message
+            logger.info(
+                f"⚡ FAST PATH: {decision.router} router expects a direct answer "
+                f"(confidence {decision.confidence:.2f}), leaving it to the supervisor LLM"
+            )
+            return request, None
+        logger.info(
+            f"⚡ FAST PATH: {decision.router} router sent the message to {decision.domain} "
+            f"(confidence {decision.confidence:.2f}), skipping the supervisor LLM call"
+        )
+        text = message_text(request.messages[-1])
+        if self.on_route is not None:
+            self.on_route(decision.domain, text)
+        return request, AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": self.domain_tools[decision.domain],
+                    "args": {"query": text},
+                    "id": f"fastpath_{uuid.uuid4().hex[:16]}",
+                    "type": "tool_call",
+                }
+            ],
+        )
+
+    def wrap_model_call(
+        self, request: ModelRequest, handler: Callable[[ModelRequest], ModelResponse]
+    ) -> ModelResponse | AIMessage:
+        request, message = self._apply(request, self.decide(request.messages))
+        return message if message is not None else handler(request)
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse | AIMessage:
+        request, message = self._apply(request, await self.adecide(request.messages))
+        return message if message is not None else await handler(request)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Fast-path counters for health and metrics endpoints.
+
+        Returns:
+            dict: Turns routed per router and domain, turns left to the
+            LLM ("fallback"), and the mean routing time in microseconds
+        """
+        with self._lock:
+            return {
+                "routers": [router.name for router in self.routers],
+                "routed": {
+                    router: dict(domains) for router, domains in self._routed.items()
+                },
+                "fallback": self._fallbacks,
+                "mean_route_us": round(self._route_seconds / self._decisions * 1e6, 1)
+                if self._decisions
+                else 0.0,
+            }
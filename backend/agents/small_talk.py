@@ -0,0 +1,137 @@
+"""
+Template Replies for Small Talk.
+
+Greetings, thanks, feedback and goodbyes are a large share of turns and the
+supervisor prompt answers them directly anyway ("Handle directly yourself").
+``SmallTalk`` recognizes messages that consist only of such phrases and
+answers them from a template library, without any LLM call. Anything with
+more content ("Hi, my app crashes") is left to the supervisor.
+
+The library (data/routing/small_talk.json by default) maps a category to
+regular expressions for its phrases and the replies to pick from:
+
+    {"thanks": {"patterns": ["thanks( so much)?", ...],
+                "responses": ["You're welcome! ...", ...]}, ...}
+
+Patterns match whole phrases of the normalized message (lowercase, see
+utils.text.normalize_message); a message may chain several phrases ("thanks,
+bye"), and the reply comes from the category of the last one.
+
+Last Updated: October 17, 2026
+"""
+
+import json
+import logging
+import random
+import re
+from pathlib import Path
+
+from utils.text import normalize_message
+
+logger = logging.getLogger(__name__)
+
+# Default template library
+DEFAULT_TEMPLATES_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "small_talk.json"
+)
+
+# Between chained phrases ("thanks, bye!")
+_SEPARATOR = re.compile(r"[\s,.;:!?\-–—]*")
+
+
+class SmallTalk:
+    """
+    Detects small-talk messages and picks a template reply.
+
+    Example:
+        >>> small_talk = SmallTalk.load()
+        >>> small_talk.reply("Thanks so much!")
+        "You're welcome! Is there anything else I can help you with?"
+        >>> small_talk.reply("Thanks, but I still get error 500") is None
+        True
+    """
+
+    def __init__(self, templates: dict[str, dict[str, list[str]]]):
+        """
+        Args:
+            templates: Category -> {"patterns": [...], "responses": [...]}
+
+        Raises:
+            ValueError: If a category has no patterns or no responses, or a
+                pattern is not a valid regular expression
+        """
+        self.responses: dict[str, list[str]] = {}
+        alternatives = []
+        for category, template in templates.items():
+            if not template.get("patterns") or not template.get("responses"):
+                raise ValueError(
+                    f"Small-talk category {category!r} needs patterns and responses"
+                )
+            if not category.isidentifier():
+                raise ValueError(
+                    f"Small-talk category {category!r} must be an identifier"
+                )
+            self.responses[category] = list(template["responses"])
+            alternatives.append(
+                f"(?P<{category}>{'|'.join(f'(?:{p})' for p in template['patterns'])})"
+            )
+        try:
+            # One phrase, ending at a word boundary
+            self._phrase = re.compile(f"(?:{'|'.join(alternatives)})\\b")
+        except re.error as e:
+            raise ValueError(f"Invalid small-talk pattern: {e}") from e
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_TEMPLATES_PATH) -> "SmallTalk":
+        """
+        Load a template library from JSON.
+
+        Args:
+            path: Library file
+
+        Returns:
+            SmallTalk: Detector with the library's categories
+        """
+        with open(path, encoding="utf-8") as f:
+            small_talk = cls(json.load(f))
+        logger.info(
+            f"Loaded small-talk templates from {path} ({', '.join(small_talk.responses)})"
+        )
+        return small_talk
+
+    def category(self, message: str) -> str | None:
+        """
+        Classify a message that consists only of small-talk phrases.
+
+        Args:
+            message: Raw user message
+
+        Returns:
+            str | None: Category of the last phrase, or None if the message
+            contains anything else
+        """
+        text = normalize_message(message)
+        position, category = 0, None
+        while position < len(text):
+            match = self._phrase.match(text, position)
+            if match is None:
+                return None
+            category = match.lastgroup
+            position = _SEPARATOR.match(text, match.end()).end()
+        return category
+
+    def reply(self, message: str) -> str | None:
+        """
+        Template reply for a small-talk message.
+
+        Args:
+            message: Raw user message
+
+        Returns:
+            str | None: A reply from the message's category, or None if the
+            message is not small talk
+        """
+        category = self.category(message)
+        if category is None:
+            return None
+        return random.choice(self.responses[category])
@@ -0,0 +1,111 @@
+"""
+Token Streaming for the Multi-Agent System.
+
+This module turns a LangGraph agent run into a stream of LLM tokens using
+``stream_mode="messages"``. Tokens are forwarded as the model generates
+them rather than after each graph step, and nested worker agents (invoked
+inside the ``*_support_tool`` wrappers) are included via subgraph
+streaming. Each token is tagged with the name of the agent that produced it
+(``lc_agent_name``), so callers can tell supervisor output from worker
+output.
+
+LangChain Version: v1.0+
+Documentation Reference: https://docs.langchain.com/oss/python/langgraph/streaming
+Last Updated: October 17, 2026
+"""
+
+import logging
+from collections.abc import AsyncIterator
+from typing import Any, NamedTuple
+
+from langchain_core.messages import AIMessage
+
+from utils.agent_names import SUPERVISOR_AGENT_NAME
+
+logger = logging.getLogger(__name__)
+
+
+class TokenChunk(NamedTuple):
+    """A piece of generated text and the agent that produced it."""
+
+    text: str
+    agent: str
+
+    @property
+    def from_supervisor(self) -> bool:
+        """True if the supervisor (not a worker) generated this token."""
+        return self.agent == SUPERVISOR_AGENT_NAME
+
+
+def message_text(message: Any) -> str:
+    """
+    Extract plain text from a message or message chunk.
+
+    OpenAI models return ``content`` as a string, while Bedrock models
+    return a list of content blocks (``{"type": "text", "text": ...}``).
+
+    Args:
+        message: LangChain message or chunk
+
+    Returns:
+        str: Concatenated text content (empty for tool-call-only chunks)
+    """
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+async def stream_agent_tokens(
+    agent: Any,
+    inputs: dict,
+    config: dict,
+    include_workers: bool = True,
+) -> AsyncIterator[TokenChunk]:
+    """
+    Stream LLM tokens from an agent run as they are generated.
+
+    Tool messages, tool-call chunks and empty chunks are skipped; only text
+    produced by an AI model is yielded.
+
+    Args:
+        agent: Compiled LangGraph agent (e.g. the supervisor)
+        inputs: Agent input, e.g. ``{"messages": [...]}``
+        config: Run config with ``thread_id``
+        include_workers: Also yield tokens from nested worker agents
+
+    Yields:
+        TokenChunk: Text fragment tagged with the producing agent's name
+
+    Example:
+        >>> async for chunk in stream_agent_tokens(supervisor, inputs, config):
+        ...     if chunk.from_supervisor:
+        ...         print(chunk.text, end="")
+    """
+    async for namespace, (message, metadata) in agent.astream(
+        inputs,
+        config,
+        stream_mode="messages",
+        subgraphs=True,
+    ):
+        if namespace and not include_workers:
+            # Non-empty namespace = produced inside a nested (worker) run
+            continue
+
+        if not isinstance(message, AIMessage):
+            # ToolMessage / HumanMessage node outputs are not generated text
+            continue
+
+        text = message_text(message)
+        if not text:
+            continue
+
+        agent_name = (metadata or {}).get("lc_agent_name") or SUPERVISOR_AGENT_NAME
+        yield TokenChunk(text=text, agent=agent_name)
@@ -12,16 +12,145 @@ Last Updated: November 4, 2025
 """
 
 from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.checkpoint.memory import InMemorySaver
 import os
 import logging
 
+from data.document_loader import get_knowledge_base_version
+from data.vectorstore import (
+    EMBEDDING_MODEL,
+    aembed_query,
+    embed_query,
+    set_routed_query,
+)
+from utils.agent_names import SUPERVISOR_AGENT_NAME
+
+from .embedding_router import DEFAULT_CENTROIDS_PATH, EmbeddingRouter
+from .handoff import WorkerHandoffMiddleware
+from .intent_classifier import (
+    DEFAULT_MIN_CONFIDENCE,
+    DEFAULT_MODEL_PATH,
+    IntentClassifier,
+)
+from .routing import DIRECT_DOMAIN, FastPathMiddleware, RuleRouter
+
 logger = logging.getLogger(__name__)
 
 # Initialize checkpointer for conversation memory
 # Same checkpointer used by all agents to maintain context across routing
 checkpointer = InMemorySaver()
 
+# Worker tool name -> knowledge domain it answers for
+WORKER_DOMAINS = {
+    "technical_support_tool": "technical",
+    "billing_support_tool": "billing",
+    "compliance_tool": "compliance",
+    "general_info_tool": "general",
+}
+
+# Supervisor model: AWS Nova Lite, or OpenAI GPT-4o-mini if Bedrock is
+# unavailable. create_supervisor_agent() records the one it used in
+# supervisor_model (the startup warm-up calls it, see get_supervisor_model)
+SUPERVISOR_MODEL = "bedrock:us.amazon.nova-lite-v1:0"
+SUPERVISOR_FALLBACK_MODEL = "openai:gpt-4o-mini"
+supervisor_model: str | None = None
+
+# Fast-path routing: clear-cut messages go straight to a worker without the
+# supervisor's routing LLM call (see agents.routing). FAST_ROUTERS lists the
+# routers to ask, in order ("rules", "classifier", "embedding"); anything
+# they are unsure about goes to the LLM
+FAST_PATH_ROUTING_ENABLED = (
+    os.getenv("FAST_PATH_ROUTING_ENABLED", "true").lower() == "true"
+)
+FAST_ROUTERS = [
+    name.strip()
+    for name in os.getenv("FAST_ROUTERS", "rules,classifier").split(",")
+    if name.strip()
+]
+
+
+def build_fast_routers(names: list[str]) -> list:
+    """
+    Create the fast-path routers named in FAST_ROUTERS.
+
+    Args:
+        names: Router names, in the order they are asked ("rules",
+            "classifier", "embedding")
+
+    Returns:
+        list: Router instances (a classifier or embedding router whose
+        artifact is missing is left out with a warning; build them with
+        scripts/train_router.py and scripts/build_domain_centroids.py)
+
+    Raises:
+        ValueError: If a name is not a known router, or the domain
+            centroids were built with another embedding model
+    """
+    routers = []
+    for name in names:
+        if name == "rules":
+            routers.append(
+                RuleRouter(
+                    min_score=float(os.getenv("FAST_ROUTER_MIN_SCORE", "2.0")),
+                    min_margin=float(os.getenv("FAST_ROUTER_MIN_MARGIN", "1.0")),
+                )
+            )
+        elif name == "classifier":
+            path = os.getenv("ROUTER_MODEL_PATH", str(DEFAULT_MODEL_PATH))
+            try:
+                routers.append(
+                    IntentClassifier.load(
+                        path,
+                        min_confidence=float(
+                            os.getenv(
+                                "ROUTER_MIN_CONFIDENCE", str(DEFAULT_MIN_CONFIDENCE)
+                            )
+                        ),
+                    )
+                )
+            except FileNotFoundError:
+                logger.warning(
+                    f"Intent classifier not found at {path}, routing without it"
+                )
+        elif name == "embedding":
+            path = os.getenv("ROUTER_CENTROIDS_PATH", str(DEFAULT_CENTROIDS_PATH))
+            try:
+                routers.append(
+                    EmbeddingRouter.load(
+                        path,
+                        embed=embed_query,
+                        aembed=aembed_query,
+                        embedding_model=EMBEDDING_MODEL,
+                        knowledge_base_version=get_knowledge_base_version(),
+                        min_similarity=float(
+                            os.getenv("EMBEDDING_ROUTER_MIN_SIMILARITY", "0.25")
+                        ),
+                        min_margin=float(
+                            os.getenv("EMBEDDING_ROUTER_MIN_MARGIN", "0.04")
+                        ),
+                    )
+                )
+            except FileNotFoundError:
+                logger.warning(
+                    f"Domain centroids not found at {path}, routing without the embedding router"
+                )
+        else:
+            raise ValueError(f"Unknown fast router {name!r} in FAST_ROUTERS")
+    return routers
+
+
+fast_path = FastPathMiddleware(
+    build_fast_routers(FAST_ROUTERS) if FAST_PATH_ROUTING_ENABLED else [],
+    {domain: tool_name for tool_name, domain in WORKER_DOMAINS.items()},
+    on_route=set_routed_query,
+)
+
+# Worker handoff: a turn's single worker answer is returned verbatim instead
+# of having the supervisor LLM re-generate it (see agents.handoff)
+WORKER_HANDOFF_ENABLED = os.getenv("WORKER_HANDOFF_ENABLED", "true").lower() == "true"
+handoff = WorkerHandoffMiddleware(set(WORKER_DOMAINS), enabled=WORKER_HANDOFF_ENABLED)
+
 
 def create_supervisor_agent(tools: list):
     """
@@ -52,6 +181,8 @@ def create_supervisor_agent(tools: list):
         ...     config
         ... )
     """
+    global supervisor_model
+
     # Validate OpenAI API key is set
     if not os.getenv("OPENAI_API_KEY"):
         logger.error("OPENAI_API_KEY environment variable is not set")
@@ -168,15 +299,19 @@ Each specialist is an expert in their domain - trust their responses."""
     try:
         logger.info("Attempting to create supervisor with AWS Nova Lite")
         supervisor = create_agent(
-            model="bedrock:us.amazon.nova-lite-v1:0",  # AWS Nova Lite for routing
+            model=SUPERVISOR_MODEL,  # AWS Nova Lite for routing
             # Cost: $0.06 input / $0.24 output per 1M tokens (60% cheaper than GPT-4o-mini)
             # Perfect for: Classification, routing, lightweight tasks
             # Region: us-east-1 (ensure AWS_DEFAULT_REGION is set)
             tools=tools,  # Worker agents wrapped as tools
             system_prompt=system_prompt,
             checkpointer=checkpointer,  # Shared memory for conversation continuity
-            name="supervisor_agent",  # Required in LangChain v1.0
+            # Skip the routing call for clear-cut queries, and the final
+            # call after a worker answered
+            middleware=[fast_path, handoff],
+            name=SUPERVISOR_AGENT_NAME,  # Required in LangChain v1.0
         )
+        supervisor_model = SUPERVISOR_MODEL
         logger.info("✅ Supervisor created successfully with AWS Nova Lite")
         
     except Exception as e:
@@ -185,13 +320,17 @@ Each specialist is an expert in their domain - trust their responses."""
         logger.info("Creating supervisor with OpenAI GPT-4o-mini (fallback)")
         
         supervisor = create_agent(
-            model="openai:gpt-4o-mini",  # Fallback: Reliable, fast routing
+            model=SUPERVISOR_FALLBACK_MODEL,  # Fallback: Reliable, fast routing
             # Cost: $0.15 input / $0.60 output per 1M tokens
             tools=tools,  # Worker agents wrapped as tools
             system_prompt=system_prompt,
             checkpointer=checkpointer,  # Shared memory for conversation continuity
-            name="supervisor_agent",  # Required in LangChain v1.0
+            # Skip the routing call for clear-cut queries, and the final
+            # call after a worker answered
+            middleware=[fast_path, handoff],
+            name=SUPERVISOR_AGENT_NAME,  # Required in LangChain v1.0
         )
+        supervisor_model = SUPERVISOR_FALLBACK_MODEL
         logger.info("✅ Supervisor created successfully with OpenAI GPT-4o-mini (fallback)")
 
     logger.info("Supervisor agent created successfully")
@@ -251,3 +390,113 @@ def get_supervisor():
             "Check that OPENAI_API_KEY is set and workers are available."
         )
     return supervisor
+
+
+def get_supervisor_model() -> str:
+    """
+    Get the model the supervisor agent was created with.
+
+    Returns:
+        str: SUPERVISOR_MODEL, or SUPERVISOR_FALLBACK_MODEL if Bedrock was
+        unavailable
+
+    Raises:
+        RuntimeError: If the supervisor failed to initialize
+
+    Example:
+        >>> get_supervisor_model()
+        'bedrock:us.amazon.nova-lite-v1:0'
+    """
+    if supervisor_model is None:
+        raise RuntimeError("Supervisor agent is not initialized.")
+    return supervisor_model
+
+
+def session_has_history(agent, config: dict) -> bool:
+    """
+    Check whether a conversation thread already has messages.
+
+    First-turn optimizations (request coalescing, answer caching) only
+    apply to threads with no prior state, because the answer to a
+    follow-up depends on earlier turns.
+
+    Args:
+        agent: The supervisor agent (must share the session checkpointer)
+        config: Run config with ``configurable.thread_id``
+
+    Returns:
+        bool: True if the thread has at least one stored message
+    """
+    state = agent.get_state(config)
+    return bool(state.values.get("messages"))
+
+
+def record_turn(agent, config: dict, user_message: str, response: str) -> None:
+    """
+    Append a user/assistant exchange to a session's checkpoint.
+
+    Used when a response was produced without running the supervisor for
+    this thread (e.g. shared or cached answers), so that follow-up
+    questions still see the full conversation.
+
+    Args:
+        agent: The supervisor agent (must share the session checkpointer)
+        config: Run config with ``configurable.thread_id``
+        user_message: The user's message text
+        response: The assistant's response text
+
+    Example:
+        >>> config = {"configurable": {"thread_id": "session-123"}}
+        >>> record_turn(get_supervisor(), config, "Hi", "Hello! How can I help?")
+    """
+    # as_node="model": the exchange looks like a finished model turn, so the
+    # next invoke starts a fresh step instead of resuming a tool call
+    agent.update_state(
+        config,
+        {
+            "messages": [
+                HumanMessage(content=user_message),
+                AIMessage(content=response, name=SUPERVISOR_AGENT_NAME),
+            ]
+        },
+        as_node="model",
+    )
+
+
+def routed_domain(messages: list) -> str:
+    """
+    Determine which worker domain handled a turn.
+
+    Only the latest turn is inspected (messages after the last user
+    message), so a full thread history can be passed in.
+
+    Args:
+        messages: Messages of the supervisor run for the turn
+
+    Returns:
+        str: Domain of the last worker tool called ("technical", "billing",
+        "compliance", "general"), or "direct" if no worker was called
+
+    Example:
+        >>> result = get_supervisor().invoke({...}, config)
+        >>> routed_domain(result["messages"])
+        'billing'
+    """
+    for message in reversed(messages):
+        message_type = getattr(message, "type", None)
+        if message_type == "human":
+            break
+        if message_type == "tool":
+            return WORKER_DOMAINS.get(getattr(message, "name", None), DIRECT_DOMAIN)
+    return DIRECT_DOMAIN
+
+
+def session_count() -> int:
+    """
+    Number of conversation threads held by the shared checkpointer.
+
+    Returns:
+        int: Sessions with stored state (the in-memory checkpointer keeps
+        them until the process restarts)
+    """
+    return len(checkpointer.storage)
@@ -13,6 +13,9 @@ Last Updated: November 4, 2025
 """
 
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Annotated
 
@@ -20,14 +23,72 @@ from dotenv import load_dotenv
 from langchain.tools import tool, ToolRuntime
 from langgraph.types import Command
 
-from data.vectorstore import get_vectorstore
+from data.vectorstore import get_vectorstore, similarity_search
 from data.document_loader import load_single_document
+from utils.deadline import check_deadline
+from utils.timing import timed
 
 # Load environment variables (with override for cached env vars)
 load_dotenv(override=True)
 
 logger = logging.getLogger(__name__)
 
+
+class RetrievalErrors:
+    """Knowledge base searches of a turn that failed (see retrieval_errors_scope)."""
+
+    def __init__(self):
+        self.tools: list[str] = []
+
+
+_retrieval_errors: ContextVar[RetrievalErrors | None] = ContextVar(
+    "retrieval_errors", default=None
+)
+
+
+@contextmanager
+def retrieval_errors_scope() -> Iterator[RetrievalErrors]:
+    """
+    Track the knowledge base searches that fail during the current turn.
+
+    A search that cannot open its vector store (or raises) answers with a
+    fallback message instead of failing the turn, so the worker's answer
+    looks like any other; callers check this before caching it. Everything
+    run in the block (including pool threads started with a copy of the
+    context) reports to one RetrievalErrors.
+
+    Example:
+        >>> with retrieval_errors_scope() as errors:
+        ...     turn = await run_supervisor(agent, message, config)
+        >>> errors.tools
+        ['technical_docs_search']
+    """
+    token = _retrieval_errors.set(RetrievalErrors())
+    try:
+        yield _retrieval_errors.get()
+    finally:
+        _retrieval_errors.reset(token)
+
+
+def report_retrieval_error(tool_name: str) -> None:
+    """
+    Record that a knowledge base search answered with an error fallback.
+
+    No-op outside retrieval_errors_scope().
+
+    Args:
+        tool_name: Name of the search tool (or worker) that failed
+    """
+    errors = _retrieval_errors.get()
+    if errors is not None:
+        errors.tools.append(tool_name)
+
+
+def failed_retrievals() -> list[str]:
+    """Knowledge base searches that have failed so far in this turn."""
+    errors = _retrieval_errors.get()
+    return list(errors.tools) if errors is not None else []
+
 # ============================================================================
 # Strategy 1: Pure RAG (Technical Support, General Info)
 # ============================================================================
@@ -61,16 +122,21 @@ def technical_docs_search(query: str) -> str:
     """
     logger.info(f"[PURE RAG] Technical docs search: {query[:50]}...")
     
+    # Out of time: raise before the try below turns it into a reply
+    check_deadline("retrieval")
+    
     try:
         # Get technical vector store
         vectorstore = get_vectorstore("technical")
         
         if vectorstore is None:
             logger.error("Technical vector store not available")
+            report_retrieval_error("technical_docs_search")
             return "Technical documentation is currently unavailable. Please try again later."
         
         # Search vector store (Pure RAG - always retrieves fresh)
-        docs = vectorstore.similarity_search(query, k=3)
+        with timed("retrieval"):
+            docs = similarity_search(vectorstore, query, k=3, domain="technical")
         
         if not docs:
             logger.warning(f"No technical docs found for query: {query[:50]}...")
@@ -94,6 +160,7 @@ def technical_docs_search(query: str) -> str:
         
     except Exception as e:
         logger.error(f"Error in technical_docs_search: {e}", exc_info=True)
+        report_retrieval_error("technical_docs_search")
         return "An error occurred while searching technical documentation. Please try rephrasing your question."
 
 
@@ -123,16 +190,21 @@ def general_docs_search(query: str) -> str:
     """
     logger.info(f"[PURE RAG] General docs search: {query[:50]}...")
     
+    # Out of time: raise before the try below turns it into a reply
+    check_deadline("retrieval")
+    
     try:
         # Get general vector store
         vectorstore = get_vectorstore("general")
         
         if vectorstore is None:
             logger.error("General vector store not available")
+            report_retrieval_error("general_docs_search")
             return "General information is currently unavailable. Please try again later."
         
         # Search vector store (Pure RAG - always retrieves fresh)
-        docs = vectorstore.similarity_search(query, k=3)
+        with timed("retrieval"):
+            docs = similarity_search(vectorstore, query, k=3, domain="general")
         
         if not docs:
             logger.warning(f"No general docs found for query: {query[:50]}...")
@@ -156,6 +228,7 @@ def general_docs_search(query: str) -> str:
         
     except Exception as e:
         logger.error(f"Error in general_docs_search: {e}", exc_info=True)
+        report_retrieval_error("general_docs_search")
         return "An error occurred while searching for information. Please try again."
 
 
@@ -199,6 +272,9 @@ def billing_docs_search(
     """
     logger.info(f"[HYBRID RAG/CAG] Billing docs search: {query[:50]}...")
     
+    # Out of time: raise before the try below turns it into a reply
+    check_deadline("retrieval")
+    
     try:
         # Check if we already have cached billing policies (CAG)
         cached_policies = runtime.state.get("billing_policies")
@@ -214,13 +290,15 @@ def billing_docs_search(
         
         if vectorstore is None:
             logger.error("Billing vector store not available")
+            report_retrieval_error("billing_docs_search")
             return Command(
                 update={"billing_policies": "unavailable"},
                 goto="__end__"
             )
         
         # Search vector store
-        docs = vectorstore.similarity_search(query, k=3)
+        with timed("retrieval"):
+            docs = similarity_search(vectorstore, query, k=3, domain="billing")
         
         if not docs:
             logger.warning(f"No billing docs found for query: {query[:50]}...")
@@ -251,12 +329,22 @@ def billing_docs_search(
         
     except Exception as e:
         logger.error(f"Error in billing_docs_search: {e}", exc_info=True)
+        report_retrieval_error("billing_docs_search")
         return Command(
             update={"billing_policies": "error"},
             goto="__end__"
         )
 
 
+# Knowledge base search tools -> domain (progress events report when a
+# worker's search has finished)
+RETRIEVAL_TOOLS = {
+    technical_docs_search.name: "technical",
+    general_docs_search.name: "general",
+    billing_docs_search.name: "billing",
+}
+
+
 # ============================================================================
 # Strategy 3: Pure CAG (Compliance)
 # ============================================================================
@@ -266,6 +354,11 @@ def billing_docs_search(
 # ============================================================================
 
 
+# Context used when the compliance documents could not be read (startup
+# readiness checks for it)
+COMPLIANCE_UNAVAILABLE = "Compliance documents could not be loaded."
+
+
 def load_compliance_context() -> str:
     """
     Load all compliance documents at module startup (Pure CAG).
@@ -292,7 +385,7 @@ def load_compliance_context() -> str:
         
         if not privacy_content or not terms_content:
             logger.error("[PURE CAG] Failed to load compliance documents")
-            return "Compliance documents could not be loaded."
+            return COMPLIANCE_UNAVAILABLE
         
         # Combine into single context
         context = f"""# PRIVACY POLICY
@@ -310,7 +403,7 @@ def load_compliance_context() -> str:
         
     except Exception as e:
         logger.error(f"[PURE CAG] Error loading compliance context: {e}", exc_info=True)
-        return "Compliance documents could not be loaded."
+        return COMPLIANCE_UNAVAILABLE
 
 
 # Load compliance context ONCE at module level (Pure CAG)
@@ -19,9 +19,19 @@ import logging
 
 # Import Hybrid RAG/CAG tool for billing documentation
 from agents.tools.rag_tools import billing_docs_search
+from utils.deadline import stage_deadline
+from utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
+# Time budget for one call of this worker tool, in seconds (capped by the
+# request deadline; see utils.deadline)
+TOOL_TIMEOUT_SECONDS = float(
+    os.getenv(
+        "BILLING_TOOL_TIMEOUT_SECONDS", os.getenv("WORKER_TOOL_TIMEOUT_SECONDS", "30")
+    )
+)
+
 
 def create_billing_support_agent():
     """
@@ -221,8 +231,10 @@ def billing_support_tool(query: str) -> str:
     # Get the billing agent
     agent = get_billing_agent()
 
-    # Invoke the agent with the query
-    result = agent.invoke({"messages": [{"role": "user", "content": query}]})
+    # Invoke the agent with the query (timed as the "worker" stage; LLM
+    # calls stop once the tool or request deadline has passed)
+    with timed("worker"), stage_deadline("billing_support_tool", TOOL_TIMEOUT_SECONDS):
+        result = agent.invoke({"messages": [{"role": "user", "content": query}]})
 
     # Extract the response from the last message
     response = result["messages"][-1].content
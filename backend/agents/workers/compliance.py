@@ -18,10 +18,25 @@ import os
 import logging
 
 # Import Pure CAG compliance context (loaded at module startup)
-from agents.tools.rag_tools import COMPLIANCE_CONTEXT
+from agents.tools.rag_tools import (
+    COMPLIANCE_CONTEXT,
+    COMPLIANCE_UNAVAILABLE,
+    report_retrieval_error,
+)
+from utils.deadline import stage_deadline
+from utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
+# Time budget for one call of this worker tool, in seconds (capped by the
+# request deadline; see utils.deadline)
+TOOL_TIMEOUT_SECONDS = float(
+    os.getenv(
+        "COMPLIANCE_TOOL_TIMEOUT_SECONDS",
+        os.getenv("WORKER_TOOL_TIMEOUT_SECONDS", "30"),
+    )
+)
+
 
 def create_compliance_agent():
     """
@@ -242,9 +257,14 @@ def compliance_tool(query: str) -> str:
 
     # Get the compliance agent
     agent = get_compliance_agent()
-
-    # Invoke the agent with the query
-    result = agent.invoke({"messages": [{"role": "user", "content": query}]})
+    if COMPLIANCE_CONTEXT == COMPLIANCE_UNAVAILABLE:
+        # The agent answers without the policy documents
+        report_retrieval_error("compliance_tool")
+
+    # Invoke the agent with the query (timed as the "worker" stage; LLM
+    # calls stop once the tool or request deadline has passed)
+    with timed("worker"), stage_deadline("compliance_tool", TOOL_TIMEOUT_SECONDS):
+        result = agent.invoke({"messages": [{"role": "user", "content": query}]})
 
     # Extract the response from the last message
     response = result["messages"][-1].content
@@ -19,9 +19,19 @@ import logging
 
 # Import RAG tool for general documentation search
 from agents.tools.rag_tools import general_docs_search
+from utils.deadline import stage_deadline
+from utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
+# Time budget for one call of this worker tool, in seconds (capped by the
+# request deadline; see utils.deadline)
+TOOL_TIMEOUT_SECONDS = float(
+    os.getenv(
+        "GENERAL_TOOL_TIMEOUT_SECONDS", os.getenv("WORKER_TOOL_TIMEOUT_SECONDS", "30")
+    )
+)
+
 
 def create_general_info_agent():
     """
@@ -245,8 +255,10 @@ def general_info_tool(query: str) -> str:
     # Get the general info agent
     agent = get_general_info_agent()
 
-    # Invoke the agent with the query
-    result = agent.invoke({"messages": [{"role": "user", "content": query}]})
+    # Invoke the agent with the query (timed as the "worker" stage; LLM
+    # calls stop once the tool or request deadline has passed)
+    with timed("worker"), stage_deadline("general_info_tool", TOOL_TIMEOUT_SECONDS):
+        result = agent.invoke({"messages": [{"role": "user", "content": query}]})
 
     # Extract the response from the last message
     response = result["messages"][-1].content
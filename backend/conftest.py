@@ -34,6 +34,16 @@ def pytest_configure(config):
     if "OPENAI_API_KEY" not in os.environ:
         os.environ["OPENAI_API_KEY"] = "sk-test-fake-key-for-pytest-collection"
 
+    # Many tests reuse the same session ID for dozens of requests; admission
+    # control would delay or reject them. Rate limiter tests enable it
+    # explicitly
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    # Many tests send greetings ("Hello", "Hi") as stand-ins for messages
+    # that run the supervisor; template replies would answer them without
+    # it. Small-talk tests enable it explicitly
+    os.environ.setdefault("SMALL_TALK_ENABLED", "false")
+
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to skip integration tests by default."""
@@ -9,7 +9,10 @@ LangChain Version: 1.0+
 Last Updated: November 4, 2025
 """
 
+import hashlib
 import logging
+import os
+import time
 from pathlib import Path
 from typing import List
 
@@ -26,6 +29,15 @@ logger = logging.getLogger(__name__)
 DEFAULT_CHUNK_SIZE = 1000
 DEFAULT_CHUNK_OVERLAP = 200
 
+# Root of the knowledge base (one subdirectory per domain)
+DOCS_DIR = Path(__file__).parent / "docs"
+
+# docs_dir -> (size and mtime of each document, version computed from them)
+_knowledge_base_versions: dict[Path, tuple[tuple, str]] = {}
+
+# Documents modified more recently than this are hashed on every call
+KNOWLEDGE_BASE_SETTLE_NS = 2_000_000_000
+
 
 def load_documents(
     directory: str | Path,
@@ -189,6 +201,60 @@ def get_document_stats(documents: List[Document]) -> dict:
     }
 
 
+def get_knowledge_base_version(docs_dir: str | Path = DOCS_DIR) -> str:
+    """
+    Compute a short fingerprint of the knowledge base documents.
+
+    The fingerprint changes whenever any document under ``docs_dir`` is
+    added, removed or edited, so it can be used to invalidate cached
+    answers. Set KNOWLEDGE_BASE_VERSION to pin an explicit version instead
+    (e.g. a release tag when documents are re-indexed out of band).
+
+    Cheap enough to call per request: the documents are only re-read when
+    a file's size or modification time has changed since the last call.
+
+    Args:
+        docs_dir: Root directory of the knowledge base
+
+    Returns:
+        str: Explicit version from the environment, or a 12-char content hash
+
+    Example:
+        >>> get_knowledge_base_version()
+        '3f9a2c1b7e4d'
+    """
+    explicit = os.getenv("KNOWLEDGE_BASE_VERSION")
+    if explicit:
+        return explicit
+
+    root = Path(docs_dir)
+    files = [
+        path
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and path.suffix in {".md", ".txt", ".pdf"}
+    ]
+    stats = []
+    for path in files:
+        stat = path.stat()
+        stats.append((path, stat.st_mtime_ns, stat.st_size))
+    stats = tuple(stats)
+    cached = _knowledge_base_versions.get(root)
+    if cached is not None and cached[0] == stats:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.relative_to(root)).encode("utf-8"))
+        digest.update(path.read_bytes())
+    version = digest.hexdigest()[:12]
+    # A file written within the filesystem's timestamp granularity of this
+    # read could change again without a new mtime: hash it again next time
+    newest = max((mtime for _, mtime, _ in stats), default=0)
+    if time.time_ns() - newest > KNOWLEDGE_BASE_SETTLE_NS:
+        _knowledge_base_versions[root] = (stats, version)
+    return version
+
+
 # Module-level test
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
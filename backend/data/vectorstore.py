@@ -12,21 +12,193 @@ Last Updated: November 4, 2025
 
 import logging
 import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache
 from pathlib import Path
 from typing import Optional
 
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 
+from utils.cache import TTLCache
+from utils.timing import TimedEmbeddings
+
 logger = logging.getLogger(__name__)
 
 # Base directory for all vector stores
 CHROMA_BASE_DIR = Path(__file__).parent / "chroma_db"
 
+# Embedding model shared by the vector stores and the semantic answer cache
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Domains with a vector store
+DOMAINS = ("technical", "billing", "general")
+
+# Representative query per domain, run at startup to warm the collection
+# (HNSW index loaded into memory) and the embeddings connection pool
+WARMUP_QUERIES = {
+    "technical": "error 500 when logging in",
+    "billing": "refund policy",
+    "general": "what services do you offer",
+}
+
+# Opened vector stores, keyed by (domain, embedding model). Opening a
+# collection reads its index from disk, so it is done once per process
+_vectorstores: dict[tuple[str, str], Chroma] = {}
+# One lock per domain, so different domains can be opened concurrently
+_vectorstore_locks = {domain: threading.Lock() for domain in DOMAINS}
+
+# Recently embedded queries (text -> vector, default embedding model). A
+# message embedded for routing is not embedded again when a worker searches
+# its knowledge base with the same text moments later
+query_embeddings = TTLCache(max_entries=1024, ttl_seconds=300)
+
+
+class RoutedQuery:
+    """The message a turn was routed to a worker with (see routed_query_scope)."""
+
+    def __init__(self):
+        self.domain: str | None = None
+        self.text: str | None = None
+
+
+_routed_query: ContextVar[RoutedQuery | None] = ContextVar("routed_query", default=None)
+
+
+@cache
+def get_embeddings(embedding_model: str = EMBEDDING_MODEL) -> Embeddings:
+    """
+    Get the (shared) OpenAI embeddings client for a model.
+
+    Calls are recorded as the "embedding" stage of the current request's
+    Server-Timing breakdown (see utils.timing).
+
+    Args:
+        embedding_model: OpenAI embedding model to use
+
+    Returns:
+        OpenAIEmbeddings instance (timing wrapper), created once per model
+
+    Example:
+        >>> vector = get_embeddings().embed_query("refund policy")
+    """
+    return TimedEmbeddings(OpenAIEmbeddings(model=embedding_model))
+
+
+def embed_query(text: str) -> list[float]:
+    """
+    Embed a query with the default model, remembering the vector.
+
+    Args:
+        text: Query text
+
+    Returns:
+        list[float]: Query embedding (from query_embeddings if recently
+        embedded)
+    """
+    vector = query_embeddings.get(text)
+    if vector is None:
+        vector = get_embeddings().embed_query(text)
+        query_embeddings.set(text, vector)
+    return vector
+
+
+async def aembed_query(text: str) -> list[float]:
+    """Async ``embed_query``."""
+    vector = query_embeddings.get(text)
+    if vector is None:
+        vector = await get_embeddings().aembed_query(text)
+        query_embeddings.set(text, vector)
+    return vector
+
 
-def get_vectorstore(domain: str, embedding_model: str = "text-embedding-3-small") -> Optional[Chroma]:
+@contextmanager
+def routed_query_scope() -> Iterator[RoutedQuery]:
+    """
+    Track the message the current turn is routed with, for the worker's search.
+
+    Everything run in the block (including pool threads started with a
+    copy of the context) shares one RoutedQuery, so a routing decision made
+    in the supervisor's model call reaches the worker's tool call.
+
+    Example:
+        >>> with routed_query_scope():
+        ...     turn = await run_supervisor(agent, message, config)
+    """
+    token = _routed_query.set(RoutedQuery())
+    try:
+        yield _routed_query.get()
+    finally:
+        _routed_query.reset(token)
+
+
+def set_routed_query(domain: str, text: str) -> None:
+    """
+    Record that the current turn was routed to ``domain`` with message ``text``.
+
+    The first knowledge base search of that domain in the turn then uses the
+    message's embedding, if one was computed for it (e.g. by the embedding
+    router or the semantic cache), whatever query text the worker searches
+    with. No-op outside routed_query_scope().
+
+    Args:
+        domain: Worker domain (e.g. "billing")
+        text: The user's message
+    """
+    routed = _routed_query.get()
+    if routed is not None:
+        routed.domain, routed.text = domain, text
+
+
+def similarity_search(
+    vectorstore: Chroma, query: str, k: int = 3, domain: str | None = None
+) -> list[Document]:
+    """
+    Search a vector store, reusing an embedding computed earlier in the turn.
+
+    The first search of the domain the turn was routed to uses the routed
+    message's embedding (see set_routed_query); otherwise a recently
+    computed embedding of ``query`` itself is reused.
+
+    Args:
+        vectorstore: Domain vector store (default embedding model)
+        query: Search query
+        k: Number of chunks to return
+        domain: Domain of ``vectorstore``
+
+    Returns:
+        list[Document]: Most similar chunks
+
+    Example:
+        >>> with routed_query_scope():
+        ...     embed_query("I was charged twice")  # e.g. by the embedding router
+        ...     set_routed_query("billing", "I was charged twice")
+        ...     docs = similarity_search(get_vectorstore("billing"), "duplicate charge", domain="billing")
+    """
+    vector = None
+    routed = _routed_query.get()
+    if routed is not None and domain is not None and routed.domain == domain:
+        vector = query_embeddings.get(routed.text)
+        # Later searches (e.g. a refined query) use their own text
+        routed.domain = routed.text = None
+    if vector is None:
+        vector = query_embeddings.get(query)
+    if vector is not None:
+        return vectorstore.similarity_search_by_vector(vector, k=k)
+    return vectorstore.similarity_search(query, k=k)
+
+
+def get_vectorstore(domain: str, embedding_model: str = EMBEDDING_MODEL) -> Optional[Chroma]:
     """
     Get or create a ChromaDB vector store for a specific domain.
+
+    The store is opened once and reused by later calls (failures are not
+    cached, so a store that failed to open is retried next time).
     
     Args:
         domain: Domain name (technical, billing, general)
@@ -39,34 +211,21 @@ def get_vectorstore(domain: str, embedding_model: str = "text-embedding-3-small"
         >>> vectorstore = get_vectorstore("technical")
         >>> docs = vectorstore.similarity_search("error 500", k=3)
     """
+    vectorstore = _vectorstores.get((domain, embedding_model))
+    if vectorstore is not None:
+        return vectorstore
+
     try:
         # Validate domain
-        valid_domains = ["technical", "billing", "general"]
-        if domain not in valid_domains:
-            logger.error(f"Invalid domain: {domain}. Must be one of {valid_domains}")
+        if domain not in DOMAINS:
+            logger.error(f"Invalid domain: {domain}. Must be one of {list(DOMAINS)}")
             return None
         
-        # Create persist directory for this domain
-        persist_directory = CHROMA_BASE_DIR / domain
-        persist_directory.mkdir(parents=True, exist_ok=True)
-        
-        logger.info(f"Initializing vector store for domain: {domain}")
-        logger.info(f"Persist directory: {persist_directory}")
-        
-        # Initialize embeddings
-        embeddings = OpenAIEmbeddings(model=embedding_model)
-        
-        # Create or load ChromaDB vector store
-        vectorstore = Chroma(
-            collection_name=f"{domain}_docs",
-            embedding_function=embeddings,
-            persist_directory=str(persist_directory),
-        )
-        
-        # Log collection info
-        doc_count = vectorstore._collection.count()
-        logger.info(f"Vector store loaded: {domain} ({doc_count} documents)")
-        
+        with _vectorstore_locks[domain]:
+            vectorstore = _vectorstores.get((domain, embedding_model))
+            if vectorstore is None:
+                vectorstore = _open_vectorstore(domain, embedding_model)
+                _vectorstores[(domain, embedding_model)] = vectorstore
         return vectorstore
         
     except Exception as e:
@@ -74,6 +233,57 @@ def get_vectorstore(domain: str, embedding_model: str = "text-embedding-3-small"
         return None
 
 
+def _open_vectorstore(domain: str, embedding_model: str) -> Chroma:
+    """Open (or create) a domain's Chroma collection."""
+    # Create persist directory for this domain
+    persist_directory = CHROMA_BASE_DIR / domain
+    persist_directory.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Initializing vector store for domain: {domain}")
+    logger.info(f"Persist directory: {persist_directory}")
+
+    # Initialize embeddings
+    embeddings = get_embeddings(embedding_model)
+
+    # Create or load ChromaDB vector store
+    vectorstore = Chroma(
+        collection_name=f"{domain}_docs",
+        embedding_function=embeddings,
+        persist_directory=str(persist_directory),
+    )
+
+    # Log collection info
+    doc_count = vectorstore._collection.count()
+    logger.info(f"Vector store loaded: {domain} ({doc_count} documents)")
+
+    return vectorstore
+
+
+def warm_vectorstore(domain: str, query: str | None = None) -> int:
+    """
+    Open a domain's vector store and optionally run a warm-up search.
+
+    Used at startup so the first user request does not pay for opening
+    the collection, loading its index or the first embeddings connection.
+
+    Args:
+        domain: Domain name (technical, billing, general)
+        query: Warm-up query (searched with k=1), or None to only open the store
+
+    Returns:
+        int: Number of documents in the collection
+
+    Raises:
+        RuntimeError: If the vector store cannot be opened
+    """
+    vectorstore = get_vectorstore(domain)
+    if vectorstore is None:
+        raise RuntimeError(f"Vector store for domain '{domain}' could not be opened")
+    if query:
+        vectorstore.similarity_search(query, k=1)
+    return vectorstore._collection.count()
+
+
 def get_all_vectorstores() -> dict[str, Chroma]:
     """
     Get vector stores for all domains.
@@ -85,10 +295,9 @@ def get_all_vectorstores() -> dict[str, Chroma]:
         >>> stores = get_all_vectorstores()
         >>> tech_docs = stores["technical"].similarity_search("error", k=3)
     """
-    domains = ["technical", "billing", "general"]
     stores = {}
     
-    for domain in domains:
+    for domain in DOMAINS:
         vectorstore = get_vectorstore(domain)
         if vectorstore:
             stores[domain] = vectorstore
@@ -112,6 +321,10 @@ def clear_vectorstore(domain: str) -> bool:
     """
     try:
         persist_directory = CHROMA_BASE_DIR / domain
+
+        # Drop the open store so the next get_vectorstore() starts fresh
+        for key in [key for key in _vectorstores if key[0] == domain]:
+            del _vectorstores[key]
         
         if not persist_directory.exists():
             logger.info(f"No vector store exists for domain: {domain}")
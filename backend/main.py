@@ -8,20 +8,109 @@ LangChain Version: v1.0+
 Last Updated: November 2, 2025
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, field_validator, ValidationError
+from langchain_core.messages import ToolMessage
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+from collections.abc import AsyncIterator
+import asyncio
+import json
 import os
 import logging
 import re
 import time
-import json
-import asyncio
 
 # Import LangChain agent (Phase 3: using supervisor for multi-agent routing)
-from agents import get_supervisor
+from agents import (
+    get_supervisor,
+    record_turn,
+    routed_domain,
+    session_count,
+    session_has_history,
+    stream_agent_tokens,
+)
+from agents.routing import DIRECT_DOMAIN
+from agents.small_talk import DEFAULT_TEMPLATES_PATH as SMALL_TALK_TEMPLATES, SmallTalk
+from agents.streaming import message_text
+from agents.supervisor_agent import (
+    FAST_PATH_ROUTING_ENABLED,
+    WORKER_DOMAINS,
+    WORKER_HANDOFF_ENABLED,
+    fast_path,
+    get_supervisor_model,
+    handoff,
+)
+from agents.tools.rag_tools import (
+    COMPLIANCE_CONTEXT,
+    COMPLIANCE_UNAVAILABLE,
+    RETRIEVAL_TOOLS,
+    failed_retrievals,
+    retrieval_errors_scope,
+)
+from agents.workers import (
+    get_billing_agent,
+    get_compliance_agent,
+    get_general_info_agent,
+    get_technical_agent,
+)
+from data.document_loader import get_knowledge_base_version
+from data.vectorstore import (
+    DOMAINS,
+    WARMUP_QUERIES,
+    aembed_query,
+    routed_query_scope,
+    warm_vectorstore,
+)
+from utils.batch import run_keyed_batch
+from utils.cache import TTLCache
+from utils.idempotency import (
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+    request_fingerprint,
+)
+from utils.concurrency import BoundedAgentExecutor, ExecutorSaturatedError
+from utils.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    RunCancelledError,
+    current_deadline,
+    deadline_scope,
+)
+from utils.keyed_lock import KeyBusyError, KeyedLock
+from utils.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsRegistry,
+    flatten_stats,
+)
+from utils.rate_limit import RateLimitedError, RateLimiter
+from utils.progress import ProgressEvent, collect_progress, merge_progress
+from utils.readiness import Readiness
+from utils.replay import (
+    ReplayBuffer,
+    ReplayBuffers,
+    ReplayGapError,
+    SlowConsumerError,
+    parse_event_id,
+)
+from utils.scheduler import FairScheduler, Flow, parse_tier_weights
+from utils.semantic_cache import SemanticCache, SemanticHit
+from utils.singleflight import SingleFlight
+from utils.sse import SSEWriter, coalesce_tokens
+from utils.text import normalize_message
+from utils.timing import RequestTimings, collect_timings, current_timings
 
 # Load environment variables
 load_dotenv()
@@ -49,6 +138,15 @@ except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI package not found - using generic error handling")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: startup checks and warm-up, then cleanup
+    (see "Application Startup/Shutdown" below)."""
+    await startup_event()
+    yield
+    await shutdown_event()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Advanced Customer Service AI",
@@ -56,6 +154,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -69,9 +168,1007 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ============================================================================
-# Pydantic Models for Request/Response Validation
-# ============================================================================
+# ============================================================================
+# Agent Executor (keeps blocking agent calls off the event loop)
+# ============================================================================
+# agent.invoke() is synchronous and blocks for the full LLM round-trip.
+# Running it on a dedicated pool keeps /health and other requests responsive,
+# and the in-flight cap turns overload into a fast 503 instead of a pile-up.
+
+agent_executor = BoundedAgentExecutor(
+    max_workers=int(os.getenv("AGENT_EXECUTOR_WORKERS", "16")),
+    max_in_flight=int(os.getenv("AGENT_MAX_IN_FLIGHT", "64")),
+    min_retry_after=int(os.getenv("AGENT_RETRY_AFTER_SECONDS", "1")),
+)
+
+# Fair scheduling of admitted agent runs: at most SCHEDULER_MAX_CONCURRENT
+# run at once; waiting runs get slots by deficit round-robin across tenants
+# (X-Tenant-ID), weighted by priority tier (X-Priority-Tier)
+scheduler = FairScheduler(
+    max_concurrent=int(
+        os.getenv("SCHEDULER_MAX_CONCURRENT", str(agent_executor.max_workers))
+    ),
+    weights=parse_tier_weights(
+        os.getenv("SCHEDULER_TIER_WEIGHTS", "premium:4,standard:2,free:1")
+    ),
+    default_tier=os.getenv("SCHEDULER_DEFAULT_TIER", "standard"),
+)
+
+
+# Admission control: global and per-session token buckets checked before any
+# LLM work. Requests that would wait longer than RATE_LIMIT_MAX_WAIT_SECONDS
+# for a token get 429 with Retry-After; shorter waits are queued
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+rate_limiter = RateLimiter(
+    global_rate=float(os.getenv("RATE_LIMIT_GLOBAL_RPS", "50")),
+    global_burst=float(os.getenv("RATE_LIMIT_GLOBAL_BURST", "100")),
+    session_rate=float(os.getenv("RATE_LIMIT_SESSION_RPS", "1")),
+    session_burst=float(os.getenv("RATE_LIMIT_SESSION_BURST", "10")),
+    max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "2")),
+)
+
+# Forward tokens generated inside worker agents as "worker_token" events
+STREAM_WORKER_TOKENS = os.getenv("STREAM_WORKER_TOKENS", "true").lower() == "true"
+
+# SSE token coalescing: flush a frame after this many ms or bytes
+SSE_FLUSH_INTERVAL = int(os.getenv("SSE_FLUSH_INTERVAL_MS", "20")) / 1000
+SSE_FLUSH_BYTES = int(os.getenv("SSE_FLUSH_BYTES", "256"))
+
+# Progress events (routing, worker_started, retrieval_done, generating)
+# before and between tokens of streamed turns
+STREAM_PROGRESS_EVENTS = os.getenv("STREAM_PROGRESS_EVENTS", "true").lower() == "true"
+
+# SSE comment sent on /chat/stream after this many seconds without an event,
+# so idle-timeout proxies keep long worker calls connected (0 disables)
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# How often /chat/stream checks whether the client is still connected; a
+# disconnect cancels the agent run, including worker tool calls, unless the
+# client resumes the stream within STREAM_RESUME_GRACE_SECONDS
+STREAM_DISCONNECT_POLL_SECONDS = float(
+    os.getenv("STREAM_DISCONNECT_POLL_SECONDS", "0.5")
+)
+STREAM_RESUME_GRACE_SECONDS = float(os.getenv("STREAM_RESUME_GRACE_SECONDS", "5"))
+
+# Resumable /chat/stream: events carry an "id:" and are kept in a replay
+# buffer so a reconnect with Last-Event-ID continues after that event.
+# Finished streams are kept for SSE_REPLAY_TTL_SECONDS; buffers are capped
+# per stream and in total (oldest finished streams are evicted first)
+stream_buffers = ReplayBuffers(
+    max_bytes=int(os.getenv("SSE_REPLAY_MAX_BYTES", str(64 << 20))),
+    max_stream_bytes=int(os.getenv("SSE_REPLAY_MAX_STREAM_BYTES", str(256 << 10))),
+    ttl_seconds=float(os.getenv("SSE_REPLAY_TTL_SECONDS", "60")),
+)
+
+# Slow SSE clients: the agent run never waits for the client. A client more
+# than SSE_CONSUMER_MAX_LAG_BYTES behind gets its pending tokens merged
+# into larger frames ("coalesce") or is disconnected ("drop"; it may
+# resume with Last-Event-ID)
+SSE_SLOW_CONSUMER_POLICY = os.getenv("SSE_SLOW_CONSUMER_POLICY", "coalesce").lower()
+SSE_CONSUMER_MAX_LAG_BYTES = int(os.getenv("SSE_CONSUMER_MAX_LAG_BYTES", "65536"))
+if SSE_SLOW_CONSUMER_POLICY not in ("coalesce", "drop"):
+    raise ValueError(
+        f"SSE_SLOW_CONSUMER_POLICY must be 'coalesce' or 'drop', got {SSE_SLOW_CONSUMER_POLICY!r}"
+    )
+
+
+# Identical first-turn messages in flight at the same time share one
+# supervisor run (see run_supervisor)
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+first_turn_flight = SingleFlight()
+
+# Exact-match answer cache for first-turn messages, keyed on the normalized
+# message plus the knowledge base version (edits to data/docs invalidate it:
+# the version is re-checked on every lookup, see get_knowledge_base_version)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+answer_cache = TTLCache(
+    max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")),
+)
+
+# Semantic answer cache: first-turn paraphrases of a recently answered query
+# (cosine similarity of query embeddings >= threshold) reuse its answer.
+# Costs one embedding call per uncached first turn, so it is opt-in
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+semantic_cache = SemanticCache(
+    capacity=int(os.getenv("SEMANTIC_CACHE_CAPACITY", "10000")),
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+    ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")),
+)
+
+# Greetings, thanks, feedback and goodbyes are answered from a template
+# library without any LLM call, in any turn (see agents.small_talk)
+SMALL_TALK_ENABLED = os.getenv("SMALL_TALK_ENABLED", "true").lower() == "true"
+small_talk = SmallTalk.load(
+    os.getenv("SMALL_TALK_TEMPLATES_PATH", str(SMALL_TALK_TEMPLATES))
+)
+
+# Turns of one session run one at a time, in arrival order (a retry or a
+# double submit waits for the running turn instead of racing it on the
+# checkpoint). Beyond this many queued turns per session, requests get 429
+session_locks = KeyedLock(max_pending=int(os.getenv("SESSION_MAX_PENDING_TURNS", "16")))
+
+# Idempotency-Key on /chat: a duplicate of a request (client retry) within
+# the TTL waits for or replays the original's result instead of running
+# the agent again and adding the turn to the session twice
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000")),
+    ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+)
+
+# Request deadlines: clients may ask for a shorter (or, up to the maximum,
+# longer) budget with the X-Request-Timeout header or "timeout_seconds";
+# the supervisor, worker tools and retrieval stop once it has passed
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "60"))
+REQUEST_MAX_TIMEOUT_SECONDS = float(os.getenv("REQUEST_MAX_TIMEOUT_SECONDS", "120"))
+
+# /chat/batch: items processed at once per batch, and maximum batch size
+CHAT_BATCH_CONCURRENCY = int(os.getenv("CHAT_BATCH_CONCURRENCY", "8"))
+CHAT_BATCH_MAX_ITEMS = int(os.getenv("CHAT_BATCH_MAX_ITEMS", "100"))
+
+# Startup warm-up (see startup_event): open the Chroma collections, build
+# the agents and, if enabled, run one warm-up query per domain plus one LLM
+# call. /ready returns 503 until every task has succeeded; failed tasks are
+# retried with exponential backoff (initial delay, doubling up to the max;
+# an initial delay of 0 disables retries)
+STARTUP_WARMUP_QUERIES = os.getenv("STARTUP_WARMUP_QUERIES", "true").lower() == "true"
+STARTUP_TASK_TIMEOUT_SECONDS = float(os.getenv("STARTUP_TASK_TIMEOUT_SECONDS", "60"))
+STARTUP_RETRY_INITIAL_SECONDS = float(os.getenv("STARTUP_RETRY_INITIAL_SECONDS", "1"))
+STARTUP_RETRY_MAX_SECONDS = float(os.getenv("STARTUP_RETRY_MAX_SECONDS", "30"))
+readiness = Readiness()
+warmup_task: asyncio.Task | None = None
+
+# In-process metrics, served on /metrics in Prometheus text format
+metrics = MetricsRegistry(namespace="customer_service")
+request_latency = metrics.histogram(
+    "request_duration_seconds", "Chat request latency by endpoint", ("endpoint",)
+)
+time_to_first_token = metrics.histogram(
+    "time_to_first_token_seconds", "Streamed agent runs: time to the first answer token"
+)
+requests_in_flight = metrics.gauge(
+    "requests_in_flight", "Chat requests being processed", ("endpoint",)
+)
+turns_served = metrics.counter(
+    "turns_total", "Chat turns by how they were answered", ("source",)
+)
+supervisor_routes = metrics.counter(
+    "supervisor_routes_total",
+    "Supervisor runs by worker domain routed to (direct = no worker)",
+    ("domain",),
+)
+llm_errors = metrics.counter(
+    "llm_errors_total", "LLM provider errors by exception class", ("error",)
+)
+deadlines_exceeded = metrics.counter(
+    "deadline_exceeded_total", "Requests that ran out of time, by stage", ("stage",)
+)
+stream_consumer_lag = metrics.histogram(
+    "sse_consumer_lag_bytes",
+    "High-water mark of bytes an SSE client was behind its agent run, per connection",
+    buckets=(1024, 4096, 16384, 65536, 262144, 1048576),
+)
+runs_cancelled = metrics.counter(
+    "cancelled_total",
+    "Streamed agent runs cancelled because the client disconnected or cancelled the turn",
+    ("endpoint",),
+)
+
+
+@metrics.collector
+def component_metrics():
+    """Export existing stats() counters and the checkpointer size."""
+    yield "checkpointer_sessions", {}, session_count()
+    yield from flatten_stats("agent_executor", agent_executor.stats())
+    yield from flatten_stats("single_flight", first_turn_flight.stats())
+    yield from flatten_stats("session_locks", session_locks.stats())
+    yield from flatten_stats("idempotency", idempotency_store.stats())
+    yield from flatten_stats("stream_buffers", stream_buffers.stats())
+    yield from flatten_stats("rate_limiter", rate_limiter.stats())
+    yield from flatten_stats("answer_cache", answer_cache.stats())
+    yield from flatten_stats("semantic_cache", semantic_cache.stats())
+    yield from flatten_stats("fast_path", fast_path.stats())
+    yield from flatten_stats("handoff", handoff.stats())
+    stats = scheduler.stats()
+    for tier, tier_stats in stats.pop("tiers").items():
+        for key, value in tier_stats.items():
+            yield f"scheduler_tier_{key}", {"tier": tier}, value
+    yield from flatten_stats("scheduler", stats)
+
+
+def record_llm_error(e: Exception) -> None:
+    """Count an LLM provider error by its exception class."""
+    if OPENAI_AVAILABLE and isinstance(e, APIError):
+        llm_errors.inc(type(e).__name__)
+
+
+def saturated_error(e: ExecutorSaturatedError, session_id: str) -> HTTPException:
+    """
+    Build the 503 response returned when the agent executor is full.
+
+    Args:
+        e: The saturation error raised by the executor
+        session_id: Session ID to echo back to the client
+
+    Returns:
+        HTTPException: 503 with a Retry-After header
+    """
+    logger.warning(
+        f"Agent executor saturated ({e.in_flight}/{e.limit}), "
+        f"rejecting session {session_id}"
+    )
+    return HTTPException(
+        status_code=503,
+        detail={
+            "error": "Service busy",
+            "detail": "The assistant is handling too many conversations. Please retry shortly.",
+            "session_id": session_id,
+        },
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def admit(session_id: str) -> None:
+    """
+    Admit a chat request through the rate limiter.
+
+    Waits for a reserved slot if the buckets are briefly empty.
+
+    Args:
+        session_id: Session the request belongs to
+
+    Raises:
+        RateLimitedError: If the request would wait longer than allowed
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    delay = rate_limiter.acquire(session_id)
+    if delay:
+        logger.info(f"Rate limiter: delaying session {session_id} by {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+def rate_limited_error(e: RateLimitedError, session_id: str) -> HTTPException:
+    """
+    Build the 429 response returned when admission control rejects a request.
+
+    Args:
+        e: The rate limiter's error
+        session_id: Session ID to echo back to the client
+
+    Returns:
+        HTTPException: 429 with a Retry-After header from the bucket state
+    """
+    logger.warning(
+        f"Rate limited ({e.scope}) session {session_id}, retry in {e.retry_after:.2f}s"
+    )
+    detail = (
+        "You are sending messages too quickly. Please wait a moment and try again."
+        if e.scope == "session"
+        else "The service is receiving too many requests. Please try again shortly."
+    )
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": "Too many requests",
+            "detail": detail,
+            "session_id": session_id,
+        },
+        headers={"Retry-After": e.retry_after_header},
+    )
+
+
+def session_busy_error(e: KeyBusyError, session_id: str) -> HTTPException:
+    """
+    Build the 429 response returned when a session has too many queued turns.
+
+    Args:
+        e: The error raised by the session lock
+        session_id: Session ID to echo back to the client
+
+    Returns:
+        HTTPException: 429 with a Retry-After header
+    """
+    logger.warning(f"Session {session_id} has {e.pending} turns pending, rejecting")
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": "Too many pending messages",
+            "detail": "Earlier messages in this conversation are still being answered. Please wait.",
+            "session_id": session_id,
+        },
+        headers={"Retry-After": str(agent_executor.retry_after())},
+    )
+
+
+def idempotency_error(e: IdempotencyKeyReusedError, session_id: str) -> HTTPException:
+    """Build the 422 response for an idempotency key reused with another message."""
+    logger.warning(
+        f"Idempotency key reused with a different message (session: {session_id})"
+    )
+    return HTTPException(
+        status_code=422,
+        detail={
+            "error": "Idempotency key reused",
+            "detail": f"{e}. Use a new Idempotency-Key for a new message.",
+            "session_id": session_id,
+        },
+    )
+
+
+def stream_expired_error(last_event_id: str, session_id: str) -> HTTPException:
+    """Build the 410 response for a Last-Event-ID whose stream can no longer be resumed."""
+    logger.info(
+        f"Cannot resume stream from event {last_event_id!r} (session: {session_id})"
+    )
+    return HTTPException(
+        status_code=410,
+        detail={
+            "error": "Stream expired",
+            "detail": "The stream can no longer be resumed. Send the message again without Last-Event-ID.",
+            "session_id": session_id,
+        },
+    )
+
+
+async def run_idempotent(
+    session_id: str, idempotency_key: str | None, message: str, run_turn
+) -> "TurnResult":
+    """
+    Run a chat turn at most once per (session, Idempotency-Key).
+
+    Args:
+        session_id: Session the key is scoped to
+        idempotency_key: Idempotency-Key header value, or None to just run
+        message: The user's message (a reused key must carry the same one)
+        run_turn: Zero-argument coroutine function running the turn
+
+    Returns:
+        TurnResult: The turn's result; a duplicate request gets the
+        original's result with source "replay"
+
+    Raises:
+        IdempotencyKeyReusedError: If the key was used for a different message
+    """
+    if idempotency_key is None:
+        return await run_turn()
+    turn, replayed = await idempotency_store.run(
+        (session_id, idempotency_key), request_fingerprint(message), run_turn
+    )
+    if replayed:
+        logger.info(
+            f"♻️ REPLAY: Idempotent retry answered with the original result (session: {session_id})"
+        )
+        return turn._replace(source="replay", queue_wait=0.0)
+    return turn
+
+
+def request_deadline(*timeouts: float | None) -> Deadline:
+    """
+    Start the deadline for a request.
+
+    Args:
+        *timeouts: Client-requested budgets in seconds (header, body field);
+            None where not given
+
+    Returns:
+        Deadline: The shortest requested budget, or REQUEST_TIMEOUT_SECONDS,
+        capped at REQUEST_MAX_TIMEOUT_SECONDS
+    """
+    requested = [timeout for timeout in timeouts if timeout is not None]
+    timeout = min(requested) if requested else REQUEST_TIMEOUT_SECONDS
+    return Deadline(min(timeout, REQUEST_MAX_TIMEOUT_SECONDS))
+
+
+def deadline_progress(
+    e: DeadlineExceededError, timings: RequestTimings | None = None
+) -> dict:
+    """
+    Describe how far a timed-out request got.
+
+    Returns:
+        dict: Stage that ran out of time, steps started (LLM calls, tools,
+        retrieval) and per-stage timings in milliseconds
+    """
+    deadlines_exceeded.inc(e.stage)
+    return {
+        "stage": e.stage,
+        "timeout_seconds": e.timeout,
+        "progress": {
+            "steps": e.steps,
+            "timings": timings.as_dict() if timings is not None else {},
+        },
+    }
+
+
+def deadline_error(
+    e: DeadlineExceededError, session_id: str, timings: RequestTimings | None = None
+) -> HTTPException:
+    """
+    Build the 504 response returned when a request runs out of time.
+
+    Args:
+        e: The error raised by the deadline check
+        session_id: Session ID to echo back to the client
+        timings: The request's stage timings, if collected
+
+    Returns:
+        HTTPException: 504 with the stage that timed out and partial progress
+    """
+    logger.warning(
+        f"Deadline exceeded for session {session_id}: {e} (steps: {e.steps})"
+    )
+    return HTTPException(
+        status_code=504,
+        detail={
+            "error": "Request timeout",
+            "detail": "The request took too long to process. Please try again.",
+            "session_id": session_id,
+            **deadline_progress(e, timings),
+        },
+    )
+
+
+class TurnResult(NamedTuple):
+    """Outcome of one chat turn."""
+
+    response: str
+    # Messages from the agent run ([] when no run happened for this request)
+    messages: list
+    # "agent" (own run), "coalesced" (shared in-flight run), "cache" (exact
+    # match), "semantic_cache" (paraphrase of a cached query) or
+    # "small_talk" (template reply)
+    source: str
+    # Seconds spent waiting in the fair scheduler for a run slot
+    queue_wait: float = 0.0
+
+
+async def run_agent(fn, *args, flow: Flow) -> tuple:
+    """
+    Run a blocking agent call: admission, fair queueing, then the pool.
+
+    Args:
+        fn: Blocking callable, typically ``agent.invoke``
+        *args: Arguments for ``fn``
+        flow: Scheduling key for the fair scheduler
+
+    Returns:
+        tuple: (result of ``fn``, seconds waited for a run slot)
+
+    Raises:
+        ExecutorSaturatedError: If the agent executor is full
+    """
+    async with agent_executor.slot(), scheduler.slot(flow) as queue_wait:
+        return await agent_executor.call(fn, *args), queue_wait
+
+
+def answer_cache_key(message: str) -> tuple[str, str]:
+    """Cache key for a first-turn message under the current knowledge base."""
+    return normalize_message(message), get_knowledge_base_version()
+
+
+async def embed_first_turn(message: str) -> list[float] | None:
+    """
+    Embed a first-turn message for the semantic cache.
+
+    Uses the same embedding model as the vector stores, through the query
+    embedding cache: the embedding router and the routed worker's knowledge
+    base search reuse the vector (see data.vectorstore.set_routed_query).
+    Failures (e.g. no API key or a network error) disable the semantic
+    cache for this request instead of failing it.
+
+    Args:
+        message: The user's message
+
+    Returns:
+        list[float] | None: Query embedding, or None if unavailable
+    """
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+
+    try:
+        return await aembed_query(message)
+    except Exception as e:  # noqa: BLE001 - any failure skips the lookup
+        logger.warning(f"Semantic cache: could not embed query, skipping lookup: {e}")
+        return None
+
+
+async def semantic_lookup(message: str, embedding: list[float]) -> SemanticHit | None:
+    """
+    Look up a first-turn message in the semantic cache.
+
+    The search is scoped to the domain the fast-path routers pick for the
+    message, so a close paraphrase answered by another worker is not served.
+    When no router is confident only answers the supervisor gave without a
+    worker ("direct") are considered. Entries built from an older knowledge
+    base version never match. The search is a matrix product over the whole
+    buffer, so it runs in a thread instead of on the event loop.
+
+    Args:
+        message: The user's message
+        embedding: Its query embedding
+
+    Returns:
+        SemanticHit | None: The closest cached answer above the threshold
+    """
+    decision = await fast_path.aroute(message)
+    domain = decision.domain if decision is not None else DIRECT_DOMAIN
+    return await asyncio.to_thread(
+        semantic_cache.search, embedding, domain, get_knowledge_base_version()
+    )
+
+
+def small_talk_turn(agent, message: str, config: dict) -> TurnResult | None:
+    """
+    Answer a greeting, thanks, feedback or goodbye from the templates.
+
+    The exchange is appended to the session checkpoint, so later turns see
+    it exactly as if the supervisor had answered.
+
+    Args:
+        agent: The supervisor agent
+        message: The user's message
+        config: Run config with ``configurable.thread_id``
+
+    Returns:
+        TurnResult | None: The template reply, or None if the message is
+        not small talk (or SMALL_TALK_ENABLED is off)
+    """
+    if not SMALL_TALK_ENABLED:
+        return None
+    reply = small_talk.reply(message)
+    if reply is None:
+        return None
+    record_turn(agent, config, message, reply)
+    return TurnResult(reply, [], "small_talk")
+
+
+async def cached_first_turn(
+    agent, message: str, config: dict
+) -> tuple[TurnResult | None, list[float] | None]:
+    """
+    Serve a first-turn message from the answer caches if possible.
+
+    The exact-match cache is checked first; on a miss (and with the
+    semantic cache enabled) the message is embedded and the semantic cache
+    is checked next (see semantic_lookup()). On a hit the exchange is appended to the session
+    checkpoint, so follow-up questions see it exactly as if the supervisor
+    had answered.
+
+    Args:
+        agent: The supervisor agent
+        message: The user's message
+        config: Run config with ``configurable.thread_id``
+
+    Returns:
+        tuple: (cached TurnResult or None, query embedding or None). Pass
+        the embedding to remember_answer() so it is not computed twice
+    """
+    turn, embedding = None, None
+    if ANSWER_CACHE_ENABLED:
+        cached = answer_cache.get(answer_cache_key(message))
+        if cached is not None:
+            turn = TurnResult(cached, [], "cache")
+
+    if turn is None:
+        embedding = await embed_first_turn(message)
+        hit = (
+            await semantic_lookup(message, embedding) if embedding is not None else None
+        )
+        if hit is not None:
+            logger.info(
+                f"Semantic cache hit (score {hit.score:.3f}, domain {hit.domain}): "
+                f"'{normalize_message(message)}' ~ '{hit.query}'"
+            )
+            turn = TurnResult(hit.answer, [], "semantic_cache")
+
+    if turn is not None:
+        record_turn(agent, config, message, turn.response)
+    return turn, embedding
+
+
+def failed_tools(messages: list) -> list[str]:
+    """
+    Tools that reported an error during the current turn.
+
+    Worker tools that raised show up as error ToolMessages; knowledge base
+    searches that answered with a fallback message (vector store
+    unavailable, search error) are reported by rag_tools (see
+    retrieval_errors_scope).
+
+    Args:
+        messages: Messages from the run
+
+    Returns:
+        list[str]: Names of the failed tools (empty if none failed)
+    """
+    failed = [
+        message.name or "tool"
+        for message in messages
+        if isinstance(message, ToolMessage) and message.status == "error"
+    ]
+    return failed + failed_retrievals()
+
+
+def remember_answer(
+    message: str, response: str, messages: list, embedding: list[float] | None = None
+) -> None:
+    """
+    Store a first-turn answer in the answer caches.
+
+    Answers from turns where a tool reported an error are not stored: they
+    are built on a fallback message and would be served for the full TTL.
+
+    Args:
+        message: The user's message
+        response: The supervisor's final answer
+        messages: Messages from the run (used to find the routed domain)
+        embedding: Query embedding from embed_first_turn(), if any
+    """
+    failed = failed_tools(messages)
+    if failed:
+        logger.info(f"Not caching answer: {', '.join(failed)} reported an error")
+        return
+    if ANSWER_CACHE_ENABLED:
+        answer_cache.set(answer_cache_key(message), response)
+    if embedding is not None:
+        semantic_cache.add(
+            embedding,
+            normalize_message(message),
+            response,
+            routed_domain(messages),
+            get_knowledge_base_version(),
+        )
+
+
+async def run_supervisor(
+    agent, message: str, config: dict, flow: Flow | None = None
+) -> TurnResult:
+    """
+    Run the supervisor for one user message on the agent executor.
+
+    Small talk (greetings, thanks, goodbyes) is answered from templates in
+    any turn. First-turn messages (no prior thread state) take two more
+    shortcuts:
+    - Answer caches: an identical normalized message (or, with the semantic
+      cache enabled, a close paraphrase) answered recently is served from
+      the cache without any LLM call
+    - Coalescing: if an identical message is already being answered for
+      another session with the same time budget, this call waits for that
+      run instead of starting its own
+
+    Template, shared and cached answers are written into this session's
+    history.
+    Turns of the same session are serialized (see session_locks).
+
+    Args:
+        agent: The supervisor agent
+        message: The user's message
+        config: Run config with ``configurable.thread_id``
+        flow: Scheduling key (tier/tenant); None = default tier
+
+    Returns:
+        TurnResult: Response text, agent messages, where it came from, and
+        the scheduler queue wait
+
+    Raises:
+        ExecutorSaturatedError: If the agent executor is full
+        KeyBusyError: If too many turns are already queued for the session
+    """
+    flow = flow or scheduler.flow(None)
+    async with session_locks.hold(config["configurable"]["thread_id"]):
+        return await _run_supervisor_turn(agent, message, config, flow)
+
+
+async def _run_supervisor_turn(
+    agent, message: str, config: dict, flow: Flow
+) -> TurnResult:
+    """Body of run_supervisor(); the caller holds the session lock."""
+    inputs = {"messages": [{"role": "user", "content": message}]}
+
+    small_talk_reply = small_talk_turn(agent, message, config)
+    if small_talk_reply is not None:
+        return small_talk_reply
+
+    if session_has_history(agent, config):
+        result, queue_wait = await run_agent(agent.invoke, inputs, config, flow=flow)
+        return TurnResult(
+            result["messages"][-1].content, result["messages"], "agent", queue_wait
+        )
+
+    cached, embedding = await cached_first_turn(agent, message, config)
+    if cached is not None:
+        return cached
+
+    if SINGLE_FLIGHT_ENABLED:
+        # The shared run is bound by the leader's deadline (and reports to
+        # its timing collector), so only requests with the same time budget
+        # share it: a leader with a short X-Request-Timeout cannot make
+        # followers with a longer one fail
+        deadline = current_deadline()
+        (result, queue_wait), shared = await first_turn_flight.do(
+            (
+                normalize_message(message),
+                deadline.timeout if deadline is not None else None,
+            ),
+            lambda: run_agent(agent.invoke, inputs, config, flow=flow),
+        )
+    else:
+        (result, queue_wait), shared = (
+            await run_agent(agent.invoke, inputs, config, flow=flow),
+            False,
+        )
+
+    response = result["messages"][-1].content
+    if shared:
+        # The leader's run only wrote the leader's thread
+        record_turn(agent, config, message, response)
+        return TurnResult(response, result["messages"], "coalesced")
+
+    remember_answer(message, response, result["messages"], embedding)
+    return TurnResult(response, result["messages"], "agent", queue_wait)
+
+
+class StreamEvent(NamedTuple):
+    """One event of a streamed chat turn (transport-independent)."""
+
+    # "token", "worker_token", "done" or "error", or a progress event
+    # ("routing", "worker_started", "retrieval_done", "generating")
+    type: str
+    content: str = ""
+    # Worker agent name (worker_token only)
+    agent: str | None = None
+    # Extra JSON fields (done/error/progress)
+    fields: dict | None = None
+
+
+async def stream_turn(
+    agent,
+    message: str,
+    config: dict,
+    flow: Flow | None = None,
+    deadline: Deadline | None = None,
+) -> AsyncIterator[StreamEvent]:
+    """
+    Run one chat turn, yielding tokens as they are generated.
+
+    Shared by the SSE (/chat/stream) and WebSocket (/ws/chat) transports.
+    Turns of the same session are serialized, small talk is answered from
+    templates and first-turn messages may be answered from the answer
+    caches. Tokens are
+    coalesced into frames (SSE_FLUSH_INTERVAL_MS / SSE_FLUSH_BYTES) and the
+    run counts against the agent executor's in-flight limit.
+
+    Args:
+        agent: The supervisor agent
+        message: The user's message
+        config: Run config with ``configurable.thread_id``
+        flow: Scheduling key (tier/tenant); None = default tier
+        deadline: Time budget for the turn; None = REQUEST_TIMEOUT_SECONDS.
+            Cancelled if the caller stops iterating (or calls its cancel()),
+            which stops the agent run, worker tool calls included
+
+    Yields:
+        StreamEvent: token / worker_token events, interleaved with progress
+        events if STREAM_PROGRESS_EVENTS is on (see utils.progress), then a
+        single done or error event (done carries per-stage "timings" in
+        milliseconds)
+    """
+    session_id = config["configurable"]["thread_id"]
+    flow = flow or scheduler.flow(None)
+    deadline = deadline or request_deadline()
+    try:
+        # Stage timings for the done event (see utils.timing)
+        with (
+            collect_timings() as timings,
+            deadline_scope(deadline),
+            routed_query_scope(),
+            retrieval_errors_scope(),
+        ):
+            # Turns of one session run one at a time (see session_locks)
+            async with session_locks.hold(session_id):
+                async for event in _stream_turn(agent, message, config, flow):
+                    if event.type == "done":
+                        timings.add("queue", event.fields["queue_wait"])
+                        event.fields["timings"] = timings.as_dict()
+                    yield event
+    except (asyncio.CancelledError, GeneratorExit):
+        # The consumer went away (client disconnected or cancelled the
+        # turn). Stop what is still running for this turn: worker tools in
+        # pool threads are not reached by task cancellation
+        deadline.cancel("client_gone")
+        raise
+    except KeyBusyError as e:
+        logger.warning(
+            f"Session {session_id} has {e.pending} turns pending, rejecting stream"
+        )
+        yield StreamEvent(
+            "error",
+            fields={
+                "error": "Too many pending messages",
+                "detail": "Earlier messages in this conversation are still being answered. Please wait.",
+            },
+        )
+
+
+async def _stream_turn(
+    agent, message: str, config: dict, flow: Flow
+) -> AsyncIterator[StreamEvent]:
+    """Body of stream_turn(); the caller holds the session lock."""
+    session_id = config["configurable"]["thread_id"]
+
+    # Small talk gets a template reply, and first-turn messages may be
+    # answered straight from the cache
+    instant = small_talk_turn(agent, message, config)
+    first_turn = instant is None and not session_has_history(agent, config)
+    embedding = None
+    if first_turn:
+        instant, embedding = await cached_first_turn(agent, message, config)
+    if instant is not None:
+        if instant.source == "small_talk":
+            logger.info(
+                f"💬 SMALL TALK: Streaming template reply for session: {session_id}"
+            )
+        else:
+            logger.info(f"⚡ CACHED: Streaming cached answer for session: {session_id}")
+        turns_served.inc(instant.source)
+        yield StreamEvent("token", instant.response)
+        yield StreamEvent(
+            "done",
+            fields={
+                "ttft": 0.0,
+                "time": 0.0,
+                "queue_wait": 0.0,
+                "tokens": 1,
+                "worker_tokens": 0,
+                "frames": 1,
+                "cached": instant.source != "small_talk",
+            },
+        )
+        return
+
+    # Stream LLM tokens as they are generated (stream_mode="messages")
+    # Supervisor tokens are the answer; worker tokens are forwarded
+    # separately so clients can show progress without duplicating text
+    logger.info(f"Invoking streaming agent for session: {session_id}")
+    start_time = time.time()
+    first_token_time = None
+    queue_wait = 0.0
+
+    counts = {"tokens": 0, "worker_tokens": 0, "frames": 0}
+    deadline = current_deadline()
+
+    async def counted_tokens():
+        async for chunk in stream_agent_tokens(
+            agent,
+            {"messages": [{"role": "user", "content": message}]},
+            config,
+            include_workers=STREAM_WORKER_TOKENS,
+        ):
+            if deadline is not None and (deadline.expired or deadline.cancelled):
+                # Stops the run mid-answer (closing the stream cancels it)
+                raise deadline.error()
+            counts["tokens" if chunk.from_supervisor else "worker_tokens"] += 1
+            yield chunk
+
+    try:
+        # Stream agent responses (counts against the executor in-flight
+        # limit, then waits for a fair-scheduler run slot)
+        async with agent_executor.slot(), scheduler.slot(flow) as queue_wait:
+            with collect_progress(WORKER_DOMAINS, RETRIEVAL_TOOLS) as progress:
+                frames = coalesce_tokens(
+                    counted_tokens(), SSE_FLUSH_INTERVAL, SSE_FLUSH_BYTES
+                )
+                if STREAM_PROGRESS_EVENTS:
+                    frames = merge_progress(frames, progress)
+                async for chunk in frames:
+                    if isinstance(chunk, ProgressEvent):
+                        yield StreamEvent(chunk.type, fields=chunk.fields)
+                        continue
+                    counts["frames"] += 1
+                    if chunk.from_supervisor:
+                        if first_token_time is None:
+                            first_token_time = time.time()
+                        yield StreamEvent("token", chunk.text)
+                    else:
+                        yield StreamEvent("worker_token", chunk.text, chunk.agent)
+
+    except RunCancelledError as e:
+        # Nobody is listening any more: nothing to send
+        logger.info(f"Stream cancelled for session {session_id}: {e}")
+        return
+
+    except DeadlineExceededError as e:
+        logger.warning(f"Deadline exceeded mid-stream for session {session_id}: {e}")
+        yield StreamEvent(
+            "error",
+            fields=dict(
+                error="Request timeout",
+                detail="The request took too long to process. Please try again.",
+                **deadline_progress(e, current_timings()),
+            ),
+        )
+        return
+
+    except ExecutorSaturatedError as e:
+        # Capacity was taken between the pre-check and the stream start
+        logger.warning(f"Agent executor saturated mid-stream: {e}")
+        yield StreamEvent(
+            "error",
+            fields={
+                "error": "Service busy",
+                "detail": str(e),
+                "retry_after": e.retry_after,
+            },
+        )
+        return
+
+    except Exception as stream_error:
+        logger.error(f"Streaming error: {stream_error}", exc_info=True)
+        record_llm_error(stream_error)
+        yield StreamEvent("error", fields={"error": str(stream_error)})
+        return
+
+    elapsed_time = time.time() - start_time
+    ttft = first_token_time - start_time if first_token_time else None
+    logger.info(
+        f"Streaming completed for session: {session_id} "
+        f"({counts['tokens']} tokens, {counts['worker_tokens']} worker tokens, "
+        f"{counts['frames']} frames, "
+        f"ttft: {ttft if ttft is None else round(ttft, 2)}s, {elapsed_time:.2f}s)"
+    )
+
+    if ttft is not None:
+        time_to_first_token.observe(ttft)
+    messages = agent.get_state(config).values["messages"]
+    turns_served.inc("agent")
+    supervisor_routes.inc(routed_domain(messages))
+
+    # Cache the final answer (not the raw token stream, which may
+    # include text the supervisor emitted before calling a tool)
+    if first_turn:
+        remember_answer(message, message_text(messages[-1]), messages, embedding)
+
+    yield StreamEvent(
+        "done",
+        fields=dict(
+            ttft=ttft, time=elapsed_time, queue_wait=queue_wait, cached=False, **counts
+        ),
+    )
+
+
+# ============================================================================
+# Pydantic Models for Request/Response Validation
+# ============================================================================
+
+# Maximum length of a user message (shared by HTTP and WebSocket chat)
+MAX_MESSAGE_LENGTH = 2000
+
+# UUID v4 pattern: 8-4-4-4-12 hexadecimal characters
+UUID_V4_PATTERN = re.compile(
+    r"^[a-f0-9]{8}-[a-f0-9]{4}-4[a-f0-9]{3}-[89ab][a-f0-9]{3}-[a-f0-9]{12}$"
+)
+
+
+def validate_session_id(session_id: str) -> str:
+    """
+    Validate that a session_id is a UUID v4 and normalize it.
+
+    Args:
+        session_id: The session_id string to validate
+
+    Returns:
+        str: The lowercased session_id
+
+    Raises:
+        ValueError: If session_id is not a valid UUID v4
+    """
+    if not UUID_V4_PATTERN.match(session_id.lower()):
+        raise ValueError(
+            "session_id must be a valid UUID v4 format "
+            "(e.g., '550e8400-e29b-41d4-a716-446655440000')"
+        )
+    return session_id.lower()
 
 
 class ChatRequest(BaseModel):
@@ -84,7 +1181,7 @@ class ChatRequest(BaseModel):
     message: str = Field(
         ...,
         min_length=1,
-        max_length=2000,
+        max_length=MAX_MESSAGE_LENGTH,
         description="User's message to the AI assistant",
         examples=["Hello, I need help with my account"],
     )
@@ -93,6 +1190,12 @@ class ChatRequest(BaseModel):
         description="UUID v4 session identifier for conversation continuity",
         examples=["550e8400-e29b-41d4-a716-446655440000"],
     )
+    timeout_seconds: float | None = Field(
+        None,
+        gt=0,
+        description="Time budget for the request; defaults to the server's REQUEST_TIMEOUT_SECONDS",
+        examples=[15],
+    )
     
     @field_validator("session_id")
     @classmethod
@@ -109,18 +1212,7 @@ class ChatRequest(BaseModel):
         Raises:
             ValueError: If session_id is not a valid UUID v4
         """
-        # UUID v4 pattern: 8-4-4-4-12 hexadecimal characters
-        uuid_pattern = (
-            r"^[a-f0-9]{8}-[a-f0-9]{4}-4[a-f0-9]{3}-[89ab][a-f0-9]{3}-[a-f0-9]{12}$"
-        )
-        
-        if not re.match(uuid_pattern, v.lower()):
-            raise ValueError(
-                "session_id must be a valid UUID v4 format "
-                "(e.g., '550e8400-e29b-41d4-a716-446655440000')"
-            )
-        
-        return v.lower()  # Normalize to lowercase
+        return validate_session_id(v)  # Normalizes to lowercase
     
     model_config = {
         "json_schema_extra": {
@@ -138,6 +1230,24 @@ class ChatRequest(BaseModel):
     }
 
 
+class ChatMetadata(BaseModel):
+    """How a chat turn was served."""
+
+    source: str = Field(
+        ...,
+        description="agent, coalesced, cache, semantic_cache, small_talk or replay (Idempotency-Key retry)",
+        examples=["agent"],
+    )
+    tier: str = Field(
+        ...,
+        description="Priority tier the turn was scheduled in",
+        examples=["standard"],
+    )
+    queue_wait_ms: float = Field(
+        ..., description="Time spent waiting for an agent run slot", examples=[0.0]
+    )
+
+
 class ChatResponse(BaseModel):
     """
     Response model for chat endpoint.
@@ -157,6 +1267,9 @@ class ChatResponse(BaseModel):
         description="Echo back the session_id for confirmation",
         examples=["550e8400-e29b-41d4-a716-446655440000"],
     )
+    metadata: ChatMetadata | None = Field(
+        None, description="How the turn was served (source, tier, queue wait)"
+    )
     
     model_config = {
         "json_schema_extra": {
@@ -164,6 +1277,45 @@ class ChatResponse(BaseModel):
                 {
                     "response": "I'd be happy to help you with your account. What specific issue are you experiencing?",
                     "session_id": "550e8400-e29b-41d4-a716-446655440000",
+                    "metadata": {
+                        "source": "agent",
+                        "tier": "standard",
+                        "queue_wait_ms": 0.0,
+                    },
+                }
+            ]
+        }
+    }
+
+
+class BatchChatRequest(BaseModel):
+    """
+    Request model for the batch chat endpoint.
+
+    Carries many chat messages, typically for different sessions.
+    """
+
+    items: list[ChatRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=CHAT_BATCH_MAX_ITEMS,
+        description="Chat messages to process; messages for the same session run in order",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "items": [
+                        {
+                            "message": "I was charged twice this month",
+                            "session_id": "550e8400-e29b-41d4-a716-446655440000",
+                        },
+                        {
+                            "message": "Error 500 when I log in",
+                            "session_id": "123e4567-e89b-42d3-a456-426614174000",
+                        },
+                    ]
                 }
             ]
         }
@@ -214,19 +1366,94 @@ class ErrorResponse(BaseModel):
 @app.get("/health")
 async def health_check():
     """
-    Health check endpoint for monitoring and load balancers.
+    Health check endpoint for monitoring (liveness probe).
+
+    Answers as soon as the process is up, including while the startup
+    warm-up is still running; load balancers should route traffic by
+    GET /ready instead.
 
     Returns:
-        dict: Status information about the service
+        dict: Status information about the service, whether it is ready
+        for traffic ("ready", see GET /ready), plus agent executor
+        load, fair scheduler queues, rate limiter buckets, first-turn
+        coalescing, per-session lock, idempotency key, SSE replay buffer
+        and answer cache (exact and semantic) counters under "performance"
     """
     return {
         "status": "healthy",
         "service": "customer-service-ai",
         "version": "1.0.0",
         "environment": os.getenv("ENVIRONMENT", "development"),
+        "ready": readiness.ready,
+        "performance": {
+            "agent_executor": agent_executor.stats(),
+            "scheduler": scheduler.stats(),
+            "single_flight": first_turn_flight.stats(),
+            "session_locks": session_locks.stats(),
+            "idempotency": idempotency_store.stats(),
+            "stream_buffers": stream_buffers.stats(),
+            "rate_limiter": {"enabled": RATE_LIMIT_ENABLED, **rate_limiter.stats()},
+            "answer_cache": {
+                **answer_cache.stats(),
+                "knowledge_base_version": get_knowledge_base_version(),
+            },
+            "semantic_cache": {
+                "enabled": SEMANTIC_CACHE_ENABLED,
+                **semantic_cache.stats(),
+            },
+            "fast_path": {"enabled": FAST_PATH_ROUTING_ENABLED, **fast_path.stats()},
+            "handoff": {"enabled": WORKER_HANDOFF_ENABLED, **handoff.stats()},
+        },
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 200 once the instance is warm, 503 until then.
+
+    The instance is ready when every startup task has succeeded: agents
+    built, compliance documents loaded, each domain's Chroma collection
+    opened and, with STARTUP_WARMUP_QUERIES enabled, one warm-up search
+    per domain and one LLM call to the supervisor's model made (so
+    connection pools are open). Failed tasks are retried with backoff
+    (STARTUP_RETRY_INITIAL_SECONDS / STARTUP_RETRY_MAX_SECONDS).
+
+    Returns:
+        JSONResponse: {"ready": bool, "warming": bool, "startup_ms": float,
+        "tasks": {name: {"status": "pending" | "ok" | "failed" | "retrying",
+        "duration_ms": float, "error": str, "attempts": int}}}
+    """
+    report = readiness.status()
+    return JSONResponse(
+        report,
+        status_code=status.HTTP_200_OK
+        if report["ready"]
+        else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Metrics endpoint for Prometheus scraping.
+
+    Exposes, in the Prometheus text format:
+    - Request latency histograms for /chat (including batch items) and
+      /chat/stream, and time to first token for streamed agent runs
+    - Requests in flight per endpoint
+    - Turns by source (agent, coalesced, cache, semantic_cache, small_talk) and
+      supervisor runs by routed worker domain
+    - LLM provider errors by OpenAI exception class
+    - Sessions in the checkpointer, plus the executor, scheduler, rate
+      limiter, session lock and cache counters shown on /health
+
+    Returns:
+        PlainTextResponse: Exposition text (version 0.0.4)
+    """
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 # ============================================================================
 # Root Endpoint
 # ============================================================================
@@ -244,6 +1471,7 @@ async def root():
         "message": "Welcome to Advanced Customer Service AI",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
         "version": "1.0.0",
     }
 
@@ -252,16 +1480,51 @@ async def root():
 # Chat Endpoint - LangChain Agent Integration
 # ============================================================================
 
+# Runs whose request already got a 504 (referenced until they stop, so they
+# are not garbage-collected while still holding the session lock and slot)
+timed_out_turns: set[asyncio.Task] = set()
+
+
+def finish_timed_out_turn(task: asyncio.Task) -> None:
+    """Drop a timed-out run once it has stopped and log how it ended."""
+    timed_out_turns.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None and not isinstance(
+        error, (DeadlineExceededError, RunCancelledError)
+    ):
+        logger.error("Timed-out /chat run failed", exc_info=error)
+
 
 @app.post(
     "/chat",
     response_model=ChatResponse,
     responses={
-    400: {"model": ErrorResponse, "description": "Bad Request - Invalid input"},
-    500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        400: {"model": ErrorResponse, "description": "Bad Request - Invalid input"},
+        422: {
+            "model": ErrorResponse,
+            "description": "Unprocessable - Idempotency-Key already used for a different message",
+        },
+        429: {
+            "model": ErrorResponse,
+            "description": "Too Many Requests - rate limited (see Retry-After) or too many pending messages for the session",
+        },
+        500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        503: {
+            "model": ErrorResponse,
+            "description": "Service Busy - Retry after the Retry-After header",
+        },
     },
 )
-async def chat_endpoint(request: ChatRequest):
+async def chat_endpoint(
+    request: ChatRequest,
+    response: Response,
+    x_priority_tier: str | None = Header(None),
+    x_tenant_id: str | None = Header(None),
+    x_request_timeout: float | None = Header(None, gt=0),
+    idempotency_key: str | None = Header(None, min_length=1, max_length=255),
+):
     """
     Process user messages through the LangChain customer service agent.
     
@@ -273,13 +1536,32 @@ async def chat_endpoint(request: ChatRequest):
     
     Args:
         request: ChatRequest containing message and session_id
+        response: Outgoing response (carries the Server-Timing header)
+        x_priority_tier: X-Priority-Tier header (e.g. premium, standard,
+            free); unknown or missing tiers use SCHEDULER_DEFAULT_TIER
+        x_tenant_id: X-Tenant-ID header; tenants of one tier share its
+            slots fairly
+        x_request_timeout: X-Request-Timeout header, time budget in seconds
+            (the shorter of this and ``request.timeout_seconds`` applies)
+        idempotency_key: Idempotency-Key header. Retries of a request with
+            the same key (and message) within IDEMPOTENCY_TTL_SECONDS wait
+            for or replay the first request's answer, with source "replay"
+            and an ``Idempotent-Replayed: true`` header, instead of running
+            the agent again
         
     Returns:
         ChatResponse: AI assistant's response with session confirmation
+        and metadata (source, tier, queue wait)
         
     Raises:
         HTTPException 400: Invalid session ID format
+        HTTPException 422: Idempotency-Key already used for a different message
         HTTPException 500: Agent initialization error or LLM API error
+        HTTPException 429: Rate limited, or too many messages queued for
+            this session (see Retry-After)
+        HTTPException 503: Too many agent runs in flight (see Retry-After)
+        HTTPException 504: Deadline exceeded; the detail names the stage that
+            ran out of time and the progress made so far
         
     Example:
         Request:
@@ -297,7 +1579,15 @@ async def chat_endpoint(request: ChatRequest):
             "session_id": "550e8400-e29b-41d4-a716-446655440000"
         }
         ```
+
+        Headers:
+        ```
+        Server-Timing: supervisor;dur=812.4;desc="Supervisor LLM", worker;dur=1204.9;desc="Worker agents", ..., total;dur=2051.3;desc="Total"
+        ```
     """
+    requests_in_flight.inc("/chat")
+    request_started = time.perf_counter()
+    deadline = request_deadline(request.timeout_seconds, x_request_timeout)
     try:
         logger.info(f"Received chat request for session: {request.session_id}")
         logger.debug(f"Message: {request.message[:50]}...")  # Log first 50 chars
@@ -332,25 +1622,76 @@ async def chat_endpoint(request: ChatRequest):
         logger.info(f"Query: '{request.message}'")
 
         # Track routing decision by checking for tool calls in the result
+        # The blocking invoke runs on the agent executor so the event loop
+        # stays free for other requests while the LLM call is in flight
+        flow = scheduler.flow(x_priority_tier, x_tenant_id)
+
+        async def run_turn() -> TurnResult:
+            # Admission control before any LLM work (may wait briefly or
+            # raise); an idempotent replay skips it
+            await admit(request.session_id)
+            return await run_supervisor(agent, request.message, config, flow)
+
         start_time = time.time()
-        result = agent.invoke(
-            {"messages": [{"role": "user", "content": request.message}]}, config
-        )
+        # Per-stage timings (supervisor, worker, retrieval, embedding) are
+        # collected along the whole call chain for the Server-Timing header
+        with (
+            collect_timings() as timings,
+            deadline_scope(deadline),
+            routed_query_scope(),
+            retrieval_errors_scope(),
+        ):
+            turn_task = asyncio.ensure_future(
+                run_idempotent(
+                    request.session_id, idempotency_key, request.message, run_turn
+                )
+            )
+            try:
+                turn = await asyncio.wait_for(
+                    asyncio.shield(turn_task), timeout=max(deadline.remaining(), 0)
+                )
+            except TimeoutError:
+                # Ran out of time mid-call: answer now and stop the run. It
+                # keeps the session lock and executor slot until its pool
+                # thread has returned (until then it still writes this
+                # session's checkpoint, so a retry must not run alongside it)
+                error = deadline.error()
+                deadline.cancel("timeout")
+                timed_out_turns.add(turn_task)
+                turn_task.add_done_callback(finish_timed_out_turn)
+                raise deadline_error(error, request.session_id, timings)
+            except DeadlineExceededError as e:
+                raise deadline_error(e, request.session_id, timings)
+            except asyncio.CancelledError:
+                # The request itself was cancelled: stop the run too (it
+                # releases the lock and slot once its thread returns)
+                deadline.cancel("client_gone")
+                raise
+            timings.add("queue", turn.queue_wait)
         elapsed_time = time.time() - start_time
         
-        # Extract the agent's response from the result
         # The last message in the conversation is the agent's response
-        response_text = result["messages"][-1].content
+        response_text = turn.response
         
-        # Analyze routing: Check if any tool was called
-        tool_called = any(
-            msg.get("type") == "tool" or msg.get("role") == "tool"
-            for msg in result["messages"]
-        )
+        # Analyze routing: which worker tool (if any) the supervisor called
+        domain = routed_domain(turn.messages)
+        turns_served.inc(turn.source)
+        if turn.source == "agent":
+            supervisor_routes.inc(domain)
 
-        if tool_called:
+        if turn.source in ("cache", "semantic_cache"):
+            logger.info(
+                f"⚡ CACHED: Served first-turn answer from {turn.source.replace('_', ' ')} "
+                f"(session: {request.session_id}, time: {elapsed_time:.3f}s)"
+            )
+        elif turn.source == "small_talk":
+            logger.info(
+                f"💬 SMALL TALK: Answered from templates "
+                f"(session: {request.session_id}, time: {elapsed_time:.3f}s)"
+            )
+        elif domain != "direct":
             logger.info(
-                f"🔀 ROUTING: Query routed to worker agent "
+                f"🔀 ROUTING: Query routed to {domain} worker agent "
                 f"(session: {request.session_id}, time: {elapsed_time:.2f}s)"
             )
         else:
@@ -359,15 +1700,49 @@ async def chat_endpoint(request: ChatRequest):
                 f"(session: {request.session_id}, time: {elapsed_time:.2f}s)"
             )
 
+        if turn.source == "replay":
+            response.headers["Idempotent-Replayed"] = "true"
+
+        if turn.source == "coalesced":
+            logger.info(
+                f"🔗 COALESCED: Answer shared from an identical in-flight query "
+                f"(session: {request.session_id})"
+            )
+
         logger.info(f"Agent response generated for session: {request.session_id}")
         logger.debug(f"Response: {response_text[:50]}...")  # Log first 50 chars
         
+        response.headers["Server-Timing"] = timings.header()
+
         # Return the response with session confirmation
-        return ChatResponse(response=response_text, session_id=request.session_id)
+        return ChatResponse(
+            response=response_text,
+            session_id=request.session_id,
+            metadata=ChatMetadata(
+                source=turn.source,
+                tier=flow.tier,
+                queue_wait_ms=round(turn.queue_wait * 1000, 1),
+            ),
+        )
         
     except HTTPException:
         # Re-raise HTTPExceptions (validation errors, agent init errors)
         raise
+
+    except ExecutorSaturatedError as e:
+        # Too many agent runs in flight - shed load before any LLM work
+        raise saturated_error(e, request.session_id)
+
+    except KeyBusyError as e:
+        # Too many turns already queued behind this session's running turn
+        raise session_busy_error(e, request.session_id)
+
+    except IdempotencyKeyReusedError as e:
+        raise idempotency_error(e, request.session_id)
+
+    except RateLimitedError as e:
+        # Rejected by admission control - no LLM tokens spent
+        raise rate_limited_error(e, request.session_id)
     
     except ValidationError as e:
         # Handle Pydantic validation errors
@@ -384,6 +1759,7 @@ async def chat_endpoint(request: ChatRequest):
     except Exception as e:
         # OpenAI-specific error handling
         # Check error type and handle accordingly
+        record_llm_error(e)
         
         if OPENAI_AVAILABLE:
             if isinstance(e, AuthenticationError):
@@ -462,146 +1838,616 @@ async def chat_endpoint(request: ChatRequest):
             },
         )
 
+    finally:
+        requests_in_flight.dec("/chat")
+        request_latency.observe(time.perf_counter() - request_started, "/chat")
+
 
 # ============================================================================
 # Streaming Chat Endpoint (Phase 6: Real-time token streaming)
 # ============================================================================
 
 
+# SSE response settings shared by new and resumed streams
+SSE_RESPONSE_OPTIONS = {
+    "media_type": "text/event-stream",
+    "headers": {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",  # Disable nginx buffering
+    },
+}
+
+# stream_id -> agent run producing that stream (the reference also keeps
+# the task alive while no client is reading it)
+stream_producers: dict[str, asyncio.Task] = {}
+
+# Pending cancel_if_abandoned() checks (referenced so they are not
+# garbage-collected before the grace period ends)
+abandon_checks: set[asyncio.Task] = set()
+
+
+def finish_abandon_check(task: asyncio.Task) -> None:
+    """Drop a finished abandon check and log it if it failed."""
+    abandon_checks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Abandoned-stream check failed", exc_info=task.exception())
+
+
 @app.post("/chat/stream")
-async def chat_stream_endpoint(request: ChatRequest):
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    http_request: Request,
+    x_priority_tier: str | None = Header(None),
+    x_tenant_id: str | None = Header(None),
+    x_request_timeout: float | None = Header(None, gt=0),
+    last_event_id: str | None = Header(None),
+):
     """
     Stream AI responses in real-time using Server-Sent Events (SSE).
     
     This endpoint provides token-by-token streaming of the AI assistant's response,
-    enabling a more interactive user experience with immediate feedback.
+    enabling a more interactive user experience with immediate feedback. Tokens
+    come from LangGraph message streaming, so they are forwarded as the LLM
+    generates them (including tokens from the worker agents).
     
     Phase 6: Multi-Provider LLMs & Streaming
     
     Args:
         request: ChatRequest containing message and session_id
+        http_request: The HTTP request (to detect client disconnects)
+        x_priority_tier: X-Priority-Tier header (see POST /chat)
+        x_tenant_id: X-Tenant-ID header (see POST /chat)
+        x_request_timeout: X-Request-Timeout header (see POST /chat)
+        last_event_id: Last-Event-ID header; resumes an earlier stream of
+            the session after that event instead of starting a new turn
         
     Returns:
         StreamingResponse: SSE stream with agent response chunks
         
+    Raises:
+        HTTPException: 410 if the stream named by Last-Event-ID can no
+            longer be resumed (expired, trimmed or unknown)
+        
     Event Format:
-        Each SSE event is a JSON object:
+        Each SSE event is an "id:" line plus a JSON object on a single data
+        line, terminated by a blank line. Consecutive tokens may be
+        coalesced into one event:
         ```
-        data: {"type": "token", "content": "Hello", "session_id": "..."}
-        data: {"type": "token", "content": " world", "session_id": "..."}
-        data: {"type": "done", "session_id": "..."}
+        id: 3f2c9a41d7e84b0c9b5e6a1d2c3b4a59:2
+        data: {"type":"token","session_id":"...","content":"Hello"}
+
+        id: 3f2c9a41d7e84b0c9b5e6a1d2c3b4a59:3
+        data: {"type":"token","session_id":"...","content":" world"}
+
+        id: 3f2c9a41d7e84b0c9b5e6a1d2c3b4a59:4
+        data: {"type":"done","session_id":"...","ttft":0.42,"time":1.3,"queue_wait":0.0,"tokens":2,"worker_tokens":0,"frames":2}
         ```
         
     Event Types:
-        - "start": Stream initialization
-        - "token": Individual response token/chunk
-        - "done": Stream completion
-        - "error": Error occurred during streaming
+        - "start": Stream initialization (carries "stream_id")
+        - "token": LLM token of the answer, forwarded as it is generated
+        - "worker_token": LLM token generated by a worker agent (carries "agent")
+        - "done": Stream completion with token/frame counts,
+          time-to-first-token ("ttft", seconds), total time, time spent
+          waiting for an agent run slot ("queue_wait", seconds), whether
+          the answer was served from the first-turn answer cache ("cached"),
+          and a per-stage breakdown in milliseconds ("timings": supervisor,
+          worker, worker_llm, retrieval, embedding, queue, total; the same
+          stages as the Server-Timing header of POST /chat)
+        - "error": Error occurred during streaming; a deadline timeout
+          carries "stage" and "progress" like the 504 of POST /chat
+        - Progress (STREAM_PROGRESS_EVENTS), each with "elapsed_ms" since
+          the turn started: "routing" (supervisor deciding), "worker_started"
+          ("worker" domain), "retrieval_done" ("domain", "retrieval_ms") and
+          "generating" ("agent" that started writing text)
+
+        While no event is due, a ": heartbeat" comment line is sent every
+        SSE_HEARTBEAT_SECONDS so proxies do not close the idle connection.
+
+    Resuming:
+        The agent run is not tied to the connection (nor slowed down by a
+        slow client; see SSE_SLOW_CONSUMER_POLICY). A client that loses
+        it sends the same request again with the ID of the last event it
+        received in Last-Event-ID and gets the following events: first
+        those already produced, then live ones while the run continues.
+        Finished streams can be resumed for SSE_REPLAY_TTL_SECONDS.
+
+        If no client is reading the stream for STREAM_RESUME_GRACE_SECONDS
+        after a disconnect, the agent run is cancelled (worker tool calls
+        included) at its next LLM call or token, and counted in the
+        customer_service_cancelled_total metric.
         
     Example:
         ```bash
         curl -X POST http://localhost:8000/chat/stream \\
           -H "Content-Type: application/json" \\
           -d '{"message": "Hello", "session_id": "550e8400-e29b-41d4-a716-446655440000"}'
+
+        # Resume after a dropped connection
+        curl -X POST http://localhost:8000/chat/stream \\
+          -H "Content-Type: application/json" \\
+          -H "Last-Event-ID: 3f2c9a41d7e84b0c9b5e6a1d2c3b4a59:3" \\
+          -d '{"message": "Hello", "session_id": "550e8400-e29b-41d4-a716-446655440000"}'
         ```
     """
     
-    async def generate_stream():
+    async def produce_stream(buffer: ReplayBuffer):
         """
-        Generate SSE stream of agent responses.
+        Run the agent turn and append its SSE events to the replay buffer.
         
-        Yields SSE-formatted events with token chunks and metadata.
+        Token events are coalesced into frames (see SSE_FLUSH_INTERVAL_MS /
+        SSE_FLUSH_BYTES) to cut per-token writes when many streams are open.
         """
+        writer = SSEWriter(request.session_id)
+        requests_in_flight.inc("/chat/stream")
+        request_started = time.perf_counter()
         try:
             logger.info(f"Starting streaming chat for session: {request.session_id}")
             logger.debug(f"Message: {request.message[:50]}...")
             
             # Send start event
-            yield f"data: {json.dumps({'type': 'start', 'session_id': request.session_id})}\\n\\n"
+            buffer.append(writer.event("start", stream_id=buffer.stream_id))
             
             # Get supervisor agent
             try:
                 agent = get_supervisor()
             except RuntimeError as e:
                 logger.error(f"Agent not initialized: {e}")
-                yield f"data: {json.dumps({'type': 'error', 'error': 'Service configuration error', 'detail': str(e), 'session_id': request.session_id})}\\n\\n"
+                buffer.append(writer.event("error", error="Service configuration error", detail=str(e)))
                 return
             
             # Create configuration with thread_id for conversation memory
             config = {"configurable": {"thread_id": request.session_id}}
             
-            # Invoke agent with streaming
-            # Note: LangGraph agents support streaming via astream()
-            logger.info(f"Invoking streaming agent for session: {request.session_id}")
-            start_time = time.time()
-            
-            full_response = ""
-            token_count = 0
-            
-            try:
-                # Stream agent responses
-                async for event in agent.astream(
-                    {"messages": [{"role": "user", "content": request.message}]},
-                    config
-                ):
-                    # Extract content from agent events
-                    # LangGraph streams events as dictionaries with message updates
-                    if "messages" in event:
-                        # Get the latest message
-                        messages = event["messages"]
-                        if messages and len(messages) > 0:
-                            latest_message = messages[-1]
-                            
-                            # Check if it's an assistant message
-                            if hasattr(latest_message, "content") and hasattr(latest_message, "type"):
-                                if latest_message.type == "ai" or getattr(latest_message, "role", None) == "assistant":
-                                    content = latest_message.content
-                                    
-                                    # Send the new content (delta from previous)
-                                    if content and content != full_response:
-                                        delta = content[len(full_response):]
-                                        if delta:
-                                            full_response = content
-                                            token_count += 1
-                                            
-                                            # Send token event
-                                            yield f"data: {json.dumps({'type': 'token', 'content': delta, 'session_id': request.session_id})}\\n\\n"
-                                            
-                                            # Small delay to prevent overwhelming the client
-                                            await asyncio.sleep(0.01)
-            
-            except Exception as stream_error:
-                logger.error(f"Streaming error: {stream_error}", exc_info=True)
-                yield f"data: {json.dumps({'type': 'error', 'error': str(stream_error), 'session_id': request.session_id})}\\n\\n"
-                return
+            flow = scheduler.flow(x_priority_tier, x_tenant_id)
+            async for event in stream_turn(
+                agent, request.message, config, flow, deadline
+            ):
+                if event.type == "token":
+                    buffer.append(
+                        writer.token(event.content), token=(None, event.content)
+                    )
+                elif event.type == "worker_token":
+                    buffer.append(
+                        writer.worker_token(event.content, event.agent),
+                        token=(event.agent, event.content),
+                    )
+                else:
+                    buffer.append(writer.event(event.type, **event.fields))
             
-            elapsed_time = time.time() - start_time
+        except asyncio.CancelledError:
             logger.info(
-                f"Streaming completed for session: {request.session_id} "
-                f"({token_count} chunks, {elapsed_time:.2f}s)"
+                f"Stream abandoned, agent run cancelled for session: {request.session_id}"
             )
-            
-            # Send completion event
-            yield f"data: {json.dumps({'type': 'done', 'session_id': request.session_id, 'tokens': token_count, 'time': elapsed_time})}\\n\\n"
+            runs_cancelled.inc("/chat/stream")
+            raise
             
         except ValidationError as e:
             logger.warning(f"Validation error: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'error': 'Invalid request format', 'detail': str(e), 'session_id': request.session_id})}\\n\\n"
+            buffer.append(
+                writer.event("error", error="Invalid request format", detail=str(e))
+            )
             
         except Exception as e:
             logger.error(f"Unexpected streaming error: {e}", exc_info=True)
-            yield f"data: {json.dumps({'type': 'error', 'error': 'Unexpected error', 'detail': str(e), 'session_id': request.session_id})}\\n\\n"
+            buffer.append(
+                writer.event("error", error="Unexpected error", detail=str(e))
+            )
     
-    # Return StreamingResponse with SSE headers
-    return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        finally:
+            buffer.close()
+            requests_in_flight.dec("/chat/stream")
+            request_latency.observe(
+                time.perf_counter() - request_started, "/chat/stream"
+            )
+
+    async def follow_stream(buffer: ReplayBuffer, after: int):
+        """
+        Yield the buffered and live events after ``after`` until the stream ends or the client leaves.
+
+        A client more than SSE_CONSUMER_MAX_LAG_BYTES behind the agent run
+        gets merged token frames or is dropped (SSE_SLOW_CONSUMER_POLICY).
+        While no event arrives, a heartbeat comment is sent every
+        SSE_HEARTBEAT_SECONDS.
+        """
+        writer = SSEWriter(request.session_id)
+
+        def merge_tokens(agent: str | None, text: str) -> bytes:
+            return (
+                writer.token(text)
+                if agent is None
+                else writer.worker_token(text, agent)
+            )
+
+        disconnected = asyncio.Event()
+        # Servers that do not cancel the response on disconnect only notice
+        # it on the next write, which may be a long worker call away
+        watcher = asyncio.create_task(watch_disconnect(buffer, disconnected))
+        try:
+            async for frame in buffer.follow(
+                after,
+                stop=disconnected,
+                max_lag=SSE_CONSUMER_MAX_LAG_BYTES,
+                merge=merge_tokens if SSE_SLOW_CONSUMER_POLICY == "coalesce" else None,
+                heartbeat=SSE_HEARTBEAT_SECONDS or None,
+            ):
+                yield frame
+        except SlowConsumerError as e:
+            logger.warning(
+                f"Dropping slow SSE client: {e} (session: {request.session_id})"
+            )
+            yield writer.event(
+                "error",
+                error="Stream dropped",
+                detail="The client is reading too slowly. Resume with Last-Event-ID.",
+            )
+        except ReplayGapError as e:
+            # This reader fell behind the per-stream cap
+            logger.warning(f"{e} (session: {request.session_id})")
+        finally:
+            watcher.cancel()
+            stream_consumer_lag.observe(buffer.max_lag)
+            if not buffer.closed and buffer.readers == 0:
+                check = asyncio.create_task(cancel_if_abandoned(buffer))
+                abandon_checks.add(check)
+                check.add_done_callback(finish_abandon_check)
+
+    async def watch_disconnect(buffer: ReplayBuffer, disconnected: asyncio.Event):
+        """Stop following the stream once the client has disconnected."""
+        while not await http_request.is_disconnected():
+            await asyncio.sleep(STREAM_DISCONNECT_POLL_SECONDS)
+        disconnected.set()
+        buffer.wake()
+
+    async def cancel_if_abandoned(buffer: ReplayBuffer):
+        """Cancel the agent run unless a client resumes the stream within the grace period."""
+        await asyncio.sleep(STREAM_RESUME_GRACE_SECONDS)
+        producer = stream_producers.get(buffer.stream_id)
+        if buffer.readers == 0 and producer is not None and not producer.done():
+            producer.cancel()
+
+    if last_event_id:
+        # Resume: no new agent run, so no admission or capacity check
+        try:
+            stream_id, after = parse_event_id(last_event_id)
+        except ValueError:
+            raise stream_expired_error(last_event_id, request.session_id)
+        buffer = stream_buffers.resume(stream_id, request.session_id, after)
+        if buffer is None:
+            raise stream_expired_error(last_event_id, request.session_id)
+        logger.info(
+            f"Resuming stream {stream_id} after event {after} for session: {request.session_id}"
+        )
+        return StreamingResponse(follow_stream(buffer, after), **SSE_RESPONSE_OPTIONS)
+
+    # The deadline covers admission and queueing too
+    deadline = request_deadline(request.timeout_seconds, x_request_timeout)
+
+    # Reject up front when rate limited or saturated so the client gets a
+    # real 429/503 status (once streaming starts the status code is
+    # already committed)
+    try:
+        await admit(request.session_id)
+    except RateLimitedError as e:
+        raise rate_limited_error(e, request.session_id)
+
+    try:
+        agent_executor.check_capacity()
+    except ExecutorSaturatedError as e:
+        raise saturated_error(e, request.session_id)
+
+    # The run outlives the connection so a reconnect can pick it up
+    buffer = stream_buffers.create(request.session_id)
+    producer = asyncio.create_task(produce_stream(buffer))
+    stream_producers[buffer.stream_id] = producer
+    producer.add_done_callback(lambda _: stream_producers.pop(buffer.stream_id, None))
+
+    return StreamingResponse(follow_stream(buffer, 0), **SSE_RESPONSE_OPTIONS)
+
+
+# ============================================================================
+# Batch Chat Endpoint (many sessions per request, NDJSON results)
+# ============================================================================
+
+
+def batch_item_result(index: int, request: ChatRequest, outcome, error) -> dict:
+    """
+    Convert one /chat/batch item outcome into its NDJSON record.
+
+    Args:
+        index: Position of the item in the batch
+        request: The item's ChatRequest
+        outcome: ChatResponse on success
+        error: Exception raised by chat_endpoint, if any
+
+    Returns:
+        dict: {"index", "status", "session_id", ...} with either "response"
+        or the error fields of ErrorResponse (plus "retry_after" for 503s)
+    """
+    record = {"index": index, "session_id": request.session_id}
+    if error is None:
+        record.update(status=200, response=outcome.response)
+        if outcome.metadata is not None:
+            record["metadata"] = outcome.metadata.model_dump()
+        return record
+
+    if isinstance(error, HTTPException):
+        record["status"] = error.status_code
+        if isinstance(error.detail, dict):
+            record.update(error.detail)
+        else:
+            record["error"] = str(error.detail)
+        retry_after = (error.headers or {}).get("Retry-After")
+        if retry_after is not None:
+            record["retry_after"] = int(retry_after)
+        return record
+
+    logger.error(f"Unexpected error in batch item {index}: {error}", exc_info=error)
+    return {
+        **record,
+        "status": 500,
+        "error": "Failed to process your message",
+        "detail": "An unexpected error occurred. Please try again in a moment.",
+    }
+
+
+@app.post(
+    "/chat/batch",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One JSON object per line, in completion order",
         },
+        422: {"description": "Validation Error - invalid item or too many items"},
+    },
+)
+async def chat_batch_endpoint(
+    request: BatchChatRequest,
+    x_priority_tier: str | None = Header(None),
+    x_tenant_id: str | None = Header(None),
+    x_request_timeout: float | None = Header(None, gt=0),
+):
+    """
+    Process many chat messages in one request, streaming results as NDJSON.
+
+    Items run concurrently (at most CHAT_BATCH_CONCURRENCY at a time per
+    batch), except that items for the same session run one after another
+    in the order given, so each turn sees the previous one. Each item goes
+    through the same path as POST /chat (caches, coalescing, agent
+    executor), and its result is written as soon as it completes.
+
+    Args:
+        request: BatchChatRequest with the list of ChatRequest items
+        x_priority_tier: X-Priority-Tier header, applied to every item
+        x_tenant_id: X-Tenant-ID header, applied to every item
+        x_request_timeout: X-Request-Timeout header, time budget of each item
+
+    Returns:
+        StreamingResponse: NDJSON stream, one line per item
+
+    Line Format:
+        ```
+        {"index": 1, "session_id": "...", "status": 200, "response": "...", "metadata": {...}}
+        {"index": 0, "session_id": "...", "status": 503, "error": "Service busy", "detail": "...", "retry_after": 2}
+        ```
+        "index" is the item's position in the request; "status" is the HTTP
+        status POST /chat would have returned for it.
+    """
+    items = request.items
+    logger.info(
+        f"Received batch of {len(items)} messages "
+        f"({len({item.session_id for item in items})} sessions)"
+    )
+
+    async def generate_results():
+        start_time = time.time()
+        failed = 0
+
+        async def run_item(item: ChatRequest) -> ChatResponse:
+            return await chat_endpoint(
+                item,
+                Response(),
+                x_priority_tier=x_priority_tier,
+                x_tenant_id=x_tenant_id,
+                x_request_timeout=x_request_timeout,
+                idempotency_key=None,
+            )
+
+        async for done in run_keyed_batch(
+            items, lambda item: item.session_id, run_item, CHAT_BATCH_CONCURRENCY
+        ):
+            record = batch_item_result(
+                done.index, items[done.index], done.result, done.error
+            )
+            failed += record["status"] != 200
+            yield (json.dumps(record, ensure_ascii=False) + "\n").encode()
+
+        logger.info(
+            f"Batch completed: {len(items)} messages, {failed} failed "
+            f"({time.time() - start_time:.2f}s)"
+        )
+
+    return StreamingResponse(
+        generate_results(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================================
+# WebSocket Chat Endpoint (long-lived conversations over one connection)
+# ============================================================================
+
+
+def ws_event(event_type: str, **fields) -> str:
+    """Encode a WebSocket chat event as compact JSON text."""
+    return json.dumps(
+        {"type": event_type, **fields}, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+@app.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket, session_id: str = ""):
+    """
+    Chat over a WebSocket: many turns, streamed tokens, one connection.
+
+    Intended for long-running conversations (e.g. support agents' consoles)
+    where a full HTTP request per turn is wasted work. The session ID is
+    validated once when the socket opens; each turn then goes through the
+    same streaming path as POST /chat/stream (answer caches, token
+    coalescing, agent executor limits).
+
+    Connect:
+        ws://localhost:8000/ws/chat?session_id=<uuid4>
+
+    Client Messages (JSON text):
+        - {"type": "message", "content": "..."}: start a turn (one at a time)
+        - {"type": "cancel"}: stop the turn in progress
+
+    Server Events (JSON text):
+        - "ready": Connection accepted ("session_id")
+        - "start": Turn started ("turn" number)
+        - "token" / "worker_token": Same as the SSE events
+        - "done": Turn completed ("turn" plus the SSE "done" fields)
+        - "cancelled": Turn stopped at the client's request. The user
+          message stays in the conversation history
+        - "error": Invalid message or failed turn; the connection stays open
+
+    The X-Priority-Tier and X-Tenant-ID headers of the upgrade request
+    select the scheduling tier for every turn (see POST /chat).
+
+    Invalid session IDs are rejected with close code 1008 (policy violation).
+    """
+    await websocket.accept()
+
+    try:
+        session_id = validate_session_id(session_id)
+    except ValueError as e:
+        await websocket.send_text(
+            ws_event("error", error="Invalid session", detail=str(e))
+        )
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        agent = get_supervisor()
+    except RuntimeError as e:
+        logger.error(f"Agent not initialized: {e}")
+        await websocket.send_text(
+            ws_event("error", error="Service configuration error", detail=str(e))
+        )
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    config = {"configurable": {"thread_id": session_id}}
+    flow = scheduler.flow(
+        websocket.headers.get("x-priority-tier"), websocket.headers.get("x-tenant-id")
     )
+    logger.info(f"WebSocket chat opened for session: {session_id}")
+    await websocket.send_text(ws_event("ready", session_id=session_id))
+
+    async def run_turn(turn: int, message: str) -> None:
+        deadline = request_deadline()
+        try:
+            try:
+                await admit(session_id)
+            except RateLimitedError as e:
+                await websocket.send_text(
+                    ws_event(
+                        "error",
+                        turn=turn,
+                        error="Too many requests",
+                        detail=str(e),
+                        retry_after=float(e.retry_after_header),
+                    )
+                )
+                return
+            await websocket.send_text(ws_event("start", turn=turn))
+            async for event in stream_turn(agent, message, config, flow, deadline):
+                if event.type == "token":
+                    await websocket.send_text(ws_event("token", content=event.content))
+                elif event.type == "worker_token":
+                    await websocket.send_text(
+                        ws_event(
+                            "worker_token", content=event.content, agent=event.agent
+                        )
+                    )
+                else:
+                    await websocket.send_text(
+                        ws_event(event.type, turn=turn, **event.fields)
+                    )
+        except Exception as e:  # noqa: BLE001 - the turn is logged as aborted
+            # Usually the socket closed mid-turn; nothing left to report to
+            logger.warning(
+                f"WebSocket turn {turn} aborted for session {session_id}: {e}"
+            )
+        finally:
+            if deadline.cancelled:
+                runs_cancelled.inc("/ws/chat")
+
+    turn_task: asyncio.Task | None = None
+    turns = 0
+    try:
+        while True:
+            try:
+                data = json.loads(await websocket.receive_text())
+                kind = data.get("type") if isinstance(data, dict) else None
+            except json.JSONDecodeError:
+                kind = None
+
+            busy = turn_task is not None and not turn_task.done()
+
+            if kind == "message":
+                content = data.get("content")
+                if (
+                    not isinstance(content, str)
+                    or not 1 <= len(content) <= MAX_MESSAGE_LENGTH
+                ):
+                    await websocket.send_text(
+                        ws_event(
+                            "error",
+                            error="Invalid message",
+                            detail=f"content must be a string of 1 to {MAX_MESSAGE_LENGTH} characters",
+                        )
+                    )
+                elif busy:
+                    await websocket.send_text(
+                        ws_event(
+                            "error",
+                            error="Turn in progress",
+                            detail="Wait for the current response to finish or send a cancel",
+                        )
+                    )
+                else:
+                    turns += 1
+                    turn_task = asyncio.create_task(run_turn(turns, content))
+
+            elif kind == "cancel":
+                if busy:
+                    turn_task.cancel()
+                    await asyncio.gather(turn_task, return_exceptions=True)
+                    logger.info(
+                        f"WebSocket turn {turns} cancelled for session: {session_id}"
+                    )
+                    await websocket.send_text(ws_event("cancelled", turn=turns))
+
+            else:
+                await websocket.send_text(
+                    ws_event(
+                        "error",
+                        error="Invalid message",
+                        detail='Expected {"type": "message", "content": ...} or {"type": "cancel"}',
+                    )
+                )
+
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket chat closed for session: {session_id} ({turns} turns)")
+
+    finally:
+        if turn_task is not None and not turn_task.done():
+            turn_task.cancel()
+            await asyncio.gather(turn_task, return_exceptions=True)
 
 
 # ============================================================================
@@ -609,13 +2455,77 @@ async def chat_stream_endpoint(request: ChatRequest):
 # ============================================================================
 
 
-@app.on_event("startup")
+def check_agents() -> list[str]:
+    """Startup task: the supervisor and every worker agent are built."""
+    agents = [
+        get_supervisor(),
+        get_technical_agent(),
+        get_billing_agent(),
+        get_compliance_agent(),
+        get_general_info_agent(),
+    ]
+    return [agent.name for agent in agents]
+
+
+def check_compliance_context() -> int:
+    """Startup task: the compliance documents (Pure CAG context) loaded."""
+    if COMPLIANCE_CONTEXT == COMPLIANCE_UNAVAILABLE:
+        raise RuntimeError(COMPLIANCE_UNAVAILABLE)
+    return len(COMPLIANCE_CONTEXT)
+
+
+def warm_up_llm() -> str:
+    """Startup task: one minimal call to the supervisor's model (AWS Nova
+    Lite, or the OpenAI fallback), which opens its HTTP connection pool."""
+    from langchain.chat_models import init_chat_model
+
+    model = get_supervisor_model()
+    init_chat_model(model, max_tokens=1).invoke("ping")
+    return model
+
+
+def startup_tasks() -> dict:
+    """
+    Blocking startup tasks, run concurrently by readiness.run().
+
+    Returns:
+        dict: Task name -> callable (one vector store task per domain)
+    """
+    tasks = {
+        "agents": check_agents,
+        "compliance_context": check_compliance_context,
+    }
+    for domain in DOMAINS:
+        query = WARMUP_QUERIES[domain] if STARTUP_WARMUP_QUERIES else None
+        tasks[f"vectorstore:{domain}"] = lambda domain=domain, query=query: (
+            warm_vectorstore(domain, query)
+        )
+    if STARTUP_WARMUP_QUERIES:
+        tasks["llm"] = warm_up_llm
+    return tasks
+
+
+async def warm_up() -> None:
+    """Run the startup tasks (retrying failures); the instance turns ready
+    when all have succeeded."""
+    logger.info("Warming up (agents, vector stores, connection pools)...")
+    await readiness.run(
+        startup_tasks(),
+        timeout=STARTUP_TASK_TIMEOUT_SECONDS,
+        retry_initial_seconds=STARTUP_RETRY_INITIAL_SECONDS or None,
+        retry_max_seconds=STARTUP_RETRY_MAX_SECONDS,
+    )
+
+
 async def startup_event():
     """
-    Execute tasks on application startup.
+    Execute tasks on application startup (called by the lifespan).
     
     Validates required configuration and initializes the LangChain agent.
     The application will fail to start if critical configuration is missing.
+    The warm-up (opening vector stores, warm-up queries) then runs in the
+    background: /health answers right away and /ready turns 200 once it
+    has finished.
     """
     logger.info("=" * 70)
     logger.info("Starting Advanced Customer Service AI backend...")
@@ -737,15 +2647,26 @@ async def startup_event():
     logger.info("=" * 70)
     logger.info(f"API Documentation: http://localhost:{os.getenv('PORT', 8000)}/docs")
     logger.info(f"Health Check: http://localhost:{os.getenv('PORT', 8000)}/health")
+    logger.info(f"Readiness: http://localhost:{os.getenv('PORT', '8000')}/ready")
     logger.info(f"Chat Endpoint: POST http://localhost:{os.getenv('PORT', 8000)}/chat")
     logger.info("=" * 70)
     logger.info("")
 
+    global warmup_task
+    warmup_task = asyncio.create_task(warm_up())
+
 
-@app.on_event("shutdown")
 async def shutdown_event():
-    """Execute cleanup tasks on application shutdown."""
+    """Execute cleanup tasks on application shutdown (called by the lifespan)."""
     logger.info("Shutting down Advanced Customer Service AI backend...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    for producer in list(stream_producers.values()):
+        producer.cancel()
+    for check in list(abandon_checks):
+        check.cancel()
+    agent_executor.shutdown()
 
 
 # ============================================================================
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Concurrent /chat Throughput Benchmark.
+
+Fires N concurrent /chat requests at the FastAPI app (in-process, via
+httpx's ASGI transport) with a fake supervisor whose invoke() blocks for a
+fixed "LLM latency". Compares two modes:
+
+- blocking: agent.invoke() called directly on the event loop (old behaviour)
+- executor: agent.invoke() run on the bounded agent executor (current)
+
+While the load runs, /health is polled to show event-loop responsiveness.
+Every request is a first turn in its own session with a distinct,
+non-small-talk message, so none of them is answered from a template,
+coalesced or served from the answer cache. Rate limiting is turned off so
+only the executor is measured. Exits with status 1 if any request fails.
+
+Usage:
+    python scripts/benchmark_chat_concurrency.py
+    python scripts/benchmark_chat_concurrency.py --requests 64 --latency 0.5
+
+No API keys or network access are required.
+
+Last Updated: October 17, 2026
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The app builds agents at import time; a placeholder key keeps that offline
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from langchain_core.messages import AIMessage, HumanMessage
+
+import main
+
+
+class FakeSupervisor:
+    """
+    Supervisor stand-in whose invoke() blocks like a real LLM call.
+
+    Keeps per-thread messages so the endpoint's history checks
+    (get_state) and recorded turns (update_state) work as with a real agent.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.threads: dict[str, list] = {}
+
+    def invoke(self, inputs, config):
+        time.sleep(self.latency)
+        messages = [
+            HumanMessage(content=inputs["messages"][-1]["content"]),
+            AIMessage(content="Benchmark response"),
+        ]
+        self.threads.setdefault(config["configurable"]["thread_id"], []).extend(
+            messages
+        )
+        return {"messages": messages}
+
+    def get_state(self, config):
+        return SimpleNamespace(
+            values={
+                "messages": list(
+                    self.threads.get(config["configurable"]["thread_id"], [])
+                )
+            }
+        )
+
+    def update_state(self, config, values, as_node=None):
+        self.threads.setdefault(config["configurable"]["thread_id"], []).extend(
+            values["messages"]
+        )
+
+
+async def blocking_run(fn, *args, **kwargs):
+    """Reproduce the pre-executor behaviour: call invoke() on the loop."""
+    return fn(*args, **kwargs)
+
+
+async def run_load(requests: int, health_polls: int, label: str) -> dict:
+    """
+    Send concurrent /chat requests while polling /health.
+
+    Args:
+        requests: Concurrent /chat requests
+        health_polls: /health probes during the load
+        label: Mode name, part of every message so runs never share cache entries
+
+    Returns:
+        dict: Wall time, throughput and health-check latency percentiles
+    """
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def chat(i: int):
+            response = await client.post(
+                "/chat",
+                json={
+                    "message": f"Why does {label} request {i} fail with error 500?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+            return response.status_code
+
+        async def health():
+            # Probes run on a fixed schedule; latency is measured from the
+            # scheduled time, so a blocked event loop shows up as delay
+            latencies = []
+            interval = 0.02
+            scheduled = time.perf_counter()
+            for _ in range(health_polls):
+                scheduled += interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/health")
+                latencies.append(time.perf_counter() - scheduled)
+            return latencies
+
+        started = time.perf_counter()
+        health_task = asyncio.create_task(health())
+        statuses = await asyncio.gather(*(chat(i) for i in range(requests)))
+        wall = time.perf_counter() - started
+        health_latencies = await health_task
+
+    return {
+        "wall": wall,
+        "throughput": requests / wall,
+        "ok": sum(1 for s in statuses if s == 200),
+        "rejected": sum(1 for s in statuses if s == 503),
+        "health_p50": statistics.median(health_latencies),
+        "health_max": max(health_latencies),
+    }
+
+
+def print_result(label: str, result: dict) -> None:
+    print(
+        f"{label:<10} wall={result['wall']:6.2f}s  "
+        f"throughput={result['throughput']:7.2f} req/s  "
+        f"ok={result['ok']:<4} 503={result['rejected']:<4} "
+        f"/health p50={result['health_p50'] * 1000:7.1f}ms "
+        f"max={result['health_max'] * 1000:7.1f}ms"
+    )
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark concurrent /chat throughput"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=32, help="Concurrent /chat requests"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.25, help="Fake LLM latency (seconds)"
+    )
+    parser.add_argument(
+        "--health-polls", type=int, default=10, help="/health probes during load"
+    )
+    args = parser.parse_args()
+
+    fake = FakeSupervisor(args.latency)
+    print(
+        f"{args.requests} concurrent /chat requests, {args.latency:.2f}s fake LLM latency, "
+        f"executor workers={main.agent_executor.max_workers} "
+        f"in-flight limit={main.agent_executor.max_in_flight}"
+    )
+    print()
+
+    with patch.object(main, "get_supervisor", return_value=fake):
+        with patch.object(main.agent_executor, "call", blocking_run):
+            before = asyncio.run(run_load(args.requests, args.health_polls, "blocking"))
+        after = asyncio.run(run_load(args.requests, args.health_polls, "executor"))
+
+    print_result("blocking", before)
+    print_result("executor", after)
+    print()
+    if before["ok"] < args.requests or after["ok"] < args.requests:
+        print(f"FAILED: not every request succeeded (expected ok={args.requests})")
+        sys.exit(1)
+    print(f"Speed-up: {after['throughput'] / before['throughput']:.1f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Worker Handoff Benchmark.
+
+Streams routed turns through a supervisor built with create_agent (the
+same graph, tools and WorkerHandoffMiddleware as production) whose LLM is
+simulated: each call waits a time-to-first-token, then emits tokens at a
+fixed rate. The routing call picks the billing worker; the final call (if
+it happens) re-emits the worker's answer, as the supervisor prompt asks.
+Compares two modes:
+
+- llm: the supervisor's final LLM call re-generates the answer
+  (WORKER_HANDOFF_ENABLED=false)
+- handoff: the worker's answer ends the turn verbatim (current default)
+
+Reports supervisor LLM calls and estimated input/output tokens per turn
+(~4 characters per token), and the time until the first answer token
+reaches the client and until the turn is done.
+
+Usage:
+    python scripts/benchmark_handoff.py
+    python scripts/benchmark_handoff.py --turns 10 --answer-words 300 --tokens-per-second 40
+
+No API keys or network access are required.
+
+Last Updated: October 17, 2026
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+from agents.handoff import WorkerHandoffMiddleware
+from agents.streaming import message_text, stream_agent_tokens
+
+# Roughly the size of the supervisor's system prompt and tool schemas
+SYSTEM_PROMPT = "You are a supervisor agent. " * 450
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token (English text, GPT-style tokenizers)."""
+    return max(1, len(text) // 4)
+
+
+class SimulatedLLM(BaseChatModel):
+    """Supervisor LLM with a fixed time-to-first-token and token rate."""
+
+    ttft: float
+    tokens_per_second: float
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "simulated"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "SimulatedLLM":
+        return self
+
+    def _reply(self, messages: list) -> AIMessage:
+        self.calls += 1
+        self.input_tokens += estimate_tokens(SYSTEM_PROMPT) + sum(
+            estimate_tokens(message_text(m)) for m in messages
+        )
+        if isinstance(messages[-1], ToolMessage):
+            # "Pass specialist responses directly": re-emit the answer
+            return AIMessage(content=message_text(messages[-1]))
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "billing_support_tool",
+                    "args": {"query": message_text(messages[-1])},
+                    "id": f"call_{uuid.uuid4().hex[:8]}",
+                }
+            ],
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        chunks = [
+            chunk.message
+            for chunk in self._stream(messages, stop, run_manager, **kwargs)
+        ]
+        message = sum(chunks[1:], chunks[0])
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(
+                        content=message.content, tool_calls=message.tool_calls
+                    )
+                )
+            ]
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._reply(messages)
+        time.sleep(self.ttft)
+        if message.tool_calls:
+            # A tool call is ~20 output tokens
+            self.output_tokens += 20
+            time.sleep(20 / self.tokens_per_second)
+            call = message.tool_calls[0]
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": 0,
+                        }
+                    ],
+                )
+            )
+            return
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            token = word if i == len(words) - 1 else word + " "
+            self.output_tokens += estimate_tokens(token)
+            time.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def build_supervisor(
+    handoff_enabled: bool, answer: str, worker_latency: float, llm: SimulatedLLM
+):
+    """Supervisor with a billing worker tool that answers after ``worker_latency``."""
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        time.sleep(worker_latency)
+        return answer
+
+    return create_agent(
+        model=llm,
+        tools=[billing_support_tool],
+        checkpointer=InMemorySaver(),
+        middleware=[
+            WorkerHandoffMiddleware({"billing_support_tool"}, enabled=handoff_enabled)
+        ],
+        name="supervisor_agent",
+    )
+
+
+async def run_turns(agent, turns: int) -> dict:
+    """
+    Stream ``turns`` routed turns, each in a new session.
+
+    Returns:
+        dict: Median time to the first answer token and to the end of the turn
+    """
+    first_token, total = [], []
+    for _ in range(turns):
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        inputs = {
+            "messages": [{"role": "user", "content": "When will my refund arrive?"}]
+        }
+        started = time.perf_counter()
+        first = None
+        async for chunk in stream_agent_tokens(
+            agent, inputs, config, include_workers=False
+        ):
+            if first is None and chunk.from_supervisor:
+                first = time.perf_counter() - started
+        total.append(time.perf_counter() - started)
+        first_token.append(first)
+    return {
+        "first_token": statistics.median(first_token),
+        "total": statistics.median(total),
+    }
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark worker handoff against the supervisor's final LLM call"
+    )
+    parser.add_argument("--turns", type=int, default=5, help="Routed turns per mode")
+    parser.add_argument(
+        "--answer-words", type=int, default=180, help="Length of the worker's answer"
+    )
+    parser.add_argument(
+        "--ttft",
+        type=float,
+        default=0.4,
+        help="Simulated time to first token (seconds)",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=80,
+        help="Simulated output token rate",
+    )
+    parser.add_argument(
+        "--worker-latency",
+        type=float,
+        default=2.0,
+        help="Simulated worker tool time (seconds)",
+    )
+    args = parser.parse_args()
+
+    answer = " ".join(f"word{i % 50}" for i in range(args.answer_words))
+    print(
+        f"{args.turns} routed turns per mode, {args.answer_words}-word worker answer, "
+        f"LLM ttft {args.ttft:.2f}s at {args.tokens_per_second:.0f} tokens/s, "
+        f"worker {args.worker_latency:.2f}s"
+    )
+    print()
+
+    results = {}
+    for label, enabled in (("llm", False), ("handoff", True)):
+        llm = SimulatedLLM(ttft=args.ttft, tokens_per_second=args.tokens_per_second)
+        agent = build_supervisor(enabled, answer, args.worker_latency, llm)
+        timings = asyncio.run(run_turns(agent, args.turns))
+        results[label] = {
+            **timings,
+            "calls": llm.calls / args.turns,
+            "input_tokens": llm.input_tokens / args.turns,
+            "output_tokens": llm.output_tokens / args.turns,
+        }
+        print(
+            f"{label:<8} supervisor calls/turn={results[label]['calls']:.1f}  "
+            f"input tokens/turn={results[label]['input_tokens']:7.0f}  "
+            f"output tokens/turn={results[label]['output_tokens']:5.0f}  "
+            f"first token p50={timings['first_token'] * 1000:7.0f}ms  "
+            f"turn p50={timings['total'] * 1000:7.0f}ms"
+        )
+
+    before, after = results["llm"], results["handoff"]
+    print()
+    print(
+        f"Saved per routed turn: {before['input_tokens'] - after['input_tokens']:.0f} input tokens, "
+        f"{before['output_tokens'] - after['output_tokens']:.0f} output tokens, "
+        f"{(before['first_token'] - after['first_token']) * 1000:.0f}ms to first answer token, "
+        f"{(before['total'] - after['total']) * 1000:.0f}ms per turn"
+    )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Fast-Path Router Benchmark.
+
+Runs the fast-path routers (rules, the trained intent classifier, and both
+chained like FAST_ROUTERS=rules,classifier) over a labelled query set and
+reports, per router:
+
+- coverage: share of worker-domain queries it routes (the rest cost a
+  supervisor LLM call as before)
+- accuracy: share of its routing decisions that pick the labelled domain
+- direct: "direct" queries (greetings, thanks) it recognized as such
+- false routes: "direct" queries it sent to a worker, worker queries it
+  would have answered directly, and "llm" queries (vague or follow-up
+  messages only the supervisor LLM can route) it routed at all
+- latency: p50/p95/p99 of one routing decision
+
+The default set is the routing regression set
+(data/routing/routing_examples.jsonl), which follows the supervisor
+prompt's routing matrix; data/routing/heldout_queries.jsonl is written
+apart from it and from the classifier's training queries.
+
+Usage:
+    python scripts/benchmark_router.py
+    python scripts/benchmark_router.py --examples data/routing/heldout_queries.jsonl
+    python scripts/benchmark_router.py --min-score 3 --min-margin 1.5 --repeat 1000
+    python scripts/benchmark_router.py --min-confidence 0.7
+    python scripts/benchmark_router.py --embedding --repeat 1
+
+No API keys or network access are required. With --embedding, the
+embedding router (domain centroids from scripts/build_domain_centroids.py)
+is measured too; it needs OPENAI_API_KEY and its latency includes the
+embedding call.
+
+Last Updated: October 17, 2026
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.embedding_router import DEFAULT_CENTROIDS_PATH, EmbeddingRouter
+from agents.intent_classifier import (
+    DEFAULT_MIN_CONFIDENCE,
+    DEFAULT_MODEL_PATH,
+    IntentClassifier,
+)
+from agents.routing import DIRECT_DOMAIN, RouteDecision, RuleRouter
+
+EXAMPLES_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "routing_examples.jsonl"
+)
+
+# Label of queries no fast router should route
+LLM_LABEL = "llm"
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    """p50/p95/p99 of latencies in seconds."""
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return statistics.median(ordered), pick(0.95), pick(0.99)
+
+
+def load_examples(path: Path) -> list[dict]:
+    """Labelled queries: {"query": ..., "domain": ...} per line."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ChainedRouter:
+    """Routers asked in order, like FastPathMiddleware does."""
+
+    def __init__(self, routers: list):
+        self.routers = routers
+        self.name = "+".join(router.name for router in routers)
+
+    def route(self, message: str) -> RouteDecision | None:
+        for router in self.routers:
+            decision = router.route(message)
+            if decision is not None:
+                return decision
+        return None
+
+
+def evaluate(router, examples: list[dict], repeat: int) -> None:
+    """Print coverage, accuracy and latency of ``router`` on ``examples``."""
+    routed = correct = direct = false_routes = 0
+    worker_queries = [
+        e for e in examples if e["domain"] not in (DIRECT_DOMAIN, LLM_LABEL)
+    ]
+    direct_queries = [e for e in examples if e["domain"] == DIRECT_DOMAIN]
+    misses = []
+    for example in examples:
+        decision = router.route(example["query"])
+        if decision is None:
+            continue
+        if example["domain"] == LLM_LABEL:
+            false_routes += 1
+            misses.append((example, decision.domain))
+            continue
+        if DIRECT_DOMAIN in (example["domain"], decision.domain):
+            if decision.domain == example["domain"]:
+                direct += 1
+            else:
+                false_routes += 1
+                misses.append((example, decision.domain))
+            continue
+        routed += 1
+        if decision.domain == example["domain"]:
+            correct += 1
+        else:
+            misses.append((example, decision.domain))
+
+    latencies = []
+    for _ in range(repeat):
+        for example in examples:
+            t0 = time.perf_counter()
+            router.route(example["query"])
+            latencies.append(time.perf_counter() - t0)
+    p50, p95, p99 = percentiles(latencies)
+
+    print(
+        f"{router.name:<17} coverage={routed}/{len(worker_queries)} "
+        f"({routed / max(len(worker_queries), 1):.0%})  "
+        f"accuracy={correct}/{routed} ({correct / max(routed, 1):.0%})  "
+        f"direct={direct}/{len(direct_queries)}  false_routes={false_routes}  "
+        f"route p50={p50 * 1e6:6.1f}us p95={p95 * 1e6:6.1f}us p99={p99 * 1e6:6.1f}us"
+    )
+    for example, domain in misses:
+        print(f"    {example['domain']:>10} -> {domain:<10} {example['query']}")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fast-path routers")
+    parser.add_argument(
+        "--examples", type=Path, default=EXAMPLES_PATH, help="Labelled JSONL queries"
+    )
+    parser.add_argument(
+        "--min-score", type=float, default=2.0, help="Rule router: minimum domain score"
+    )
+    parser.add_argument(
+        "--min-margin",
+        type=float,
+        default=1.0,
+        help="Rule router: minimum lead over the runner-up",
+    )
+    parser.add_argument(
+        "--model",
+        type=Path,
+        default=DEFAULT_MODEL_PATH,
+        help="Intent classifier artifact",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=DEFAULT_MIN_CONFIDENCE,
+        help="Classifier: probability needed to route",
+    )
+    parser.add_argument(
+        "--embedding", action="store_true", help="Also measure the embedding router"
+    )
+    parser.add_argument(
+        "--centroids",
+        type=Path,
+        default=DEFAULT_CENTROIDS_PATH,
+        help="Domain centroids artifact",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=200, help="Timed passes over the examples"
+    )
+    args = parser.parse_args()
+
+    if args.embedding and not args.centroids.exists():
+        parser.error(
+            f"{args.centroids} not found; build it with scripts/build_domain_centroids.py"
+        )
+
+    examples = load_examples(args.examples)
+    print(
+        f"{len(examples)} labelled queries from {args.examples}, {args.repeat} timed passes"
+    )
+    print()
+    rules = RuleRouter(min_score=args.min_score, min_margin=args.min_margin)
+    classifier = IntentClassifier.load(args.model, min_confidence=args.min_confidence)
+    for router in (rules, classifier, ChainedRouter([rules, classifier])):
+        evaluate(router, examples, args.repeat)
+
+    if args.embedding:
+        from dotenv import load_dotenv
+
+        load_dotenv(override=True)
+        from data.vectorstore import EMBEDDING_MODEL, embed_query, query_embeddings
+
+        embedding = EmbeddingRouter.load(
+            args.centroids, embed=embed_query, embedding_model=EMBEDDING_MODEL
+        )
+        # Measure real embedding calls, not the query embedding cache
+        embedding.embed = lambda text: (query_embeddings.clear(), embed_query(text))[1]
+        evaluate(embedding, examples, args.repeat)
+        evaluate(ChainedRouter([rules, classifier, embedding]), examples, args.repeat)
+
+
+if __name__ == "__main__":
+    main_cli()
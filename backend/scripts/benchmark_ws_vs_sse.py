@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Per-Turn Overhead Benchmark: WebSocket vs SSE.
+
+Starts the app on a local uvicorn server with an instant scripted
+supervisor (no LLM latency), then runs the same multi-turn conversation
+three ways and reports per-turn latency (send message -> "done" event):
+
+- sse-new:       POST /chat/stream with a new HTTP connection per turn
+- sse-keepalive: POST /chat/stream over one keep-alive HTTP connection
+- websocket:     /ws/chat, all turns over one socket
+
+Because the model answers instantly, the numbers are transport and
+per-request overhead (connection setup, CORS, validation, response
+setup), not LLM time.
+
+Usage:
+    python scripts/benchmark_ws_vs_sse.py
+    python scripts/benchmark_ws_vs_sse.py --turns 200
+
+No API keys or network access are required.
+
+Last Updated: October 17, 2026
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The app builds agents at import time; a placeholder key keeps that offline
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# The per-session rate limiter would throttle the conversation, and the
+# startup warm-up would make real LLM and vector store calls
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("STARTUP_WARMUP_QUERIES", "false")
+
+import httpx
+import uvicorn
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from websockets.sync.client import connect
+
+import main
+from tests.fake_models import ScriptedChatModel
+
+ANSWER = "Please clear your browser cache and sign in again."
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    """Run the app on a background uvicorn server."""
+    config = uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def sse_turn(client: httpx.Client, session_id: str, message: str) -> None:
+    with client.stream(
+        "POST", "/chat/stream", json={"message": message, "session_id": session_id}
+    ) as response:
+        for line in response.iter_lines():
+            if line.startswith("data: ") and json.loads(line[6:])["type"] == "done":
+                return
+
+
+def bench_sse(base_url: str, turns: int, keep_alive: bool) -> list[float]:
+    session_id = str(uuid.uuid4())
+    latencies = []
+    limits = httpx.Limits(max_keepalive_connections=1 if keep_alive else 0)
+    with httpx.Client(base_url=base_url, limits=limits) as client:
+        for turn in range(turns):
+            t0 = time.perf_counter()
+            sse_turn(client, session_id, f"Question {turn}")
+            latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def bench_websocket(port: int, turns: int) -> list[float]:
+    latencies = []
+    with connect(f"ws://127.0.0.1:{port}/ws/chat?session_id={uuid.uuid4()}") as ws:
+        ws.recv()  # ready
+        for turn in range(turns):
+            t0 = time.perf_counter()
+            ws.send(json.dumps({"type": "message", "content": f"Question {turn}"}))
+            while json.loads(ws.recv())["type"] != "done":
+                pass
+            latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> float:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(
+        f"{label:<14} per-turn p50={p50 * 1000:6.2f}ms  p95={p95 * 1000:6.2f}ms  mean={statistics.mean(ordered) * 1000:6.2f}ms"
+    )
+    return p50
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-turn overhead of /ws/chat and /chat/stream"
+    )
+    parser.add_argument("--turns", type=int, default=100, help="Turns per conversation")
+    args = parser.parse_args()
+
+    model = ScriptedChatModel(responses=[AIMessage(content=ANSWER)])
+    agent = create_agent(
+        model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+    )
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    with (
+        patch.object(main, "get_supervisor", return_value=agent),
+        patch.object(main, "ANSWER_CACHE_ENABLED", False),
+    ):
+        server = start_server(port)
+        try:
+            # Warm up both paths once
+            bench_sse(base_url, 3, keep_alive=True)
+            bench_websocket(port, 3)
+
+            print(f"{args.turns} turns per conversation, instant scripted model")
+            print()
+            sse_new = report(
+                "sse-new", bench_sse(base_url, args.turns, keep_alive=False)
+            )
+            sse_keep = report(
+                "sse-keepalive", bench_sse(base_url, args.turns, keep_alive=True)
+            )
+            ws = report("websocket", bench_websocket(port, args.turns))
+        finally:
+            server.should_exit = True
+
+    print()
+    print(
+        f"WebSocket saves {(sse_new - ws) * 1000:.2f}ms/turn vs new connections, "
+        f"{(sse_keep - ws) * 1000:.2f}ms/turn vs keep-alive SSE"
+    )
+
+
+if __name__ == "__main__":
+    main_cli()
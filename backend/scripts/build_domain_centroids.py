@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Build the Domain Centroids of the Embedding Router.
+
+Collects chunk embeddings per domain and writes the centroid/exemplar
+artifact the embedding router (agents.embedding_router) loads at startup:
+
+- technical, billing, general: read from their Chroma collections (already
+  embedded by scripts/index_documents.py, no API calls)
+- compliance: not indexed (the compliance worker keeps its documents in
+  the prompt), so its chunks from data/docs/compliance are embedded here
+
+Rebuild after re-indexing or editing data/docs (the router logs a warning
+when the knowledge base version no longer matches).
+
+Usage:
+    python scripts/build_domain_centroids.py
+    python scripts/build_domain_centroids.py --max-exemplars 32 --output /tmp/centroids.npz
+
+Requires OPENAI_API_KEY (compliance chunks) and indexed vector stores.
+
+Last Updated: October 17, 2026
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables (override=True to use .env file values over shell env vars)
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+from agents.embedding_router import DEFAULT_CENTROIDS_PATH, EmbeddingRouter
+from data.document_loader import DOCS_DIR, get_knowledge_base_version, load_documents
+from data.vectorstore import DOMAINS, EMBEDDING_MODEL, get_embeddings, get_vectorstore
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def indexed_embeddings(domain: str) -> np.ndarray:
+    """Chunk embeddings stored in a domain's Chroma collection."""
+    vectorstore = get_vectorstore(domain)
+    if vectorstore is None:
+        raise RuntimeError(f"Vector store for domain '{domain}' could not be opened")
+    embeddings = vectorstore._collection.get(include=["embeddings"])["embeddings"]
+    if embeddings is None or len(embeddings) == 0:
+        raise RuntimeError(
+            f"Vector store for '{domain}' is empty; run scripts/index_documents.py --all"
+        )
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def document_embeddings(domain: str) -> np.ndarray:
+    """Embed the chunks of a domain's documents (for domains without a collection)."""
+    chunks = load_documents(DOCS_DIR / domain)
+    if not chunks:
+        raise RuntimeError(f"No documents found in {DOCS_DIR / domain}")
+    vectors = get_embeddings().embed_documents([chunk.page_content for chunk in chunks])
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the embedding router's domain centroids"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_CENTROIDS_PATH,
+        help="Artifact to write (.npz)",
+    )
+    parser.add_argument(
+        "--max-exemplars", type=int, default=64, help="Chunk vectors kept per domain"
+    )
+    args = parser.parse_args()
+
+    corpora = {}
+    for domain in DOMAINS:
+        corpora[domain] = indexed_embeddings(domain)
+        logger.info(f"{domain}: {len(corpora[domain])} indexed chunks")
+    corpora["compliance"] = document_embeddings("compliance")
+    logger.info(f"compliance: {len(corpora['compliance'])} chunks embedded")
+
+    domains, centroids, exemplars, exemplar_domains = EmbeddingRouter.build_vectors(
+        corpora, max_exemplars=args.max_exemplars
+    )
+    EmbeddingRouter.save_vectors(
+        args.output,
+        domains,
+        centroids,
+        exemplars,
+        exemplar_domains,
+        embedding_model=EMBEDDING_MODEL,
+        knowledge_base_version=get_knowledge_base_version(),
+    )
+    logger.info(
+        f"Wrote {args.output} ({args.output.stat().st_size / 1024:.0f} KB): "
+        f"{len(domains)} domains, {len(exemplars)} exemplars"
+    )
+
+
+if __name__ == "__main__":
+    main_cli()
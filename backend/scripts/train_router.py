@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Train the Fast-Path Intent Classifier.
+
+Fits the TF-IDF + logistic regression router (agents.intent_classifier) on
+labelled queries and writes the artifact the backend loads at startup.
+
+The confidence threshold is chosen on a validation set
+(data/routing/validation_queries.jsonl): the lowest threshold at which the
+routed validation queries are at least --target-precision correct. Queries
+labelled "llm" (vague or follow-up messages) should not be routed at all,
+so routing one counts as a mistake. Coverage and accuracy at that threshold
+are then reported on the held-out set (data/routing/heldout_queries.jsonl),
+which is used for nothing else. Both sets are written apart from the
+training queries. Pass --min-confidence to skip the search.
+
+Usage:
+    python scripts/train_router.py
+    python scripts/train_router.py --examples data/routing/training_queries.jsonl more.jsonl \\
+        --output data/routing/intent_classifier.npz --eval data/routing/heldout_queries.jsonl
+
+Input lines look like {"query": "Why was I charged twice?", "domain": "billing"};
+domains are technical, billing, compliance, general or direct (plus "llm"
+in the validation and held-out sets).
+
+Last Updated: October 17, 2026
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.intent_classifier import (
+    DEFAULT_MIN_CONFIDENCE,
+    DEFAULT_MODEL_PATH,
+    IntentClassifier,
+    load_examples,
+)
+
+ROUTING_DATA = Path(__file__).parent.parent / "data" / "routing"
+
+# Label of queries that should be left to the supervisor LLM
+LLM_LABEL = "llm"
+
+# Candidate thresholds for the validation search
+THRESHOLDS = [round(0.30 + 0.01 * step, 2) for step in range(66)]
+
+
+def top_predictions(
+    classifier: IntentClassifier, queries: list[str]
+) -> list[tuple[str, float]]:
+    """
+    Most likely class and its probability for each query.
+
+    Args:
+        classifier: Trained classifier
+        queries: Queries to predict
+
+    Returns:
+        list: (label, probability) per query
+    """
+    predictions = []
+    for query in queries:
+        probabilities = classifier.predict_proba(query)
+        label = max(probabilities, key=probabilities.get)
+        predictions.append((label, probabilities[label]))
+    return predictions
+
+
+def evaluate(
+    predictions: list[tuple[str, float]], labels: list[str], min_confidence: float
+) -> dict:
+    """
+    Coverage and accuracy of routing at a confidence threshold.
+
+    Args:
+        predictions: Output of top_predictions()
+        labels: Expected label per query ("llm" = should not be routed)
+        min_confidence: Threshold to apply
+
+    Returns:
+        dict: Counts of queries, routed and correctly routed queries, the
+        same for queries with a domain label, and routed "llm" queries
+    """
+    routed = [
+        (label, expected)
+        for (label, probability), expected in zip(predictions, labels)
+        if probability >= min_confidence
+    ]
+    return {
+        "total": len(labels),
+        "routed": len(routed),
+        "correct": sum(label == expected for label, expected in routed),
+        "domain_total": sum(label != LLM_LABEL for label in labels),
+        "domain_routed": sum(expected != LLM_LABEL for _, expected in routed),
+        "llm_total": labels.count(LLM_LABEL),
+        "llm_routed": sum(expected == LLM_LABEL for _, expected in routed),
+    }
+
+
+def choose_threshold(
+    predictions: list[tuple[str, float]], labels: list[str], target_precision: float
+) -> float:
+    """
+    Lowest threshold whose routed queries are at least target_precision correct.
+
+    Args:
+        predictions: Output of top_predictions() on the validation set
+        labels: Expected validation labels
+        target_precision: Required share of correct routes among routed queries
+
+    Returns:
+        float: Chosen threshold (the highest candidate if none qualifies)
+    """
+    for threshold in THRESHOLDS:
+        stats = evaluate(predictions, labels, threshold)
+        if stats["routed"] and stats["correct"] / stats["routed"] >= target_precision:
+            return threshold
+    return THRESHOLDS[-1]
+
+
+def report(name: str, stats: dict, min_confidence: float) -> None:
+    """Print coverage and accuracy of one labelled set."""
+    routed, total = stats["routed"], stats["total"]
+    print(
+        f"{name}: routed {routed}/{total} ({routed / total:.0%}) at confidence >= "
+        f"{min_confidence}, {stats['correct']}/{routed} correct; "
+        f"domain queries routed {stats['domain_routed']}/{stats['domain_total']}, "
+        f"'{LLM_LABEL}' queries routed {stats['llm_routed']}/{stats['llm_total']}"
+    )
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Train the fast-path intent classifier"
+    )
+    parser.add_argument(
+        "--examples",
+        type=Path,
+        nargs="+",
+        default=[ROUTING_DATA / "training_queries.jsonl"],
+        help="Labelled JSONL training files",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_MODEL_PATH,
+        help="Artifact to write (.npz)",
+    )
+    parser.add_argument(
+        "--validation",
+        type=Path,
+        default=ROUTING_DATA / "validation_queries.jsonl",
+        help="Labelled JSONL the threshold is chosen on",
+    )
+    parser.add_argument(
+        "--eval",
+        type=Path,
+        default=ROUTING_DATA / "heldout_queries.jsonl",
+        help="Held-out labelled JSONL",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=None,
+        help="Probability needed to route (default: chosen on --validation)",
+    )
+    parser.add_argument(
+        "--target-precision",
+        type=float,
+        default=0.98,
+        help="Share of routed validation queries that must be correct",
+    )
+    parser.add_argument(
+        "--l2", type=float, default=1e-4, help="L2 regularization strength"
+    )
+    parser.add_argument(
+        "--epochs", type=int, default=1000, help="Gradient descent steps"
+    )
+    args = parser.parse_args()
+
+    queries, labels = [], []
+    for path in args.examples:
+        file_queries, file_labels = load_examples(path)
+        queries += file_queries
+        labels += file_labels
+
+    started = time.perf_counter()
+    classifier = IntentClassifier.train(queries, labels, l2=args.l2, epochs=args.epochs)
+    classifier.save(args.output)
+    print(
+        f"Trained on {len(queries)} queries in {time.perf_counter() - started:.1f}s: "
+        f"{len(classifier.vocabulary)} features, classes {classifier.classes}"
+    )
+    print(f"Wrote {args.output} ({args.output.stat().st_size / 1024:.0f} KB)")
+
+    # Evaluate the saved artifact (float16 weights), as the backend loads it
+    classifier = IntentClassifier.load(args.output)
+    min_confidence = args.min_confidence
+    if args.validation and args.validation.exists():
+        validation_queries, validation_labels = load_examples(args.validation)
+        predictions = top_predictions(classifier, validation_queries)
+        if min_confidence is None:
+            min_confidence = choose_threshold(
+                predictions, validation_labels, args.target_precision
+            )
+            print(
+                f"Chose threshold {min_confidence} on {args.validation.name} "
+                f"(target precision {args.target_precision:.0%}); set "
+                "DEFAULT_MIN_CONFIDENCE / ROUTER_MIN_CONFIDENCE to use it"
+            )
+        report(
+            args.validation.name,
+            evaluate(predictions, validation_labels, min_confidence),
+            min_confidence,
+        )
+    if min_confidence is None:
+        min_confidence = DEFAULT_MIN_CONFIDENCE
+
+    if args.eval and args.eval.exists():
+        eval_queries, eval_labels = load_examples(args.eval)
+        report(
+            args.eval.name,
+            evaluate(
+                top_predictions(classifier, eval_queries), eval_labels, min_confidence
+            ),
+            min_confidence,
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
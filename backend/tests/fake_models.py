@@ -0,0 +1,137 @@
+"""
+Scripted Chat Model and Fake Embeddings for Offline Agent Tests.
+
+A minimal LangChain chat model that replays a fixed list of AIMessages and
+streams them word by word, so real ``create_agent`` graphs (supervisor,
+workers, tool calls, checkpointer) can be exercised without any API calls.
+``KeywordEmbeddings`` is a deterministic bag-of-words embedding in which
+queries sharing keywords are similar.
+"""
+
+import json
+import re
+import time
+import zlib
+from typing import Any, ClassVar
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that returns pre-scripted responses in order (cycling).
+
+    Attributes:
+        responses: AIMessages to return, one per model call
+        delay: Seconds to sleep per call (simulates LLM latency)
+    """
+
+    responses: list[AIMessage]
+    delay: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _next(self) -> AIMessage:
+        # Copy: LangChain assigns a run id to the returned message, and a
+        # reused id would make the checkpointer replace the earlier reply
+        message = self.responses[self.calls % len(self.responses)].model_copy()
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._next())])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next()
+
+        if message.tool_calls:
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": i,
+                        }
+                        for i, call in enumerate(message.tool_calls)
+                    ],
+                )
+            )
+            if run_manager:
+                run_manager.on_llm_new_token("", chunk=chunk)
+            yield chunk
+            return
+
+        for token in re.findall(r"\S+\s*", message.content):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def tool_call(name: str, query: str, call_id: str = "call_1") -> AIMessage:
+    """Build an AIMessage that calls a worker tool with a query."""
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": {"query": query}, "id": call_id}],
+    )
+
+
+class KeywordEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embedding.
+
+    Each non-stopword is truncated to its first five letters (a crude stem,
+    so "refund" and "refunds" match) and hashed into one of ``size``
+    dimensions. Cosine similarity is therefore keyword overlap.
+    """
+
+    STOPWORDS: ClassVar[set[str]] = {
+        "a",
+        "an",
+        "and",
+        "are",
+        "can",
+        "do",
+        "does",
+        "how",
+        "i",
+        "is",
+        "it",
+        "me",
+        "my",
+        "of",
+        "on",
+        "s",
+        "the",
+        "to",
+        "what",
+        "you",
+        "your",
+    }
+
+    def __init__(self, size: int = 256):
+        self.size = size
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = [0.0] * self.size
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            if word not in self.STOPWORDS:
+                vector[zlib.crc32(word[:5].encode()) % self.size] += 1.0
+        return vector
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
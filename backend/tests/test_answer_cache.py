@@ -0,0 +1,266 @@
+"""
+Unit Tests for the First-Turn Answer Cache.
+
+Tests TTL/LRU behaviour of TTLCache, the knowledge base fingerprint used
+in cache keys, and cache hits on /chat and /chat/stream.
+"""
+
+import json
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.tools.rag_tools import report_retrieval_error, retrieval_errors_scope
+from data import document_loader
+from data.document_loader import get_knowledge_base_version
+from tests.fake_models import ScriptedChatModel
+from utils.cache import TTLCache
+
+
+def build_supervisor(*answers: str):
+    model = ScriptedChatModel(responses=[AIMessage(content=a) for a in answers])
+    agent = create_agent(
+        model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+    )
+    return agent, model
+
+
+def history(agent, session_id: str) -> list[str]:
+    state = agent.get_state({"configurable": {"thread_id": session_id}})
+    return [m.content for m in state.values["messages"]]
+
+
+# ============================================================================
+# TTLCache Tests
+# ============================================================================
+
+
+class TestTTLCache:
+    """Test expiry, LRU eviction and counters."""
+
+    def test_get_and_set(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", "answer")
+        assert cache.get("a") == "answer"
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=10)
+        with patch("utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", "answer")
+        with patch("utils.cache.time.monotonic", return_value=109.0):
+            assert cache.get("a") == "answer"
+        with patch("utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_rejects_zero_size(self):
+        with pytest.raises(ValueError):
+            TTLCache(max_entries=0)
+
+
+# ============================================================================
+# Knowledge Base Version Tests
+# ============================================================================
+
+
+class TestKnowledgeBaseVersion:
+    """Test that the fingerprint tracks document changes."""
+
+    def test_changes_when_a_document_changes(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("KNOWLEDGE_BASE_VERSION", raising=False)
+        (tmp_path / "billing").mkdir()
+        doc = tmp_path / "billing" / "pricing.md"
+        doc.write_text("Basic plan: $10")
+
+        before = get_knowledge_base_version(tmp_path)
+        assert before == get_knowledge_base_version(tmp_path)
+
+        doc.write_text("Basic plan: $12")
+        assert get_knowledge_base_version(tmp_path) != before
+
+    def test_unchanged_documents_are_not_read_again(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("KNOWLEDGE_BASE_VERSION", raising=False)
+        monkeypatch.setattr(document_loader, "KNOWLEDGE_BASE_SETTLE_NS", 0)
+        doc = tmp_path / "pricing.md"
+        doc.write_text("Basic plan: $10")
+        before = get_knowledge_base_version(tmp_path)
+
+        with patch.object(Path, "read_bytes", side_effect=AssertionError("re-read")):
+            assert get_knowledge_base_version(tmp_path) == before
+
+        doc.write_text("Basic plan: $100")
+        assert get_knowledge_base_version(tmp_path) != before
+
+    def test_environment_override(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("KNOWLEDGE_BASE_VERSION", "kb-2026-10")
+        assert get_knowledge_base_version(tmp_path) == "kb-2026-10"
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+class TestAnswerCacheEndpoints:
+    """Test cache hits on /chat and /chat/stream."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        yield
+        main.answer_cache.clear()
+
+    def test_identical_first_turn_is_served_from_cache(self):
+        from backend import main
+
+        agent, model = build_supervisor("We offer Basic and Pro plans")
+        client = TestClient(main.app)
+        first, second = str(uuid.uuid4()), str(uuid.uuid4())
+        hits_before = main.answer_cache.stats()["hits"]
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            r1 = client.post(
+                "/chat",
+                json={"message": "What are your pricing plans?", "session_id": first},
+            )
+            r2 = client.post(
+                "/chat",
+                json={"message": "what are your pricing plans", "session_id": second},
+            )
+
+        assert (
+            r1.json()["response"]
+            == r2.json()["response"]
+            == "We offer Basic and Pro plans"
+        )
+        assert model.calls == 1
+        assert main.answer_cache.stats()["hits"] - hits_before == 1
+        # The cached exchange is part of the second session's history
+        assert history(agent, second) == [
+            "what are your pricing plans",
+            "We offer Basic and Pro plans",
+        ]
+
+    def test_follow_up_turns_bypass_cache(self):
+        from backend import main
+
+        agent, model = build_supervisor("Answer one", "Answer two")
+        client = TestClient(main.app)
+        session_id = str(uuid.uuid4())
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            client.post("/chat", json={"message": "Pricing?", "session_id": session_id})
+            response = client.post(
+                "/chat", json={"message": "Pricing?", "session_id": session_id}
+            )
+
+        assert response.json()["response"] == "Answer two"
+        assert model.calls == 2
+
+    def test_cache_key_includes_knowledge_base_version(self):
+        from backend import main
+
+        agent, model = build_supervisor("Old answer", "New answer")
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            client.post(
+                "/chat", json={"message": "Refunds?", "session_id": str(uuid.uuid4())}
+            )
+            with patch(
+                "backend.main.get_knowledge_base_version", return_value="next-version"
+            ):
+                response = client.post(
+                    "/chat",
+                    json={"message": "Refunds?", "session_id": str(uuid.uuid4())},
+                )
+
+        assert response.json()["response"] == "New answer"
+        assert model.calls == 2
+
+    def test_answers_built_on_tool_errors_are_not_cached(self):
+        from backend import main
+
+        failed_worker = ToolMessage(
+            content="Error: timed out",
+            tool_call_id="call_1",
+            name="technical_support_tool",
+            status="error",
+        )
+        main.remember_answer("Error 500?", "Please try again", [failed_worker])
+        with retrieval_errors_scope():
+            report_retrieval_error("technical_docs_search")
+            main.remember_answer("Error 404?", "Docs are unavailable", [])
+        main.remember_answer("Error 403?", "Clear your cookies", [])
+
+        assert main.answer_cache.get(main.answer_cache_key("Error 500?")) is None
+        assert main.answer_cache.get(main.answer_cache_key("Error 404?")) is None
+        assert main.answer_cache.get(main.answer_cache_key("Error 403?")) == (
+            "Clear your cookies"
+        )
+
+    def test_stream_populates_and_hits_cache(self):
+        from backend import main
+
+        agent, model = build_supervisor("Reset it from the login page")
+        client = TestClient(main.app)
+        second = str(uuid.uuid4())
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            client.post(
+                "/chat/stream",
+                json={
+                    "message": "How do I reset my password?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+            response = client.post(
+                "/chat/stream",
+                json={"message": "How do I reset my password?", "session_id": second},
+            )
+
+        events = [
+            json.loads(line[len("data: ") :])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert [e["type"] for e in events] == ["start", "token", "done"]
+        assert events[1]["content"] == "Reset it from the login page"
+        assert events[2]["cached"] is True
+        assert model.calls == 1
+        assert history(agent, second)[-1] == "Reset it from the login page"
+
+    def test_health_reports_cache_stats(self):
+        from backend import main
+
+        data = TestClient(main.app).get("/health").json()
+        cache_stats = data["performance"]["answer_cache"]
+        assert {"hits", "misses", "knowledge_base_version"} <= cache_stats.keys()
@@ -0,0 +1,191 @@
+"""
+Unit Tests for Batch Chat Processing.
+
+Tests run_keyed_batch (per-key ordering, concurrency cap, completion-order
+results, error isolation) and the /chat/batch NDJSON endpoint.
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel
+from utils.batch import run_keyed_batch
+
+
+async def collect(items, key, handler, concurrency):
+    return [done async for done in run_keyed_batch(items, key, handler, concurrency)]
+
+
+# ============================================================================
+# run_keyed_batch Tests
+# ============================================================================
+
+
+class TestRunKeyedBatch:
+    """Test keyed ordering and concurrency of batch execution."""
+
+    async def test_same_key_runs_in_order(self):
+        started = []
+
+        async def handler(item):
+            _key, step = item
+            started.append(item)
+            await asyncio.sleep(0.03 if step == 0 else 0.0)
+            return item
+
+        items = [("a", 0), ("b", 0), ("a", 1), ("a", 2), ("b", 1)]
+        await collect(items, lambda item: item[0], handler, concurrency=4)
+
+        assert [i for i in started if i[0] == "a"] == [("a", 0), ("a", 1), ("a", 2)]
+        assert [i for i in started if i[0] == "b"] == [("b", 0), ("b", 1)]
+
+    async def test_results_arrive_in_completion_order(self):
+        async def handler(item):
+            await asyncio.sleep(item)
+            return item
+
+        results = await collect(
+            [0.1, 0.0, 0.05], lambda item: item, handler, concurrency=3
+        )
+
+        assert [r.index for r in results] == [1, 2, 0]
+
+    async def test_concurrency_cap(self):
+        active = peak = 0
+
+        async def handler(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await collect(list(range(10)), lambda item: item, handler, concurrency=3)
+
+        assert peak == 3
+
+    async def test_errors_are_isolated(self):
+        async def handler(item):
+            if item == "bad":
+                raise RuntimeError("LLM failure")
+            return item.upper()
+
+        results = await collect(
+            ["ok", "bad", "ok"], lambda item: "same-session", handler, concurrency=2
+        )
+        by_index = {r.index: r for r in results}
+
+        assert isinstance(by_index[1].error, RuntimeError)
+        assert by_index[0].result == by_index[2].result == "OK"
+
+    async def test_consumer_exit_cancels_remaining_work(self):
+        finished = []
+
+        async def handler(item):
+            await asyncio.sleep(item)
+            finished.append(item)
+
+        batch = run_keyed_batch([0.0, 1.0], lambda item: item, handler, concurrency=2)
+        await batch.__anext__()
+        await batch.aclose()
+        await asyncio.sleep(0)
+
+        assert finished == [0.0]
+
+    async def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError):
+            await collect([1], lambda item: item, lambda item: item, concurrency=0)
+
+
+# ============================================================================
+# /chat/batch Endpoint Tests
+# ============================================================================
+
+
+class TestChatBatchEndpoint:
+    """Test NDJSON batch processing through the /chat path."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        yield
+        main.answer_cache.clear()
+
+    def parse_ndjson(self, text: str) -> list[dict]:
+        return [json.loads(line) for line in text.splitlines() if line]
+
+    def test_processes_all_items_and_keeps_session_order(self):
+        from backend import main
+
+        model = ScriptedChatModel(responses=[AIMessage(content="Noted")])
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+        first, second = str(uuid.uuid4()), str(uuid.uuid4())
+        items = [
+            {"message": "Ticket 1: charged twice", "session_id": first},
+            {"message": "Ticket 2: login error", "session_id": second},
+            {"message": "Ticket 1: follow-up", "session_id": first},
+        ]
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = TestClient(main.app).post("/chat/batch", json={"items": items})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = self.parse_ndjson(response.text)
+        assert sorted(r["index"] for r in records) == [0, 1, 2]
+        assert all(r["status"] == 200 and r["response"] == "Noted" for r in records)
+
+        history = agent.get_state({"configurable": {"thread_id": first}}).values[
+            "messages"
+        ]
+        assert [m.content for m in history if m.type == "human"] == [
+            "Ticket 1: charged twice",
+            "Ticket 1: follow-up",
+        ]
+
+    def test_item_errors_are_reported_per_line(self):
+        from backend import main
+
+        with patch(
+            "backend.main.get_supervisor", side_effect=RuntimeError("not initialized")
+        ):
+            response = TestClient(main.app).post(
+                "/chat/batch",
+                json={"items": [{"message": "Hi", "session_id": str(uuid.uuid4())}]},
+            )
+
+        [record] = self.parse_ndjson(response.text)
+        assert record["status"] == 500
+        assert record["error"] == "Service configuration error"
+
+    def test_invalid_item_rejects_batch(self):
+        from backend import main
+
+        response = TestClient(main.app).post(
+            "/chat/batch",
+            json={"items": [{"message": "Hi", "session_id": "not-a-uuid"}]},
+        )
+        assert response.status_code == 422
+
+    def test_empty_batch_is_rejected(self):
+        from backend import main
+
+        response = TestClient(main.app).post("/chat/batch", json={"items": []})
+        assert response.status_code == 422
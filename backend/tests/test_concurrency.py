@@ -0,0 +1,186 @@
+"""
+Unit Tests for the Bounded Agent Executor.
+
+Tests that blocking agent calls run off the event loop, that the in-flight
+limit is enforced, and that /chat maps saturation to 503 + Retry-After.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.concurrency import BoundedAgentExecutor, ExecutorSaturatedError
+
+# ============================================================================
+# Executor Behaviour
+# ============================================================================
+
+
+class TestBoundedAgentExecutor:
+    """Test thread pool execution and admission control."""
+
+    def test_rejects_invalid_limits(self):
+        """Test that nonsensical pool sizes are rejected."""
+        with pytest.raises(ValueError):
+            BoundedAgentExecutor(max_workers=0)
+        with pytest.raises(ValueError):
+            BoundedAgentExecutor(max_workers=4, max_in_flight=2)
+
+    async def test_run_returns_result_from_worker_thread(self):
+        """Test that run() executes the callable on a pool thread."""
+        executor = BoundedAgentExecutor(max_workers=2, max_in_flight=2)
+        main_thread = threading.get_ident()
+
+        result = await executor.run(lambda x: (x * 2, threading.get_ident()), 21)
+
+        assert result[0] == 42
+        assert result[1] != main_thread
+        assert executor.in_flight == 0
+        executor.shutdown()
+
+    async def test_blocking_call_does_not_block_event_loop(self):
+        """Test that other coroutines progress while a blocking call runs."""
+        executor = BoundedAgentExecutor(max_workers=1, max_in_flight=1)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(executor.run(time.sleep, 0.2), ticker())
+
+        assert ticks == 5
+        executor.shutdown()
+
+    async def test_rejects_when_in_flight_limit_reached(self):
+        """Test that excess runs fail fast with a Retry-After hint."""
+        executor = BoundedAgentExecutor(
+            max_workers=1, max_in_flight=2, min_retry_after=3
+        )
+        release = threading.Event()
+
+        running = [
+            asyncio.ensure_future(executor.run(release.wait, 1)) for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ExecutorSaturatedError) as exc_info:
+            await executor.run(lambda: None)
+
+        assert exc_info.value.limit == 2
+        assert exc_info.value.retry_after == 3
+        assert executor.stats()["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(*running)
+        assert executor.in_flight == 0
+        executor.shutdown()
+
+    async def test_slot_releases_on_error(self):
+        """Test that a failing run frees its in-flight slot."""
+        executor = BoundedAgentExecutor(max_workers=1, max_in_flight=1)
+
+        def boom():
+            raise RuntimeError("LLM failure")
+
+        with pytest.raises(RuntimeError):
+            await executor.run(boom)
+
+        assert executor.in_flight == 0
+        assert await executor.run(lambda: "ok") == "ok"
+        executor.shutdown()
+
+    def test_check_capacity_raises_when_full(self):
+        """Test the pre-flight capacity check used by streaming endpoints."""
+        executor = BoundedAgentExecutor(max_workers=1, max_in_flight=1)
+        executor.check_capacity()
+
+        executor._in_flight = 1
+        with pytest.raises(ExecutorSaturatedError):
+            executor.check_capacity()
+        executor.shutdown()
+
+
+# ============================================================================
+# Endpoint Integration
+# ============================================================================
+
+
+class TestChatBackpressure:
+    """Test that /chat and /chat/stream shed load with 503."""
+
+    SESSION_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+    def test_chat_returns_503_with_retry_after_when_saturated(self):
+        """Test that a saturated executor yields 503 and Retry-After."""
+        from backend import main
+
+        client = TestClient(main.app)
+        mock_supervisor = Mock()
+
+        with (
+            patch("backend.main.get_supervisor", return_value=mock_supervisor),
+            patch.object(
+                main.agent_executor, "_in_flight", main.agent_executor.max_in_flight
+            ),
+        ):
+            response = client.post(
+                "/chat", json={"message": "Hello", "session_id": self.SESSION_ID}
+            )
+
+        assert response.status_code == 503
+        assert int(response.headers["retry-after"]) >= 1
+        assert response.json()["detail"]["session_id"] == self.SESSION_ID
+        mock_supervisor.invoke.assert_not_called()
+
+    def test_stream_returns_503_when_saturated(self):
+        """Test that /chat/stream rejects before opening the stream."""
+        from backend import main
+
+        client = TestClient(main.app)
+
+        with patch.object(
+            main.agent_executor, "_in_flight", main.agent_executor.max_in_flight
+        ):
+            response = client.post(
+                "/chat/stream", json={"message": "Hello", "session_id": self.SESSION_ID}
+            )
+
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+
+    def test_chat_runs_supervisor_through_executor(self):
+        """Test that /chat invokes the supervisor off the event loop."""
+        from backend import main
+
+        client = TestClient(main.app)
+        caller_threads = []
+
+        def fake_invoke(inputs, config):
+            caller_threads.append(threading.current_thread().name)
+            msg = Mock()
+            msg.content = "Hi there!"
+            return {"messages": [msg]}
+
+        mock_supervisor = Mock()
+        mock_supervisor.invoke.side_effect = fake_invoke
+
+        with patch("backend.main.get_supervisor", return_value=mock_supervisor):
+            response = client.post(
+                "/chat", json={"message": "Hello", "session_id": self.SESSION_ID}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["response"] == "Hi there!"
+        assert caller_threads[0].startswith("agent-run")
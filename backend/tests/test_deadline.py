@@ -0,0 +1,388 @@
+"""
+Unit Tests for End-to-End Request Deadlines.
+
+Tests Deadline checks and stage budgets, propagation through the agent
+executor into supervisor → worker tool → LLM calls, the RAG tool check,
+504 / stream error responses with partial progress, and cancellation of
+streamed runs when the client disconnects.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel, tool_call
+from utils.concurrency import BoundedAgentExecutor
+from utils.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    RunCancelledError,
+    check_deadline,
+    deadline_scope,
+    stage_deadline,
+)
+
+
+def build_supervisor(supervisor_delay=0.0, worker_delay=0.0, worker_timeout=None):
+    """Supervisor routing to a billing worker; returns (agent, supervisor model)."""
+    worker = create_agent(
+        model=ScriptedChatModel(
+            responses=[AIMessage(content="Refunds take 5 days.")], delay=worker_delay
+        ),
+        tools=[],
+        name="billing_support_agent",
+    )
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        with stage_deadline("billing_support_tool", worker_timeout):
+            return worker.invoke({"messages": [{"role": "user", "content": query}]})[
+                "messages"
+            ][-1].content
+
+    model = ScriptedChatModel(
+        responses=[
+            tool_call("billing_support_tool", "refund"),
+            AIMessage(content="Refunds take 5 days."),
+        ],
+        delay=supervisor_delay,
+    )
+    agent = create_agent(
+        model=model,
+        tools=[billing_support_tool],
+        checkpointer=InMemorySaver(),
+        name="supervisor_agent",
+    )
+    return agent, model
+
+
+# ============================================================================
+# Deadline Tests
+# ============================================================================
+
+
+class TestDeadline:
+    """Test budget checks and stage deadlines."""
+
+    def test_check_records_steps_until_expired(self):
+        deadline = Deadline(0.05)
+        deadline.check("supervisor")
+        time.sleep(0.06)
+
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            deadline.check("billing_support_tool")
+
+        assert exc_info.value.stage == "billing_support_tool"
+        assert exc_info.value.steps == ["supervisor"]
+
+    def test_stage_deadline_is_capped_by_request(self):
+        with deadline_scope(Deadline(0.01)), stage_deadline("worker", 10) as stage:
+            assert stage.remaining() <= 0.01
+
+    def test_stage_timeout_reports_stage(self):
+        with deadline_scope(Deadline(10)), stage_deadline("billing_support_tool", 0.01):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceededError) as exc_info:
+                check_deadline("retrieval")
+
+        assert exc_info.value.stage == "billing_support_tool"
+
+    def test_cancel_reaches_stage_deadlines(self):
+        deadline = Deadline(10)
+        with deadline_scope(deadline), stage_deadline("billing_support_tool", 5):
+            deadline.cancel("client_disconnected")
+            with pytest.raises(RunCancelledError) as exc_info:
+                check_deadline("retrieval")
+
+        assert exc_info.value.reason == "client_disconnected"
+        assert exc_info.value.stage == "retrieval"
+
+    def test_no_deadline_is_noop(self):
+        check_deadline("retrieval")
+        with stage_deadline("worker", None) as stage:
+            assert stage is None
+
+
+# ============================================================================
+# Propagation Tests
+# ============================================================================
+
+
+class TestDeadlinePropagation:
+    """Test that every stage of an agent run checks the deadline."""
+
+    async def test_supervisor_stops_after_slow_worker(self):
+        executor = BoundedAgentExecutor(max_workers=2)
+        agent, supervisor_model = build_supervisor(worker_delay=0.15)
+        inputs = {"messages": [{"role": "user", "content": "refund?"}]}
+
+        with (
+            deadline_scope(Deadline(0.1)),
+            pytest.raises(DeadlineExceededError) as exc_info,
+        ):
+            await executor.run(
+                agent.invoke, inputs, {"configurable": {"thread_id": "t1"}}
+            )
+        executor.shutdown()
+
+        # The supervisor's second LLM call was never made
+        assert supervisor_model.calls == 1
+        assert exc_info.value.stage == "supervisor"
+        assert exc_info.value.steps == [
+            "supervisor",
+            "billing_support_tool",
+            "worker_llm",
+        ]
+
+    def test_worker_tool_timeout_aborts_worker(self):
+        agent, _supervisor_model = build_supervisor(worker_timeout=0.0)
+
+        with (
+            deadline_scope(Deadline(10)),
+            pytest.raises(DeadlineExceededError) as exc_info,
+        ):
+            agent.invoke(
+                {"messages": [{"role": "user", "content": "refund?"}]},
+                {"configurable": {"thread_id": "t2"}},
+            )
+
+        assert exc_info.value.stage == "billing_support_tool"
+        assert "worker_llm" not in exc_info.value.steps
+
+    def test_rag_tool_raises_instead_of_searching(self):
+        from agents.tools.rag_tools import technical_docs_search
+
+        with (
+            patch("agents.tools.rag_tools.get_vectorstore") as get_vectorstore,
+            deadline_scope(Deadline(0)),
+            pytest.raises(DeadlineExceededError),
+        ):
+            technical_docs_search.func("error 500")
+
+        get_vectorstore.assert_not_called()
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+class TestDeadlineEndpoints:
+    """Test 504 responses and stream timeout events."""
+
+    def test_chat_returns_504_with_progress(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, model = build_supervisor(worker_delay=0.3)
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("backend.main.startup_tasks", return_value={}),
+            patch.object(main.agent_executor, "shutdown"),
+            patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-fake-key-for-pytest"}),
+            TestClient(main.app) as client,
+        ):
+            started = time.perf_counter()
+            response = client.post(
+                "/chat",
+                json={
+                    "message": "How long do refunds take?",
+                    "session_id": str(uuid.uuid4()),
+                },
+                headers={"X-Request-Timeout": "0.1"},
+            )
+            elapsed = time.perf_counter() - started
+
+            # The 504 does not wait for the worker's LLM call to return
+            assert response.status_code == 504
+            assert elapsed < 0.25
+            # The run still holds the session and its slot until it stops
+            # at its next check, so a retry cannot overlap with it
+            assert main.agent_executor.in_flight == 1
+            assert main.session_locks.stats()["active_sessions"] == 1
+            for _ in range(100):
+                if not main.timed_out_turns:
+                    break
+                time.sleep(0.01)
+
+        detail = response.json()["detail"]
+        assert detail["error"] == "Request timeout"
+        assert detail["timeout_seconds"] == 0.1
+        assert detail["progress"]["steps"][:2] == ["supervisor", "billing_support_tool"]
+        assert "total" in detail["progress"]["timings"]
+        assert not main.timed_out_turns
+        assert main.agent_executor.in_flight == 0
+        assert main.session_locks.stats()["active_sessions"] == 0
+        assert model.calls == 1
+
+    def test_body_timeout_and_server_cap(self):
+        from backend import main
+
+        assert main.request_deadline(None, None).timeout == main.REQUEST_TIMEOUT_SECONDS
+        assert main.request_deadline(5, 30).timeout == 5
+        assert main.request_deadline(10_000).timeout == main.REQUEST_MAX_TIMEOUT_SECONDS
+
+    def test_invalid_timeout_header_is_rejected(self):
+        from backend import main
+
+        response = TestClient(main.app).post(
+            "/chat",
+            json={"message": "Hi", "session_id": str(uuid.uuid4())},
+            headers={"X-Request-Timeout": "soon"},
+        )
+
+        assert response.status_code == 422
+
+    def test_stream_reports_timeout_event(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, supervisor_model = build_supervisor(worker_delay=0.15)
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = client.post(
+                "/chat/stream",
+                json={
+                    "message": "How long do refunds take?",
+                    "session_id": str(uuid.uuid4()),
+                    "timeout_seconds": 0.1,
+                },
+            )
+
+        events = [
+            json.loads(line[6:])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert events[-1]["type"] == "error"
+        assert events[-1]["error"] == "Request timeout"
+        # Stopped at the worker's first token after the deadline
+        assert events[-1]["stage"] == "worker_llm"
+        assert supervisor_model.calls == 1
+
+
+# ============================================================================
+# Cancellation Tests
+# ============================================================================
+
+
+def build_slow_worker_supervisor():
+    """Supervisor whose worker needs two slow LLM calls and a lookup tool."""
+    lookups = []
+
+    @tool
+    def lookup_invoice(query: str) -> str:
+        """Look up an invoice."""
+        lookups.append(query)
+        return "Invoice 42: paid"
+
+    worker_model = ScriptedChatModel(
+        responses=[
+            tool_call("lookup_invoice", "42"),
+            AIMessage(content="Invoice 42 is paid."),
+        ],
+        delay=0.2,
+    )
+    worker = create_agent(
+        model=worker_model, tools=[lookup_invoice], name="billing_support_agent"
+    )
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        return worker.invoke({"messages": [{"role": "user", "content": query}]})[
+            "messages"
+        ][-1].content
+
+    agent = create_agent(
+        model=ScriptedChatModel(
+            responses=[
+                tool_call("billing_support_tool", "invoice 42"),
+                AIMessage(content="It is paid."),
+            ]
+        ),
+        tools=[billing_support_tool],
+        checkpointer=InMemorySaver(),
+        name="supervisor_agent",
+    )
+    return agent, worker_model, lookups
+
+
+class TestStreamCancellation:
+    """Test that a disconnected stream stops its agent run."""
+
+    def test_cancelled_run_makes_no_llm_call(self):
+        model = ScriptedChatModel(responses=[AIMessage(content="Hello there")])
+        agent = create_agent(model=model, tools=[], name="billing_support_agent")
+
+        with deadline_scope(Deadline(10)) as deadline:
+            deadline.cancel()
+            with pytest.raises(RunCancelledError):
+                agent.invoke({"messages": [{"role": "user", "content": "Hi"}]})
+
+        assert model.calls == 0
+
+    async def test_disconnect_cancels_worker_tool_call(self):
+        from starlette.requests import Request
+
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, worker_model, lookups = build_slow_worker_supervisor()
+        cancelled_before = main.runs_cancelled.value("/chat/stream")
+
+        # The client goes away while the worker's first LLM call is running
+        disconnect_at = time.monotonic() + 0.1
+
+        async def receive():
+            if time.monotonic() >= disconnect_at:
+                return {"type": "http.disconnect"}
+            await asyncio.sleep(3600)
+
+        http_request = Request(
+            {"type": "http", "method": "POST", "headers": []}, receive
+        )
+        chat_request = main.ChatRequest(
+            message="Is invoice 42 paid?", session_id=str(uuid.uuid4())
+        )
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("backend.main.STREAM_DISCONNECT_POLL_SECONDS", 0.02),
+            patch("backend.main.STREAM_RESUME_GRACE_SECONDS", 0),
+        ):
+            response = await main.chat_stream_endpoint(
+                chat_request,
+                http_request,
+                x_priority_tier=None,
+                x_tenant_id=None,
+                x_request_timeout=None,
+                last_event_id=None,
+            )
+            body = b"".join([chunk async for chunk in response.body_iterator]).decode()
+            # Give a still-running worker thread time to continue if it could
+            await asyncio.sleep(0.5)
+
+        assert '"type":"done"' not in body
+        # The worker stopped before its second LLM call and its tool call
+        assert worker_model.calls == 1
+        assert lookups == []
+        assert main.runs_cancelled.value("/chat/stream") == cancelled_before + 1
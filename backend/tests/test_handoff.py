@@ -0,0 +1,291 @@
+"""
+Unit Tests for Worker Handoff.
+
+Tests the WorkerHandoffMiddleware on a scripted supervisor: a single worker
+answer ends the turn verbatim without the supervisor's final LLM call (in
+invoke, async and streamed runs), is stored in the session checkpoint, and
+several workers, failed workers or a disabled handoff still get the LLM
+call. Also tests the handed-off answer on /chat/stream.
+"""
+
+import json
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.handoff import WorkerHandoffMiddleware
+from agents.streaming import stream_agent_tokens
+from tests.fake_models import ScriptedChatModel, tool_call
+
+WORKER_TOOLS = {"technical_support_tool", "billing_support_tool"}
+BILLING_ANSWER = (
+    "Refunds are issued within 5 business days to your original payment method."
+)
+
+
+def build_supervisor(handoff: WorkerHandoffMiddleware, *responses: AIMessage):
+    """Scripted supervisor with billing and technical worker tools."""
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        return BILLING_ANSWER
+
+    @tool
+    def technical_support_tool(query: str) -> str:
+        """Handle technical issues."""
+        return "Clear your cache and retry."
+
+    model = ScriptedChatModel(responses=list(responses))
+    agent = create_agent(
+        model=model,
+        tools=[billing_support_tool, technical_support_tool],
+        checkpointer=InMemorySaver(),
+        middleware=[handoff],
+        name="supervisor_agent",
+    )
+    return agent, model
+
+
+def new_config() -> dict:
+    return {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+
+def ask(message: str) -> dict:
+    return {"messages": [{"role": "user", "content": message}]}
+
+
+# ============================================================================
+# Handoff Decision Tests
+# ============================================================================
+
+
+class TestWorkerResult:
+    """Test which model calls can hand off a worker answer."""
+
+    def test_single_worker_answer(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+        result = ToolMessage(
+            content="answer", name="billing_support_tool", tool_call_id="call_1"
+        )
+
+        assert (
+            handoff.worker_result(
+                [HumanMessage("q"), tool_call("billing_support_tool", "q"), result]
+            )
+            is result
+        )
+
+    def test_first_call_of_turn(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+
+        assert handoff.worker_result([HumanMessage("q")]) is None
+        assert handoff.stats()["fallback"] == 0
+
+    @pytest.mark.parametrize(
+        "results",
+        [
+            # Two workers: the LLM combines their answers
+            [
+                ToolMessage(
+                    content="a", name="billing_support_tool", tool_call_id="call_1"
+                ),
+                ToolMessage(
+                    content="b", name="technical_support_tool", tool_call_id="call_2"
+                ),
+            ],
+            [
+                ToolMessage(
+                    content="failed",
+                    name="billing_support_tool",
+                    tool_call_id="call_1",
+                    status="error",
+                )
+            ],
+            [ToolMessage(content="42", name="calculator", tool_call_id="call_1")],
+        ],
+    )
+    def test_left_to_llm(self, results):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+
+        assert (
+            handoff.worker_result([HumanMessage("q"), AIMessage(content=""), *results])
+            is None
+        )
+        assert handoff.stats()["fallback"] == 1
+
+
+# ============================================================================
+# Supervisor Tests
+# ============================================================================
+
+
+class TestWorkerHandoffMiddleware:
+    """Test the supervisor with worker handoff."""
+
+    def test_worker_answer_ends_turn(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+        agent, model = build_supervisor(
+            handoff,
+            tool_call("billing_support_tool", "refund"),
+            AIMessage(content="Rewritten by the LLM"),
+        )
+        config = new_config()
+
+        result = agent.invoke(ask("When will my refund arrive?"), config)
+
+        # Only the routing call: the worker's answer is the reply
+        assert model.calls == 1
+        assert result["messages"][-1].content == BILLING_ANSWER
+        assert result["messages"][-1].tool_calls == []
+        history = agent.get_state(config).values["messages"]
+        assert [type(m).__name__ for m in history] == [
+            "HumanMessage",
+            "AIMessage",
+            "ToolMessage",
+            "AIMessage",
+        ]
+        assert history[-1].name == "supervisor_agent"
+        assert handoff.stats() == {
+            "handoffs": {"billing_support_tool": 1},
+            "fallback": 0,
+            "characters_saved": len(BILLING_ANSWER),
+        }
+
+    def test_follow_up_sees_handed_off_answer(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+        agent, model = build_supervisor(
+            handoff,
+            tool_call("billing_support_tool", "refund"),
+            AIMessage(content="You're welcome!"),
+        )
+        config = new_config()
+
+        agent.invoke(ask("When will my refund arrive?"), config)
+        result = agent.invoke(ask("Thanks"), config)
+
+        assert model.calls == 2
+        assert result["messages"][-1].content == "You're welcome!"
+        assert [
+            m.content
+            for m in result["messages"]
+            if isinstance(m, (HumanMessage, AIMessage)) and m.content
+        ] == [
+            "When will my refund arrive?",
+            BILLING_ANSWER,
+            "Thanks",
+            "You're welcome!",
+        ]
+
+    async def test_async_run(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+        agent, model = build_supervisor(
+            handoff, tool_call("billing_support_tool", "refund")
+        )
+
+        result = await agent.ainvoke(ask("When will my refund arrive?"), new_config())
+
+        assert model.calls == 1
+        assert result["messages"][-1].content == BILLING_ANSWER
+
+    async def test_streamed_as_supervisor_answer(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+        agent, model = build_supervisor(
+            handoff, tool_call("billing_support_tool", "refund")
+        )
+
+        chunks = [
+            chunk
+            async for chunk in stream_agent_tokens(agent, ask("Refund?"), new_config())
+        ]
+
+        assert model.calls == 1
+        assert "".join(c.text for c in chunks if c.from_supervisor) == BILLING_ANSWER
+
+    def test_several_workers_go_to_llm(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS)
+        both = AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "billing_support_tool",
+                    "args": {"query": "refund"},
+                    "id": "call_1",
+                },
+                {
+                    "name": "technical_support_tool",
+                    "args": {"query": "error"},
+                    "id": "call_2",
+                },
+            ],
+        )
+        agent, model = build_supervisor(
+            handoff, both, AIMessage(content="Combined answer")
+        )
+
+        result = agent.invoke(ask("Refund for the app that crashes?"), new_config())
+
+        assert model.calls == 2
+        assert result["messages"][-1].content == "Combined answer"
+        assert handoff.stats()["fallback"] == 1
+
+    def test_disabled(self):
+        handoff = WorkerHandoffMiddleware(WORKER_TOOLS, enabled=False)
+        agent, model = build_supervisor(
+            handoff,
+            tool_call("billing_support_tool", "refund"),
+            AIMessage(content="Rewritten by the LLM"),
+        )
+
+        result = agent.invoke(ask("When will my refund arrive?"), new_config())
+
+        assert model.calls == 2
+        assert result["messages"][-1].content == "Rewritten by the LLM"
+        assert handoff.stats()["handoffs"] == {}
+
+
+class TestHandoffEndpoints:
+    """Test a handed-off answer on /chat/stream."""
+
+    def test_stream_returns_worker_answer(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, model = build_supervisor(
+            WorkerHandoffMiddleware(WORKER_TOOLS),
+            tool_call("billing_support_tool", "refund"),
+            AIMessage(content="Rewritten by the LLM"),
+        )
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = TestClient(main.app).post(
+                "/chat/stream",
+                json={
+                    "message": "When will my refund arrive?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+        main.answer_cache.clear()
+
+        events = [
+            json.loads(line[len("data: ") :])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert (
+            "".join(e["content"] for e in events if e["type"] == "token")
+            == BILLING_ANSWER
+        )
+        assert events[-1]["type"] == "done"
+        assert model.calls == 1
@@ -0,0 +1,228 @@
+"""
+Unit Tests for Idempotency Keys.
+
+Tests IdempotencyStore (replay, waiting on an in-flight original, failures,
+key reuse, bounded size) and the Idempotency-Key header on /chat, which
+must not run the agent or add to the session history a second time.
+"""
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel
+from utils.idempotency import (
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+    request_fingerprint,
+)
+
+
+def build_supervisor(answer: str, delay: float = 0.0):
+    """Supervisor on a scripted model with a real checkpointer."""
+    model = ScriptedChatModel(responses=[AIMessage(content=answer)], delay=delay)
+    agent = create_agent(
+        model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+    )
+    return agent, model
+
+
+def counting(result="answer", delay=0.0, error: Exception | None = None):
+    """Coroutine function that counts its calls."""
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, calls
+
+
+# ============================================================================
+# IdempotencyStore Tests
+# ============================================================================
+
+
+class TestIdempotencyStore:
+    """Test running work once per key."""
+
+    async def test_duplicate_gets_stored_result(self):
+        store = IdempotencyStore()
+        fn, calls = counting()
+
+        first = await store.run("key-1", "fp", fn)
+        second = await store.run("key-1", "fp", fn)
+
+        assert first == ("answer", False)
+        assert second == ("answer", True)
+        assert len(calls) == 1
+
+    async def test_concurrent_duplicate_waits_for_original(self):
+        store = IdempotencyStore()
+        fn, calls = counting(delay=0.05)
+
+        results = await asyncio.gather(
+            store.run("key-1", "fp", fn), store.run("key-1", "fp", fn)
+        )
+
+        assert sorted(replayed for _, replayed in results) == [False, True]
+        assert len(calls) == 1
+        assert store.stats()["joined"] == 1
+
+    async def test_failure_is_not_stored(self):
+        store = IdempotencyStore()
+        fn, calls = counting(error=RuntimeError("LLM down"))
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await store.run("key-1", "fp", fn)
+
+        assert len(calls) == 2
+
+    async def test_cancelled_original_still_stores_result(self):
+        store = IdempotencyStore()
+        fn, calls = counting(delay=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(store.run("key-1", "fp", fn), timeout=0.01)
+        await asyncio.sleep(0.08)
+
+        assert await store.run("key-1", "fp", fn) == ("answer", True)
+        assert len(calls) == 1
+
+    async def test_key_reused_for_other_request(self):
+        store = IdempotencyStore()
+        fn, _ = counting()
+        await store.run("key-1", request_fingerprint("refund?"), fn)
+
+        with pytest.raises(IdempotencyKeyReusedError):
+            await store.run("key-1", request_fingerprint("invoice?"), fn)
+
+    async def test_store_is_bounded(self):
+        store = IdempotencyStore(max_entries=2)
+        fn, calls = counting()
+
+        for key in ("a", "b", "c"):
+            await store.run(key, "fp", fn)
+        # "a" was evicted, so it runs again
+        await store.run("a", "fp", fn)
+
+        assert len(calls) == 4
+        assert store.stats()["entries"] == 2
+
+
+# ============================================================================
+# /chat Idempotency-Key Tests
+# ============================================================================
+
+
+class TestChatIdempotencyKey:
+    """Test Idempotency-Key handling on /chat."""
+
+    def test_retry_replays_without_running_agent(self):
+        from backend import main
+
+        agent, model = build_supervisor("Refunds take 5 days.")
+        session_id = str(uuid.uuid4())
+        client = TestClient(main.app)
+        payload = {
+            "message": "Thanks, and how long do refunds take?",
+            "session_id": session_id,
+        }
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            first = client.post("/chat", json=payload, headers=headers)
+            retry = client.post("/chat", json=payload, headers=headers)
+
+        assert first.status_code == retry.status_code == 200
+        assert retry.json()["response"] == first.json()["response"]
+        assert retry.json()["metadata"]["source"] == "replay"
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        assert model.calls == 1
+
+        # The turn is in the history once
+        history = agent.get_state({"configurable": {"thread_id": session_id}}).values[
+            "messages"
+        ]
+        assert len(history) == 2
+
+    async def test_concurrent_retry_waits_for_original(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, model = build_supervisor("Your invoice is paid.", delay=0.2)
+        payload = {"message": "Is my invoice paid?", "session_id": str(uuid.uuid4())}
+        headers = {"Idempotency-Key": "retry-1"}
+
+        transport = httpx.ASGITransport(app=main.app)
+        with patch("backend.main.get_supervisor", return_value=agent):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                responses = await asyncio.gather(
+                    client.post("/chat", json=payload, headers=headers),
+                    client.post("/chat", json=payload, headers=headers),
+                )
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert sorted(r.json()["metadata"]["source"] for r in responses) == [
+            "agent",
+            "replay",
+        ]
+        assert model.calls == 1
+
+    def test_key_reused_with_different_message_is_rejected(self):
+        from backend import main
+
+        agent, _ = build_supervisor("Hello!")
+        session_id = str(uuid.uuid4())
+        client = TestClient(main.app)
+        headers = {"Idempotency-Key": "key-1"}
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            client.post(
+                "/chat",
+                json={"message": "Hi", "session_id": session_id},
+                headers=headers,
+            )
+            response = client.post(
+                "/chat",
+                json={"message": "Cancel my plan", "session_id": session_id},
+                headers=headers,
+            )
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["error"] == "Idempotency key reused"
+
+    def test_requests_without_key_run_every_time(self):
+        from backend import main
+
+        agent, model = build_supervisor("Sure.")
+        session_id = str(uuid.uuid4())
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            for _ in range(2):
+                client.post(
+                    "/chat",
+                    json={"message": "One more thing", "session_id": session_id},
+                )
+
+        assert model.calls == 2
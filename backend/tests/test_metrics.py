@@ -0,0 +1,186 @@
+"""
+Unit Tests for In-Process Metrics.
+
+Tests counter, gauge and histogram rendering in the Prometheus text format,
+stats flattening, and the /metrics endpoint (latency, routing, in-flight
+and error counters).
+"""
+
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel
+from utils.metrics import MetricsRegistry, flatten_stats
+
+# ============================================================================
+# MetricsRegistry Tests
+# ============================================================================
+
+
+class TestMetricsRegistry:
+    """Test metric types and the text exposition format."""
+
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry(namespace="app")
+        errors = registry.counter("errors_total", "Errors", ("error",))
+        in_flight = registry.gauge("in_flight", "In flight", ("endpoint",))
+
+        errors.inc("RateLimitError")
+        errors.inc("RateLimitError")
+        in_flight.inc("/chat")
+        in_flight.inc("/chat")
+        in_flight.dec("/chat")
+
+        text = registry.render()
+        assert "# TYPE app_errors_total counter" in text
+        assert 'app_errors_total{error="RateLimitError"} 2' in text
+        assert 'app_in_flight{endpoint="/chat"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 3.65" in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("total", "Total", ("name",)).inc('a"b\\c')
+
+        assert 'total{name="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_wrong_label_count_raises(self):
+        counter = MetricsRegistry().counter("total", "Total", ("a", "b"))
+
+        with pytest.raises(ValueError):
+            counter.inc("only-one")
+
+    def test_collectors_flatten_stats(self):
+        registry = MetricsRegistry(namespace="app")
+        registry.collector(
+            lambda: flatten_stats(
+                "limiter", {"enabled": True, "rejected": {"global": 2}, "mode": "x"}
+            )
+        )
+
+        text = registry.render()
+        assert "app_limiter_enabled 1" in text
+        assert "app_limiter_rejected_global 2" in text
+        assert "mode" not in text
+
+
+# ============================================================================
+# /metrics Endpoint Tests
+# ============================================================================
+
+
+class TestMetricsEndpoint:
+    """Test request, routing and error metrics recorded by the endpoints."""
+
+    def test_chat_records_latency_and_routing(self):
+        from backend import main
+
+        agent = Mock()
+        agent.invoke.return_value = {
+            "messages": [
+                HumanMessage(content="Why was I charged twice?"),
+                ToolMessage(
+                    content="...", name="billing_support_tool", tool_call_id="1"
+                ),
+                AIMessage(content="Refund issued."),
+            ]
+        }
+        client = TestClient(main.app)
+        requests_before = main.request_latency.count("/chat")
+        billing_before = main.supervisor_routes.value("billing")
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = client.post(
+                "/chat",
+                json={
+                    "message": "Why was I charged twice?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+
+        assert response.status_code == 200
+        assert main.request_latency.count("/chat") == requests_before + 1
+        assert main.supervisor_routes.value("billing") == billing_before + 1
+        assert main.requests_in_flight.value("/chat") == 0
+
+    def test_chat_counts_openai_errors_by_class(self):
+        from openai import APIConnectionError
+
+        from backend import main
+
+        agent = Mock()
+        agent.invoke.side_effect = APIConnectionError(
+            request=httpx.Request("POST", "https://api.openai.com")
+        )
+        client = TestClient(main.app)
+        before = main.llm_errors.value("APIConnectionError")
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = client.post(
+                "/chat", json={"message": "Hi", "session_id": str(uuid.uuid4())}
+            )
+
+        assert response.status_code == 503
+        assert main.llm_errors.value("APIConnectionError") == before + 1
+
+    def test_stream_records_ttft_and_direct_route(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        model = ScriptedChatModel(responses=[AIMessage(content="Hello there!")])
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+        client = TestClient(main.app)
+        ttft_before = main.time_to_first_token.count()
+        direct_before = main.supervisor_routes.value("direct")
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = client.post(
+                "/chat/stream",
+                json={"message": "Hello", "session_id": str(uuid.uuid4())},
+            )
+
+        assert response.status_code == 200
+        assert '"type":"done"' in response.text
+        assert main.time_to_first_token.count() == ttft_before + 1
+        assert main.supervisor_routes.value("direct") == direct_before + 1
+        assert main.requests_in_flight.value("/chat/stream") == 0
+
+    def test_metrics_endpoint_renders_text_format(self):
+        from backend import main
+
+        response = TestClient(main.app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "customer_service_checkpointer_sessions" in response.text
+        assert "customer_service_agent_executor_in_flight" in response.text
+        assert (
+            'customer_service_scheduler_tier_dispatched{tier="premium"}'
+            in response.text
+        )
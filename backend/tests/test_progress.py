@@ -0,0 +1,218 @@
+"""
+Unit Tests for Progress Events and SSE Heartbeats.
+
+Tests the progress events of routed and direct supervisor runs (including
+events from worker threads), interleaving them with the token stream,
+progress events on /chat/stream, and heartbeat comments on idle streams.
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel, tool_call
+from utils.progress import ProgressEvent, collect_progress, merge_progress
+from utils.replay import ReplayBuffers
+from utils.sse import HEARTBEAT
+
+WORKER_TOOLS = {"billing_support_tool": "billing"}
+RETRIEVAL_TOOLS = {"billing_docs_search": "billing"}
+
+
+def build_supervisor(routed: bool = True):
+    """Supervisor that routes to a billing worker which searches its docs first."""
+
+    @tool
+    def billing_docs_search(query: str) -> str:
+        """Search billing policies."""
+        return "Refunds are processed within 5 business days."
+
+    worker = create_agent(
+        model=ScriptedChatModel(
+            responses=[
+                tool_call("billing_docs_search", "refund"),
+                AIMessage(content="Refunds take 5 days."),
+            ]
+        ),
+        tools=[billing_docs_search],
+        name="billing_support_agent",
+    )
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        return worker.invoke({"messages": [{"role": "user", "content": query}]})[
+            "messages"
+        ][-1].content
+
+    responses = [AIMessage(content="Refunds take 5 days.")]
+    if routed:
+        responses.insert(0, tool_call("billing_support_tool", "refund"))
+    return create_agent(
+        model=ScriptedChatModel(responses=responses),
+        tools=[billing_support_tool],
+        checkpointer=InMemorySaver(),
+        name="supervisor_agent",
+    )
+
+
+async def run_with_progress(agent) -> list[ProgressEvent]:
+    with collect_progress(WORKER_TOOLS, RETRIEVAL_TOOLS) as progress:
+        # Streamed like stream_turn(), so models generate token by token
+        async for _ in agent.astream(
+            {"messages": [{"role": "user", "content": "How long do refunds take?"}]},
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+            stream_mode="messages",
+            subgraphs=True,
+        ):
+            pass
+    # Events from worker threads arrive through the loop
+    await asyncio.sleep(0)
+    events = []
+    while not progress.empty():
+        events.append(progress.get_nowait())
+    return events
+
+
+# ============================================================================
+# Progress Callback Tests
+# ============================================================================
+
+
+class TestProgressEvents:
+    """Test the stages reported for supervisor runs."""
+
+    async def test_routed_turn(self):
+        events = await run_with_progress(build_supervisor())
+
+        assert [
+            (e.type, e.fields.get("worker") or e.fields.get("agent")) for e in events
+        ] == [
+            ("routing", None),
+            ("worker_started", "billing"),
+            ("retrieval_done", None),
+            ("generating", "billing_support_agent"),
+            ("generating", "supervisor_agent"),
+        ]
+        assert events[2].fields["domain"] == "billing"
+        assert events[2].fields["retrieval_ms"] >= 0
+        elapsed = [e.fields["elapsed_ms"] for e in events]
+        assert elapsed == sorted(elapsed)
+
+    async def test_direct_answer(self):
+        events = await run_with_progress(build_supervisor(routed=False))
+
+        assert [e.type for e in events] == ["routing", "generating"]
+
+    async def test_no_events_outside_collector(self):
+        with collect_progress(WORKER_TOOLS, RETRIEVAL_TOOLS) as progress:
+            pass
+        await build_supervisor().ainvoke(
+            {"messages": [{"role": "user", "content": "refund?"}]},
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        )
+        await asyncio.sleep(0)
+
+        assert progress.empty()
+
+
+class TestMergeProgress:
+    """Test interleaving progress events with the token stream."""
+
+    async def test_events_are_yielded_in_arrival_order(self):
+        progress = asyncio.Queue()
+
+        async def tokens():
+            progress.put_nowait(ProgressEvent("routing", {}))
+            await asyncio.sleep(0.01)
+            yield "Hello"
+            progress.put_nowait(ProgressEvent("generating", {}))
+            await asyncio.sleep(0.01)
+            yield " world"
+
+        items = [item async for item in merge_progress(tokens(), progress)]
+
+        assert [getattr(item, "type", item) for item in items] == [
+            "routing",
+            "Hello",
+            "generating",
+            " world",
+        ]
+
+
+# ============================================================================
+# /chat/stream Progress and Heartbeat Tests
+# ============================================================================
+
+
+class TestStreamProgress:
+    """Test progress events and heartbeats on /chat/stream."""
+
+    def stream_event_types(self, main) -> list[str]:
+        client = TestClient(main.app)
+        with (
+            patch("backend.main.get_supervisor", return_value=build_supervisor()),
+            patch("backend.main.WORKER_DOMAINS", WORKER_TOOLS),
+            patch("backend.main.RETRIEVAL_TOOLS", RETRIEVAL_TOOLS),
+        ):
+            response = client.post(
+                "/chat/stream",
+                json={
+                    "message": "How long do refunds take?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+        return [
+            json.loads(line[len("data: ") :])["type"]
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+
+    def test_progress_precedes_first_token(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        types = self.stream_event_types(main)
+
+        assert types[:4] == ["start", "routing", "worker_started", "retrieval_done"]
+        assert types.index("generating") < types.index("token")
+        assert types[-1] == "done"
+
+    def test_progress_can_be_disabled(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        with patch("backend.main.STREAM_PROGRESS_EVENTS", False):
+            types = self.stream_event_types(main)
+
+        assert not {"routing", "worker_started", "retrieval_done", "generating"} & set(
+            types
+        )
+
+    async def test_idle_stream_gets_heartbeats(self):
+        buffer = ReplayBuffers().create("session-1")
+        buffer.append(b"data: {}\n\n")
+
+        async def finish_later():
+            await asyncio.sleep(0.07)
+            buffer.append(b"data: {}\n\n")
+            buffer.close()
+
+        asyncio.create_task(finish_later())
+        frames = [frame async for frame in buffer.follow(0, heartbeat=0.02)]
+
+        assert frames[1] == HEARTBEAT
+        assert HEARTBEAT not in (frames[0], frames[-1])
+        assert frames.count(HEARTBEAT) >= 2
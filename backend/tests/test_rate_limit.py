@@ -0,0 +1,201 @@
+"""
+Unit Tests for Token-Bucket Admission Control.
+
+Tests TokenBucket refill, RateLimiter global/per-session limits, queued
+admission, session bucket cleanup, and 429 responses on /chat and
+/chat/stream.
+"""
+
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.rate_limit import RateLimitedError, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Controllable time.monotonic() replacement."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("utils.rate_limit.time.monotonic", fake):
+        yield fake
+
+
+# ============================================================================
+# TokenBucket Tests
+# ============================================================================
+
+
+class TestTokenBucket:
+    """Test refill and wait-time computation."""
+
+    def test_refills_at_rate_up_to_burst(self):
+        bucket = TokenBucket(rate=2, burst=4, now=0.0)
+        bucket.tokens = 0
+
+        assert bucket.wait_time(0.25) == pytest.approx(0.25)
+        bucket.refill(10.0)
+        assert bucket.tokens == 4
+
+    def test_rejects_invalid_config(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, burst=1, now=0.0)
+
+
+# ============================================================================
+# RateLimiter Tests
+# ============================================================================
+
+
+class TestRateLimiter:
+    """Test global and per-session admission."""
+
+    def test_session_burst_then_reject_with_retry_after(self, clock):
+        limiter = RateLimiter(
+            global_rate=100, global_burst=100, session_rate=1, session_burst=2
+        )
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") == 0
+        with pytest.raises(RateLimitedError) as exc_info:
+            limiter.acquire("a")
+
+        assert exc_info.value.scope == "session"
+        assert exc_info.value.retry_after == pytest.approx(1.0)
+        assert exc_info.value.retry_after_header == "1"
+        # Other sessions are unaffected
+        assert limiter.acquire("b") == 0
+
+    def test_global_limit_applies_across_sessions(self, clock):
+        limiter = RateLimiter(
+            global_rate=2, global_burst=2, session_rate=10, session_burst=10
+        )
+
+        limiter.acquire("a")
+        limiter.acquire("b")
+        with pytest.raises(RateLimitedError) as exc_info:
+            limiter.acquire("c")
+
+        assert exc_info.value.scope == "global"
+        assert exc_info.value.retry_after == pytest.approx(0.5)
+
+    def test_short_waits_are_queued(self, clock):
+        limiter = RateLimiter(
+            global_rate=100,
+            global_burst=100,
+            session_rate=2,
+            session_burst=1,
+            max_wait=1,
+        )
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") == pytest.approx(0.5)
+        assert limiter.acquire("a") == pytest.approx(1.0)
+        with pytest.raises(RateLimitedError):
+            limiter.acquire("a")
+        assert limiter.stats()["delayed"] == 2
+
+    def test_tokens_recover_over_time(self, clock):
+        limiter = RateLimiter(
+            global_rate=100, global_burst=100, session_rate=1, session_burst=1
+        )
+
+        limiter.acquire("a")
+        clock.now += 1.0
+        assert limiter.acquire("a") == 0
+
+    def test_idle_session_buckets_are_dropped(self, clock):
+        limiter = RateLimiter(
+            global_rate=100, global_burst=100, session_rate=1, session_burst=2
+        )
+
+        for n in range(50):
+            limiter.acquire(f"session-{n}")
+        clock.now += 5.0
+        limiter.acquire("new-session")
+
+        assert limiter.stats()["session"]["tracked"] == 1
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+class TestAdmissionControlEndpoints:
+    """Test 429 responses before any LLM work."""
+
+    @pytest.fixture
+    def strict_limiter(self):
+        from backend import main
+
+        limiter = RateLimiter(
+            global_rate=100, global_burst=100, session_rate=0.1, session_burst=1
+        )
+        with (
+            patch.object(main, "RATE_LIMIT_ENABLED", True),
+            patch.object(main, "rate_limiter", limiter),
+        ):
+            yield limiter
+
+    def test_chat_rejects_before_invoking_agent(self, strict_limiter):
+        from backend import main
+
+        agent = Mock()
+        agent.invoke.return_value = {"messages": [Mock(content="Hi!", type="ai")]}
+        client = TestClient(main.app)
+        session_id = str(uuid.uuid4())
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            first = client.post(
+                "/chat", json={"message": "Hi", "session_id": session_id}
+            )
+            second = client.post(
+                "/chat", json={"message": "Hi again", "session_id": session_id}
+            )
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert second.headers["Retry-After"] == "10"
+        assert second.json()["detail"]["error"] == "Too many requests"
+        assert agent.invoke.call_count == 1
+
+    def test_stream_returns_real_429_status(self, strict_limiter):
+        from backend import main
+
+        client = TestClient(main.app)
+        session_id = str(uuid.uuid4())
+        strict_limiter.acquire(session_id)
+
+        with patch("backend.main.get_supervisor") as get_supervisor:
+            response = client.post(
+                "/chat/stream", json={"message": "Hi", "session_id": session_id}
+            )
+
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+        get_supervisor.assert_not_called()
+
+    def test_health_reports_bucket_state(self, strict_limiter):
+        from backend import main
+
+        data = TestClient(main.app).get("/health").json()
+        limiter_stats = data["performance"]["rate_limiter"]
+        assert limiter_stats["enabled"] is True
+        assert limiter_stats["global"]["burst"] == 100
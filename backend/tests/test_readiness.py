@@ -0,0 +1,269 @@
+"""
+Unit Tests for Startup Warm-Up and Readiness.
+
+Tests concurrent startup tasks, their failure reporting and retries with
+capped backoff, vector store reuse and warm-up searches, the LLM warm-up of
+the supervisor's model, the startup task list, and the /ready probe while
+the lifespan warm-up runs.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.supervisor_agent as supervisor_module
+import data.vectorstore as vectorstore_module
+from utils.readiness import Readiness
+
+# ============================================================================
+# Readiness Tests
+# ============================================================================
+
+
+class TestReadiness:
+    """Test running startup tasks and reporting their outcome."""
+
+    async def test_tasks_run_concurrently(self):
+        readiness = Readiness()
+        started = time.perf_counter()
+
+        ready = await readiness.run(
+            {f"task{n}": lambda: time.sleep(0.1) for n in range(4)}
+        )
+
+        assert ready is True
+        assert time.perf_counter() - started < 0.3
+        assert readiness.status()["tasks"]["task0"]["status"] == "ok"
+
+    async def test_failed_task_keeps_instance_unready(self):
+        readiness = Readiness()
+
+        def broken():
+            raise RuntimeError("Vector store for domain 'billing' could not be opened")
+
+        ready = await readiness.run(
+            {"agents": lambda: ["supervisor_agent"], "vectorstore:billing": broken}
+        )
+
+        status = readiness.status()
+        assert ready is False
+        assert status["ready"] is False
+        assert status["tasks"]["agents"]["result"] == ["supervisor_agent"]
+        assert "could not be opened" in status["tasks"]["vectorstore:billing"]["error"]
+
+    async def test_task_timeout(self):
+        readiness = Readiness()
+
+        await readiness.run({"llm": lambda: time.sleep(0.2)}, timeout=0.05)
+
+        assert readiness.status()["tasks"]["llm"]["error"] == "Timed out after 0.05s"
+
+    async def test_failed_task_is_retried_with_capped_backoff(self):
+        readiness = Readiness()
+        failures = iter([OSError("chroma locked")] * 4)
+
+        def flaky():
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return 42
+
+        with patch("utils.readiness.asyncio.sleep", new=AsyncMock()) as sleep:
+            ready = await readiness.run(
+                {"vectorstore:billing": flaky},
+                retry_initial_seconds=1,
+                retry_max_seconds=3,
+            )
+
+        task = readiness.status()["tasks"]["vectorstore:billing"]
+        assert ready is True
+        assert [call.args[0] for call in sleep.await_args_list] == [1, 2, 3, 3]
+        assert task["status"] == "ok"
+        assert task["attempts"] == 5
+        assert task["result"] == 42
+        assert "error" not in task
+
+    async def test_task_is_retrying_until_it_succeeds(self):
+        readiness = Readiness()
+        available = threading.Event()
+
+        def check():
+            if not available.is_set():
+                raise RuntimeError("Bedrock unavailable")
+
+        run = asyncio.create_task(
+            readiness.run({"llm": check}, retry_initial_seconds=0.01)
+        )
+        await asyncio.sleep(0.05)
+        status = readiness.status()
+        assert status["warming"] is True
+        assert status["tasks"]["llm"]["status"] == "retrying"
+        assert status["tasks"]["llm"]["error"] == "Bedrock unavailable"
+
+        available.set()
+        assert await asyncio.wait_for(run, 1) is True
+        assert readiness.status()["ready"] is True
+
+    def test_not_ready_before_startup(self):
+        status = Readiness().status()
+        assert status == {"ready": False, "warming": False, "tasks": {}}
+
+
+# ============================================================================
+# Vector Store Warm-Up Tests
+# ============================================================================
+
+
+class TestVectorStoreWarmUp:
+    """Test that vector stores are opened once and warmed with a search."""
+
+    def test_store_is_opened_once(self):
+        store = Mock()
+        with (
+            patch.dict(vectorstore_module._vectorstores, clear=True),
+            patch.object(
+                vectorstore_module, "_open_vectorstore", return_value=store
+            ) as open_store,
+        ):
+            assert vectorstore_module.get_vectorstore("billing") is store
+            assert vectorstore_module.get_vectorstore("billing") is store
+
+        open_store.assert_called_once()
+
+    def test_failed_open_is_retried(self):
+        store = Mock()
+        with (
+            patch.dict(vectorstore_module._vectorstores, clear=True),
+            patch.object(
+                vectorstore_module,
+                "_open_vectorstore",
+                side_effect=[OSError("locked"), store],
+            ),
+        ):
+            assert vectorstore_module.get_vectorstore("general") is None
+            assert vectorstore_module.get_vectorstore("general") is store
+
+    def test_warm_vectorstore_searches_and_counts(self):
+        store = Mock()
+        store._collection.count.return_value = 42
+        with patch.object(vectorstore_module, "get_vectorstore", return_value=store):
+            assert vectorstore_module.warm_vectorstore("technical", "error 500") == 42
+
+        store.similarity_search.assert_called_once_with("error 500", k=1)
+
+    def test_warm_vectorstore_raises_when_unavailable(self):
+        with (
+            patch.object(vectorstore_module, "get_vectorstore", return_value=None),
+            pytest.raises(RuntimeError),
+        ):
+            vectorstore_module.warm_vectorstore("technical")
+
+
+# ============================================================================
+# LLM Warm-Up Tests
+# ============================================================================
+
+
+class TestLLMWarmUp:
+    """Test that the LLM warm-up calls the model the supervisor uses."""
+
+    def test_supervisor_falls_back_to_openai_model(self):
+        with (
+            patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-fake-key-for-pytest"}),
+            patch.object(supervisor_module, "supervisor_model", None),
+            patch.object(
+                supervisor_module,
+                "create_agent",
+                side_effect=[ImportError("langchain-aws not installed"), Mock()],
+            ),
+        ):
+            supervisor_module.create_supervisor_agent(tools=[])
+            model = supervisor_module.get_supervisor_model()
+
+        assert model == supervisor_module.SUPERVISOR_FALLBACK_MODEL
+
+    def test_warm_up_llm_calls_supervisor_model(self):
+        from backend import main
+
+        with (
+            patch(
+                "backend.main.get_supervisor_model",
+                return_value=supervisor_module.SUPERVISOR_MODEL,
+            ),
+            patch("langchain.chat_models.init_chat_model") as init_chat_model,
+        ):
+            assert main.warm_up_llm() == supervisor_module.SUPERVISOR_MODEL
+
+        init_chat_model.assert_called_once_with(
+            supervisor_module.SUPERVISOR_MODEL, max_tokens=1
+        )
+        init_chat_model.return_value.invoke.assert_called_once_with("ping")
+
+
+# ============================================================================
+# Lifespan / Endpoint Tests
+# ============================================================================
+
+
+class TestReadyEndpoint:
+    """Test the startup task list and the /ready probe."""
+
+    def test_startup_tasks_without_warmup_queries(self):
+        from backend import main
+
+        with (
+            patch("backend.main.STARTUP_WARMUP_QUERIES", False),
+            patch("backend.main.warm_vectorstore", return_value=3) as warm,
+        ):
+            tasks = main.startup_tasks()
+            tasks["vectorstore:billing"]()
+
+        assert "llm" not in tasks
+        assert {
+            "agents",
+            "compliance_context",
+            "vectorstore:technical",
+            "vectorstore:general",
+        } <= set(tasks)
+        warm.assert_called_once_with("billing", None)
+
+    def test_ready_after_warmup_while_health_answers_immediately(self):
+        from backend import main
+
+        release = threading.Event()
+        tasks = {
+            "agents": lambda: ["supervisor_agent"],
+            "vectorstore:billing": lambda: release.wait(5),
+        }
+
+        with (
+            patch("backend.main.startup_tasks", return_value=tasks),
+            patch.object(main.agent_executor, "shutdown"),
+            patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-fake-key-for-pytest"}),
+            TestClient(main.app) as client,
+        ):
+            # Still warming: alive but not ready
+            assert client.get("/health").json()["ready"] is False
+            response = client.get("/ready")
+            assert response.status_code == 503
+            assert response.json()["warming"] is True
+
+            release.set()
+            for _ in range(100):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.01)
+
+        assert response.status_code == 200
+        assert response.json()["tasks"]["vectorstore:billing"]["status"] == "ok"
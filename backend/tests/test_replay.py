@@ -0,0 +1,443 @@
+"""
+Unit Tests for Resumable SSE Streams.
+
+Tests ReplayBuffer (ordered replay, live following, trimming), the
+per-stream, global and TTL bounds of ReplayBuffers, the slow-consumer
+policies (merging tokens or dropping the reader), and resuming
+/chat/stream with Last-Event-ID after it finished or while its agent run
+continues.
+"""
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel
+from utils.replay import (
+    ReplayBuffers,
+    ReplayGapError,
+    SlowConsumerError,
+    parse_event_id,
+)
+
+
+def frame(text: str) -> bytes:
+    return b"data: " + text.encode() + b"\n\n"
+
+
+async def read_all(buffer, after=0) -> list[bytes]:
+    return [data async for data in buffer.follow(after)]
+
+
+async def read_all_until(buffer, stop) -> list[bytes]:
+    return [data async for data in buffer.follow(0, stop=stop)]
+
+
+def parse_events(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: ") :])
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def event_ids(body: str) -> list[str]:
+    return [
+        line[len("id: ") :] for line in body.splitlines() if line.startswith("id: ")
+    ]
+
+
+# ============================================================================
+# ReplayBuffer Tests
+# ============================================================================
+
+
+class TestReplayBuffer:
+    """Test event IDs, replay and live following of one stream."""
+
+    async def test_events_get_sequential_ids(self):
+        buffer = ReplayBuffers().create("session-1")
+        for text in ("a", "b", "c"):
+            buffer.append(frame(text))
+        buffer.close()
+
+        events = await read_all(buffer)
+
+        assert events[0] == f"id: {buffer.stream_id}:1\n".encode() + frame("a")
+        assert [parse_event_id(e.split(b"\n")[0][4:].decode())[1] for e in events] == [
+            1,
+            2,
+            3,
+        ]
+
+    async def test_follow_resumes_after_event(self):
+        buffer = ReplayBuffers().create("session-1")
+        for text in ("a", "b", "c"):
+            buffer.append(frame(text))
+        buffer.close()
+
+        events = await read_all(buffer, after=2)
+
+        assert len(events) == 1
+        assert events[0].endswith(frame("c"))
+
+    async def test_reader_gets_live_events_until_close(self):
+        buffer = ReplayBuffers().create("session-1")
+        buffer.append(frame("a"))
+        reader = asyncio.create_task(read_all(buffer))
+
+        await asyncio.sleep(0.01)
+        buffer.append(frame("b"))
+        await asyncio.sleep(0.01)
+        assert not reader.done()
+        buffer.close()
+
+        assert len(await reader) == 2
+
+    async def test_stop_ends_follow(self):
+        buffer = ReplayBuffers().create("session-1")
+        stop = asyncio.Event()
+        reader = asyncio.create_task(read_all_until(buffer, stop))
+        await asyncio.sleep(0.01)
+
+        stop.set()
+        buffer.wake()
+
+        assert await asyncio.wait_for(reader, 1) == []
+        assert buffer.readers == 0
+
+    async def test_trimmed_events_cannot_be_resumed(self):
+        buffer = ReplayBuffers(max_stream_bytes=100).create("session-1")
+        for n in range(10):
+            buffer.append(frame(f"token {n}"))
+        buffer.close()
+
+        assert buffer.size <= 100
+        assert buffer.can_resume(buffer.last_seq - 1)
+        assert not buffer.can_resume(0)
+        with pytest.raises(ReplayGapError):
+            await read_all(buffer, after=0)
+
+
+def test_parse_event_id():
+    assert parse_event_id("3f2c9a:17") == ("3f2c9a", 17)
+    for bad in ("17", "3f2c9a:", "3f2c9a:x"):
+        with pytest.raises(ValueError):
+            parse_event_id(bad)
+
+
+# ============================================================================
+# ReplayBuffers Bounds Tests
+# ============================================================================
+
+
+class TestReplayBuffers:
+    """Test the global memory cap, TTL and resume checks."""
+
+    def test_global_cap_evicts_finished_streams_first(self):
+        buffers = ReplayBuffers(max_bytes=300, max_stream_bytes=1000)
+        finished = buffers.create("session-1")
+        finished.append(frame("x" * 100))
+        finished.close()
+        running = buffers.create("session-2")
+        running.append(frame("y" * 100))
+
+        running.append(frame("z" * 100))
+
+        assert buffers.get(finished.stream_id) is None
+        assert buffers.get(running.stream_id) is running
+        assert buffers.stats()["evicted"] == 1
+        assert buffers.stats()["bytes"] <= 300
+
+    def test_global_cap_trims_running_stream(self):
+        buffers = ReplayBuffers(max_bytes=300, max_stream_bytes=1000)
+        buffer = buffers.create("session-1")
+        for _ in range(5):
+            buffer.append(frame("y" * 100))
+
+        assert buffers.stats()["bytes"] == buffer.size <= 300
+        assert buffers.stats()["trimmed_bytes"] > 0
+
+    def test_finished_streams_expire(self):
+        buffers = ReplayBuffers(ttl_seconds=60)
+        buffer = buffers.create("session-1")
+        buffer.append(frame("a"))
+        buffer.close()
+
+        with patch("utils.replay.time.monotonic", return_value=time.monotonic() + 61):
+            assert buffers.get(buffer.stream_id) is None
+
+        assert buffers.stats()["expired"] == 1
+        assert buffers.stats()["bytes"] == 0
+
+    def test_resume_checks_session(self):
+        buffers = ReplayBuffers()
+        buffer = buffers.create("session-1")
+        buffer.append(frame("a"))
+
+        assert buffers.resume(buffer.stream_id, "session-2", 0) is None
+        assert buffers.resume(buffer.stream_id, "session-1", 1) is buffer
+        assert buffers.resume(buffer.stream_id, "session-1", 5) is None
+
+
+# ============================================================================
+# Slow Consumer Tests
+# ============================================================================
+
+
+def merge(agent, text) -> bytes:
+    return frame(f"{agent}:{text}")
+
+
+class TestSlowConsumer:
+    """Test the policies for readers that fall behind the producer."""
+
+    def filled_buffer(self, buffers):
+        buffer = buffers.create("session-1")
+        buffer.append(frame("start"))
+        for word in ("Your ", "invoice ", "is ", "paid"):
+            buffer.append(frame(word), token=(None, word))
+        buffer.append(frame("done"))
+        buffer.close()
+        return buffer
+
+    async def test_lagging_reader_gets_merged_tokens(self):
+        buffers = ReplayBuffers()
+        buffer = self.filled_buffer(buffers)
+
+        events = [data async for data in buffer.follow(0, max_lag=20, merge=merge)]
+
+        assert events[1] == f"id: {buffer.stream_id}:5\n".encode() + frame(
+            "None:Your invoice is paid"
+        )
+        assert events[2].endswith(frame("done"))
+        assert len(events) == 3
+        assert buffers.stats()["coalesced_tokens"] == 3
+
+    async def test_reader_within_limit_gets_every_token(self):
+        buffer = self.filled_buffer(ReplayBuffers())
+
+        events = [data async for data in buffer.follow(0, max_lag=10_000, merge=merge)]
+
+        assert len(events) == 6
+
+    async def test_lagging_reader_without_merge_is_dropped(self):
+        buffers = ReplayBuffers()
+        buffer = self.filled_buffer(buffers)
+
+        with pytest.raises(SlowConsumerError):
+            [data async for data in buffer.follow(0, max_lag=20)]
+
+        assert buffers.stats()["dropped_readers"] == 1
+
+    async def test_high_water_marks(self):
+        buffers = ReplayBuffers()
+        buffer = self.filled_buffer(buffers)
+        [data async for data in buffer.follow(0)]
+
+        stats = buffers.stats()
+        assert stats["peak_bytes"] == stats["bytes"] == buffer.size
+        assert stats["max_lag_bytes"] == buffer.max_lag == buffer.size
+
+
+# ============================================================================
+# /chat/stream Resume Tests
+# ============================================================================
+
+
+class TestStreamResume:
+    """Test reconnecting to /chat/stream with Last-Event-ID."""
+
+    def test_resume_finished_stream(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        model = ScriptedChatModel(
+            responses=[AIMessage(content="Refunds take five business days")]
+        )
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+        client = TestClient(main.app)
+        payload = {
+            "message": "How long do refunds take?",
+            "session_id": str(uuid.uuid4()),
+        }
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            first = client.post("/chat/stream", json=payload)
+            ids = event_ids(first.text)
+            resumed = client.post(
+                "/chat/stream", json=payload, headers={"Last-Event-ID": ids[1]}
+            )
+
+        assert resumed.status_code == 200
+        assert event_ids(resumed.text) == ids[2:]
+        assert first.text.endswith(resumed.text)
+        assert model.calls == 1
+
+    def test_unknown_or_foreign_stream_is_gone(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent = create_agent(
+            model=ScriptedChatModel(responses=[AIMessage(content="Hi")]),
+            tools=[],
+            checkpointer=InMemorySaver(),
+            name="supervisor_agent",
+        )
+        client = TestClient(main.app)
+        payload = {"message": "Hello", "session_id": str(uuid.uuid4())}
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            last_id = event_ids(client.post("/chat/stream", json=payload).text)[-1]
+            foreign = client.post(
+                "/chat/stream",
+                json={**payload, "session_id": str(uuid.uuid4())},
+                headers={"Last-Event-ID": last_id},
+            )
+            unknown = client.post(
+                "/chat/stream", json=payload, headers={"Last-Event-ID": "nope:3"}
+            )
+
+        assert foreign.status_code == unknown.status_code == 410
+        assert unknown.json()["detail"]["error"] == "Stream expired"
+
+    async def read_late(self, main, agent, policy):
+        """Start a stream and read it only after the agent run has finished."""
+        from starlette.requests import Request
+
+        async def connected_receive():
+            await asyncio.sleep(3600)
+
+        chat_request = main.ChatRequest(
+            message="Is invoice 42 paid?", session_id=str(uuid.uuid4())
+        )
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("backend.main.SSE_FLUSH_INTERVAL", 0),
+            patch("backend.main.SSE_CONSUMER_MAX_LAG_BYTES", 100),
+            patch("backend.main.SSE_SLOW_CONSUMER_POLICY", policy),
+        ):
+            response = await main.chat_stream_endpoint(
+                chat_request,
+                Request(
+                    {"type": "http", "method": "POST", "headers": []}, connected_receive
+                ),
+                x_priority_tier=None,
+                x_tenant_id=None,
+                x_request_timeout=None,
+                last_event_id=None,
+            )
+            await asyncio.sleep(0.2)
+            body = b"".join([chunk async for chunk in response.body_iterator]).decode()
+        return parse_events(body)
+
+    async def test_slow_client_gets_coalesced_tokens(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        model = ScriptedChatModel(
+            responses=[AIMessage(content="Your invoice 42 was paid on March 3")]
+        )
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+
+        events = await self.read_late(main, agent, "coalesce")
+
+        tokens = [e["content"] for e in events if e["type"] == "token"]
+        assert "".join(tokens) == "Your invoice 42 was paid on March 3"
+        assert len(tokens) < 8
+        assert events[-1]["type"] == "done"
+
+    async def test_slow_client_is_dropped(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        model = ScriptedChatModel(
+            responses=[AIMessage(content="Your invoice 42 was paid on March 3")]
+        )
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+
+        events = await self.read_late(main, agent, "drop")
+
+        assert events[-1]["error"] == "Stream dropped"
+        assert model.calls == 1
+
+    async def test_resume_while_run_continues(self):
+        from starlette.requests import Request
+
+        from backend import main
+
+        main.answer_cache.clear()
+        model = ScriptedChatModel(
+            responses=[AIMessage(content="Your invoice is paid")], delay=0.3
+        )
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+        chat_request = main.ChatRequest(
+            message="Is invoice 42 paid?", session_id=str(uuid.uuid4())
+        )
+        headers = {
+            "x_priority_tier": None,
+            "x_tenant_id": None,
+            "x_request_timeout": None,
+        }
+
+        # The first connection drops while the LLM call is running
+        disconnect_at = time.monotonic() + 0.1
+
+        async def dropping_receive():
+            if time.monotonic() >= disconnect_at:
+                return {"type": "http.disconnect"}
+            await asyncio.sleep(3600)
+
+        async def connected_receive():
+            await asyncio.sleep(3600)
+
+        def http_request(receive):
+            return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("backend.main.STREAM_DISCONNECT_POLL_SECONDS", 0.02),
+        ):
+            response = await main.chat_stream_endpoint(
+                chat_request,
+                http_request(dropping_receive),
+                last_event_id=None,
+                **headers,
+            )
+            first = b"".join([chunk async for chunk in response.body_iterator]).decode()
+            assert '"type":"done"' not in first
+
+            response = await main.chat_stream_endpoint(
+                chat_request,
+                http_request(connected_receive),
+                last_event_id=event_ids(first)[-1],
+                **headers,
+            )
+            resumed = b"".join(
+                [chunk async for chunk in response.body_iterator]
+            ).decode()
+
+        assert "Your invoice is paid" in resumed
+        assert '"type":"done"' in resumed
+        assert model.calls == 1
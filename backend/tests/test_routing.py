@@ -0,0 +1,627 @@
+"""
+Unit Tests for Fast-Path Routing.
+
+Tests the rule router against the labelled routing regression set and the
+supervisor prompt's tie-breaking rules, training, saving and loading the
+intent classifier, the embedding-centroid router and the reuse of its
+query embedding for the knowledge base search, and the FastPathMiddleware
+on a scripted supervisor: clear-cut messages reach the worker without the
+routing LLM call on first turns, direct decisions keep the tools, everything else goes
+to the LLM as before.
+"""
+
+import json
+import logging
+import sys
+import uuid
+from pathlib import Path
+from typing import ClassVar
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.embedding_router import EmbeddingRouter
+from agents.intent_classifier import (
+    DEFAULT_MODEL_PATH,
+    IntentClassifier,
+)
+from agents.intent_classifier import (
+    load_examples as load_training,
+)
+from agents.routing import DIRECT_DOMAIN, FastPathMiddleware, RouteDecision, RuleRouter
+from data import vectorstore
+from tests.fake_models import KeywordEmbeddings, ScriptedChatModel, tool_call
+
+EXAMPLES_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "routing_examples.jsonl"
+)
+HELDOUT_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "heldout_queries.jsonl"
+)
+VALIDATION_PATH = (
+    Path(__file__).parent.parent / "data" / "routing" / "validation_queries.jsonl"
+)
+DOMAIN_TOOLS = {
+    "technical": "technical_support_tool",
+    "billing": "billing_support_tool",
+}
+
+
+def load_examples() -> list[dict]:
+    with open(EXAMPLES_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ============================================================================
+# Rule Router Tests
+# ============================================================================
+
+
+class TestRuleRouter:
+    """Test routing decisions of the rule router."""
+
+    @pytest.mark.parametrize("example", load_examples(), ids=lambda e: e["query"][:40])
+    def test_regression_set(self, example):
+        decision = RuleRouter().route(example["query"])
+
+        expected = None if example["domain"] == "direct" else example["domain"]
+        assert (decision.domain if decision else None) == expected
+
+    @pytest.mark.parametrize(
+        "query, domain",
+        [
+            ("What is your refund policy?", "compliance"),
+            ("My payment failed with an error", "technical"),
+            ("How do I cancel my subscription?", "billing"),
+            ("Can you delete my account and all my data?", "compliance"),
+        ],
+    )
+    def test_tie_breaking_rules(self, query, domain):
+        assert RuleRouter().route(query).domain == domain
+
+    def test_ambiguous_message_is_left_to_llm(self):
+        router = RuleRouter()
+
+        # Billing and general score the same
+        assert (
+            router.scores("Where can I find my invoices?")["billing"]
+            == router.scores("Where can I find my invoices?")["general"]
+        )
+        assert router.route("Where can I find my invoices?") is None
+
+    def test_confidence_reflects_margin(self):
+        decision = RuleRouter().route("The app crashes with error 500")
+
+        assert decision == RouteDecision("technical", 1.0, "rules")
+        assert RuleRouter().route("How do I set up a payment method?").confidence < 1.0
+
+    def test_thresholds(self):
+        assert RuleRouter(min_score=10).route("The app crashes with error 500") is None
+        assert (
+            RuleRouter(min_margin=0).route("Where can I find my invoices?") is not None
+        )
+
+
+class TestIntentClassifier:
+    """Test training, saving and loading the intent classifier."""
+
+    QUERIES: ClassVar[list[str]] = [
+        "the app crashes on start",
+        "error 500 on login",
+        "page is broken",
+        "refund my payment",
+        "I was charged twice",
+        "send my invoice",
+        "hello",
+        "thanks a lot",
+        "hi there",
+    ]
+    LABELS = ["technical"] * 3 + ["billing"] * 3 + [DIRECT_DOMAIN] * 3
+
+    def test_learns_training_queries(self):
+        classifier = IntentClassifier.train(
+            self.QUERIES, self.LABELS, min_confidence=0.0
+        )
+
+        assert [classifier.route(q).domain for q in self.QUERIES] == self.LABELS
+        probabilities = classifier.predict_proba("my app crashes")
+        assert max(probabilities, key=probabilities.get) == "technical"
+        assert sum(probabilities.values()) == pytest.approx(1.0)
+
+    def test_low_confidence_is_left_to_llm(self):
+        classifier = IntentClassifier.train(
+            self.QUERIES, self.LABELS, min_confidence=0.99
+        )
+
+        # Unknown words only: the class priors decide, far below 0.99
+        assert classifier.route("zzz qqq") is None
+
+    def test_save_and_load(self, tmp_path):
+        classifier = IntentClassifier.train(self.QUERIES, self.LABELS)
+        path = tmp_path / "router.npz"
+        classifier.save(path)
+
+        loaded = IntentClassifier.load(path, min_confidence=0.4)
+
+        assert loaded.classes == classifier.classes
+        assert loaded.min_confidence == 0.4
+        for query in self.QUERIES:
+            assert loaded.predict_proba(query) == pytest.approx(
+                classifier.predict_proba(query), abs=1e-2
+            )
+
+    def test_invalid_training_data(self):
+        with pytest.raises(ValueError):
+            IntentClassifier.train([], [])
+        with pytest.raises(ValueError):
+            IntentClassifier.train(["hello", "hi"], ["direct", "direct"])
+
+    @pytest.mark.parametrize(
+        "path, min_coverage, min_precision",
+        [
+            # The default threshold is chosen on the validation split
+            (VALIDATION_PATH, 0.6, 0.98),
+            (EXAMPLES_PATH, 0.6, 0.98),
+            # Used neither for training nor for choosing the threshold
+            (HELDOUT_PATH, 0.5, 0.85),
+        ],
+    )
+    def test_shipped_model_coverage_and_precision(
+        self, path, min_coverage, min_precision
+    ):
+        classifier = IntentClassifier.load(DEFAULT_MODEL_PATH)
+        queries, labels = load_training(path)
+
+        decisions = [classifier.route(query) for query in queries]
+        routed = [
+            (d.domain, label) for d, label in zip(decisions, labels) if d is not None
+        ]
+        correct = sum(domain == label for domain, label in routed)
+
+        # Not in the training data; routing a vague message ("llm") counts
+        # as a mistake
+        assert len(routed) / len(queries) >= min_coverage
+        assert correct / len(routed) >= min_precision
+
+
+class TestEmbeddingRouter:
+    """Test routing by nearest knowledge base centroid."""
+
+    CORPORA: ClassVar[dict[str, list[str]]] = {
+        "technical": [
+            "Error 500 means the server crashed",
+            "Clear the cache when the app crashes",
+        ],
+        "billing": [
+            "Refunds are issued within 5 days",
+            "Invoices list every charge on your card",
+        ],
+        "compliance": [
+            "We process personal data under GDPR",
+            "You may request deletion of personal data",
+        ],
+    }
+
+    def build(self, embeddings=None, **kwargs) -> EmbeddingRouter:
+        embeddings = embeddings or KeywordEmbeddings()
+        corpora = {
+            domain: np.array(embeddings.embed_documents(texts))
+            for domain, texts in self.CORPORA.items()
+        }
+        # Keyword-overlap similarities are not on the scale of real embeddings
+        kwargs = {"min_similarity": 0.1, "min_margin": 0.1, **kwargs}
+        return EmbeddingRouter(
+            *EmbeddingRouter.build_vectors(corpora),
+            embed=embeddings.embed_query,
+            **kwargs,
+        )
+
+    def test_routes_to_nearest_domain(self):
+        router = self.build()
+
+        assert router.route("The app crashes with error 500").domain == "technical"
+        assert router.route("Refund the charge on my card").domain == "billing"
+        assert router.route("Delete my personal data").domain == "compliance"
+
+    def test_ambiguous_or_unrelated_message_is_left_to_llm(self):
+        router = self.build()
+
+        # Shares one keyword each with billing and compliance / technical
+        assert router.route("refunds gdpr") is None
+        assert router.route("refund crashed") is None
+        assert router.route("hello there") is None
+
+    def test_embedding_failure_is_left_to_llm(self):
+        router = self.build()
+        router.embed = Mock(side_effect=RuntimeError("API down"))
+
+        assert router.route("Refund the charge on my card") is None
+
+    def test_save_and_load(self, tmp_path, caplog):
+        embeddings = KeywordEmbeddings()
+        corpora = {
+            domain: np.array(embeddings.embed_documents(texts))
+            for domain, texts in self.CORPORA.items()
+        }
+        path = tmp_path / "centroids.npz"
+        EmbeddingRouter.save_vectors(
+            path, *EmbeddingRouter.build_vectors(corpora), "keywords", "kb-1"
+        )
+
+        router = EmbeddingRouter.load(
+            path,
+            embed=embeddings.embed_query,
+            embedding_model="keywords",
+            min_similarity=0.1,
+            min_margin=0.1,
+        )
+        assert router.route("Refund the charge on my card").domain == "billing"
+
+        with caplog.at_level(logging.WARNING):
+            EmbeddingRouter.load(
+                path, embed=embeddings.embed_query, knowledge_base_version="kb-2"
+            )
+        assert "rebuild" in caplog.text
+        with pytest.raises(ValueError):
+            EmbeddingRouter.load(
+                path, embed=embeddings.embed_query, embedding_model="other-model"
+            )
+
+    async def test_async_supervisor_run_awaits_embedding(self):
+        embeddings = KeywordEmbeddings()
+
+        async def aembed(text):
+            return embeddings.embed_query(text)
+
+        router = self.build(embeddings)
+        router.embed = Mock(
+            side_effect=AssertionError("blocking embed on the event loop")
+        )
+        router.aembed = aembed
+        fast_path = FastPathMiddleware([router], DOMAIN_TOOLS)
+        agent, model, worker_calls = build_supervisor(
+            fast_path, [AIMessage(content="Refunds take 5 days.")]
+        )
+
+        await agent.ainvoke(
+            {"messages": [{"role": "user", "content": "Refund the charge on my card"}]},
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        )
+
+        assert model.calls == 1
+        assert worker_calls == [("billing", "Refund the charge on my card")]
+
+
+class TestQueryEmbeddingReuse:
+    """Test that a routed message is not embedded again for retrieval."""
+
+    def setup_method(self):
+        vectorstore.query_embeddings.clear()
+
+    def test_search_reuses_routing_embedding(self):
+        embeddings = Mock()
+        embeddings.embed_query.return_value = [0.1, 0.2]
+        store = Mock()
+        with patch("data.vectorstore.get_embeddings", return_value=embeddings):
+            vectorstore.embed_query("Refund the charge on my card")
+            vectorstore.embed_query("Refund the charge on my card")
+            vectorstore.similarity_search(store, "Refund the charge on my card", k=3)
+
+        embeddings.embed_query.assert_called_once()
+        store.similarity_search_by_vector.assert_called_once_with([0.1, 0.2], k=3)
+        store.similarity_search.assert_not_called()
+
+    def test_search_without_cached_embedding(self):
+        store = Mock()
+
+        vectorstore.similarity_search(store, "How do refunds work?", k=3)
+
+        store.similarity_search.assert_called_once_with("How do refunds work?", k=3)
+
+    def test_routed_search_uses_message_embedding(self):
+        vectorstore.query_embeddings.set("I was charged twice", [0.1, 0.2])
+        store = Mock()
+
+        with vectorstore.routed_query_scope():
+            vectorstore.set_routed_query("billing", "I was charged twice")
+            # Another domain's store and the worker's own wording do not matter
+            vectorstore.similarity_search(
+                store, "duplicate charge", k=3, domain="technical"
+            )
+            vectorstore.similarity_search(
+                store, "duplicate charge", k=3, domain="billing"
+            )
+            # Only the first search of the routed domain
+            vectorstore.similarity_search(
+                store, "refund timeline", k=3, domain="billing"
+            )
+
+        store.similarity_search_by_vector.assert_called_once_with([0.1, 0.2], k=3)
+        assert [c.args[0] for c in store.similarity_search.call_args_list] == [
+            "duplicate charge",
+            "refund timeline",
+        ]
+
+    def test_set_routed_query_outside_scope_is_ignored(self):
+        vectorstore.query_embeddings.set("I was charged twice", [0.1, 0.2])
+        store = Mock()
+
+        vectorstore.set_routed_query("billing", "I was charged twice")
+        vectorstore.similarity_search(store, "duplicate charge", k=3, domain="billing")
+
+        store.similarity_search.assert_called_once_with("duplicate charge", k=3)
+
+    def test_fast_path_passes_message_to_worker_search(self):
+        class AlwaysBilling:
+            name = "always_billing"
+
+            def route(self, message):
+                return RouteDecision("billing", 1.0, self.name)
+
+        store = Mock()
+        store.similarity_search_by_vector.return_value = []
+
+        @tool
+        def billing_support_tool(query: str) -> str:
+            """Handle billing questions."""
+            # The worker searches with its own rewording of the message
+            vectorstore.similarity_search(
+                store, "duplicate card charge refund", k=3, domain="billing"
+            )
+            return "Refunds take 5 days."
+
+        fast_path = FastPathMiddleware(
+            [AlwaysBilling()],
+            {"billing": "billing_support_tool"},
+            on_route=vectorstore.set_routed_query,
+        )
+        agent = create_agent(
+            model=ScriptedChatModel(
+                responses=[AIMessage(content="Refunds take 5 days.")]
+            ),
+            tools=[billing_support_tool],
+            checkpointer=InMemorySaver(),
+            middleware=[fast_path],
+            name="supervisor_agent",
+        )
+        # e.g. embedded for the semantic cache before the run
+        vectorstore.query_embeddings.set("I was charged twice", [0.1, 0.2])
+
+        with vectorstore.routed_query_scope():
+            agent.invoke(
+                {"messages": [{"role": "user", "content": "I was charged twice"}]},
+                {"configurable": {"thread_id": str(uuid.uuid4())}},
+            )
+
+        store.similarity_search_by_vector.assert_called_once_with([0.1, 0.2], k=3)
+        store.similarity_search.assert_not_called()
+
+
+# ============================================================================
+# Fast-Path Middleware Tests
+# ============================================================================
+
+
+def build_supervisor(
+    fast_path: FastPathMiddleware,
+    responses: list[AIMessage] | None = None,
+    model: ScriptedChatModel | None = None,
+):
+    """Scripted supervisor with technical and billing worker tools."""
+    worker_calls = []
+
+    @tool
+    def technical_support_tool(query: str) -> str:
+        """Handle technical issues."""
+        worker_calls.append(("technical", query))
+        return "Clear your cache and retry."
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        worker_calls.append(("billing", query))
+        return "Refunds take 5 days."
+
+    model = model or ScriptedChatModel(responses=responses)
+    agent = create_agent(
+        model=model,
+        tools=[technical_support_tool, billing_support_tool],
+        checkpointer=InMemorySaver(),
+        middleware=[fast_path],
+        name="supervisor_agent",
+    )
+    return agent, model, worker_calls
+
+
+class TestFastPathMiddleware:
+    """Test the supervisor with fast-path routing."""
+
+    def test_clear_cut_message_skips_routing_call(self):
+        fast_path = FastPathMiddleware([RuleRouter()], DOMAIN_TOOLS)
+        agent, model, worker_calls = build_supervisor(
+            fast_path, [AIMessage(content="Clear your cache and retry.")]
+        )
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+        result = agent.invoke(
+            {"messages": [{"role": "user", "content": "I get error 500 on login"}]},
+            config,
+        )
+
+        # One model call: the final answer after the worker
+        assert model.calls == 1
+        assert worker_calls == [("technical", "I get error 500 on login")]
+        assert result["messages"][-1].content == "Clear your cache and retry."
+        tool_messages = [m for m in result["messages"] if isinstance(m, ToolMessage)]
+        assert tool_messages[0].name == "technical_support_tool"
+        # The routed turn is in the checkpoint like an LLM-routed one
+        history = agent.get_state(config).values["messages"]
+        assert [type(m).__name__ for m in history] == [
+            "HumanMessage",
+            "AIMessage",
+            "ToolMessage",
+            "AIMessage",
+        ]
+        assert fast_path.stats()["routed"] == {"rules": {"technical": 1}}
+
+    async def test_async_run(self):
+        fast_path = FastPathMiddleware([RuleRouter()], DOMAIN_TOOLS)
+        agent, model, worker_calls = build_supervisor(
+            fast_path, [AIMessage(content="Refunds take 5 days.")]
+        )
+
+        result = await agent.ainvoke(
+            {"messages": [{"role": "user", "content": "When will my refund arrive?"}]},
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        )
+
+        assert model.calls == 1
+        assert worker_calls == [("billing", "When will my refund arrive?")]
+        assert result["messages"][-1].content == "Refunds take 5 days."
+
+    def test_unclear_message_falls_back_to_llm(self):
+        fast_path = FastPathMiddleware([RuleRouter()], DOMAIN_TOOLS)
+        agent, model, worker_calls = build_supervisor(
+            fast_path, [AIMessage(content="Hello! How can I help?")]
+        )
+
+        result = agent.invoke(
+            {"messages": [{"role": "user", "content": "Hello there!"}]},
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        )
+
+        assert model.calls == 1
+        assert worker_calls == []
+        assert result["messages"][-1].content == "Hello! How can I help?"
+        assert fast_path.stats()["fallback"] == 1
+
+    def test_domain_without_worker_tool_falls_back(self):
+        fast_path = FastPathMiddleware([RuleRouter()], DOMAIN_TOOLS)
+        agent, model, worker_calls = build_supervisor(
+            fast_path,
+            [
+                tool_call("billing_support_tool", "gdpr"),
+                AIMessage(content="See billing."),
+            ],
+        )
+
+        agent.invoke(
+            {"messages": [{"role": "user", "content": "What are my GDPR rights?"}]},
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        )
+
+        # Compliance is not among DOMAIN_TOOLS: the LLM routed this turn
+        assert model.calls == 2
+        assert worker_calls == [("billing", "gdpr")]
+
+    def test_direct_answer_keeps_tools(self):
+        class AlwaysDirect:
+            name = "always_direct"
+
+            def route(self, message):
+                return RouteDecision(DIRECT_DOMAIN, 1.0, self.name)
+
+        class ToolRecordingModel(ScriptedChatModel):
+            bound_tools: ClassVar[list] = []
+
+            def bind_tools(self, tools, **kwargs):
+                self.bound_tools.append([t.name for t in tools])
+                return self
+
+        model = ToolRecordingModel(
+            responses=[
+                tool_call("billing_support_tool", "refund"),
+                AIMessage(content="Refunds take 5 days."),
+            ],
+            bound_tools=[],
+        )
+        fast_path = FastPathMiddleware([AlwaysDirect()], DOMAIN_TOOLS)
+        agent, _, worker_calls = build_supervisor(fast_path, model=model)
+
+        result = agent.invoke(
+            {
+                "messages": [
+                    {"role": "user", "content": "Hi! When will my refund arrive?"}
+                ]
+            },
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        )
+
+        # A wrong "direct" does not stop the LLM from routing the message
+        assert model.bound_tools[0] == [
+            "technical_support_tool",
+            "billing_support_tool",
+        ]
+        assert worker_calls == [("billing", "refund")]
+        assert result["messages"][-1].content == "Refunds take 5 days."
+        assert fast_path.stats()["routed"] == {"always_direct": {DIRECT_DOMAIN: 1}}
+
+    def test_follow_up_turns_go_to_llm(self):
+        fast_path = FastPathMiddleware([RuleRouter()], DOMAIN_TOOLS)
+        agent, model, worker_calls = build_supervisor(
+            fast_path,
+            [
+                AIMessage(content="Clear your cache and retry."),
+                tool_call(
+                    "technical_support_tool",
+                    "Login error 500 persists after clearing the cache",
+                ),
+                AIMessage(content="Try another browser."),
+            ],
+        )
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+        agent.invoke(
+            {"messages": [{"role": "user", "content": "I get error 500 on login"}]},
+            config,
+        )
+        agent.invoke(
+            {
+                "messages": [
+                    {"role": "user", "content": "It still does not work, same error"}
+                ]
+            },
+            config,
+        )
+
+        # The follow-up reached the worker with the LLM's self-contained query
+        assert worker_calls == [
+            ("technical", "I get error 500 on login"),
+            ("technical", "Login error 500 persists after clearing the cache"),
+        ]
+        assert model.calls == 3
+        assert fast_path.stats()["routed"] == {"rules": {"technical": 1}}
+
+    def test_routers_are_asked_in_order(self):
+        class AlwaysBilling:
+            name = "always_billing"
+
+            def route(self, message):
+                return RouteDecision("billing", 1.0, self.name)
+
+        fast_path = FastPathMiddleware([RuleRouter(), AlwaysBilling()], DOMAIN_TOOLS)
+
+        assert fast_path.decide([]) is None
+        agent, _, _ = build_supervisor(fast_path, [AIMessage(content="Done.")])
+        for message in ("The app crashes on startup", "Hello!"):
+            agent.invoke(
+                {"messages": [{"role": "user", "content": message}]},
+                {"configurable": {"thread_id": str(uuid.uuid4())}},
+            )
+
+        stats = fast_path.stats()
+        assert stats["routers"] == ["rules", "always_billing"]
+        assert stats["routed"] == {
+            "rules": {"technical": 1},
+            "always_billing": {"billing": 1},
+        }
+        assert stats["fallback"] == 0
+        assert stats["mean_route_us"] > 0
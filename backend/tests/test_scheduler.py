@@ -0,0 +1,193 @@
+"""
+Unit Tests for the Weighted Fair Scheduler.
+
+Tests FairScheduler concurrency limits, weighted shares across tiers,
+fairness across tenants of one tier, cancelled waiters, tier parsing, and
+queue wait reporting on /chat and /health.
+"""
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.scheduler import FairScheduler, Flow, parse_tier_weights
+
+WEIGHTS = {"premium": 4, "standard": 2, "free": 1}
+
+
+async def run_backlog(scheduler: FairScheduler, flows: list[Flow]) -> list[Flow]:
+    """Queue one job per flow behind a held slot; return dispatch order."""
+    order = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot(Flow("standard")):
+            await release.wait()
+
+    async def job(flow):
+        async with scheduler.slot(flow):
+            order.append(flow)
+            await asyncio.sleep(0)
+
+    holding = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    jobs = [asyncio.create_task(job(flow)) for flow in flows]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holding, *jobs)
+    return order
+
+
+# ============================================================================
+# FairScheduler Tests
+# ============================================================================
+
+
+class TestFairScheduler:
+    """Test slot limits and deficit round-robin dispatch."""
+
+    async def test_limits_concurrent_runs(self):
+        scheduler = FairScheduler(max_concurrent=3, weights=WEIGHTS)
+        running = peak = 0
+
+        async def job():
+            nonlocal running, peak
+            async with scheduler.slot(Flow("standard")):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(job() for _ in range(10)))
+
+        assert peak == 3
+        assert scheduler.running == 0
+        assert scheduler.queued == 0
+
+    async def test_backlog_is_shared_by_tier_weight(self):
+        scheduler = FairScheduler(max_concurrent=1, weights=WEIGHTS)
+        flows = [Flow("standard", "s")] * 30 + [Flow("premium", "p")] * 30
+
+        order = await run_backlog(scheduler, flows)
+
+        # While both are backlogged premium gets twice standard's slots
+        first = order[:30]
+        assert first.count(Flow("premium", "p")) == 20
+        assert first.count(Flow("standard", "s")) == 10
+
+    async def test_burst_from_one_tenant_does_not_starve_another(self):
+        scheduler = FairScheduler(max_concurrent=1, weights=WEIGHTS)
+        flows = [Flow("standard", "big")] * 50 + [Flow("standard", "small")] * 3
+
+        order = await run_backlog(scheduler, flows)
+
+        # Same tier, so the small tenant alternates with the big one
+        # instead of waiting behind all 50 jobs
+        last_small = max(i for i, flow in enumerate(order) if flow.tenant == "small")
+        assert last_small < 10
+
+    async def test_cancelled_waiter_is_removed(self):
+        scheduler = FairScheduler(max_concurrent=1, weights=WEIGHTS)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot(Flow("standard")):
+                await release.wait()
+
+        async def waiter():
+            async with scheduler.slot(Flow("free", "t")):
+                pass
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await holding
+
+        assert scheduler.queued == 0
+        assert scheduler.running == 0
+        # The freed slot is immediately usable again
+        async with scheduler.slot(Flow("standard")) as queue_wait:
+            assert queue_wait == 0
+
+    async def test_reports_queue_wait_per_tier(self):
+        scheduler = FairScheduler(max_concurrent=1, weights=WEIGHTS)
+
+        async def job(tier):
+            async with scheduler.slot(Flow(tier)):
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(job("premium"), job("free"))
+
+        tiers = scheduler.stats()["tiers"]
+        assert tiers["premium"]["dispatched"] == 1
+        assert tiers["free"]["wait_seconds_max"] >= 0.015
+
+    def test_unknown_tier_maps_to_default(self):
+        scheduler = FairScheduler(max_concurrent=1, weights=WEIGHTS)
+
+        assert scheduler.flow("PREMIUM", "acme") == Flow("premium", "acme")
+        assert scheduler.flow("platinum") == Flow("standard")
+        assert scheduler.flow(None, "") == Flow("standard")
+
+    def test_parse_tier_weights(self):
+        assert parse_tier_weights("premium:4, free:0.5") == {
+            "premium": 4.0,
+            "free": 0.5,
+        }
+        with pytest.raises(ValueError):
+            parse_tier_weights("premium:0")
+        with pytest.raises(ValueError):
+            FairScheduler(
+                max_concurrent=1, weights={"premium": 1}, default_tier="standard"
+            )
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+class TestSchedulerEndpoints:
+    """Test tier headers and queue wait reporting."""
+
+    def test_chat_reports_tier_and_queue_wait(self):
+        from backend import main
+
+        agent = Mock()
+        agent.invoke.return_value = {"messages": [Mock(content="Hi!", type="ai")]}
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = client.post(
+                "/chat",
+                json={"message": "Hello", "session_id": str(uuid.uuid4())},
+                headers={"X-Priority-Tier": "premium", "X-Tenant-ID": "acme"},
+            )
+
+        assert response.status_code == 200
+        metadata = response.json()["metadata"]
+        assert metadata["tier"] == "premium"
+        assert metadata["source"] == "agent"
+        assert metadata["queue_wait_ms"] >= 0
+
+    def test_health_reports_scheduler(self):
+        from backend import main
+
+        data = TestClient(main.app).get("/health").json()
+        scheduler_stats = data["performance"]["scheduler"]
+        assert scheduler_stats["max_concurrent"] >= 1
+        assert set(scheduler_stats["tiers"]) >= {"premium", "standard", "free"}
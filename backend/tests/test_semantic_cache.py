@@ -0,0 +1,320 @@
+"""
+Unit Tests for the Semantic Answer Cache.
+
+Tests the NumPy ring-buffer SemanticCache (similarity threshold, domain
+and knowledge base version scoping, overwrite and expiry), routed-domain
+detection, and paraphrase hits on /chat, scoped to the domain the fast-path
+routers pick. Uses a deterministic keyword embedding, so no API calls.
+"""
+
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.supervisor_agent import routed_domain
+from data import vectorstore
+from tests.fake_models import KeywordEmbeddings, ScriptedChatModel
+from utils.semantic_cache import SemanticCache
+
+embed = KeywordEmbeddings().embed_query
+
+
+# ============================================================================
+# SemanticCache Tests
+# ============================================================================
+
+
+class TestSemanticCache:
+    """Test vectorized similarity lookup over the ring buffer."""
+
+    def test_paraphrase_above_threshold_hits(self):
+        cache = SemanticCache(capacity=8, threshold=0.9)
+        cache.add(
+            embed("refund policy?"),
+            "refund policy",
+            "Refunds within 30 days",
+            "compliance",
+        )
+
+        hit = cache.search(embed("What's your policy on refunds"))
+
+        assert hit is not None
+        assert hit.answer == "Refunds within 30 days"
+        assert hit.domain == "compliance"
+        assert hit.score == pytest.approx(1.0)
+
+    def test_unrelated_query_misses(self):
+        cache = SemanticCache(capacity=8, threshold=0.9)
+        cache.add(
+            embed("refund policy?"),
+            "refund policy",
+            "Refunds within 30 days",
+            "compliance",
+        )
+
+        assert cache.search(embed("Error 500 on login")) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_returns_best_match(self):
+        cache = SemanticCache(capacity=8, threshold=0.5)
+        cache.add(embed("refund invoice"), "refund invoice", "partial", "billing")
+        cache.add(embed("refund policy"), "refund policy", "best", "compliance")
+
+        assert cache.search(embed("policy for refunds")).answer == "best"
+
+    def test_domain_scoping(self):
+        cache = SemanticCache(capacity=8, threshold=0.9)
+        cache.add(embed("cancel plan"), "cancel plan", "Billing answer", "billing")
+
+        assert cache.search(embed("cancel plan"), domain="compliance") is None
+        assert (
+            cache.search(embed("cancel plan"), domain="billing").answer
+            == "Billing answer"
+        )
+
+    def test_version_scoping(self):
+        cache = SemanticCache(capacity=8, threshold=0.9)
+        cache.add(embed("cancel plan"), "cancel plan", "Old answer", "billing", "v1")
+
+        assert cache.search(embed("cancel plan"), "billing", "v2") is None
+        assert cache.search(embed("cancel plan"), "billing", "v1").answer == (
+            "Old answer"
+        )
+
+    def test_ring_buffer_overwrites_oldest(self):
+        cache = SemanticCache(capacity=2, threshold=0.99)
+        cache.add(embed("pricing plans"), "pricing plans", "first", "billing")
+        cache.add(embed("reset password"), "reset password", "second", "technical")
+        cache.add(embed("delete data"), "delete data", "third", "compliance")
+
+        assert len(cache) == 2
+        assert cache.search(embed("pricing plans")) is None
+        assert cache.search(embed("delete data")).answer == "third"
+
+    def test_expired_entries_are_ignored(self):
+        cache = SemanticCache(capacity=4, threshold=0.9, ttl_seconds=10)
+        with patch("utils.semantic_cache.time.monotonic", return_value=100.0):
+            cache.add(embed("pricing plans"), "pricing plans", "answer", "billing")
+        with patch("utils.semantic_cache.time.monotonic", return_value=111.0):
+            assert cache.search(embed("pricing plans")) is None
+
+    def test_rejects_mismatched_dimensions(self):
+        cache = SemanticCache(capacity=4)
+        cache.add(np.ones(8), "q", "a", "direct")
+
+        with pytest.raises(ValueError):
+            cache.add(np.ones(16), "q", "a", "direct")
+        assert cache.search(np.ones(16)) is None
+
+    def test_zero_vector_is_ignored(self):
+        cache = SemanticCache(capacity=4)
+        cache.add(np.zeros(8), "q", "a", "direct")
+        assert len(cache) == 0
+
+
+# ============================================================================
+# Routed Domain Tests
+# ============================================================================
+
+
+class TestRoutedDomain:
+    """Test detection of the worker that handled a turn."""
+
+    def test_worker_tool_maps_to_domain(self):
+        messages = [
+            HumanMessage(content="Refund?"),
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "billing_support_tool",
+                        "args": {"query": "Refund?"},
+                        "id": "1",
+                    }
+                ],
+            ),
+            ToolMessage(
+                content="Refunds...", name="billing_support_tool", tool_call_id="1"
+            ),
+            AIMessage(content="Refunds..."),
+        ]
+        assert routed_domain(messages) == "billing"
+
+    def test_no_tool_call_is_direct(self):
+        assert (
+            routed_domain([HumanMessage(content="Hi"), AIMessage(content="Hello!")])
+            == "direct"
+        )
+
+
+# ============================================================================
+# /chat Endpoint Tests
+# ============================================================================
+
+
+class TestSemanticCacheEndpoint:
+    """Test paraphrase hits on /chat with the semantic cache enabled."""
+
+    @pytest.fixture(autouse=True)
+    def semantic_cache_enabled(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        main.semantic_cache.clear()
+        vectorstore.query_embeddings.clear()
+        with (
+            patch.object(main, "SEMANTIC_CACHE_ENABLED", True),
+            patch("data.vectorstore.get_embeddings", return_value=KeywordEmbeddings()),
+        ):
+            yield
+        main.answer_cache.clear()
+        main.semantic_cache.clear()
+        vectorstore.query_embeddings.clear()
+
+    def test_paraphrase_is_served_from_semantic_cache(self):
+        from backend import main
+
+        model = ScriptedChatModel(
+            responses=[AIMessage(content="Refunds within 30 days")]
+        )
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+        client = TestClient(main.app)
+        second = str(uuid.uuid4())
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            client.post(
+                "/chat",
+                json={"message": "Refund policy?", "session_id": str(uuid.uuid4())},
+            )
+            response = client.post(
+                "/chat",
+                json={"message": "What's your policy on refunds", "session_id": second},
+            )
+
+        assert response.json()["response"] == "Refunds within 30 days"
+        assert model.calls == 1
+        history = agent.get_state({"configurable": {"thread_id": second}}).values[
+            "messages"
+        ]
+        assert [m.content for m in history] == [
+            "What's your policy on refunds",
+            "Refunds within 30 days",
+        ]
+
+    @pytest.mark.parametrize(
+        "domain, served", [("compliance", True), ("billing", False)]
+    )
+    def test_lookup_is_scoped_to_routed_domain(self, domain, served):
+        from backend import main
+
+        # The rule router sends "Refund policy?" to compliance
+        main.semantic_cache.add(
+            embed("refund policy"),
+            "refund policy",
+            "Cached answer",
+            domain,
+            main.get_knowledge_base_version(),
+        )
+        model = ScriptedChatModel(responses=[AIMessage(content="Answer")])
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = TestClient(main.app).post(
+                "/chat",
+                json={"message": "Refund policy?", "session_id": str(uuid.uuid4())},
+            )
+
+        assert (response.json()["response"] == "Cached answer") is served
+        assert model.calls == (0 if served else 1)
+
+    @pytest.mark.parametrize("domain, served", [("direct", True), ("billing", False)])
+    def test_unrouted_lookup_only_serves_direct_answers(self, domain, served):
+        from backend import main
+
+        # No fast-path router is confident about this message
+        main.semantic_cache.add(
+            embed("refund policy"),
+            "refund policy",
+            "Cached answer",
+            domain,
+            main.get_knowledge_base_version(),
+        )
+        model = ScriptedChatModel(responses=[AIMessage(content="Answer")])
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = TestClient(main.app).post(
+                "/chat",
+                json={
+                    "message": "What's your policy on refunds",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+
+        assert (response.json()["response"] == "Cached answer") is served
+        assert model.calls == (0 if served else 1)
+
+    def test_answers_from_an_older_knowledge_base_are_not_served(self):
+        from backend import main
+
+        main.semantic_cache.add(
+            embed("refund policy"),
+            "refund policy",
+            "Cached answer",
+            "compliance",
+            "old-version",
+        )
+        model = ScriptedChatModel(responses=[AIMessage(content="Answer")])
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = TestClient(main.app).post(
+                "/chat",
+                json={"message": "Refund policy?", "session_id": str(uuid.uuid4())},
+            )
+
+        assert response.json()["response"] == "Answer"
+        assert model.calls == 1
+
+    def test_embedding_failure_falls_back_to_agent(self):
+        from backend import main
+
+        model = ScriptedChatModel(responses=[AIMessage(content="Answer")])
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+        broken = KeywordEmbeddings()
+        broken.embed_query = lambda text: (_ for _ in ()).throw(
+            RuntimeError("no API key")
+        )
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("data.vectorstore.get_embeddings", return_value=broken),
+        ):
+            response = TestClient(main.app).post(
+                "/chat", json={"message": "Pricing?", "session_id": str(uuid.uuid4())}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["response"] == "Answer"
+        assert len(main.semantic_cache) == 0
@@ -0,0 +1,173 @@
+"""
+Unit Tests for Per-Session Turn Serialization.
+
+Tests the KeyedLock primitive (FIFO per key, parallel across keys, cleanup,
+pending limit) and a stress test firing concurrent same-session and
+cross-session /chat requests at a scripted model.
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel
+from utils.keyed_lock import KeyBusyError, KeyedLock
+
+# ============================================================================
+# KeyedLock Tests
+# ============================================================================
+
+
+class TestKeyedLock:
+    """Test per-key serialization and cleanup."""
+
+    async def test_same_key_runs_in_arrival_order(self):
+        locks = KeyedLock()
+        log = []
+
+        async def turn(n):
+            async with locks.hold("session"):
+                log.append(("start", n))
+                await asyncio.sleep(0.01)
+                log.append(("end", n))
+
+        await asyncio.gather(*(turn(n) for n in range(4)))
+
+        assert log == [(kind, n) for n in range(4) for kind in ("start", "end")]
+
+    async def test_different_keys_run_in_parallel(self):
+        locks = KeyedLock()
+
+        async def turn(key):
+            async with locks.hold(key):
+                await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(turn(k) for k in range(10)))
+
+        assert time.perf_counter() - started < 0.25
+
+    async def test_idle_locks_are_removed(self):
+        locks = KeyedLock()
+
+        async def turn(key):
+            async with locks.hold(key):
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(turn(k % 3) for k in range(9)))
+
+        assert locks.active_keys == 0
+        assert locks.stats()["contended"] > 0
+
+    async def test_cancelled_waiter_does_not_leak(self):
+        locks = KeyedLock()
+        release = asyncio.Event()
+
+        async def holder():
+            async with locks.hold("s"):
+                await release.wait()
+
+        async def waiter():
+            async with locks.hold("s"):
+                pass
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        assert locks.pending("s") == 1
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await holding
+
+        assert locks.active_keys == 0
+
+    async def test_rejects_beyond_max_pending(self):
+        locks = KeyedLock(max_pending=1)
+        release = asyncio.Event()
+
+        async def turn():
+            async with locks.hold("s"):
+                await release.wait()
+
+        tasks = [asyncio.create_task(turn()) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(KeyBusyError):
+            async with locks.hold("s"):
+                pass
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert locks.stats()["rejected"] == 1
+
+
+# ============================================================================
+# /chat Stress Test
+# ============================================================================
+
+
+class TestSessionSerializationStress:
+    """Fire concurrent same-session and cross-session /chat requests."""
+
+    async def test_same_session_turns_do_not_interleave(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        model = ScriptedChatModel(responses=[AIMessage(content="ack")], delay=0.05)
+        agent = create_agent(
+            model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+        )
+
+        busy = str(uuid.uuid4())
+        others = [str(uuid.uuid4()) for _ in range(6)]
+        requests = [(busy, f"busy message {n}") for n in range(6)]
+        requests += [
+            (session, f"other message {n}") for n, session in enumerate(others)
+        ]
+
+        transport = httpx.ASGITransport(app=main.app)
+        with patch("backend.main.get_supervisor", return_value=agent):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                started = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/chat", json={"message": message, "session_id": session}
+                        )
+                        for session, message in requests
+                    )
+                )
+                elapsed = time.perf_counter() - started
+
+        assert all(r.status_code == 200 for r in responses)
+        assert model.calls == len(requests)
+
+        # The busy session holds every turn, in order, as human/ai pairs
+        history = agent.get_state({"configurable": {"thread_id": busy}}).values[
+            "messages"
+        ]
+        assert [m.type for m in history] == ["human", "ai"] * 6
+        assert [m.content for m in history if m.type == "human"] == [
+            f"busy message {n}" for n in range(6)
+        ]
+
+        # Cross-session turns overlapped: well under the fully serial time
+        assert elapsed < 0.05 * len(requests)
+        assert main.session_locks.active_keys == 0
@@ -0,0 +1,264 @@
+"""
+Unit Tests for Single-Flight Coalescing of First-Turn Questions.
+
+Tests the SingleFlight primitive, message normalization, session history
+helpers, and /chat coalescing identical concurrent first messages.
+"""
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.supervisor_agent import record_turn, session_has_history
+from tests.fake_models import ScriptedChatModel
+from utils.singleflight import SingleFlight
+from utils.text import normalize_message
+
+
+def build_supervisor(answer: str, delay: float = 0.0):
+    """Supervisor on a scripted model with a real checkpointer."""
+    model = ScriptedChatModel(responses=[AIMessage(content=answer)], delay=delay)
+    agent = create_agent(
+        model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+    )
+    return agent, model
+
+
+def thread(session_id: str) -> dict:
+    return {"configurable": {"thread_id": session_id}}
+
+
+# ============================================================================
+# normalize_message Tests
+# ============================================================================
+
+
+class TestNormalizeMessage:
+    """Test message normalization for coalescing keys."""
+
+    def test_case_whitespace_and_edge_punctuation(self):
+        assert normalize_message("  Error 500 on   LOGIN?! ") == "error 500 on login"
+
+    def test_keeps_inner_punctuation(self):
+        assert normalize_message("error 5.00") != normalize_message("error 500")
+
+
+# ============================================================================
+# SingleFlight Tests
+# ============================================================================
+
+
+class TestSingleFlight:
+    """Test deduplication of concurrent calls."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert calls == 1
+        assert [r for r, _ in results] == ["answer"] * 5
+        assert sum(1 for _, shared in results if shared) == 4
+        assert flight.stats()["coalescing_rate"] == 0.8
+        assert flight.in_flight == 0
+
+    async def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "x"
+
+        await asyncio.gather(flight.do("a", work), flight.do("b", work))
+        assert flight.stats()["executions"] == 2
+
+    async def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        async def work():
+            return "x"
+
+        await flight.do("k", work)
+        _, shared = await flight.do("k", work)
+        assert shared is False
+
+    async def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("LLM failure")
+
+        results = await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.in_flight == 0
+
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ("done", True)
+
+
+# ============================================================================
+# Session History Helpers
+# ============================================================================
+
+
+class TestSessionHistory:
+    """Test checkpoint helpers used for shared answers."""
+
+    def test_new_session_has_no_history(self):
+        agent, _ = build_supervisor("hi")
+        assert session_has_history(agent, thread("fresh")) is False
+
+    def test_record_turn_makes_follow_ups_see_history(self):
+        agent, _ = build_supervisor("follow-up answer")
+        config = thread("recorded")
+
+        record_turn(agent, config, "Error 500 on login", "Clear your cache")
+
+        assert session_has_history(agent, config) is True
+        result = agent.invoke(
+            {"messages": [{"role": "user", "content": "Still broken"}]}, config
+        )
+        assert [m.content for m in result["messages"]] == [
+            "Error 500 on login",
+            "Clear your cache",
+            "Still broken",
+            "follow-up answer",
+        ]
+
+
+# ============================================================================
+# /chat Endpoint Coalescing
+# ============================================================================
+
+
+class TestChatCoalescing:
+    """Test that /chat coalesces identical concurrent first turns."""
+
+    async def test_identical_first_turns_share_one_supervisor_run(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, model = build_supervisor("Please clear your cache", delay=0.2)
+        sessions = [str(uuid.uuid4()) for _ in range(4)]
+        messages = [
+            "Error 500 on login",
+            "error 500 on login?",
+            "ERROR 500 ON LOGIN",
+            "Error 500 on login",
+        ]
+        before = main.first_turn_flight.stats()["coalesced"]
+
+        transport = httpx.ASGITransport(app=main.app)
+        with patch("backend.main.get_supervisor", return_value=agent):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                responses = await asyncio.gather(
+                    *(
+                        client.post("/chat", json={"message": m, "session_id": s})
+                        for m, s in zip(messages, sessions)
+                    )
+                )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert all(r.json()["response"] == "Please clear your cache" for r in responses)
+        assert model.calls == 1
+        assert main.first_turn_flight.stats()["coalesced"] - before == 3
+
+        # Every waiter has the exchange in its own history, with its own wording
+        for message, session_id in zip(messages, sessions):
+            history = agent.get_state(thread(session_id)).values["messages"]
+            assert [m.content for m in history] == [message, "Please clear your cache"]
+
+    async def test_different_time_budgets_are_not_coalesced(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        agent, model = build_supervisor("Please clear your cache", delay=0.2)
+
+        transport = httpx.ASGITransport(app=main.app)
+        with patch("backend.main.get_supervisor", return_value=agent):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/chat",
+                            json={
+                                "message": "Error 502 on login",
+                                "session_id": str(uuid.uuid4()),
+                            },
+                            headers={"X-Request-Timeout": timeout},
+                        )
+                        for timeout in ("5", "30")
+                    )
+                )
+
+        assert all(r.status_code == 200 for r in responses)
+        # The 5s request's deadline must not bound the 30s request's run
+        assert model.calls == 2
+
+    async def test_follow_up_turns_are_not_coalesced(self):
+        from backend import main
+
+        agent, model = build_supervisor("answer", delay=0.1)
+        sessions = [str(uuid.uuid4()) for _ in range(2)]
+        for session_id in sessions:
+            record_turn(agent, thread(session_id), "Hi", "Hello!")
+
+        transport = httpx.ASGITransport(app=main.app)
+        with patch("backend.main.get_supervisor", return_value=agent):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                await asyncio.gather(
+                    *(
+                        client.post(
+                            "/chat", json={"message": "Thanks", "session_id": s}
+                        )
+                        for s in sessions
+                    )
+                )
+
+        assert model.calls == 2
+
+    def test_health_reports_coalescing_stats(self):
+        from fastapi.testclient import TestClient
+
+        from backend import main
+
+        data = TestClient(main.app).get("/health").json()
+        assert "coalescing_rate" in data["performance"]["single_flight"]
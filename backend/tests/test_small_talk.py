@@ -0,0 +1,209 @@
+"""
+Unit Tests for Small-Talk Template Replies.
+
+Tests detecting greetings, thanks, feedback and goodbyes (and leaving
+anything else to the supervisor), loading template libraries, and template
+replies on /chat and /chat/stream that skip the LLM but still land in the
+session's history.
+"""
+
+import json
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.small_talk import SmallTalk
+from tests.fake_models import ScriptedChatModel
+
+
+def build_supervisor(*answers: str):
+    model = ScriptedChatModel(responses=[AIMessage(content=a) for a in answers])
+    agent = create_agent(
+        model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+    )
+    return agent, model
+
+
+def history(agent, session_id: str) -> list[str]:
+    state = agent.get_state({"configurable": {"thread_id": session_id}})
+    return [m.content for m in state.values["messages"]]
+
+
+# ============================================================================
+# Detection Tests
+# ============================================================================
+
+
+class TestSmallTalk:
+    """Test small-talk detection with the default template library."""
+
+    @pytest.fixture(scope="class")
+    def small_talk(self) -> SmallTalk:
+        return SmallTalk.load()
+
+    @pytest.mark.parametrize(
+        "message, category",
+        [
+            ("Hello", "greeting"),
+            ("Hi there!", "greeting"),
+            ("Good morning", "greeting"),
+            ("Thank you", "thanks"),
+            ("Thanks, appreciate it", "thanks"),
+            ("That helped a lot", "feedback"),
+            ("Great service!", "feedback"),
+            ("Bye", "goodbye"),
+            ("See you later", "goodbye"),
+            # Chained phrases: the last one decides
+            ("Thanks, bye!", "goodbye"),
+        ],
+    )
+    def test_detects_small_talk(self, small_talk, message, category):
+        assert small_talk.category(message) == category
+        assert small_talk.reply(message) in small_talk.responses[category]
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "Hi, my app crashes on startup",
+            "Thanks, but I still get error 500",
+            "What do you mean?",
+            "history",
+            "Hi-5",
+            "",
+        ],
+    )
+    def test_leaves_other_messages_to_supervisor(self, small_talk, message):
+        assert small_talk.reply(message) is None
+
+    def test_custom_library(self, tmp_path):
+        path = tmp_path / "templates.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "greeting": {
+                        "patterns": ["ahoy"],
+                        "responses": ["Ahoy! How can I help?"],
+                    }
+                }
+            )
+        )
+
+        small_talk = SmallTalk.load(path)
+
+        assert small_talk.reply("Ahoy!") == "Ahoy! How can I help?"
+        assert small_talk.reply("Hello") is None
+
+    @pytest.mark.parametrize(
+        "templates",
+        [
+            {"greeting": {"patterns": ["hi"], "responses": []}},
+            {"greeting": {"patterns": ["(hi"], "responses": ["Hello!"]}},
+            {"small talk": {"patterns": ["hi"], "responses": ["Hello!"]}},
+        ],
+    )
+    def test_invalid_library(self, templates):
+        with pytest.raises(ValueError):
+            SmallTalk(templates)
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+class TestSmallTalkEndpoints:
+    """Test template replies on /chat and /chat/stream."""
+
+    @pytest.fixture(autouse=True)
+    def enable_small_talk(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        with patch("backend.main.SMALL_TALK_ENABLED", True):
+            yield
+        main.answer_cache.clear()
+
+    def test_chat_answers_without_llm_and_keeps_history(self):
+        from backend import main
+
+        agent, model = build_supervisor("Refunds take 5 days.")
+        client = TestClient(main.app)
+        session_id = str(uuid.uuid4())
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            greeting = client.post(
+                "/chat", json={"message": "Hello!", "session_id": session_id}
+            )
+            question = client.post(
+                "/chat",
+                json={"message": "How long do refunds take?", "session_id": session_id},
+            )
+            thanks = client.post(
+                "/chat", json={"message": "Thanks!", "session_id": session_id}
+            )
+
+        assert greeting.json()["response"] in main.small_talk.responses["greeting"]
+        assert greeting.json()["metadata"]["source"] == "small_talk"
+        assert question.json()["metadata"]["source"] == "agent"
+        assert thanks.json()["response"] in main.small_talk.responses["thanks"]
+        # Only the real question ran the supervisor
+        assert model.calls == 1
+        assert history(agent, session_id) == [
+            "Hello!",
+            greeting.json()["response"],
+            "How long do refunds take?",
+            "Refunds take 5 days.",
+            "Thanks!",
+            thanks.json()["response"],
+        ]
+
+    def test_stream_answers_without_llm(self):
+        from backend import main
+
+        agent, model = build_supervisor("unused")
+        client = TestClient(main.app)
+        session_id = str(uuid.uuid4())
+
+        with patch("backend.main.get_supervisor", return_value=agent):
+            response = client.post(
+                "/chat/stream",
+                json={"message": "Good morning", "session_id": session_id},
+            )
+
+        events = [
+            json.loads(line[len("data: ") :])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert [e["type"] for e in events] == ["start", "token", "done"]
+        assert events[1]["content"] in main.small_talk.responses["greeting"]
+        assert events[2]["cached"] is False
+        assert model.calls == 0
+        assert history(agent, session_id) == ["Good morning", events[1]["content"]]
+
+    def test_disabled(self):
+        from backend import main
+
+        agent, model = build_supervisor("Hello from the LLM")
+        client = TestClient(main.app)
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("backend.main.SMALL_TALK_ENABLED", False),
+        ):
+            response = client.post(
+                "/chat", json={"message": "Hello", "session_id": str(uuid.uuid4())}
+            )
+
+        assert response.json()["response"] == "Hello from the LLM"
+        assert model.calls == 1
@@ -0,0 +1,148 @@
+"""
+Unit Tests for the SSE Writer and Token Coalescing.
+
+Tests event framing, pre-encoded token prefixes, and time/byte-window
+coalescing of token chunks.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.streaming import TokenChunk
+from utils.sse import SSEWriter, coalesce_tokens
+
+SESSION_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def decode(frame: bytes) -> dict:
+    """Decode a single framed SSE event into its JSON payload."""
+    text = frame.decode("utf-8")
+    assert text.startswith("data: ")
+    assert text.endswith("\n\n")
+    assert "\n" not in text[:-2]
+    return json.loads(text[len("data: ") : -2])
+
+
+async def scripted(items, delays=None):
+    """Yield items, sleeping before each according to delays."""
+    for i, item in enumerate(items):
+        if delays:
+            await asyncio.sleep(delays[i])
+        yield item
+
+
+async def collect(aiter):
+    return [item async for item in aiter]
+
+
+# ============================================================================
+# SSEWriter Tests
+# ============================================================================
+
+
+class TestSSEWriter:
+    """Test event encoding and framing."""
+
+    def test_token_event_is_framed_json(self):
+        writer = SSEWriter(SESSION_ID)
+        assert decode(writer.token("Hello")) == {
+            "type": "token",
+            "session_id": SESSION_ID,
+            "content": "Hello",
+        }
+
+    def test_token_content_is_escaped(self):
+        """Test that newlines and quotes in tokens cannot break framing."""
+        writer = SSEWriter(SESSION_ID)
+        payload = decode(writer.token('line 1\n\nline "2"'))
+        assert payload["content"] == 'line 1\n\nline "2"'
+
+    def test_token_keeps_unicode(self):
+        writer = SSEWriter(SESSION_ID)
+        frame = writer.token("café ✅")
+        assert "café ✅".encode() in frame
+
+    def test_worker_token_includes_agent(self):
+        writer = SSEWriter(SESSION_ID)
+        payload = decode(writer.worker_token("step", "billing_support_agent"))
+        assert payload["type"] == "worker_token"
+        assert payload["agent"] == "billing_support_agent"
+        assert payload["content"] == "step"
+
+    def test_control_event_fields(self):
+        writer = SSEWriter(SESSION_ID)
+        payload = decode(writer.event("done", tokens=3, ttft=0.5))
+        assert payload == {
+            "type": "done",
+            "session_id": SESSION_ID,
+            "tokens": 3,
+            "ttft": 0.5,
+        }
+
+
+# ============================================================================
+# coalesce_tokens Tests
+# ============================================================================
+
+
+class TestCoalesceTokens:
+    """Test time- and size-based frame coalescing."""
+
+    async def test_merges_burst_into_one_frame(self):
+        """Tokens arriving together are sent as a single frame."""
+        chunks = [TokenChunk(t, "supervisor_agent") for t in ["Hel", "lo ", "world"]]
+        frames = await collect(coalesce_tokens(scripted(chunks), 0.05, 1024))
+        assert [f.text for f in frames] == ["Hello world"]
+
+    async def test_flushes_on_byte_window(self):
+        chunks = [TokenChunk("abcd", "supervisor_agent") for _ in range(5)]
+        frames = await collect(coalesce_tokens(scripted(chunks), 10.0, 8))
+        assert [f.text for f in frames] == ["abcdabcd", "abcdabcd", "abcd"]
+
+    async def test_flushes_on_time_window(self):
+        """A slow gap between tokens forces a flush of the buffer."""
+        chunks = [TokenChunk(t, "supervisor_agent") for t in ["a", "b", "c"]]
+        frames = await collect(
+            coalesce_tokens(scripted(chunks, delays=[0, 0, 0.1]), 0.02, 1024)
+        )
+        assert [f.text for f in frames] == ["ab", "c"]
+
+    async def test_splits_frames_on_agent_change(self):
+        chunks = [
+            TokenChunk("w1 ", "technical_support_agent"),
+            TokenChunk("w2", "technical_support_agent"),
+            TokenChunk("s1", "supervisor_agent"),
+        ]
+        frames = await collect(coalesce_tokens(scripted(chunks), 0.05, 1024))
+        assert frames == [
+            TokenChunk("w1 w2", "technical_support_agent"),
+            TokenChunk("s1", "supervisor_agent"),
+        ]
+
+    async def test_zero_interval_disables_coalescing(self):
+        chunks = [TokenChunk(t, "supervisor_agent") for t in ["a", "b"]]
+        frames = await collect(coalesce_tokens(scripted(chunks), 0, 1024))
+        assert frames == chunks
+
+    async def test_closes_source_when_consumer_stops(self):
+        """Stopping early must close the upstream generator."""
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield TokenChunk("x", "supervisor_agent")
+                    await asyncio.sleep(0.001)
+            finally:
+                closed.set()
+
+        stream = coalesce_tokens(endless(), 0.005, 4)
+        await stream.__anext__()
+        await stream.aclose()
+
+        assert closed.is_set()
@@ -0,0 +1,208 @@
+"""
+Unit Tests for Token-Level Streaming.
+
+Runs a real supervisor/worker agent pair built on a scripted chat model to
+verify that tokens are forwarded as generated, that worker tokens are
+tagged separately, and that /chat/stream reports time-to-first-token.
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.streaming import (
+    SUPERVISOR_AGENT_NAME,
+    TokenChunk,
+    message_text,
+    stream_agent_tokens,
+)
+from tests.fake_models import ScriptedChatModel, tool_call
+
+SESSION_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def build_supervisor(worker_answer: str, final_answer: str):
+    """Build a supervisor that routes once to a scripted technical worker."""
+    worker = create_agent(
+        model=ScriptedChatModel(responses=[AIMessage(content=worker_answer)]),
+        tools=[],
+        name="technical_support_agent",
+    )
+
+    @tool
+    def technical_support_tool(query: str) -> str:
+        """Handle technical support questions."""
+        result = worker.invoke({"messages": [{"role": "user", "content": query}]})
+        return result["messages"][-1].content
+
+    return create_agent(
+        model=ScriptedChatModel(
+            responses=[
+                tool_call("technical_support_tool", "Error 500"),
+                AIMessage(content=final_answer),
+            ]
+        ),
+        tools=[technical_support_tool],
+        checkpointer=InMemorySaver(),
+        name=SUPERVISOR_AGENT_NAME,
+    )
+
+
+def parse_sse(body: str) -> list[dict]:
+    """Parse data: lines from an SSE body."""
+    events = []
+    for line in body.splitlines():
+        if line.startswith("data: "):
+            events.append(json.loads(line[len("data: ") :]))
+    return events
+
+
+# ============================================================================
+# Helper Tests
+# ============================================================================
+
+
+class TestMessageText:
+    """Test text extraction across provider content formats."""
+
+    def test_string_content(self):
+        assert message_text(AIMessageChunk(content="Hello")) == "Hello"
+
+    def test_bedrock_content_blocks(self):
+        """Test Bedrock-style list content with text and tool blocks."""
+        chunk = AIMessageChunk(
+            content=[
+                {"type": "text", "text": "Hel"},
+                {"type": "tool_use", "id": "x"},
+                {"type": "text", "text": "lo"},
+            ]
+        )
+        assert message_text(chunk) == "Hello"
+
+    def test_tool_call_chunk_has_no_text(self):
+        assert message_text(AIMessageChunk(content="")) == ""
+
+
+# ============================================================================
+# stream_agent_tokens Tests
+# ============================================================================
+
+
+class TestStreamAgentTokens:
+    """Test token streaming from supervisor and worker agents."""
+
+    async def test_streams_supervisor_and_worker_tokens(self):
+        """Test that tokens arrive individually and are tagged by agent."""
+        supervisor = build_supervisor("Clear your cache", "Try clearing your cache")
+        config = {"configurable": {"thread_id": "t-1"}}
+
+        chunks = [
+            chunk
+            async for chunk in stream_agent_tokens(
+                supervisor,
+                {"messages": [{"role": "user", "content": "Error 500"}]},
+                config,
+            )
+        ]
+
+        worker = [c for c in chunks if not c.from_supervisor]
+        answer = [c for c in chunks if c.from_supervisor]
+
+        assert [c.text for c in worker] == ["Clear ", "your ", "cache"]
+        assert all(c.agent == "technical_support_agent" for c in worker)
+        assert [c.text for c in answer] == ["Try ", "clearing ", "your ", "cache"]
+
+    async def test_excludes_worker_tokens_when_disabled(self):
+        """Test that include_workers=False yields only supervisor tokens."""
+        supervisor = build_supervisor("Worker text", "Supervisor text")
+        config = {"configurable": {"thread_id": "t-2"}}
+
+        chunks = [
+            chunk
+            async for chunk in stream_agent_tokens(
+                supervisor,
+                {"messages": [{"role": "user", "content": "Error 500"}]},
+                config,
+                include_workers=False,
+            )
+        ]
+
+        assert chunks == [
+            TokenChunk("Supervisor ", SUPERVISOR_AGENT_NAME),
+            TokenChunk("text", SUPERVISOR_AGENT_NAME),
+        ]
+
+
+# ============================================================================
+# /chat/stream Endpoint Tests
+# ============================================================================
+
+
+class TestChatStreamEndpoint:
+    """Test the SSE endpoint end-to-end with a scripted supervisor."""
+
+    def test_stream_emits_tokens_and_ttft(self):
+        """Test event sequence and the time-to-first-token in done."""
+        from backend import main
+
+        main.answer_cache.clear()
+        supervisor = build_supervisor("Worker steps", "Final answer")
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=supervisor):
+            response = client.post(
+                "/chat/stream", json={"message": "Error 500", "session_id": SESSION_ID}
+            )
+
+        assert response.status_code == 200
+        events = parse_sse(response.text)
+        types = [e["type"] for e in events]
+
+        assert types[0] == "start"
+        assert types[-1] == "done"
+        assert (
+            "".join(e["content"] for e in events if e["type"] == "token")
+            == "Final answer"
+        )
+        assert (
+            "".join(e["content"] for e in events if e["type"] == "worker_token")
+            == "Worker steps"
+        )
+
+        done = events[-1]
+        assert done["tokens"] == 2
+        assert done["worker_tokens"] == 2
+        assert done["ttft"] is not None
+        assert 0 <= done["ttft"] <= done["time"]
+
+    def test_stream_reports_agent_errors(self):
+        """Test that a failing agent run produces an error event."""
+        from backend import main
+
+        class BrokenAgent:
+            def get_state(self, config):
+                return Mock(values={})
+
+            async def astream(self, *args, **kwargs):
+                raise RuntimeError("LLM down")
+                yield  # pragma: no cover
+
+        client = TestClient(main.app)
+        with patch("backend.main.get_supervisor", return_value=BrokenAgent()):
+            response = client.post(
+                "/chat/stream", json={"message": "Hi", "session_id": SESSION_ID}
+            )
+
+        events = parse_sse(response.text)
+        assert events[-1]["type"] == "error"
+        assert main.agent_executor.in_flight == 0
@@ -0,0 +1,202 @@
+"""
+Unit Tests for Per-Request Stage Timings.
+
+Tests RequestTimings formatting, timed() outside a request, propagation
+through the agent executor into supervisor → worker tool → LLM calls,
+embedding timing, the Server-Timing header on /chat and the "timings"
+object of the streaming done event.
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import KeywordEmbeddings, ScriptedChatModel, tool_call
+from utils.concurrency import BoundedAgentExecutor
+from utils.timing import (
+    RequestTimings,
+    TimedEmbeddings,
+    collect_timings,
+    current_timings,
+    timed,
+)
+
+
+def build_supervisor(worker_delay: float = 0.02):
+    """Supervisor that routes one query to a scripted billing worker."""
+    worker = create_agent(
+        model=ScriptedChatModel(
+            responses=[AIMessage(content="Refunds take 5 days.")], delay=worker_delay
+        ),
+        tools=[],
+        name="billing_support_agent",
+    )
+
+    @tool
+    def billing_support_tool(query: str) -> str:
+        """Handle billing questions."""
+        with timed("worker"):
+            with timed("retrieval"):
+                pass
+            return worker.invoke({"messages": [{"role": "user", "content": query}]})[
+                "messages"
+            ][-1].content
+
+    model = ScriptedChatModel(
+        responses=[
+            tool_call("billing_support_tool", "refund"),
+            AIMessage(content="Refunds take 5 days."),
+        ],
+        delay=0.01,
+    )
+    return create_agent(
+        model=model,
+        tools=[billing_support_tool],
+        checkpointer=InMemorySaver(),
+        name="supervisor_agent",
+    )
+
+
+# ============================================================================
+# RequestTimings Tests
+# ============================================================================
+
+
+class TestRequestTimings:
+    """Test stage accumulation and header formatting."""
+
+    def test_header_lists_stages_in_order_with_total(self):
+        timings = RequestTimings()
+        timings.add("retrieval", 0.1204)
+        timings.add("supervisor", 0.5)
+        timings.add("supervisor", 0.25)
+
+        header = timings.header()
+
+        assert header.startswith(
+            'supervisor;dur=750.0;desc="Supervisor LLM", retrieval;dur=120.4'
+        )
+        assert "total;dur=" in header
+        assert list(timings.as_dict()) == ["supervisor", "retrieval", "total"]
+
+    def test_timed_outside_request_is_noop(self):
+        assert current_timings() is None
+        with timed("worker"):
+            pass
+        assert current_timings() is None
+
+
+# ============================================================================
+# Propagation Tests
+# ============================================================================
+
+
+class TestTimingPropagation:
+    """Test that stages are recorded along the whole call chain."""
+
+    async def test_supervisor_worker_chain_through_executor(self):
+        executor = BoundedAgentExecutor(max_workers=2)
+        agent = build_supervisor()
+        inputs = {"messages": [{"role": "user", "content": "refund?"}]}
+
+        with collect_timings() as timings:
+            await executor.run(
+                agent.invoke, inputs, {"configurable": {"thread_id": "t1"}}
+            )
+        executor.shutdown()
+
+        stages = timings.as_dict()
+        assert {"supervisor", "worker", "worker_llm", "retrieval", "total"} <= set(
+            stages
+        )
+        # Worker time includes the worker's LLM call
+        assert stages["worker"] >= stages["worker_llm"] >= 20
+
+    async def test_concurrent_requests_do_not_mix(self):
+        async def request(stage, seconds):
+            with collect_timings() as timings:
+                with timed(stage):
+                    await asyncio.sleep(seconds)
+                return timings.as_dict()
+
+        first, second = await asyncio.gather(
+            request("worker", 0.02), request("retrieval", 0.01)
+        )
+
+        assert "retrieval" not in first
+        assert "worker" not in second
+
+    async def test_embeddings_are_timed(self):
+        embeddings = TimedEmbeddings(KeywordEmbeddings())
+
+        with collect_timings() as timings:
+            embeddings.embed_query("refund policy")
+            await embeddings.aembed_query("refund policy")
+
+        assert "embedding" in timings.as_dict()
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+class TestServerTimingEndpoints:
+    """Test Server-Timing on /chat and timings in the stream done event."""
+
+    def test_chat_sets_server_timing_header(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=build_supervisor()):
+            response = client.post(
+                "/chat",
+                json={
+                    "message": "How long do refunds take?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+
+        assert response.status_code == 200
+        header = response.headers["Server-Timing"]
+        for stage in ("queue", "supervisor", "worker", "worker_llm", "total"):
+            assert f"{stage};dur=" in header
+
+    def test_stream_done_event_has_timings(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        client = TestClient(main.app)
+
+        with patch("backend.main.get_supervisor", return_value=build_supervisor()):
+            response = client.post(
+                "/chat/stream",
+                json={
+                    "message": "How long do refunds take?",
+                    "session_id": str(uuid.uuid4()),
+                },
+            )
+
+        events = [
+            json.loads(line[6:])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        done = events[-1]
+        assert done["type"] == "done"
+        assert {"supervisor", "worker", "worker_llm", "total"} <= set(done["timings"])
+        assert done["timings"]["total"] >= done["timings"]["worker"]
@@ -0,0 +1,153 @@
+"""
+Unit Tests for the WebSocket Chat Endpoint.
+
+Tests /ws/chat session validation, multi-turn conversations over one
+socket, protocol errors, and cancelling a response mid-stream.
+"""
+
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from starlette.websockets import WebSocketDisconnect
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_models import ScriptedChatModel
+
+
+def build_supervisor(*answers: str, delay: float = 0.0):
+    model = ScriptedChatModel(
+        responses=[AIMessage(content=a) for a in answers], delay=delay
+    )
+    agent = create_agent(
+        model=model, tools=[], checkpointer=InMemorySaver(), name="supervisor_agent"
+    )
+    return agent, model
+
+
+def receive_turn(ws) -> list[dict]:
+    """Collect events until the turn finishes."""
+    events = []
+    while not events or events[-1]["type"] not in ("done", "error", "cancelled"):
+        events.append(ws.receive_json())
+    return events
+
+
+class TestWebSocketChat:
+    """Test the /ws/chat protocol."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from backend import main
+
+        main.answer_cache.clear()
+        yield
+        main.answer_cache.clear()
+
+    def test_invalid_session_is_rejected(self):
+        from backend import main
+
+        with TestClient(main.app).websocket_connect(
+            "/ws/chat?session_id=not-a-uuid"
+        ) as ws:
+            assert ws.receive_json()["error"] == "Invalid session"
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                ws.receive_json()
+        assert exc_info.value.code == 1008
+
+    def test_multiple_turns_over_one_connection(self):
+        from backend import main
+
+        agent, _model = build_supervisor("Hello there!", "Clear your cache and retry")
+        session_id = str(uuid.uuid4())
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            TestClient(main.app).websocket_connect(
+                f"/ws/chat?session_id={session_id}"
+            ) as ws,
+        ):
+            assert ws.receive_json() == {"type": "ready", "session_id": session_id}
+
+            ws.send_json({"type": "message", "content": "Hi"})
+            first = receive_turn(ws)
+            ws.send_json({"type": "message", "content": "Error 500 on login"})
+            second = receive_turn(ws)
+
+        assert first[0] == {"type": "start", "turn": 1}
+        assert (
+            "".join(e["content"] for e in first if e["type"] == "token")
+            == "Hello there!"
+        )
+        assert second[-1]["type"] == "done" and second[-1]["turn"] == 2
+        assert (
+            "".join(e["content"] for e in second if e["type"] == "token")
+            == "Clear your cache and retry"
+        )
+
+        history = agent.get_state({"configurable": {"thread_id": session_id}}).values[
+            "messages"
+        ]
+        assert [m.content for m in history] == [
+            "Hi",
+            "Hello there!",
+            "Error 500 on login",
+            "Clear your cache and retry",
+        ]
+
+    def test_protocol_errors_keep_connection_open(self):
+        from backend import main
+
+        agent, _ = build_supervisor("ok")
+
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            TestClient(main.app).websocket_connect(
+                f"/ws/chat?session_id={uuid.uuid4()}"
+            ) as ws,
+        ):
+            ws.receive_json()
+            ws.send_text("not json")
+            assert ws.receive_json()["error"] == "Invalid message"
+            ws.send_json({"type": "message", "content": ""})
+            assert ws.receive_json()["error"] == "Invalid message"
+
+            ws.send_json({"type": "message", "content": "Hi"})
+            assert receive_turn(ws)[-1]["type"] == "done"
+
+    def test_cancel_stops_turn_in_progress(self):
+        from backend import main
+
+        agent, _model = build_supervisor("slow answer", delay=0.5)
+
+        # Progress events would interleave with the replies asserted below
+        with (
+            patch("backend.main.get_supervisor", return_value=agent),
+            patch("backend.main.STREAM_PROGRESS_EVENTS", False),
+            TestClient(main.app).websocket_connect(
+                f"/ws/chat?session_id={uuid.uuid4()}"
+            ) as ws,
+        ):
+            ws.receive_json()
+            ws.send_json({"type": "message", "content": "Explain my invoice"})
+            assert ws.receive_json()["type"] == "start"
+
+            ws.send_json({"type": "message", "content": "Hello?"})
+            assert ws.receive_json()["error"] == "Turn in progress"
+
+            ws.send_json({"type": "cancel"})
+            assert ws.receive_json() == {"type": "cancelled", "turn": 1}
+
+            # The connection remains usable for the next turn
+            ws.send_json({"type": "message", "content": "Never mind"})
+            assert receive_turn(ws)[-1]["type"] == "done"
+
+        assert main.agent_executor.in_flight == 0
@@ -0,0 +1,15 @@
+"""
+Agent Names.
+
+The supervisor's agent name is given to create_agent() in
+agents.supervisor_agent and shows up as ``lc_agent_name`` in callback and
+stream metadata, where the utils callback handlers and the token stream use
+it to tell supervisor calls from worker calls. It lives here, below both
+packages, because utils modules cannot import agents (whose package imports
+the supervisor, which imports utils).
+
+Last Updated: October 17, 2026
+"""
+
+# Name given to the supervisor in create_supervisor_agent()
+SUPERVISOR_AGENT_NAME = "supervisor_agent"
@@ -0,0 +1,86 @@
+"""
+Keyed Batch Execution.
+
+Runs a batch of items concurrently under a concurrency cap, while items
+that share a key (e.g. the same chat session) run one after another in
+their original order. Results are yielded as soon as each item finishes,
+so one slow item does not hold back the rest of the batch.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Sequence
+from typing import (
+    Any,
+    NamedTuple,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one batch item."""
+
+    index: int
+    result: Any
+    # Exception raised by the handler (``result`` is None when set)
+    error: BaseException | None
+
+
+async def run_keyed_batch(
+    items: Sequence[Any],
+    key: Callable[[Any], Hashable],
+    handler: Callable[[Any], Awaitable[Any]],
+    concurrency: int,
+) -> AsyncIterator[BatchResult]:
+    """
+    Run ``handler`` over a batch, yielding results in completion order.
+
+    Items with the same key form a chain that is processed sequentially in
+    input order; different chains run concurrently, with at most
+    ``concurrency`` handlers active at once. A handler error is reported
+    for its item and does not stop the rest of its chain.
+
+    Args:
+        items: Batch items
+        key: Function mapping an item to its ordering key
+        handler: Coroutine function processing one item
+        concurrency: Maximum number of handlers running at once
+
+    Yields:
+        BatchResult: (index, result, error) for each item as it completes
+
+    Example:
+        >>> async for done in run_keyed_batch(requests, lambda r: r.session_id, chat, 8):
+        ...     print(done.index, done.result)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    chains: dict[Hashable, list[int]] = {}
+    for index, item in enumerate(items):
+        chains.setdefault(key(item), []).append(index)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue[BatchResult] = asyncio.Queue()
+
+    async def run_chain(indexes: list[int]) -> None:
+        for index in indexes:
+            async with semaphore:
+                try:
+                    outcome = BatchResult(index, await handler(items[index]), None)
+                except Exception as e:  # noqa: BLE001 - handed back to the caller
+                    outcome = BatchResult(index, None, e)
+            results.put_nowait(outcome)
+
+    tasks = [asyncio.create_task(run_chain(indexes)) for indexes in chains.values()]
+    try:
+        for _ in range(len(items)):
+            yield await results.get()
+    finally:
+        # Consumer went away (e.g. client disconnected): stop remaining work
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
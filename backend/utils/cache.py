@@ -0,0 +1,116 @@
+"""
+TTL + LRU Cache.
+
+A small in-process cache used for answers to stateless first-turn questions
+("What are your pricing plans?", "How do I reset my password?"). Entries
+expire after a fixed TTL, and the least recently used entry is evicted when
+the cache is full.
+
+Last Updated: October 17, 2026
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Bounded mapping with per-entry expiry and LRU eviction.
+
+    Example:
+        >>> cache = TTLCache(max_entries=1000, ttl_seconds=3600)
+        >>> cache.set(("what are your pricing plans", "3f9a2c"), "We offer...")
+        >>> cache.get(("what are your pricing plans", "3f9a2c"))
+        'We offer...'
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (expires_at, value); order = least to most recently used
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Look up a live entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters for health and metrics endpoints.
+
+        Returns:
+            dict: Size, limits and hit/miss/eviction counters
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
@@ -0,0 +1,215 @@
+"""
+Bounded Agent Executor for Non-Blocking Agent Execution.
+
+LangChain agents expose a synchronous ``invoke()`` that performs blocking
+network I/O (Bedrock/OpenAI round-trips, vector store queries). Calling it
+directly from an ``async`` FastAPI endpoint stalls the event loop, so every
+other request on that worker (including health checks) waits for the LLM.
+
+This module runs agent calls on a dedicated, size-configurable thread pool
+and enforces a bounded in-flight limit. When the limit is reached, callers
+get an ``ExecutorSaturatedError`` carrying a Retry-After hint instead of
+queueing indefinitely.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import math
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """
+    Raised when the executor is at its in-flight limit.
+
+    Attributes:
+        in_flight: Number of agent runs currently admitted
+        limit: Configured in-flight limit
+        retry_after: Suggested client back-off in whole seconds
+    """
+
+    def __init__(self, in_flight: int, limit: int, retry_after: int):
+        super().__init__(
+            f"Agent executor saturated ({in_flight}/{limit} runs in flight)"
+        )
+        self.in_flight = in_flight
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class BoundedAgentExecutor:
+    """
+    Thread pool for blocking agent calls with admission control.
+
+    ``max_workers`` controls how many agent runs execute concurrently;
+    ``max_in_flight`` controls how many may be admitted in total (running
+    plus waiting for a worker thread). Anything beyond ``max_in_flight`` is
+    rejected immediately with ``ExecutorSaturatedError``.
+
+    Example:
+        >>> executor = BoundedAgentExecutor(max_workers=8, max_in_flight=32)
+        >>> result = await executor.run(agent.invoke, inputs, config)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_in_flight: int = 64,
+        min_retry_after: int = 1,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_in_flight < max_workers:
+            raise ValueError("max_in_flight must be >= max_workers")
+
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.min_retry_after = min_retry_after
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="agent-run"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._completed = 0
+        # Exponentially weighted moving average of run duration (seconds),
+        # used to give rejected clients a realistic Retry-After
+        self._avg_duration = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of agent runs currently admitted."""
+        return self._in_flight
+
+    def retry_after(self) -> int:
+        """
+        Estimate how long a rejected client should wait before retrying.
+
+        Returns:
+            int: Whole seconds, never below ``min_retry_after``
+        """
+        return max(self.min_retry_after, math.ceil(self._avg_duration))
+
+    def check_capacity(self) -> None:
+        """
+        Raise if a new run would currently be rejected.
+
+        Used by endpoints that must decide on a status code before they
+        start streaming (the slot itself is acquired later).
+
+        Raises:
+            ExecutorSaturatedError: If the in-flight limit is reached
+        """
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    self._in_flight, self.max_in_flight, self.retry_after()
+                )
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    self._in_flight, self.max_in_flight, self.retry_after()
+                )
+            self._in_flight += 1
+
+    def _release(self, duration: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Reserve one in-flight slot for the duration of the block.
+
+        Use this for agent work that runs on the event loop itself
+        (e.g. ``agent.astream``) so it counts against the same limit.
+
+        Raises:
+            ExecutorSaturatedError: If the in-flight limit is reached
+        """
+        self._acquire()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            yield
+        finally:
+            self._release(loop.time() - started)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop.
+
+        Context variables (LangSmith tracing, request-scoped state) are
+        copied into the worker thread.
+
+        Args:
+            fn: Blocking callable, typically ``agent.invoke``
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Whatever ``fn`` returns
+
+        Raises:
+            ExecutorSaturatedError: If the in-flight limit is reached
+        """
+        async with self.slot():
+            return await self.call(fn, *args, **kwargs)
+
+    async def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the pool inside an already held slot.
+
+        Use this instead of run() when the caller holds ``slot()`` itself,
+        e.g. to wait in a scheduler between admission and execution.
+
+        Args:
+            fn: Blocking callable, typically ``agent.invoke``
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, call)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of executor state for health and metrics endpoints.
+
+        Returns:
+            dict: Limits, current load and counters
+        """
+        return {
+            "max_workers": self.max_workers,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_run_seconds": round(self._avg_duration, 3),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work and release the worker threads."""
+        logger.info("Shutting down agent executor")
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,271 @@
+"""
+End-to-End Request Deadlines.
+
+A client that gives up after 15 seconds gains nothing from the backend
+finishing the supervisor run, the nested worker ``agent.invoke`` and the
+retrieval behind it. A ``Deadline`` is set once per request and travels
+down the call chain in a context variable (like ``utils.timing``): into
+the agent executor's pool thread, LangGraph's tool threads and the worker
+agents. Every stage checks the remaining budget before starting work:
+
+- Every LLM call and tool call, via a callback handler LangChain attaches
+  to all runs started under the deadline (``register_configure_hook``)
+- Worker tools and RAG searches, via ``check_deadline()`` /
+  ``stage_deadline()``, which may also tighten the budget for one stage
+
+An expired check raises ``DeadlineExceededError``, which propagates out of
+the agent run, so the request fails fast with a 504 instead of spending
+more tokens. An LLM call already in progress is not interrupted; the run
+stops at the next check.
+
+A deadline can also be cancelled outright (``Deadline.cancel()``), e.g.
+when a streaming client disconnects. Checks then raise
+``RunCancelledError``, and the callback handler also checks on every
+generated token, so worker agents still running in pool threads stop
+mid-answer instead of generating text nobody will read.
+
+Last Updated: October 17, 2026
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from utils.agent_names import SUPERVISOR_AGENT_NAME
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request or stage runs out of time."""
+
+    def __init__(self, stage: str, timeout: float, steps: list[str] | None = None):
+        self.stage = (
+            stage  # stage that was about to start (or running) when time ran out
+        )
+        self.timeout = timeout
+        self.steps = list(steps or [])  # steps started before the deadline expired
+        super().__init__(f"Deadline of {timeout:g}s exceeded at stage '{stage}'")
+
+
+class RunCancelledError(Exception):
+    """Raised when a request's agent run was cancelled (e.g. client disconnected)."""
+
+    def __init__(self, stage: str, reason: str, steps: list[str] | None = None):
+        self.stage = stage
+        self.reason = reason
+        self.steps = list(steps or [])
+        super().__init__(f"Run cancelled at stage '{stage}' ({reason})")
+
+
+class Deadline:
+    """
+    Point in time by which a request (or one stage of it) must finish.
+
+    Example:
+        >>> deadline = Deadline(15)
+        >>> deadline.check("retrieval")  # raises DeadlineExceededError when expired
+        >>> deadline.remaining()
+        14.98
+    """
+
+    def __init__(
+        self, timeout: float, parent: "Deadline | None" = None, stage: str | None = None
+    ):
+        self.timeout = timeout
+        self.stage = stage
+        self.expires_at = time.monotonic() + timeout
+        # Steps shared with the parent, so a stage timeout reports the
+        # whole request's progress
+        self.steps: list[str] = parent.steps if parent is not None else []
+        # Cancelling the request also cancels every stage deadline under it
+        self._root: Deadline = parent._root if parent is not None else self
+        self.cancel_reason: str | None = None
+        if parent is not None and parent.expires_at < self.expires_at:
+            # A stage never gets more time than the request has left
+            self.expires_at = parent.expires_at
+            self.timeout = parent.timeout
+            self.stage = parent.stage
+
+    def remaining(self) -> float:
+        """Seconds left (negative once expired)."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._root.cancel_reason is not None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """
+        Cancel the request: every later check raises RunCancelledError.
+
+        Safe to call from any thread; the first reason given is kept.
+        """
+        if self._root.cancel_reason is None:
+            self._root.cancel_reason = reason
+
+    def check(self, stage: str, record: bool = True) -> None:
+        """
+        Record that ``stage`` is starting, or raise if time is up.
+
+        Args:
+            stage: Stage about to start
+            record: Add the stage to ``steps`` (the progress report)
+
+        Raises:
+            RunCancelledError: If the request was cancelled
+            DeadlineExceededError: If the deadline has passed
+        """
+        if self.cancelled:
+            raise self.error(stage)
+        if self.expired:
+            raise DeadlineExceededError(self.stage or stage, self.timeout, self.steps)
+        if record:
+            self.steps.append(stage)
+
+    def error(
+        self, stage: str | None = None
+    ) -> "DeadlineExceededError | RunCancelledError":
+        """Build the error for a deadline that expired (or a request that
+        was cancelled) while ``stage`` ran."""
+        running = self.steps[-1] if self.steps else "queued"
+        if self.cancelled:
+            return RunCancelledError(
+                stage or running, self._root.cancel_reason, self.steps
+            )
+        return DeadlineExceededError(
+            self.stage or stage or running, self.timeout, self.steps
+        )
+
+
+class DeadlineCallbackHandler(BaseCallbackHandler):
+    """Checks the deadline before every LLM and tool call, and stops
+    generation mid-answer once the request is cancelled."""
+
+    # Raising from the callback aborts the run before the call is made
+    raise_error = True
+    run_inline = True
+
+    def __init__(self, deadline: Deadline):
+        self.deadline = deadline
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        agent_name = (metadata or {}).get("lc_agent_name")
+        self._deadline().check(
+            "supervisor" if agent_name == SUPERVISOR_AGENT_NAME else "worker_llm"
+        )
+
+    def on_tool_start(
+        self, serialized: dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._deadline().check((serialized or {}).get("name") or "tool")
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        # Only cancellation is checked per token (a flag read); expiry is
+        # checked when the next LLM or tool call starts
+        deadline = self._deadline()
+        if deadline.cancelled:
+            raise deadline.error()
+
+    def _deadline(self) -> Deadline:
+        # Callbacks run in the caller's context, so a tighter stage deadline
+        # set by stage_deadline() takes effect inside that stage
+        return _deadline.get() or self.deadline
+
+
+_deadline: ContextVar[Deadline | None] = ContextVar("request_deadline", default=None)
+_deadline_callbacks: ContextVar[DeadlineCallbackHandler | None] = ContextVar(
+    "deadline_callbacks", default=None
+)
+# Every LangChain run started while _deadline_callbacks is set gets the handler
+register_configure_hook(_deadline_callbacks, inheritable=True)
+
+
+def current_deadline() -> Deadline | None:
+    """The active deadline, or None outside deadline_scope()."""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """
+    Make ``deadline`` the active deadline for everything run in the block.
+
+    Example:
+        >>> with deadline_scope(Deadline(15)) as deadline:
+        ...     turn = await asyncio.wait_for(run_supervisor(...), deadline.remaining())
+    """
+    deadline_token = _deadline.set(deadline)
+    callbacks_token = _deadline_callbacks.set(DeadlineCallbackHandler(deadline))
+    try:
+        yield deadline
+    finally:
+        _deadline_callbacks.reset(callbacks_token)
+        _deadline.reset(deadline_token)
+
+
+@contextmanager
+def stage_deadline(stage: str, timeout: float | None) -> Iterator[Deadline | None]:
+    """
+    Run a stage with its own timeout, capped by the request deadline.
+
+    Checks the budget before the stage starts; LLM and tool calls inside
+    the stage are checked against the tighter of the two deadlines.
+
+    Args:
+        stage: Stage name reported on timeout (e.g. "billing_support_tool")
+        timeout: Stage timeout in seconds, or None for the request deadline only
+
+    Raises:
+        DeadlineExceededError: If the request or stage has no time left
+    """
+    parent = _deadline.get()
+    if timeout is None:
+        if parent is not None:
+            parent.check(stage, record=False)
+        yield parent
+        return
+
+    deadline = Deadline(timeout, parent=parent, stage=stage)
+    # The tool-start callback already recorded the step
+    deadline.check(stage, record=False)
+    if parent is None:
+        with deadline_scope(deadline):
+            yield deadline
+        return
+
+    # The request's callback handler is already attached to this run and
+    # reads the tighter deadline from the context
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def check_deadline(stage: str) -> None:
+    """
+    Check the active deadline before starting ``stage`` (no-op without one).
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed
+    """
+    deadline = _deadline.get()
+    if deadline is not None:
+        deadline.check(stage)
@@ -0,0 +1,146 @@
+"""
+Idempotency Keys for Retried Requests.
+
+Clients retry ``POST /chat`` on network blips. Without protection every
+retry re-runs the supervisor → worker → LLM pipeline and appends the same
+user message to the session history a second time. With an
+``Idempotency-Key`` header, the first request runs normally and every
+duplicate within the TTL gets its result instead:
+
+- While the first request is still running, duplicates wait for it (like
+  ``SingleFlight``, the run is shielded, so a first request whose client
+  gave up still finishes and stores its result for the retry)
+- Once it has succeeded, duplicates get the stored result immediately
+
+Failed runs are not stored, so a retry after an error runs again. Results
+are kept in a bounded ``TTLCache`` (LRU eviction), and a key reused with a
+different request body is rejected rather than answered with the wrong
+result.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """Raised when an idempotency key is reused for a different request."""
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        super().__init__("Idempotency key was already used for a different request")
+
+
+def request_fingerprint(*parts: str) -> str:
+    """
+    Fingerprint of the request fields an idempotency key is bound to.
+
+    Example:
+        >>> request_fingerprint("550e8400-...", "How do I get a refund?")
+        '9b1d...'
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Runs work once per idempotency key and replays its result.
+
+    Example:
+        >>> store = IdempotencyStore(max_entries=10_000, ttl_seconds=3600)
+        >>> turn, replayed = await store.run(
+        ...     (session_id, idempotency_key), request_fingerprint(message), run_turn
+        ... )
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 3600):
+        # key -> (fingerprint, result) of completed runs
+        self._results = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        # key -> (fingerprint, task) of runs in progress
+        self._in_flight: dict[Hashable, tuple[str, asyncio.Future]] = {}
+        self._executions = 0
+        self._replayed = 0
+        self._joined = 0
+
+    async def run(
+        self, key: Hashable, fingerprint: str, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Run ``fn`` unless a request with the same key already ran or is running.
+
+        Args:
+            key: Idempotency key (scope it, e.g. with the session ID)
+            fingerprint: Fingerprint of the request (see request_fingerprint)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            tuple: (result, replayed) where ``replayed`` is True if the
+            result came from an earlier or concurrent request with this key
+
+        Raises:
+            IdempotencyKeyReusedError: If the key was used with a different fingerprint
+            Exception: Whatever ``fn`` raised (for the first request and
+                the duplicates waiting on it)
+        """
+        stored = self._results.get(key)
+        if stored is not None:
+            self._check(key, fingerprint, stored[0])
+            self._replayed += 1
+            return stored[1], True
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._check(key, fingerprint, in_flight[0])
+            self._joined += 1
+            logger.info("Idempotency: duplicate request is waiting for the original")
+            return await asyncio.shield(in_flight[1]), True
+
+        self._executions += 1
+        task = asyncio.ensure_future(fn())
+        self._in_flight[key] = (fingerprint, task)
+        task.add_done_callback(lambda done: self._finish(key, fingerprint, done))
+        return await asyncio.shield(task), False
+
+    def _finish(self, key: Hashable, fingerprint: str, task: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        # Only successful results are replayed; a retry after a failure runs again
+        if not task.cancelled() and task.exception() is None:
+            self._results.set(key, (fingerprint, task.result()))
+
+    @staticmethod
+    def _check(key: Hashable, fingerprint: str, stored_fingerprint: str) -> None:
+        if fingerprint != stored_fingerprint:
+            raise IdempotencyKeyReusedError(key)
+
+    def stats(self) -> dict:
+        """
+        Idempotency counters for health and metrics endpoints.
+
+        Returns:
+            dict: Stored results and limits, runs executed, duplicates
+            answered from a stored result ("replayed") or by waiting for
+            the original ("joined"), and runs in progress
+        """
+        results = self._results.stats()
+        return {
+            "entries": results["entries"],
+            "max_entries": results["max_entries"],
+            "ttl_seconds": results["ttl_seconds"],
+            "evictions": results["evictions"],
+            "executions": self._executions,
+            "replayed": self._replayed,
+            "joined": self._joined,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,119 @@
+"""
+Keyed Async Locks.
+
+Serializes work per key (e.g. per chat session) while work for different
+keys runs fully in parallel. Used to make turns of one conversation run
+one at a time, in arrival order: two concurrent messages for the same
+thread (a retry, a double submit) would otherwise run against the same
+checkpoint at once and interleave.
+
+Locks are created on first use and removed as soon as nobody holds or
+waits for them, so the table only contains sessions with a turn in
+progress.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class KeyBusyError(Exception):
+    """Raised when too many callers are already queued for a key."""
+
+    def __init__(self, key: Hashable, pending: int):
+        self.key = key
+        self.pending = pending
+        super().__init__(f"{pending} turns already pending for {key}")
+
+
+class _Entry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        # Holder plus waiters; the entry is dropped when this reaches 0
+        self.users = 0
+
+
+class KeyedLock:
+    """
+    One FIFO async lock per key, cleaned up when idle.
+
+    Example:
+        >>> session_locks = KeyedLock(max_pending=16)
+        >>> async with session_locks.hold(session_id):
+        ...     result = await run_turn(session_id, message)
+    """
+
+    def __init__(self, max_pending: int | None = None):
+        """
+        Args:
+            max_pending: Maximum callers waiting for one key (excluding the
+                holder); further callers get KeyBusyError. None = unbounded
+        """
+        self.max_pending = max_pending
+        self._entries: dict[Hashable, _Entry] = {}
+        self._acquired = 0
+        self._contended = 0
+        self._rejected = 0
+
+    @property
+    def active_keys(self) -> int:
+        """Number of keys currently held or waited on."""
+        return len(self._entries)
+
+    def pending(self, key: Hashable) -> int:
+        """Number of callers waiting for a key (excluding the holder)."""
+        entry = self._entries.get(key)
+        return max(0, entry.users - 1) if entry else 0
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """
+        Hold the lock for ``key`` for the duration of the block.
+
+        Callers for the same key enter in arrival order.
+
+        Raises:
+            KeyBusyError: If ``max_pending`` callers are already waiting
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+        elif self.max_pending is not None and entry.users - 1 >= self.max_pending:
+            self._rejected += 1
+            raise KeyBusyError(key, entry.users - 1)
+
+        entry.users += 1
+        try:
+            if entry.lock.locked():
+                self._contended += 1
+            async with entry.lock:
+                self._acquired += 1
+                yield
+        finally:
+            # Also runs when a waiter is cancelled before acquiring
+            entry.users -= 1
+            if entry.users == 0 and self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """
+        Lock counters for health and metrics endpoints.
+
+        Returns:
+            dict: Active keys, acquisitions, how many had to wait, and
+            rejections due to max_pending
+        """
+        return {
+            "active_sessions": self.active_keys,
+            "acquired": self._acquired,
+            "contended": self._contended,
+            "rejected": self._rejected,
+            "max_pending": self.max_pending,
+        }
@@ -0,0 +1,259 @@
+"""
+In-Process Metrics in Prometheus Text Format.
+
+Minimal counters, gauges and histograms for the /metrics endpoint, so
+latency, routing and error rates can be scraped and aggregated instead of
+grepped from logs. No client library or external service: each metric is
+a dict of label values to numbers, updated from the event loop (not
+thread-safe), and rendered on demand in the Prometheus text exposition
+format (version 0.0.4).
+
+Existing ``stats()`` dicts (executor, scheduler, caches, ...) are exported
+at scrape time through collectors instead of being tracked twice.
+
+Last Updated: October 17, 2026
+"""
+
+import bisect
+import math
+from collections.abc import Callable, Iterable, Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets (seconds): cache hits to slow multi-agent turns
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# (name, labels, value)
+Sample = tuple[str, dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+        + "}"
+    )
+
+
+class _Metric:
+    """Base class: a named metric with optional label dimensions."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labelvalues: tuple) -> tuple[str, ...]:
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labelvalues}"
+            )
+        return tuple(str(value) for value in labelvalues)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing count.
+
+    Example:
+        >>> errors = Counter("errors_total", "Errors by class", ("error",))
+        >>> errors.inc("RateLimitError")
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1.0) -> None:
+        key = self._key(labelvalues)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(self._key(labelvalues), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self._values.items():
+            yield self.name, self._labels(key), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down (e.g. requests in flight)."""
+
+    type_name = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, *labelvalues, value: float) -> None:
+        self._values[self._key(labelvalues)] = value
+
+
+class Histogram(_Metric):
+    """
+    Cumulative-bucket histogram with sum and count.
+
+    Example:
+        >>> latency = Histogram("request_seconds", "Latency", ("endpoint",))
+        >>> latency.observe(0.42, "/chat")
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count], sum
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labelvalues) -> None:
+        key = self._key(labelvalues)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def count(self, *labelvalues) -> int:
+        return sum(self._counts.get(self._key(labelvalues), ()))
+
+    def samples(self) -> Iterator[Sample]:
+        for key, counts in self._counts.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    {**labels, "le": _format_value(bound)},
+                    cumulative,
+                )
+            yield f"{self.name}_sum", labels, self._sums[key]
+            yield f"{self.name}_count", labels, cumulative
+
+
+def flatten_stats(prefix: str, stats: dict) -> Iterator[Sample]:
+    """
+    Turn a nested ``stats()`` dict into unlabelled samples.
+
+    Numbers and booleans become ``<prefix>_<key>[_<subkey>...]``; other
+    values (strings, None, lists) are skipped.
+
+    Example:
+        >>> list(flatten_stats("rate_limiter", {"rejected": {"global": 2}}))
+        [('rate_limiter_rejected_global', {}, 2.0)]
+    """
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            yield from flatten_stats(name, value)
+        elif isinstance(value, (bool, int, float)):
+            yield name, {}, float(value)
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics plus scrape-time collectors, rendered as text.
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> requests = registry.counter("requests_total", "Requests", ("endpoint",))
+        >>> registry.collector(lambda: flatten_stats("cache", cache.stats()))
+        >>> body = registry.render()
+    """
+
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(self._name(name), documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        return self._register(Gauge(self._name(name), documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(self._name(name), documentation, labelnames, buckets)
+        )
+
+    def collector(
+        self, collect: Callable[[], Iterable[Sample]]
+    ) -> Callable[[], Iterable[Sample]]:
+        """Register a callable producing extra samples at scrape time (usable as a decorator)."""
+        self._collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text (serve with CONTENT_TYPE)
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        typed = set()
+        for collect in self._collectors:
+            for name, labels, value in collect():
+                name = self._name(name)
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} untyped")
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
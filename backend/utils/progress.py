@@ -0,0 +1,236 @@
+"""
+Progress Events for Streamed Chat Turns.
+
+A routed query spends seconds in the supervisor and a worker (its vector
+search and LLM call) before the first answer token. Progress events tell
+the client what is happening meanwhile and show where time-to-first-token
+went:
+
+- ``routing``: the supervisor's first LLM call started (it decides
+  whether and where to route)
+- ``worker_started``: the supervisor called a worker tool ("worker" = domain)
+- ``retrieval_done``: a worker's knowledge base search finished
+  ("domain", "retrieval_ms")
+- ``generating``: an agent started writing answer text ("agent"), once per
+  agent and turn
+
+Each carries "elapsed_ms" since the turn started. Like the stage timings
+(see utils.timing), the events come from a callback handler that LangChain
+attaches to every run started while a collector is active, including the
+worker agents running in pool threads; ``merge_progress`` interleaves them
+with the turn's token stream.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from utils.agent_names import SUPERVISOR_AGENT_NAME
+
+
+class ProgressEvent(NamedTuple):
+    """A stage of a turn: event type plus JSON fields."""
+
+    type: str
+    fields: dict
+
+
+class ProgressCallbackHandler(BaseCallbackHandler):
+    """
+    Turns agent callbacks into progress events (thread-safe).
+
+    Args:
+        emit: Called with each ProgressEvent (from any thread)
+        worker_tools: Worker tool name -> domain (supervisor tools)
+        retrieval_tools: Knowledge base search tool name -> domain
+    """
+
+    # Only takes a lock and calls emit: run inline on async runs too
+    run_inline = True
+
+    def __init__(
+        self,
+        emit: Callable[[ProgressEvent], None],
+        worker_tools: dict[str, str],
+        retrieval_tools: dict[str, str],
+    ):
+        self._emit = emit
+        self.worker_tools = worker_tools
+        self.retrieval_tools = retrieval_tools
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._routing = False
+        # LLM run -> agent name, for runs whose agent has not written text yet
+        self._quiet_runs: dict[UUID, str] = {}
+        self._generating: set[str] = set()
+        # Retrieval tool run -> (domain, start time)
+        self._retrievals: dict[UUID, tuple[str, float]] = {}
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        """Emit a progress event stamped with the time since the turn started."""
+        elapsed_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        self._emit(ProgressEvent(event_type, {**fields, "elapsed_ms": elapsed_ms}))
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        agent = (metadata or {}).get("lc_agent_name") or SUPERVISOR_AGENT_NAME
+        with self._lock:
+            routing = agent == SUPERVISOR_AGENT_NAME and not self._routing
+            self._routing = self._routing or routing
+            if agent not in self._generating:
+                self._quiet_runs[run_id] = agent
+        if routing:
+            self.emit("routing")
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        # Tool-call chunks carry no text
+        if not token or run_id not in self._quiet_runs:
+            return
+        with self._lock:
+            agent = self._quiet_runs.pop(run_id, None)
+            first = agent is not None and agent not in self._generating
+            if first:
+                self._generating.add(agent)
+        if first:
+            self.emit("generating", agent=agent)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._quiet_runs.pop(run_id, None)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._quiet_runs.pop(run_id, None)
+
+    def on_tool_start(
+        self, serialized: dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name")
+        if name in self.worker_tools:
+            # Fast-path routed turns reach the worker without a routing call
+            with self._lock:
+                self._routing = True
+            self.emit("worker_started", worker=self.worker_tools[name])
+        elif name in self.retrieval_tools:
+            self._retrievals[run_id] = (self.retrieval_tools[name], time.perf_counter())
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        retrieval = self._retrievals.pop(run_id, None)
+        if retrieval is not None:
+            domain, started = retrieval
+            self.emit(
+                "retrieval_done",
+                domain=domain,
+                retrieval_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._retrievals.pop(run_id, None)
+
+
+_progress_callbacks: ContextVar[ProgressCallbackHandler | None] = ContextVar(
+    "progress_callbacks", default=None
+)
+# Every LangChain run started while _progress_callbacks is set gets the handler
+register_configure_hook(_progress_callbacks, inheritable=True)
+
+
+@contextmanager
+def collect_progress(
+    worker_tools: dict[str, str], retrieval_tools: dict[str, str]
+) -> Iterator[asyncio.Queue]:
+    """
+    Collect progress events of everything run inside the block.
+
+    Must be entered on the event loop; events from worker threads are
+    handed over to it.
+
+    Yields:
+        asyncio.Queue: Receives the ProgressEvents (see merge_progress)
+
+    Example:
+        >>> with collect_progress(WORKER_DOMAINS, RETRIEVAL_TOOLS) as progress:
+        ...     async for item in merge_progress(token_frames, progress):
+        ...         ...
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: ProgressEvent) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        except RuntimeError:
+            # Loop closed: a late worker callback after the turn ended
+            pass
+
+    token = _progress_callbacks.set(
+        ProgressCallbackHandler(emit, worker_tools, retrieval_tools)
+    )
+    try:
+        yield queue
+    finally:
+        _progress_callbacks.reset(token)
+
+
+async def merge_progress(
+    items: AsyncIterator[Any], progress: asyncio.Queue
+) -> AsyncIterator[Any]:
+    """
+    Interleave progress events with the items of ``items``.
+
+    A progress event emitted before an item is yielded before it. Ends
+    with ``items``; progress events still queued at that point are dropped.
+
+    Args:
+        items: Main stream (e.g. coalesced token frames)
+        progress: Queue from collect_progress()
+
+    Yields:
+        Items of ``items`` and ProgressEvents
+    """
+    iterator = items.__aiter__()
+    pending_item = asyncio.ensure_future(iterator.__anext__())
+    pending_progress = asyncio.ensure_future(progress.get())
+    try:
+        while True:
+            await asyncio.wait(
+                {pending_item, pending_progress}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if pending_progress.done():
+                yield pending_progress.result()
+                pending_progress = asyncio.ensure_future(progress.get())
+                continue
+            try:
+                item = pending_item.result()
+            except StopAsyncIteration:
+                break
+            pending_item = asyncio.ensure_future(iterator.__anext__())
+            yield item
+    finally:
+        pending_progress.cancel()
+        # Consumer stopped early (client gone or error): stop the source too
+        if not pending_item.done():
+            pending_item.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration, Exception):
+                await pending_item
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
@@ -0,0 +1,182 @@
+"""
+Token-Bucket Admission Control.
+
+Rejects (or briefly delays) chat requests before any LLM work starts,
+instead of finding out about overload from the provider's RateLimitError
+after supervisor tokens have been spent.
+
+Two buckets gate each request: a global one (total request rate the
+deployment can afford) and one per session (a single client cannot use up
+the global budget). A request is admitted only if both buckets have a
+token. Buckets may go into debt up to ``max_wait`` seconds: such a request
+is admitted with a reserved start time and waits for it; any request that
+would have to wait longer is rejected with a Retry-After computed from the
+current bucket state.
+
+Last Updated: October 17, 2026
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitedError(Exception):
+    """Raised when a request is rejected by a token bucket."""
+
+    def __init__(self, scope: str, retry_after: float):
+        self.scope = scope  # "global" or "session"
+        self.retry_after = retry_after
+        super().__init__(f"{scope} rate limit exceeded, retry in {retry_after:.2f}s")
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value in whole seconds (at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, at most ``burst``.
+
+    Tokens may go negative (debt) when a caller reserves a future slot.
+    """
+
+    __slots__ = ("burst", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self.refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def idle(self, now: float) -> bool:
+        """True if the bucket would be full again (same as a fresh bucket)."""
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class RateLimiter:
+    """
+    Global plus per-session token buckets.
+
+    Per-session buckets are kept in least-recently-used order and dropped
+    once they have refilled (an idle full bucket behaves like a new one),
+    so memory follows the number of recently active sessions.
+
+    Example:
+        >>> limiter = RateLimiter(global_rate=20, global_burst=40,
+        ...                       session_rate=1, session_burst=10, max_wait=2)
+        >>> delay = limiter.acquire(session_id)  # raises RateLimitedError
+        >>> await asyncio.sleep(delay)
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        global_burst: float,
+        session_rate: float,
+        session_burst: float,
+        max_wait: float = 0.0,
+    ):
+        now = time.monotonic()
+        self.max_wait = max_wait
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self._global = TokenBucket(global_rate, global_burst, now)
+        self._sessions: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+
+        self._admitted = 0
+        self._delayed = 0
+        self._rejected = {"global": 0, "session": 0}
+
+    def _session_bucket(self, key: Hashable, now: float) -> TokenBucket:
+        # Drop refilled buckets from the least recently used end
+        while self._sessions:
+            oldest_key, oldest = next(iter(self._sessions.items()))
+            if oldest_key == key or not oldest.idle(now):
+                break
+            del self._sessions[oldest_key]
+
+        bucket = self._sessions.get(key)
+        if bucket is None:
+            bucket = self._sessions[key] = TokenBucket(
+                self.session_rate, self.session_burst, now
+            )
+        self._sessions.move_to_end(key)
+        return bucket
+
+    def acquire(self, key: Hashable) -> float:
+        """
+        Admit one request for a session.
+
+        Args:
+            key: Session ID
+
+        Returns:
+            float: Seconds the caller must wait before starting (0 = now);
+            the slot is already reserved
+
+        Raises:
+            RateLimitedError: If the request would have to wait longer
+                than ``max_wait``
+        """
+        now = time.monotonic()
+        session = self._session_bucket(key, now)
+
+        global_wait = self._global.wait_time(now)
+        session_wait = session.wait_time(now)
+        wait = max(global_wait, session_wait)
+
+        if wait > self.max_wait:
+            scope = "session" if session_wait >= global_wait else "global"
+            self._rejected[scope] += 1
+            raise RateLimitedError(scope, wait)
+
+        self._global.tokens -= 1
+        session.tokens -= 1
+        self._admitted += 1
+        if wait:
+            self._delayed += 1
+        return wait
+
+    def stats(self) -> dict:
+        """
+        Bucket state and counters for health and metrics endpoints.
+
+        Returns:
+            dict: Global bucket level, tracked sessions, and admitted /
+            delayed / rejected counts
+        """
+        now = time.monotonic()
+        self._global.refill(now)
+        return {
+            "global": {
+                "tokens": round(self._global.tokens, 2),
+                "rate": self._global.rate,
+                "burst": self._global.burst,
+            },
+            "session": {
+                "rate": self.session_rate,
+                "burst": self.session_burst,
+                "tracked": len(self._sessions),
+            },
+            "max_wait_seconds": self.max_wait,
+            "admitted": self._admitted,
+            "delayed": self._delayed,
+            "rejected": dict(self._rejected),
+        }
@@ -0,0 +1,170 @@
+"""
+Startup Warm-Up and Readiness Tracking.
+
+A process that accepts connections is alive, but it is not ready for user
+traffic until its agents are built, the Chroma collections are open and
+the first embedding / LLM connections have been made. Sending traffic
+earlier makes the first requests after every deploy or scale-up pay for
+all of that.
+
+``Readiness`` runs the startup tasks concurrently (blocking tasks go to
+threads) and records the outcome of each, optionally retrying failed tasks
+with capped exponential backoff until they succeed, so an instance that
+started while a dependency was down turns ready once it is back. The
+application reports it on
+``/ready`` so a load balancer only routes traffic to warm instances, while
+``/health`` keeps answering as a liveness probe from the first moment.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Outcome of the startup tasks; ready once every task has succeeded.
+
+    Example:
+        >>> readiness = Readiness()
+        >>> await readiness.run({"vectorstore:billing": lambda: warm_vectorstore("billing")})
+        True
+        >>> readiness.status()
+        {'ready': True, 'tasks': {'vectorstore:billing': {'status': 'ok', ...}}}
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, dict] = {}
+        self._started: float | None = None
+        self._finished: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        """True once all tasks have run and none failed."""
+        return self._finished is not None and all(
+            task["status"] == "ok" for task in self._tasks.values()
+        )
+
+    async def run(
+        self,
+        tasks: dict[str, Callable[[], Any]],
+        timeout: float | None = None,
+        retry_initial_seconds: float | None = None,
+        retry_max_seconds: float = 60.0,
+    ) -> bool:
+        """
+        Run startup tasks concurrently, each in its own thread.
+
+        A task fails if it raises or does not finish within ``timeout``
+        seconds; failures are logged and reported by ``status()``, never
+        raised. With ``retry_initial_seconds`` set, a failed task is retried
+        after that delay, doubling after every further failure up to
+        ``retry_max_seconds``, until it succeeds (its status is "retrying"
+        in the meantime); ``run`` then only returns once every task has
+        succeeded or it is cancelled.
+
+        Args:
+            tasks: Task name -> blocking callable
+            timeout: Per-task time limit in seconds (None = no limit)
+            retry_initial_seconds: Delay before the first retry of a failed
+                task (None = do not retry)
+            retry_max_seconds: Upper bound for the delay between retries
+
+        Returns:
+            bool: True if every task succeeded
+
+        Example:
+            >>> await readiness.run(tasks, timeout=60, retry_initial_seconds=1)
+            True
+        """
+        self._started = time.perf_counter()
+        self._finished = None
+        self._tasks = {name: {"status": "pending"} for name in tasks}
+
+        await asyncio.gather(
+            *(
+                self._run_with_retries(
+                    name, fn, timeout, retry_initial_seconds, retry_max_seconds
+                )
+                for name, fn in tasks.items()
+            )
+        )
+
+        self._finished = time.perf_counter()
+        logger.info(
+            f"Startup tasks finished in {self._finished - self._started:.2f}s "
+            f"({'ready' if self.ready else 'NOT ready'})"
+        )
+        return self.ready
+
+    async def _run_with_retries(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        timeout: float | None,
+        retry_initial_seconds: float | None,
+        retry_max_seconds: float,
+    ) -> None:
+        task = self._tasks[name]
+        delay = retry_initial_seconds
+        attempts = 1
+        await self._run_task(name, fn, timeout)
+        while task["status"] == "failed" and delay is not None:
+            task["status"] = "retrying"
+            task["attempts"] = attempts
+            logger.warning(f"Retrying startup task {name} in {delay:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, retry_max_seconds)
+            attempts += 1
+            await self._run_task(name, fn, timeout)
+        if attempts > 1:
+            task["attempts"] = attempts
+
+    async def _run_task(
+        self, name: str, fn: Callable[[], Any], timeout: float | None
+    ) -> None:
+        started = time.perf_counter()
+        task = self._tasks[name]
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(fn), timeout)
+            task["status"] = "ok"
+            task.pop("error", None)
+            if result is not None:
+                task["result"] = result
+        except TimeoutError:
+            task["status"] = "failed"
+            task["error"] = f"Timed out after {timeout:g}s"
+        except Exception as e:  # noqa: BLE001 - reported as the task's error
+            task["status"] = "failed"
+            task["error"] = str(e) or type(e).__name__
+        task["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        if task["status"] == "ok":
+            logger.info(f"✅ Startup task {name} ({task['duration_ms']}ms)")
+        else:
+            logger.error(f"❌ Startup task {name} failed: {task['error']}")
+
+    def status(self) -> dict:
+        """
+        Readiness report for /ready.
+
+        Returns:
+            dict: ``ready`` flag, ``warming`` while tasks are running, the
+            startup duration in ms once finished, and per-task status
+            ("pending", "ok", "failed" or "retrying", with duration_ms,
+            error and the number of attempts once retried)
+        """
+        report: dict[str, Any] = {
+            "ready": self.ready,
+            "warming": self._started is not None and self._finished is None,
+        }
+        if self._finished is not None:
+            report["startup_ms"] = round((self._finished - self._started) * 1000, 1)
+        report["tasks"] = {name: dict(task) for name, task in self._tasks.items()}
+        return report
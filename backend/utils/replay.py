@@ -0,0 +1,415 @@
+"""
+Resumable SSE Streams: Event IDs and Replay Buffers.
+
+A streamed answer on a mobile connection often loses its TCP connection
+halfway through. Without resumption the client has to send the message
+again, which re-runs the whole agent pipeline and adds the turn to the
+session history twice.
+
+Instead, ``/chat/stream`` runs the agent in a producer task that appends
+each framed SSE event to a ``ReplayBuffer`` under an ``id:`` of the form
+``<stream_id>:<seq>``. The HTTP response only follows the buffer, so a
+client that reconnects with the ``Last-Event-ID`` header gets every event
+after that ID: the rest of the stored events, then live events while the
+original run continues, or up to the end of the stream if it has
+finished in the meantime.
+
+Memory is bounded in three ways:
+- Per stream: the oldest events are trimmed beyond ``max_stream_bytes``
+  (resuming from a trimmed event is refused with ``ReplayGapError``)
+- Globally: beyond ``max_bytes`` the oldest finished streams are evicted
+  first, then the growing stream is trimmed
+- In time: finished streams are dropped ``ttl_seconds`` after their last event
+
+Because the producer never waits for a reader, a slow client no longer
+slows the LLM read loop or holds the provider connection open. A reader
+that falls more than ``max_lag`` bytes behind is handled by the caller's
+policy: its pending tokens are merged into larger frames (fewer, bigger
+writes), or it is dropped with ``SlowConsumerError`` (it may resume with
+Last-Event-ID). High-water marks of buffered bytes and reader lag are
+reported by ``stats()``.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable, Hashable
+
+from utils.sse import HEARTBEAT
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayGapError(LookupError):
+    """Raised when a resume point has already been trimmed from the buffer."""
+
+    def __init__(self, stream_id: str, after: int, first: int):
+        self.stream_id = stream_id
+        self.after = after
+        self.first = first
+        super().__init__(
+            f"Events {after + 1}-{first - 1} of stream {stream_id} are no longer buffered"
+        )
+
+
+class SlowConsumerError(RuntimeError):
+    """Raised when a reader without a merge policy falls too far behind."""
+
+    def __init__(self, stream_id: str, lag: int):
+        self.stream_id = stream_id
+        self.lag = lag
+        super().__init__(f"Reader of stream {stream_id} is {lag} bytes behind")
+
+
+def parse_event_id(event_id: str) -> tuple[str, int]:
+    """
+    Split an SSE event ID into stream ID and sequence number.
+
+    Args:
+        event_id: ``Last-Event-ID`` value, ``"<stream_id>:<seq>"``
+
+    Returns:
+        tuple: (stream_id, seq)
+
+    Raises:
+        ValueError: If the ID is not of that form
+
+    Example:
+        >>> parse_event_id("3f2c9a...:17")
+        ('3f2c9a...', 17)
+    """
+    stream_id, sep, seq = event_id.strip().rpartition(":")
+    if not sep or not stream_id or not seq.isdigit():
+        raise ValueError(f"Malformed event ID: {event_id!r}")
+    return stream_id, int(seq)
+
+
+class ReplayBuffer:
+    """
+    Events of one SSE stream, in order, for live and resumed readers.
+
+    Sequence numbers start at 1, so ``follow(0)`` reads the stream from
+    the beginning.
+
+    Example:
+        >>> buffer = buffers.create(session_id)
+        >>> buffer.append(writer.event("start"))
+        1
+        >>> async for frame in buffer.follow(after=0):
+        ...     yield frame
+    """
+
+    def __init__(
+        self, stream_id: str, session_id: str, max_bytes: int, owner: "ReplayBuffers"
+    ):
+        self.stream_id = stream_id
+        self.session_id = session_id
+        self.max_bytes = max_bytes
+        self.closed = False
+        self.readers = 0
+        # Most bytes any reader has been behind the newest event
+        self.max_lag = 0
+        self.updated = time.monotonic()
+        self._owner = owner
+        self._id_prefix = f"id: {stream_id}:".encode("ascii")
+        # (seq, framed event, bytes appended up to and including it, token)
+        self._events: deque[tuple[int, bytes, int, tuple[Hashable, str] | None]] = (
+            deque()
+        )
+        self._bytes = 0
+        self._appended = 0
+        self._next_seq = 1
+        self._signal = asyncio.Event()
+
+    @property
+    def size(self) -> int:
+        """Bytes of buffered events."""
+        return self._bytes
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 before the first)."""
+        return self._next_seq - 1
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest buffered event."""
+        return self._events[0][0] if self._events else self._next_seq
+
+    def append(self, frame: bytes, token: tuple[Hashable, str] | None = None) -> int:
+        """
+        Add a framed SSE event (``data: ...\\n\\n``) under the next ID.
+
+        Args:
+            frame: Event bytes as produced by SSEWriter
+            token: For token events, (merge key, text): lagging readers may
+                merge consecutive tokens with the same key into one frame
+
+        Returns:
+            int: Sequence number of the event
+        """
+        if self.closed:
+            raise RuntimeError(f"Stream {self.stream_id} is closed")
+        seq = self._next_seq
+        self._next_seq += 1
+        data = self._framed(seq, frame)
+        self._appended += len(data)
+        self._events.append((seq, data, self._appended, token))
+        self._bytes += len(data)
+        self.updated = time.monotonic()
+        self._owner._grew(self, len(data))
+        self.trim(self.max_bytes)
+        self.wake()
+        return seq
+
+    def _framed(self, seq: int, frame: bytes) -> bytes:
+        return self._id_prefix + str(seq).encode("ascii") + b"\n" + frame
+
+    def close(self) -> None:
+        """Mark the stream finished; readers return after the last event."""
+        self.closed = True
+        self.updated = time.monotonic()
+        self.wake()
+
+    def wake(self) -> None:
+        """Wake all readers waiting for a new event (or to re-check their stop flag)."""
+        self._signal.set()
+        self._signal = asyncio.Event()
+
+    def trim(self, max_bytes: int) -> int:
+        """
+        Drop the oldest events (keeping the newest) until at most ``max_bytes`` remain.
+
+        Returns:
+            int: Bytes freed
+        """
+        freed = 0
+        while self._bytes > max_bytes and len(self._events) > 1:
+            data = self._events.popleft()[1]
+            self._bytes -= len(data)
+            freed += len(data)
+        if freed:
+            self._owner._shrank(freed, trimmed=True)
+        return freed
+
+    def can_resume(self, after: int) -> bool:
+        """True if every event after ``after`` is still buffered (or yet to come)."""
+        return self.first_seq <= after + 1 <= self._next_seq
+
+    async def follow(
+        self,
+        after: int = 0,
+        stop: asyncio.Event | None = None,
+        max_lag: int | None = None,
+        merge: Callable[[Hashable, str], bytes] | None = None,
+        heartbeat: float | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the events after sequence number ``after``, then live events.
+
+        Returns once the stream is closed and fully read, or once ``stop``
+        is set (call ``wake()`` after setting it).
+
+        Args:
+            after: Last sequence number the reader has (0 = from the start)
+            stop: Event that ends the read early, e.g. on client disconnect
+            max_lag: Bytes the reader may fall behind the newest event
+                before the slow-consumer policy applies (None = no limit)
+            merge: Slow-consumer policy. If given, ``merge(key, text)``
+                encodes the pending consecutive tokens with the same key as
+                one frame (sent under the ID of the last of them); if None,
+                a reader past ``max_lag`` is dropped
+            heartbeat: Yield an SSE comment (``HEARTBEAT``, not buffered)
+                after this many seconds without an event (None = never)
+
+        Raises:
+            ReplayGapError: If events the reader still needs were trimmed
+            SlowConsumerError: If the reader fell more than ``max_lag``
+                bytes behind and no ``merge`` was given
+        """
+        self.readers += 1
+        try:
+            while stop is None or not stop.is_set():
+                first = self.first_seq
+                if after + 1 < first:
+                    raise ReplayGapError(self.stream_id, after, first)
+                index = after + 1 - first
+                if index < len(self._events):
+                    seq, data, end, token = self._events[index]
+                    lag = self._appended - (end - len(data))
+                    if lag > self.max_lag:
+                        self.max_lag = lag
+                        self._owner._lagged(lag)
+                    if max_lag is not None and lag > max_lag:
+                        if merge is None:
+                            self._owner._dropped += 1
+                            raise SlowConsumerError(self.stream_id, lag)
+                        if token is not None:
+                            seq, data = self._merge_tokens(index, merge)
+                    after = seq
+                    yield data
+                    continue
+                if self.closed:
+                    return
+                if heartbeat:
+                    try:
+                        await asyncio.wait_for(self._signal.wait(), heartbeat)
+                    except TimeoutError:
+                        yield HEARTBEAT
+                else:
+                    await self._signal.wait()
+        finally:
+            self.readers -= 1
+
+    def _merge_tokens(
+        self, index: int, merge: Callable[[Hashable, str], bytes]
+    ) -> tuple[int, bytes]:
+        """Merge the run of same-key token events starting at ``index`` into one frame."""
+        seq, data, _, (key, text) = self._events[index]
+        texts = [text]
+        for next_seq, _, _, token in itertools.islice(self._events, index + 1, None):
+            if token is None or token[0] != key:
+                break
+            seq = next_seq
+            texts.append(token[1])
+        if len(texts) == 1:
+            return seq, data
+        self._owner._coalesced += len(texts) - 1
+        return seq, self._framed(seq, merge(key, "".join(texts)))
+
+
+class ReplayBuffers:
+    """
+    Registry of replay buffers with per-stream, global and TTL bounds.
+
+    Example:
+        >>> buffers = ReplayBuffers(max_bytes=64 << 20, max_stream_bytes=256 << 10, ttl_seconds=60)
+        >>> buffer = buffers.create(session_id)
+        >>> buffers.get(buffer.stream_id) is buffer
+        True
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 << 20,
+        max_stream_bytes: int = 256 << 10,
+        ttl_seconds: float = 60,
+    ):
+        self.max_bytes = max_bytes
+        self.max_stream_bytes = max_stream_bytes
+        self.ttl_seconds = ttl_seconds
+        # stream_id -> buffer, oldest first
+        self._buffers: OrderedDict[str, ReplayBuffer] = OrderedDict()
+        self._bytes = 0
+        self._peak_bytes = 0
+        self._max_lag = 0
+        self._coalesced = 0
+        self._dropped = 0
+        self._created = 0
+        self._resumed = 0
+        self._expired = 0
+        self._evicted = 0
+        self._trimmed_bytes = 0
+
+    def create(self, session_id: str) -> ReplayBuffer:
+        """Start a buffer for a new stream of ``session_id``."""
+        self._sweep()
+        buffer = ReplayBuffer(uuid.uuid4().hex, session_id, self.max_stream_bytes, self)
+        self._buffers[buffer.stream_id] = buffer
+        self._created += 1
+        return buffer
+
+    def get(self, stream_id: str) -> ReplayBuffer | None:
+        """Buffer of a stream, or None if it is unknown or has expired."""
+        self._sweep()
+        return self._buffers.get(stream_id)
+
+    def resume(
+        self, stream_id: str, session_id: str, after: int
+    ) -> ReplayBuffer | None:
+        """
+        Buffer to resume a stream of ``session_id`` after event ``after``.
+
+        Returns:
+            ReplayBuffer | None: None if the stream is unknown, expired,
+            belongs to another session or no longer holds the events
+            after ``after``
+        """
+        buffer = self.get(stream_id)
+        if (
+            buffer is None
+            or buffer.session_id != session_id
+            or not buffer.can_resume(after)
+        ):
+            return None
+        self._resumed += 1
+        return buffer
+
+    def _grew(self, buffer: ReplayBuffer, size: int) -> None:
+        self._bytes += size
+        self._peak_bytes = max(self._peak_bytes, self._bytes)
+        if self._bytes <= self.max_bytes:
+            return
+        # Over the global cap: finished streams go first, oldest first
+        for stream_id, other in list(self._buffers.items()):
+            if self._bytes <= self.max_bytes:
+                return
+            if other.closed:
+                self._remove(stream_id)
+                self._evicted += 1
+        if self._bytes > self.max_bytes:
+            buffer.trim(max(buffer.size - (self._bytes - self.max_bytes), 0))
+
+    def _lagged(self, lag: int) -> None:
+        self._max_lag = max(self._max_lag, lag)
+
+    def _shrank(self, size: int, trimmed: bool = False) -> None:
+        self._bytes -= size
+        if trimmed:
+            self._trimmed_bytes += size
+
+    def _remove(self, stream_id: str) -> None:
+        buffer = self._buffers.pop(stream_id)
+        self._shrank(buffer.size)
+
+    def _sweep(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        for stream_id, buffer in list(self._buffers.items()):
+            if buffer.closed and buffer.updated < cutoff:
+                self._remove(stream_id)
+                self._expired += 1
+
+    def stats(self) -> dict:
+        """
+        Replay buffer counters for health and metrics endpoints.
+
+        Returns:
+            dict: Buffered streams (and how many are still running), bytes
+            held, their high-water mark ("peak_bytes") and limits, streams
+            created and resumed, finished streams expired or evicted under
+            memory pressure, bytes trimmed, the most bytes a reader has been
+            behind ("max_lag_bytes"), tokens merged for slow readers
+            ("coalesced_tokens") and slow readers dropped
+        """
+        return {
+            "streams": len(self._buffers),
+            "active": sum(1 for buffer in self._buffers.values() if not buffer.closed),
+            "bytes": self._bytes,
+            "peak_bytes": self._peak_bytes,
+            "max_bytes": self.max_bytes,
+            "max_stream_bytes": self.max_stream_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "created": self._created,
+            "resumed": self._resumed,
+            "expired": self._expired,
+            "evicted": self._evicted,
+            "trimmed_bytes": self._trimmed_bytes,
+            "max_lag_bytes": self._max_lag,
+            "coalesced_tokens": self._coalesced,
+            "dropped_readers": self._dropped,
+        }
@@ -0,0 +1,214 @@
+"""
+Weighted Fair Scheduler for Agent Runs.
+
+Without scheduling, agent runs start in arrival order, so a burst from one
+large customer delays everyone else. ``FairScheduler`` limits how many
+agent runs execute at once and, when runs have to wait, hands out free
+slots by deficit round-robin (DRR) across flows:
+
+- A flow is one tenant within a priority tier (or the whole tier for
+  requests without a tenant)
+- Each flow's share is proportional to its tier's weight, e.g. with
+  weights premium=4, standard=2, free=1 a waiting premium tenant gets
+  twice the slots of a waiting standard tenant
+- Flows with nothing queued use no share, so a lone tenant can use all
+  slots
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Flow(NamedTuple):
+    """Scheduling key: priority tier plus optional tenant."""
+
+    tier: str
+    tenant: str | None = None
+
+
+def parse_tier_weights(spec: str) -> dict[str, float]:
+    """
+    Parse "premium:4,standard:2,free:1" into {"premium": 4.0, ...}.
+
+    Raises:
+        ValueError: If an entry is malformed or a weight is not positive
+    """
+    weights = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        tier, _, weight = entry.partition(":")
+        value = float(weight)
+        if not tier or value <= 0:
+            raise ValueError(f"Invalid tier weight: {entry!r}")
+        weights[tier.strip().lower()] = value
+    return weights
+
+
+class FairScheduler:
+    """
+    Concurrency limiter with deficit round-robin across flows.
+
+    Example:
+        >>> scheduler = FairScheduler(max_concurrent=16, weights={"premium": 4, "standard": 1})
+        >>> async with scheduler.slot(Flow("premium", "acme")) as queue_wait:
+        ...     result = await run_agent()
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        weights: dict[str, float],
+        default_tier: str = "standard",
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if default_tier not in weights:
+            raise ValueError(f"default tier {default_tier!r} has no weight")
+
+        self.max_concurrent = max_concurrent
+        self.weights = dict(weights)
+        self.default_tier = default_tier
+
+        self._running = 0
+        # Flows with waiters, in round-robin order (head = current turn)
+        self._queues: OrderedDict[Flow, deque[asyncio.Future]] = OrderedDict()
+        self._deficit: dict[Flow, float] = {}
+
+        self._tier_stats = {
+            tier: {"dispatched": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+            for tier in self.weights
+        }
+
+    def flow(self, tier: str | None, tenant: str | None = None) -> Flow:
+        """Build a Flow, mapping unknown or missing tiers to the default."""
+        tier = (tier or "").strip().lower()
+        return Flow(tier if tier in self.weights else self.default_tier, tenant or None)
+
+    @property
+    def running(self) -> int:
+        """Number of slots currently held."""
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for a slot."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        # DRR with unit cost: the head flow is served while it has at least
+        # one credit; otherwise it earns its quantum (tier weight) for its
+        # next turn and moves to the back
+        while self._queues:
+            flow, queue = next(iter(self._queues.items()))
+            if self._deficit[flow] >= 1:
+                self._deficit[flow] -= 1
+                waiter = queue.popleft()
+                if not queue:
+                    # Idle flows do not bank credit
+                    del self._queues[flow]
+                    del self._deficit[flow]
+                return waiter
+            self._deficit[flow] += self.weights[flow.tier]
+            self._queues.move_to_end(flow)
+        return None
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._running += 1
+            waiter.set_result(None)
+
+    def _remove(self, flow: Flow, waiter: asyncio.Future) -> None:
+        queue = self._queues.get(flow)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[flow]
+                del self._deficit[flow]
+
+    @asynccontextmanager
+    async def slot(self, flow: Flow) -> AsyncIterator[float]:
+        """
+        Hold one run slot for the duration of the block.
+
+        Args:
+            flow: Scheduling key (see flow())
+
+        Yields:
+            float: Seconds spent waiting for the slot
+        """
+        if self._running < self.max_concurrent and not self._queues:
+            self._running += 1
+            queue_wait = 0.0
+        else:
+            loop = asyncio.get_running_loop()
+            enqueued = loop.time()
+            waiter = loop.create_future()
+            if flow not in self._queues:
+                self._queues[flow] = deque()
+                self._deficit[flow] = 0.0
+            self._queues[flow].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted just before the cancellation: hand it on
+                    self._running -= 1
+                    self._dispatch()
+                else:
+                    self._remove(flow, waiter)
+                raise
+            queue_wait = loop.time() - enqueued
+
+        stats = self._tier_stats[flow.tier]
+        stats["dispatched"] += 1
+        stats["wait_seconds_total"] += queue_wait
+        stats["wait_seconds_max"] = max(stats["wait_seconds_max"], queue_wait)
+
+        try:
+            yield queue_wait
+        finally:
+            self._running -= 1
+            self._dispatch()
+
+    def stats(self) -> dict:
+        """
+        Scheduler state and per-tier queue wait for health and metrics.
+
+        Returns:
+            dict: Running/queued counts and, per tier, weight, queued,
+            dispatched and queue wait totals
+        """
+        queued_by_tier = {tier: 0 for tier in self.weights}
+        for flow, queue in self._queues.items():
+            queued_by_tier[flow.tier] += len(queue)
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self._running,
+            "queued": sum(queued_by_tier.values()),
+            "tiers": {
+                tier: {
+                    "weight": self.weights[tier],
+                    "queued": queued_by_tier[tier],
+                    "dispatched": stats["dispatched"],
+                    "wait_seconds_total": round(stats["wait_seconds_total"], 4),
+                    "wait_seconds_max": round(stats["wait_seconds_max"], 4),
+                    "avg_wait_seconds": round(
+                        stats["wait_seconds_total"] / stats["dispatched"], 4
+                    )
+                    if stats["dispatched"]
+                    else 0.0,
+                }
+                for tier, stats in self._tier_stats.items()
+            },
+        }
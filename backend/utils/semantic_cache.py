@@ -0,0 +1,236 @@
+"""
+Semantic Answer Cache.
+
+The exact-match answer cache misses paraphrases ("refund policy?" vs
+"how do refunds work"). ``SemanticCache`` keeps the embeddings of recently
+answered first-turn queries in a fixed-size NumPy ring buffer and serves a
+cached answer when a new query is close enough (cosine similarity) to a
+previous one.
+
+Lookups are a single matrix-vector product over the whole buffer, so cost
+grows linearly with capacity but stays in the low milliseconds for tens of
+thousands of entries (see scripts/benchmark_semantic_cache.py); async
+callers should still run ``search`` in a thread. Each entry is tagged with
+the domain the supervisor routed it to and the knowledge base version it
+was answered from; lookups can be restricted to one domain and version.
+
+Last Updated: October 17, 2026
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticHit(NamedTuple):
+    """A cached answer whose query matched the lookup."""
+
+    answer: str
+    # Cosine similarity between the lookup and the cached query
+    score: float
+    domain: str
+    query: str
+
+
+class SemanticCache:
+    """
+    Embedding-keyed answer cache backed by a NumPy ring buffer.
+
+    Vectors are L2-normalized on insert, so cosine similarity is a dot
+    product. When the buffer is full the oldest entry is overwritten.
+    The buffer is allocated on the first insert, once the embedding
+    dimension is known.
+
+    Example:
+        >>> cache = SemanticCache(capacity=10_000, threshold=0.92)
+        >>> cache.add(embed("refund policy?"), "refund policy?", "Refunds are...", "compliance", "v1")
+        >>> hit = cache.search(embed("how do refunds work"), "compliance", "v1")
+        >>> hit.answer if hit else None
+        'Refunds are...'
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        threshold: float = 0.92,
+        ttl_seconds: float = 3600,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be a cosine similarity in [-1, 1]")
+
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        self._vectors: np.ndarray | None = None  # (capacity, dim) float32
+        self._expires_at = np.zeros(capacity, dtype=np.float64)
+        self._domain_ids = np.full(capacity, -1, dtype=np.int32)
+        self._answers: list[str | None] = [None] * capacity
+        self._queries: list[str | None] = [None] * capacity
+        self._domains: dict[str, int] = {}  # domain name -> id
+        self._domain_names: list[str] = []
+        self._version_ids = np.full(capacity, -1, dtype=np.int32)
+        self._versions: dict[str, int] = {}  # knowledge base version -> id
+        self._next = 0  # slot the next insert writes to
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimensions(self) -> int | None:
+        """Embedding dimension, or None before the first insert."""
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.ndim != 1 or not norm:
+            return None
+        return vector / norm
+
+    def add(
+        self,
+        embedding: Sequence[float],
+        query: str,
+        answer: str,
+        domain: str,
+        version: str = "",
+    ) -> None:
+        """
+        Store an answer under its query embedding.
+
+        Args:
+            embedding: Query embedding
+            query: Normalized query text (kept for logging and debugging)
+            answer: Final answer to serve on a match
+            domain: Domain the query was routed to (e.g. "billing", "direct")
+            version: Knowledge base version the answer was built from
+
+        Raises:
+            ValueError: If the embedding dimension differs from earlier inserts
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.capacity, vector.shape[0]), dtype=np.float32
+                )
+            elif vector.shape[0] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding has {vector.shape[0]} dimensions, "
+                    f"cache holds {self._vectors.shape[1]}"
+                )
+
+            slot = self._next
+            self._vectors[slot] = vector
+            self._expires_at[slot] = time.monotonic() + self.ttl_seconds
+            if domain not in self._domains:
+                self._domains[domain] = len(self._domain_names)
+                self._domain_names.append(domain)
+            self._domain_ids[slot] = self._domains[domain]
+            self._version_ids[slot] = self._versions.setdefault(
+                version, len(self._versions)
+            )
+            self._answers[slot] = answer
+            self._queries[slot] = query
+
+            self._next = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        domain: str | None = None,
+        version: str | None = None,
+    ) -> SemanticHit | None:
+        """
+        Find the most similar live entry above the similarity threshold.
+
+        Args:
+            embedding: Query embedding
+            domain: Only consider entries routed to this domain (None = all)
+            version: Only consider entries answered from this knowledge base
+                version (None = all)
+
+        Returns:
+            SemanticHit | None: Best match, or None if nothing is close enough
+        """
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            hit = None
+            if vector is not None and self._size and vector.shape[0] == self.dimensions:
+                size = self._size
+                scores = self._vectors[:size] @ vector
+
+                live = self._expires_at[:size] > time.monotonic()
+                if domain is not None:
+                    live &= self._domain_ids[:size] == self._domains.get(domain, -2)
+                if version is not None:
+                    live &= self._version_ids[:size] == self._versions.get(version, -2)
+                scores = np.where(live, scores, -np.inf)
+
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    hit = SemanticHit(
+                        self._answers[best],
+                        float(scores[best]),
+                        self._domain_names[self._domain_ids[best]],
+                        self._queries[best],
+                    )
+
+            if hit is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return hit
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._vectors = None
+            self._expires_at[:] = 0
+            self._domain_ids[:] = -1
+            self._version_ids[:] = -1
+            self._answers = [None] * self.capacity
+            self._queries = [None] * self.capacity
+            self._domains.clear()
+            self._domain_names.clear()
+            self._versions.clear()
+            self._next = 0
+            self._size = 0
+
+    def stats(self) -> dict:
+        """
+        Size and hit/miss counters for health and metrics endpoints.
+
+        Returns:
+            dict: Entries, capacity, threshold and hit/miss counters
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": self._size,
+            "capacity": self.capacity,
+            "threshold": self.threshold,
+            "dimensions": self.dimensions,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
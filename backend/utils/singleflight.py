@@ -0,0 +1,95 @@
+"""
+Single-Flight Request Coalescing.
+
+During incident spikes many sessions send the same first message within
+seconds. Each one would run the full supervisor → worker → retrieval → LLM
+pipeline. ``SingleFlight`` lets identical in-flight calls share a single
+execution: the first caller (leader) runs the work, later callers with the
+same key await the leader's result.
+
+The shared work runs in its own task, so a leader that is cancelled does
+not cancel the execution its followers are waiting on. That task copies
+the leader's context variables (request deadline, timing collector), so
+callers whose context-dependent limits differ must put them in the key.
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls that share a key.
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> result, shared = await flight.do("error 500", lambda: run_agent())
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Args:
+            key: Deduplication key (e.g. normalized message text)
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            tuple: (result, shared) where ``shared`` is True if this caller
+            reused another caller's in-flight execution
+
+        Raises:
+            Exception: Whatever ``fn`` raised, re-raised to every waiter
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self._coalesced += 1
+            logger.info(
+                f"Single-flight: joined in-flight execution ({self._calls_label(key)})"
+            )
+            return await asyncio.shield(task), True
+
+        self._executions += 1
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task), False
+
+    @staticmethod
+    def _calls_label(key: Hashable) -> str:
+        text = str(key)
+        return text if len(text) <= 40 else f"{text[:40]}..."
+
+    def stats(self) -> dict:
+        """
+        Coalescing counters for health and metrics endpoints.
+
+        Returns:
+            dict: executions, coalesced waiters, and coalescing rate
+            (share of requests served by another request's execution)
+        """
+        total = self._executions + self._coalesced
+        return {
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "coalescing_rate": round(self._coalesced / total, 4) if total else 0.0,
+            "in_flight": self.in_flight,
+        }
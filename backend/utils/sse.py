@@ -0,0 +1,188 @@
+"""
+Server-Sent Events Writer and Token Coalescing.
+
+Streaming endpoints emit one SSE event per LLM token. Building each event
+with ``json.dumps`` on a fresh dict and sending it as its own chunk costs a
+syscall (and a proxy write) per token, which adds up with hundreds of open
+streams per node.
+
+This module provides:
+- ``SSEWriter``: per-stream writer that pre-encodes the constant part of
+  each event (type, session_id) once and emits correctly framed bytes
+- ``coalesce_tokens``: merges consecutive tokens into larger frames, flushed
+  every ``flush_interval`` seconds or ``flush_bytes`` bytes, whichever
+  comes first
+- ``HEARTBEAT``: comment frame sent on idle streams
+
+SSE framing reference: https://html.spec.whatwg.org/multipage/server-sent-events.html
+
+Last Updated: October 17, 2026
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Event terminator: a blank line ends an SSE event
+EVENT_END = b"\n\n"
+
+# Comment line that clients ignore; keeps idle connections alive through
+# proxies with idle timeouts
+HEARTBEAT = b": heartbeat" + EVENT_END
+
+
+def _json(value: Any) -> bytes:
+    """Compact UTF-8 JSON encoding used for all event payloads."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SSEWriter:
+    """
+    Encodes events for a single SSE stream.
+
+    The JSON prefix of token events (everything up to the content value)
+    depends only on the event type, agent and session, so it is encoded
+    once and reused for every token.
+
+    Example:
+        >>> writer = SSEWriter("550e8400-e29b-41d4-a716-446655440000")
+        >>> writer.token("Hello")
+        b'data: {"type":"token","session_id":"550e...","content":"Hello"}\\n\\n'
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self._session_json = _json(session_id)
+        self._token_prefix = self._prefix("token")
+        self._worker_prefixes: dict[str, bytes] = {}
+
+    def _prefix(self, event_type: str, **constant_fields: Any) -> bytes:
+        parts = [
+            b'data: {"type":',
+            _json(event_type),
+            b',"session_id":',
+            self._session_json,
+        ]
+        for key, value in constant_fields.items():
+            parts += [b",", _json(key), b":", _json(value)]
+        parts.append(b',"content":')
+        return b"".join(parts)
+
+    def token(self, text: str) -> bytes:
+        """Encode an answer token event."""
+        return self._token_prefix + _json(text) + b"}" + EVENT_END
+
+    def worker_token(self, text: str, agent: str) -> bytes:
+        """Encode a worker token event (prefix cached per agent)."""
+        prefix = self._worker_prefixes.get(agent)
+        if prefix is None:
+            prefix = self._prefix("worker_token", agent=agent)
+            self._worker_prefixes[agent] = prefix
+        return prefix + _json(text) + b"}" + EVENT_END
+
+    def event(self, event_type: str, **fields: Any) -> bytes:
+        """
+        Encode a control event (start, done, error, ...).
+
+        Args:
+            event_type: Value of the "type" field
+            **fields: Additional JSON fields
+
+        Returns:
+            bytes: A complete, framed SSE event
+        """
+        payload = {"type": event_type, "session_id": self.session_id, **fields}
+        return b"data: " + _json(payload) + EVENT_END
+
+
+async def coalesce_tokens(
+    chunks: AsyncIterator[Any],
+    flush_interval: float = 0.02,
+    flush_bytes: int = 256,
+) -> AsyncIterator[Any]:
+    """
+    Merge consecutive token chunks into larger frames.
+
+    Chunks are ``TokenChunk``-like named tuples with ``text`` and ``agent``
+    fields. Consecutive chunks from the same agent are concatenated and
+    yielded when the oldest buffered token is ``flush_interval`` seconds
+    old, the buffer reaches ``flush_bytes`` bytes, the agent changes, or
+    the source ends. A zero interval disables coalescing.
+
+    Args:
+        chunks: Source of token chunks
+        flush_interval: Maximum time a token may wait in the buffer (seconds)
+        flush_bytes: Buffer size that triggers an immediate flush
+
+    Yields:
+        Chunks of the same type as the source, with merged ``text``
+    """
+    if flush_interval <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    pending: asyncio.Future | None = None
+
+    buffered: list[str] = []
+    buffered_bytes = 0
+    head = None  # first chunk in the buffer (carries the agent)
+    deadline = 0.0
+
+    def flush():
+        nonlocal buffered, buffered_bytes, head
+        merged = head._replace(text="".join(buffered))
+        buffered, buffered_bytes, head = [], 0, None
+        return merged
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            if head is not None:
+                # Wait only until the buffered tokens are due
+                timeout = max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    yield flush()
+                    continue
+            else:
+                await asyncio.wait({pending})
+
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+
+            if head is not None and chunk.agent != head.agent:
+                yield flush()
+
+            if head is None:
+                head = chunk
+                deadline = loop.time() + flush_interval
+            buffered.append(chunk.text)
+            buffered_bytes += len(chunk.text.encode("utf-8"))
+
+            if buffered_bytes >= flush_bytes:
+                yield flush()
+
+        if head is not None:
+            yield flush()
+    finally:
+        # Consumer stopped early (client gone or error): stop the source too
+        if pending is not None:
+            pending.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration, Exception):
+                await pending
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
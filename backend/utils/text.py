@@ -0,0 +1,36 @@
+"""
+Text Normalization Helpers.
+
+Shared by the request-coalescing and caching layers so that trivially
+different spellings of the same question ("Error 500 on login",
+"error 500 on login?  ") map to the same key.
+
+Last Updated: October 17, 2026
+"""
+
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+# Punctuation that does not change the meaning of a support question
+_EDGE_PUNCTUATION = " \t\n.,!?;:…\"'`"
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a user message for equality comparison.
+
+    Lowercases, collapses runs of whitespace, and strips leading/trailing
+    punctuation. Inner punctuation is kept ("error 500" != "error 5.00").
+
+    Args:
+        message: Raw user message
+
+    Returns:
+        str: Normalized message
+
+    Example:
+        >>> normalize_message("  Error 500 on   LOGIN?! ")
+        'error 500 on login'
+    """
+    collapsed = _WHITESPACE.sub(" ", message.lower())
+    return collapsed.strip(_EDGE_PUNCTUATION)
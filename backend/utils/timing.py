@@ -0,0 +1,223 @@
+"""
+Per-Request Stage Timings (Server-Timing).
+
+Breaks the latency of one chat turn down into stages so a slow request
+shows where its time went: supervisor LLM calls, worker agent tools,
+worker LLM calls, vector search, embedding calls and the wait for an
+agent run slot.
+
+A ``RequestTimings`` collector lives in a context variable for the
+duration of a request. Context variables follow the call chain into the
+agent executor's pool thread (``BoundedAgentExecutor.call`` copies the
+context), into LangGraph's tool threads, and into the worker agents the
+tools invoke, so code anywhere in that chain can record a stage with
+``timed()`` without passing anything through. LLM calls are timed by a
+callback handler that LangChain attaches to every run started while a
+collector is active (``register_configure_hook``), so run configs are
+left untouched.
+
+Stages may overlap: worker time includes the worker's LLM and retrieval
+time, and retrieval includes the query embedding.
+
+Last Updated: October 17, 2026
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+from langchain_core.tracers.context import register_configure_hook
+
+from utils.agent_names import SUPERVISOR_AGENT_NAME
+
+# Stage name -> Server-Timing description
+STAGES = {
+    "queue": "Wait for agent run slot",
+    "supervisor": "Supervisor LLM",
+    "worker": "Worker agents",
+    "worker_llm": "Worker LLM",
+    "llm": "LLM",
+    "retrieval": "Vector search",
+    "embedding": "Embeddings",
+    "total": "Total",
+}
+_STAGE_ORDER = {stage: n for n, stage in enumerate(STAGES)}
+
+
+class RequestTimings:
+    """
+    Accumulated time per stage for one request (thread-safe).
+
+    Example:
+        >>> timings = RequestTimings()
+        >>> timings.add("retrieval", 0.120)
+        >>> timings.header()
+        'retrieval;dur=120.0;desc="Vector search", total;dur=...'
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._stages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add ``seconds`` to a stage's total."""
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Stage totals in milliseconds, plus time since creation as "total".
+
+        Returns:
+            dict: {stage: milliseconds} in STAGES order
+        """
+        with self._lock:
+            stages = {**self._stages, "total": time.perf_counter() - self._started}
+        ordered = sorted(
+            stages, key=lambda stage: (_STAGE_ORDER.get(stage, len(STAGES)), stage)
+        )
+        return {stage: round(stages[stage] * 1000, 1) for stage in ordered}
+
+    def header(self) -> str:
+        """
+        Format the stage totals as a Server-Timing header value.
+
+        Returns:
+            str: e.g. 'supervisor;dur=812.4;desc="Supervisor LLM", total;dur=1630.2;desc="Total"'
+        """
+        return ", ".join(
+            f'{stage};dur={ms};desc="{STAGES[stage]}"'
+            if stage in STAGES
+            else f"{stage};dur={ms}"
+            for stage, ms in self.as_dict().items()
+        )
+
+
+class TimingCallbackHandler(BaseCallbackHandler):
+    """Records chat model call durations as supervisor / worker LLM time."""
+
+    # Only takes a lock and updates a dict: run inline on async runs too
+    run_inline = True
+
+    def __init__(self, timings: RequestTimings):
+        self.timings = timings
+        self._started: dict[UUID, tuple[str, float]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        agent_name = (metadata or {}).get("lc_agent_name")
+        if agent_name == SUPERVISOR_AGENT_NAME:
+            stage = "supervisor"
+        else:
+            stage = "worker_llm" if agent_name else "llm"
+        self._started[run_id] = (stage, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            stage, start = started
+            self.timings.add(stage, time.perf_counter() - start)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._finish(run_id)
+
+
+_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+_timing_callbacks: ContextVar[TimingCallbackHandler | None] = ContextVar(
+    "timing_callbacks", default=None
+)
+# Every LangChain run started while _timing_callbacks is set gets the handler
+register_configure_hook(_timing_callbacks, inheritable=True)
+
+
+def current_timings() -> RequestTimings | None:
+    """The active request's collector, or None outside collect_timings()."""
+    return _timings.get()
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    """
+    Collect stage timings for everything run inside the block.
+
+    Yields:
+        RequestTimings: The request's collector
+
+    Example:
+        >>> with collect_timings() as timings:
+        ...     result = await run_supervisor(agent, message, config)
+        >>> response.headers["Server-Timing"] = timings.header()
+    """
+    timings = RequestTimings()
+    timings_token = _timings.set(timings)
+    callbacks_token = _timing_callbacks.set(TimingCallbackHandler(timings))
+    try:
+        yield timings
+    finally:
+        _timing_callbacks.reset(callbacks_token)
+        _timings.reset(timings_token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Add the block's duration to a stage of the active request (no-op
+    outside collect_timings()).
+
+    Example:
+        >>> with timed("retrieval"):
+        ...     docs = vectorstore.similarity_search(query, k=3)
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, time.perf_counter() - started)
+
+
+class TimedEmbeddings(Embeddings):
+    """Embeddings wrapper that records calls under the "embedding" stage."""
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        with timed("embedding"):
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        with timed("embedding"):
+            return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        with timed("embedding"):
+            return await self.embeddings.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        with timed("embedding"):
+            return await self.embeddings.aembed_query(text)